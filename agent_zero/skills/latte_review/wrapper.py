@@ -16,16 +16,18 @@ LATTE_DIR = Path(os.path.abspath(__file__)).parent.parent.parent.parent / "_exte
 if str(LATTE_DIR) not in sys.path:
     sys.path.insert(0, str(LATTE_DIR))
 
-try:
-    from lattereview.providers import LiteLLMProvider
-    from lattereview.agents import TitleAbstractReviewer, ScoringReviewer, AbstractionReviewer
-    from lattereview.workflows import ReviewWorkflow
-    LATTE_AVAILABLE = True
-except ImportError as e:
-    import traceback
-    logger.warning(f"LatteReview not available: {e}\n{traceback.format_exc()}")
-    LATTE_AVAILABLE = False
+# LatteReview drags in LiteLLM/tokencost; resolve its classes on first use
+from runtime.lazy import is_available, lazy_attr
 
+LATTE_AVAILABLE = is_available("lattereview")
+if LATTE_AVAILABLE:
+    LiteLLMProvider = lazy_attr("lattereview.providers", "LiteLLMProvider")
+    TitleAbstractReviewer = lazy_attr("lattereview.agents", "TitleAbstractReviewer")
+    ScoringReviewer = lazy_attr("lattereview.agents", "ScoringReviewer")
+    AbstractionReviewer = lazy_attr("lattereview.agents", "AbstractionReviewer")
+    ReviewWorkflow = lazy_attr("lattereview.workflows", "ReviewWorkflow")
+else:
+    logger.warning("LatteReview not available: lattereview is not installed")
 
 class LatteReviewSkill:
     """
@@ -7,6 +7,7 @@ Includes:
 - SurfSense: Web scraping with extraction rules
 - Executor: Fetches pages and extracts text
 - Curator: Saves results and manages metadata
+- ResultIndex: BM25 full-text index over saved results
 - Reasoner: Synthesizes answers using LLM
 """
 
@@ -14,6 +15,7 @@ from .search_planner import SearchPlanner, SearchQuery, SearchPlan, SourceConfig
 from .surfsense import SurfSense, ExtractionRules, CrawlConfig, CrawlResult
 from .executor import Executor, PageResult, ExecutorConfig
 from .curator import Curator, CuratorConfig, QueryMetadata, ResultMetadata, SearchIndex
+from .result_index import ResultIndex
 from .reasoner import Reasoner, ReasonerConfig, Citation, ResearchAnswer
 
 __all__ = [
@@ -37,6 +39,7 @@ __all__ = [
     'QueryMetadata',
     'ResultMetadata',
     'SearchIndex',
+    'ResultIndex',
     # Reasoner
     'Reasoner',
     'ReasonerConfig',
@@ -13,6 +13,7 @@ import os
 from pathlib import Path
 from datetime import datetime
 from .executor import PageResult
+from .result_index import ResultIndex
 
 logger = logging.getLogger(__name__)
 
@@ -53,7 +54,7 @@ class ResultMetadata:
 
 @dataclass
 class SearchIndex:
-    """Search index for quick lookup of research results."""
+    """Legacy JSON search index layout (migrated into ResultIndex on load)."""
     queries: Dict[str, QueryMetadata] = field(default_factory=dict)
     results: Dict[str, List[ResultMetadata]] = field(default_factory=dict)
     last_updated: str = ""
@@ -66,7 +67,7 @@ class Curator:
     This component:
     - Saves results as files
     - Adds metadata to results
-    - Updates search index
+    - Updates search index (SQLite FTS5, ranked with BM25)
     - Maintains knowledge base
     """
     
@@ -79,10 +80,10 @@ class Curator:
         """
         self.config = config or CuratorConfig()
         self.base_path = Path(self.config.base_path)
-        self.index = self._load_index()
         
         # Create directory structure
         self._create_directory_structure()
+        self.index = self._load_index()
     
     def _create_directory_structure(self):
         """Create the necessary directory structure for storing results."""
@@ -98,34 +99,25 @@ class Curator:
         
         logger.info(f"Directory structure created at {self.base_path}")
     
-    def _load_index(self) -> SearchIndex:
-        """Load the search index from disk."""
-        index_path = self.base_path / "index" / "search_index.json"
+    def _load_index(self) -> ResultIndex:
+        """Open the search index, importing a legacy JSON index once."""
+        index = ResultIndex(str(self.base_path / "index" / "search_index.db"))
+        legacy_path = self.base_path / "index" / "search_index.json"
         
-        if index_path.exists():
+        if legacy_path.exists():
             try:
-                with open(index_path, 'r', encoding='utf-8') as f:
-                    index_data = json.load(f)
-                    return SearchIndex(**index_data)
+                with open(legacy_path, 'r', encoding='utf-8') as f:
+                    legacy = json.load(f)
+                for query_meta in legacy.get('queries', {}).values():
+                    index.add_query(query_meta)
+                for results in legacy.get('results', {}).values():
+                    index.add_results(results)
+                legacy_path.replace(legacy_path.with_suffix('.json.legacy'))
+                logger.info(f"Migrated legacy search index to {index.db_path}")
             except Exception as e:
-                logger.warning(f"Failed to load index: {e}. Creating new index.")
+                logger.warning(f"Failed to migrate legacy index: {e}")
         
-        return SearchIndex(last_updated=datetime.now().isoformat())
-    
-    def _save_index(self):
-        """Save the search index to disk."""
-        index_path = self.base_path / "index" / "search_index.json"
-        
-        try:
-            index_data = asdict(self.index)
-            index_data['last_updated'] = datetime.now().isoformat()
-            
-            with open(index_path, 'w', encoding='utf-8') as f:
-                json.dump(index_data, f, indent=2, ensure_ascii=False)
-            
-            logger.debug(f"Index saved to {index_path}")
-        except Exception as e:
-            logger.error(f"Failed to save index: {e}")
+        return index
     
     def _generate_query_id(self, query: str) -> str:
         """
@@ -188,6 +180,7 @@ class Curator:
         # Save individual results
         file_paths = []
         saved_results = []
+        saved_paths = []
         
         for i, result in enumerate(results):
             if not result.success:
@@ -209,6 +202,7 @@ class Curator:
                 
                 file_paths.append(str(file_path))
                 saved_results.append(result)
+                saved_paths.append(str(file_path))
                 
                 logger.debug(f"Saved result to {file_path}")
                 
@@ -219,7 +213,7 @@ class Curator:
         await self.add_metadata(saved_results, query, query_id, context)
         
         # Update index
-        await self.update_index(saved_results, query_id)
+        await self.update_index(saved_results, query_id, file_paths=saved_paths)
         
         # Save summary
         await self._save_summary(query_id, query, saved_results, context)
@@ -261,6 +255,8 @@ class Curator:
             keywords=keywords
         )
         
+        self.index.add_query(asdict(query_metadata))
+        
         # Save query metadata
         metadata_path = self.base_path / "queries" / query_id / "metadata.json"
         
@@ -290,31 +286,32 @@ class Curator:
     async def update_index(
         self,
         results: List[PageResult],
-        query_id: str
+        query_id: str,
+        file_paths: Optional[List[str]] = None
     ):
         """
         Update search index with new results.
         
+        Only the given results are written; the rest of the index is untouched.
+        
         Args:
             results: List of page results
             query_id: Query ID
+            file_paths: Saved file of each result (defaults to page_NNN.txt by position)
         """
         if not results:
             return
         
-        # Add results to index
-        if query_id not in self.index.results:
-            self.index.results[query_id] = []
-        
+        entries = []
         for i, result in enumerate(results):
             if not result.success:
                 continue
             
             # Generate file path
-            file_path = str(self.base_path / "queries" / query_id / "results" / f"page_{i+1:03d}.txt")
-            
-            # Generate result hash
-            content_hash = self._generate_result_hash(result.url, result.content)
+            if file_paths is not None:
+                file_path = file_paths[i]
+            else:
+                file_path = str(self.base_path / "queries" / query_id / "results" / f"page_{i+1:03d}.txt")
             
             # Create result metadata
             result_metadata = ResultMetadata(
@@ -325,18 +322,14 @@ class Curator:
                 timestamp=result.timestamp.isoformat(),
                 query_id=query_id,
                 file_path=file_path,
-                hash=content_hash
+                hash=self._generate_result_hash(result.url, result.content)
             )
-            
-            # Check for duplicates
-            existing_hashes = [r.hash for r in self.index.results[query_id]]
-            if content_hash not in existing_hashes:
-                self.index.results[query_id].append(result_metadata)
+            entries.append({**asdict(result_metadata), 'content': result.content})
         
-        # Save index
-        self._save_index()
+        # Duplicates (same hash within the query) are skipped by the index
+        added = self.index.add_results(entries)
         
-        logger.debug(f"Updated index for query {query_id}")
+        logger.debug(f"Updated index for query {query_id} ({added} new results)")
     
     async def deduplicate_results(
         self,
@@ -426,7 +419,7 @@ class Curator:
             Query results or None if not found
         """
         # Check index
-        if query_id not in self.index.results:
+        if not self.index.has_query(query_id):
             logger.warning(f"Query ID not found in index: {query_id}")
             return None
         
@@ -442,7 +435,7 @@ class Curator:
             
             # Load results
             results = []
-            for result_meta in self.index.results[query_id]:
+            for result_meta in self.index.results_for(query_id):
                 result_path = Path(result_meta['file_path'])
                 if result_path.exists():
                     with open(result_path, 'r', encoding='utf-8') as f:
@@ -497,25 +490,8 @@ class Curator:
         except Exception as e:
             logger.warning(f"Semantic search failed, falling back to keyword: {e}")
 
-        # 2. Keyword Search (Fallback)
-        query_lower = query.lower()
-        for query_id, results in self.index.results.items():
-            for result in results:
-                if (query_lower in result.url.lower() or
-                    query_lower in result.title.lower() or
-                    query_lower in result.domain.lower()):
-                    matches.append({
-                        'query_id': query_id,
-                        'url': result.url,
-                        'title': result.title,
-                        'domain': result.domain,
-                        'timestamp': result.timestamp,
-                        'file_path': result.file_path,
-                        'score': 0.5 # Default score for keyword match
-                    })
-        
-        matches.sort(key=lambda x: (x.get('score', 0), x['timestamp']), reverse=True)
-        return matches[:limit]
+        # 2. Keyword Search (Fallback): BM25-ranked full-text index
+        return self.index.search(query, limit=limit)
     
     async def cleanup_old_results(
         self,
@@ -530,22 +506,11 @@ class Curator:
         Returns:
             Number of results removed
         """
-        cutoff_date = datetime.now().timestamp() - (days_old * 24 * 60 * 60)
+        cutoff = datetime.fromtimestamp(datetime.now().timestamp() - (days_old * 24 * 60 * 60))
         removed = 0
         
-        # Check each query in index
-        queries_to_remove = []
-        
-        for query_id, query_meta in self.index.queries.items():
-            try:
-                query_time = datetime.fromisoformat(query_meta['timestamp']).timestamp()
-                if query_time < cutoff_date:
-                    queries_to_remove.append(query_id)
-            except Exception as e:
-                logger.warning(f"Failed to parse timestamp for {query_id}: {e}")
-        
         # Remove old queries
-        for query_id in queries_to_remove:
+        for query_id in self.index.queries_before(cutoff.isoformat()):
             try:
                 # Remove query directory
                 query_dir = self.base_path / "queries" / query_id
@@ -554,10 +519,7 @@ class Curator:
                     shutil.rmtree(query_dir)
                 
                 # Remove from index
-                if query_id in self.index.queries:
-                    del self.index.queries[query_id]
-                if query_id in self.index.results:
-                    del self.index.results[query_id]
+                self.index.delete_query(query_id)
                 
                 removed += 1
                 logger.info(f"Removed old query: {query_id}")
@@ -565,10 +527,6 @@ class Curator:
             except Exception as e:
                 logger.error(f"Failed to remove {query_id}: {e}")
         
-        # Save updated index
-        if removed > 0:
-            self._save_index()
-        
         logger.info(f"Cleaned up {removed} old queries")
         return removed
 
@@ -0,0 +1,227 @@
+"""
+Agent Zero Result Index
+
+SQLite full-text index over curated web research results.
+
+- One row per saved page, deduplicated per query by content hash
+- FTS5 table over title, URL, domain and page text, ranked with BM25
+- Incremental: saving a batch inserts only that batch
+- Falls back to LIKE matching when SQLite is built without FTS5
+"""
+
+from typing import List, Dict, Any, Iterable
+import logging
+import json
+import re
+import sqlite3
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Page text indexed per result; enough for ranking without duplicating whole pages
+MAX_INDEXED_CHARS = 20000
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class ResultIndex:
+    """
+    Persistent keyword index for research results.
+
+    This component:
+    - Stores query and result metadata
+    - Ranks results for a keyword query with BM25
+    - Removes queries and their results
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Open (or create) the index.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self.fts_enabled = self._init_db()
+
+    def _init_db(self) -> bool:
+        with self._lock, self._conn:
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS queries (
+                    query_id TEXT PRIMARY KEY,
+                    query TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    data TEXT NOT NULL
+                )
+            ''')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS results (
+                    id INTEGER PRIMARY KEY,
+                    query_id TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    title TEXT,
+                    domain TEXT,
+                    timestamp TEXT,
+                    file_path TEXT,
+                    content_length INTEGER,
+                    hash TEXT NOT NULL,
+                    UNIQUE (query_id, hash)
+                )
+            ''')
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_queries_timestamp ON queries(timestamp)")
+            try:
+                self._conn.execute('''
+                    CREATE VIRTUAL TABLE IF NOT EXISTS results_fts USING fts5(
+                        title, url, domain, body, tokenize = 'porter unicode61'
+                    )
+                ''')
+                return True
+            except sqlite3.OperationalError as e:
+                logger.warning(f"SQLite FTS5 unavailable ({e}); keyword search uses LIKE matching")
+                return False
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def add_query(self, query_metadata: Dict[str, Any]):
+        """Insert or replace the metadata of a query."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO queries (query_id, query, timestamp, data) VALUES (?, ?, ?, ?)",
+                (query_metadata['query_id'], query_metadata['query'], query_metadata['timestamp'],
+                 json.dumps(query_metadata, ensure_ascii=False))
+            )
+
+    def add_results(self, results: Iterable[Dict[str, Any]]) -> int:
+        """
+        Index a batch of results.
+
+        Args:
+            results: Result metadata dicts (ResultMetadata fields), optionally
+                with a 'content' key holding the page text
+
+        Returns:
+            Number of new results (duplicates within a query are skipped)
+        """
+        added = 0
+        with self._lock, self._conn:
+            for r in results:
+                cursor = self._conn.execute(
+                    '''INSERT OR IGNORE INTO results
+                       (query_id, url, title, domain, timestamp, file_path, content_length, hash)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+                    (r['query_id'], r['url'], r.get('title', ''), r.get('domain', ''), r.get('timestamp', ''),
+                     r.get('file_path', ''), r.get('content_length', 0), r['hash'])
+                )
+                if cursor.rowcount == 0:
+                    continue
+                added += 1
+                if self.fts_enabled:
+                    self._conn.execute(
+                        "INSERT INTO results_fts (rowid, title, url, domain, body) VALUES (?, ?, ?, ?, ?)",
+                        (cursor.lastrowid, r.get('title', ''), r['url'], r.get('domain', ''),
+                         (r.get('content') or '')[:MAX_INDEXED_CHARS])
+                    )
+        return added
+
+    def delete_query(self, query_id: str):
+        """Remove a query and all of its results."""
+        with self._lock, self._conn:
+            if self.fts_enabled:
+                self._conn.execute(
+                    "DELETE FROM results_fts WHERE rowid IN (SELECT id FROM results WHERE query_id = ?)",
+                    (query_id,)
+                )
+            self._conn.execute("DELETE FROM results WHERE query_id = ?", (query_id,))
+            self._conn.execute("DELETE FROM queries WHERE query_id = ?", (query_id,))
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def has_query(self, query_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM results WHERE query_id = ? LIMIT 1", (query_id,)
+            ).fetchone()
+        return row is not None
+
+    def results_for(self, query_id: str) -> List[Dict[str, Any]]:
+        """Result metadata of a query, in insertion order."""
+        with self._lock:
+            rows = self._conn.execute(
+                '''SELECT url, title, content_length, domain, timestamp, query_id, file_path, hash
+                   FROM results WHERE query_id = ? ORDER BY id''', (query_id,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def queries_before(self, timestamp: str) -> List[str]:
+        """Ids of queries recorded before an ISO timestamp."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT query_id FROM queries WHERE timestamp < ?", (timestamp,)
+            ).fetchall()
+        return [row['query_id'] for row in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Ranked keyword search.
+
+        Args:
+            query: Free-text query; any term may match, documents matching
+                more (and rarer) terms rank higher
+            limit: Maximum number of results
+
+        Returns:
+            Result metadata dicts with a 'score' in (0, 1), best first
+        """
+        terms = list(dict.fromkeys(t.lower() for t in _TOKEN_RE.findall(query)))
+        if not terms:
+            return []
+
+        with self._lock:
+            if self.fts_enabled:
+                match = " OR ".join(f'"{t}"' for t in terms)
+                rows = self._conn.execute(
+                    '''SELECT r.url, r.title, r.domain, r.timestamp, r.query_id, r.file_path,
+                              bm25(results_fts, 10.0, 5.0, 5.0, 1.0) AS rank
+                       FROM results_fts JOIN results r ON r.id = results_fts.rowid
+                       WHERE results_fts MATCH ?
+                       ORDER BY rank, r.timestamp DESC
+                       LIMIT ?''',
+                    (match, limit)
+                ).fetchall()
+            else:
+                clauses = " OR ".join(["(url LIKE ? OR title LIKE ? OR domain LIKE ?)"] * len(terms))
+                params = [p for t in terms for p in (f"%{t}%",) * 3]
+                rows = self._conn.execute(
+                    f'''SELECT url, title, domain, timestamp, query_id, file_path, -1.0 AS rank
+                        FROM results WHERE {clauses}
+                        ORDER BY timestamp DESC LIMIT ?''',
+                    (*params, limit)
+                ).fetchall()
+
+        matches = []
+        for row in rows:
+            match = dict(row)
+            # bm25() is negative, more negative is better; map to (0, 1)
+            strength = -match.pop('rank')
+            match['score'] = strength / (1.0 + strength) if strength > 0 else 0.0
+            matches.append(match)
+        return matches
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,146 @@
+"""
+Deferred API Routers.
+
+Routers whose modules import heavy subsystems (the agent stack, LiteLLM,
+statsmodels/lifelines) are registered here instead of being imported
+with api.main. Their modules are imported off the event loop after
+startup, and a request that arrives for one of their prefixes before it
+is mounted waits for it instead of getting a 404.
+
+Mounted routes are inserted where an eager include_router would have put
+them, so route precedence is unchanged (e.g. the statistics router's
+/api/statistics/analyze still wins over the legacy handler in api.main).
+"""
+
+import asyncio
+import importlib
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI
+
+from runtime.lazy import record_load
+
+logger = logging.getLogger("biodockify_api")
+
+
+@dataclass
+class DeferredRouter:
+    module: str
+    prefixes: Tuple[str, ...]
+    include_kwargs: Dict[str, Any]
+    attr: str = "router"
+    position: int = 0
+    router: Any = None
+    error: Optional[str] = None
+    mounted: bool = False
+    route_count: int = 0
+    import_lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def import_router(self) -> Any:
+        """Import the router module (blocking, idempotent, thread-safe)."""
+        with self.import_lock:
+            if self.router is None and self.error is None:
+                start = time.perf_counter()
+                try:
+                    self.router = getattr(importlib.import_module(self.module), self.attr)
+                except Exception as e:
+                    self.error = str(e)
+                    logger.warning(f"Deferred routes {self.module} not loaded: {e}")
+                record_load(f"router:{self.module}", time.perf_counter() - start, self.error)
+            return self.router
+
+
+class DeferredRouters:
+    """
+    Example:
+        deferred = DeferredRouters(app)
+        deferred.add("api.routes.statistics", prefixes=("/api/statistics",))
+        app.add_middleware(DeferredRouteGate, deferred=deferred)
+        # at startup
+        asyncio.create_task(deferred.mount_all())
+    """
+
+    def __init__(self, app: FastAPI):
+        self.app = app
+        self.entries: List[DeferredRouter] = []
+        self._mount_lock = threading.Lock()
+
+    def add(self, module: str, prefixes: Tuple[str, ...], attr: str = "router", **include_kwargs):
+        """Register a router; `prefixes` are the URL paths it serves (checked without importing it)."""
+        self.entries.append(DeferredRouter(
+            module=module,
+            prefixes=tuple(prefixes),
+            include_kwargs=include_kwargs,
+            attr=attr,
+            position=len(self.app.router.routes),
+        ))
+
+    def import_all(self):
+        """Import every pending router module in the calling thread (used by the warm-up)."""
+        for entry in self.entries:
+            entry.import_router()
+
+    def _mount(self, entry: DeferredRouter):
+        """Include an imported router at its registration position."""
+        with self._mount_lock:
+            if entry.mounted or entry.router is None:
+                return
+            routes = self.app.router.routes
+            # Mounted routers registered before this one shift its slot
+            order = self.entries.index(entry)
+            offset = sum(
+                e.route_count for i, e in enumerate(self.entries)
+                if e.mounted and (e.position, i) < (entry.position, order)
+            )
+            before = len(routes)
+            self.app.include_router(entry.router, **entry.include_kwargs)
+            added = routes[before:]
+            del routes[before:]
+            index = entry.position + offset
+            routes[index:index] = added
+            entry.route_count = len(added)
+            entry.mounted = True
+            self.app.openapi_schema = None
+            logger.info(f"Mounted deferred routes {entry.module} ({len(added)} routes)")
+
+    async def mount(self, entry: DeferredRouter):
+        if not entry.mounted:
+            await asyncio.to_thread(entry.import_router)
+            self._mount(entry)
+
+    async def mount_all(self):
+        for entry in self.entries:
+            await self.mount(entry)
+
+    def pending_for(self, path: str) -> List[DeferredRouter]:
+        """Unmounted routers that may serve `path`."""
+        return [
+            entry for entry in self.entries
+            if not entry.mounted and entry.error is None and any(
+                path == prefix or path.startswith(prefix.rstrip("/") + "/") for prefix in entry.prefixes
+            )
+        ]
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            entry.module: {"mounted": entry.mounted, "routes": entry.route_count, "error": entry.error}
+            for entry in self.entries
+        }
+
+
+class DeferredRouteGate:
+    """ASGI middleware that mounts a deferred router before serving its first request."""
+
+    def __init__(self, app, deferred: DeferredRouters):
+        self.app = app
+        self.deferred = deferred
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket"):
+            for entry in self.deferred.pending_for(scope.get("path", "")):
+                await self.deferred.mount(entry)
+        await self.app(scope, receive, send)
@@ -1,3 +1,4 @@
+from runtime.lazy import PROCESS_START, LazyObject, lazy_attr, mark_ready, record_phase, register_warmup, start_warmup, startup_report
 from fastapi import FastAPI, BackgroundTasks, HTTPException, Request
 from contextlib import asynccontextmanager
 import asyncio
@@ -15,9 +16,9 @@ except ImportError:
     pass
 
 try:
-    from runtime.monitoring import start_monitoring_server
+    from runtime.monitoring import start_monitoring_server, METRICS
 except ImportError:
-    pass
+    METRICS = None
 
 from pydantic import BaseModel
 from typing import Dict, Any, Optional, List
@@ -31,6 +32,17 @@ async def lifespan(app: FastAPI):
     """
     await startup_event()
     yield
+    audit_log.close()
+    try:
+        from modules.statistics.executor import shutdown_analysis_executor
+        shutdown_analysis_executor()
+    except ImportError:
+        pass
+    try:
+        from modules.llm.http_client import close_async_clients
+        await close_async_clients()
+    except ImportError:
+        pass
     logger.info("BioDockify Backend Shutdown.")
 
 app = FastAPI(
@@ -44,18 +56,12 @@ app = FastAPI(
 import logging
 logger = logging.getLogger("biodockify_api")
 
-try:
-    from orchestration.planner.orchestrator import ResearchOrchestrator, OrchestratorConfig
-    from orchestration.executor import ResearchExecutor
-    logger.info("Orchestration modules loaded.")
-except Exception as e:
-    logger.error(f"Failed to load Orchestration modules: {e}")
-
-try:
-    from modules.analyst.analytics_engine import ResearchAnalyst
-    logger.info("Analytics Engine loaded.")
-except Exception as e:
-    logger.error(f"Failed to load Analytics Engine: {e}")
+# Heavy subsystems resolve on first use (see runtime.lazy); import errors
+# surface in the handler that needs them instead of at startup.
+ResearchOrchestrator = lazy_attr("orchestration.planner.orchestrator", "ResearchOrchestrator")
+OrchestratorConfig = lazy_attr("orchestration.planner.orchestrator", "OrchestratorConfig")
+ResearchExecutor = lazy_attr("orchestration.executor", "ResearchExecutor")
+ResearchAnalyst = lazy_attr("modules.analyst.analytics_engine", "ResearchAnalyst")
 
 try:
     from modules.backup import DriveClient, BackupManager
@@ -63,13 +69,10 @@ try:
 except Exception as e:
     logger.error(f"Failed to load Backup Manager: {e}")
 
-try:
-    from modules.literature.reviewer import CitationReviewer
-    from modules.literature.scraper import LiteratureAggregator, LiteratureConfig
-    from modules.literature.synthesis import get_synthesizer
-    logger.info("Literature modules loaded.")
-except Exception as e:
-    logger.error(f"Failed to load Literature modules: {e}")
+CitationReviewer = lazy_attr("modules.literature.reviewer", "CitationReviewer")
+LiteratureAggregator = lazy_attr("modules.literature.scraper", "LiteratureAggregator")
+LiteratureConfig = lazy_attr("modules.literature.scraper", "LiteratureConfig")
+get_synthesizer = lazy_attr("modules.literature.synthesis", "get_synthesizer")
 
 try:
     # from modules.system.auth_manager import auth_manager  # REMOVED - Supabase
@@ -79,16 +82,15 @@ except Exception as e:
 
 from dataclasses import asdict
 
+# Routers that import the agent stack, LiteLLM, chromadb or statsmodels are
+# mounted after startup (or on their first request) instead of at import.
+from api.deferred_routes import DeferredRouters, DeferredRouteGate
+deferred_routers = DeferredRouters(app)
+
 # Register NanoBot Hybrid Agent Routes
-try:
-    from api.routes.nanobot_routes import router as nanobot_router
-    from api.routes.research_management import router as research_management_router
-    app.include_router(nanobot_router)
-    # Research management routes
-    app.include_router(research_management_router)
-except ImportError as e:
-    import logging
-    logging.getLogger("biodockify_api").warning(f"NanoBot routes not loaded: {e}")
+deferred_routers.add("api.routes.nanobot_routes", prefixes=("/api/nanobot",))
+# Research management routes
+deferred_routers.add("api.routes.research_management", prefixes=("/api/research/management",))
 
 # Register Agent Zero Enhanced Routes (Memory, Skills, Spawn)
 try:
@@ -107,44 +109,20 @@ except ImportError as e:
     logging.getLogger("biodockify_api").warning(f"Channels routes not loaded: {e}")
 
 # Register Research Orchestration Routes (Status, WebSocket)
-try:
-    from api.routers.research import router as research_router
-    app.include_router(research_router, prefix="/api/research", tags=["Research"])
-except ImportError as e:
-    import logging
-    logging.getLogger("biodockify_api").warning(f"Research routes not loaded: {e}")
+deferred_routers.add("api.routers.research", prefixes=("/api/research",), prefix="/api/research", tags=["Research"])
 
 # Register RAG & Notebook Routes
-try:
-    from api.routes.rag_routes import router as rag_router
-    app.include_router(rag_router)
-except ImportError as e:
-    import logging
-    logging.getLogger("biodockify_api").warning(f"RAG routes not loaded: {e}")
+deferred_routers.add("api.routes.rag_routes", prefixes=("/api/rag",))
 
 # Register Enhanced Project Routes (Phase 11)
-try:
-    from api.routes.enhanced_project_routes import router as enhanced_project_router
-    app.include_router(enhanced_project_router)
-except ImportError as e:
-    import logging
-    logging.getLogger("biodockify_api").warning(f"Enhanced Project routes not loaded: {e}")
+deferred_routers.add("api.routes.enhanced_project_routes", prefixes=("/api/enhanced",))
 
 # Register Settings Routes (Universal API & Connection Test)
-try:
-    from api.routes.settings_routes import router as settings_router
-    app.include_router(settings_router)
-except ImportError as e:
-    import logging
-    logging.getLogger("biodockify_api").warning(f"Settings routes not loaded: {e}")
+deferred_routers.add("api.routes.settings_routes", prefixes=("/api/settings/test",))
 
 # Register Statistics Routes
-try:
-    from api.routes.statistics import router as statistics_router
-    app.include_router(statistics_router)
-except ImportError as e:
-    import logging
-    logging.getLogger("biodockify_api").warning(f"Statistics routes not loaded: {e}")
+deferred_routers.add("api.routes.statistics", prefixes=("/api/statistics",))
+app.add_middleware(DeferredRouteGate, deferred=deferred_routers)
 
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -173,88 +151,38 @@ app.add_middleware(
     allow_origins=allowed_origins,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["Content-Type", "Authorization", "X-Requested-With", "X-CSRF-Token"],
+    allow_headers=[
+        "Content-Type", "Authorization", "X-Requested-With", "X-CSRF-Token",
+        "X-Session-ID", "X-Dataset-ID", "X-Analysis-Timeout",
+    ],
+    expose_headers=["X-Session-ID"],
 )
 
 # -----------------------------------------------------------------------------
-# Security Headers & CSRF Protection Middleware
+# Request Pipeline: size limit, rate limit, memory guard, CSRF, security
+# headers and audit logging in one pure-ASGI middleware (api/middleware.py)
 # -----------------------------------------------------------------------------
-@app.middleware("http")
-async def add_security_headers(request: Request, call_next):
-    # CSRF Check for state-changing methods
-    if request.method in ["POST", "PUT", "DELETE", "PATCH"]:
-        origin = request.headers.get("Origin")
-        referer = request.headers.get("Referer")
-        
-        # Simple Origin/Referer check against allowed origins
-        is_valid_origin = any(o in (origin or "") for o in allowed_origins)
-        is_valid_referer = any(o in (referer or "") for o in allowed_origins)
-        
-        if not (is_valid_origin or is_valid_referer):
-            # If it's a browser request (has origin/referer) but from wrong source
-            if origin or referer:
-                return JSONResponse(
-                    status_code=403,
-                    content={"detail": "CSRF verification failed: Invalid origin or referer"}
-                )
+from api.middleware import AuditLog, RequestPipeline, ResourceGuard, TokenBucketLimiter
 
-    response = await call_next(request)
-    
-    # Essential Security Headers
-    response.headers["Content-Security-Policy"] = (
-        "default-src 'self'; "
-        "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
-        "style-src 'self' 'unsafe-inline' https://fonts.googleapis.com; "
-        "font-src 'self' https://fonts.gstatic.com; "
-        "img-src 'self' data: https:; "
-        "connect-src 'self' ws: wss: http://localhost:8234 https://*.google.com;"
-    )
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-    response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-    response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-    
-    return response
+RATE_LIMIT = 100  # requests per minute per client IP
+MAX_SIZE = 10 * 1024 * 1024  # 10MB request body limit
+# Never refused for memory pressure: health checks and critical auth/settings endpoints
+RESOURCE_EXEMPT_PATHS = ["/health", "/api/system/info", "/api/auth/verify", "/api/auth/verify-emergency", "/api/settings/test"]
 
-# -----------------------------------------------------------------------------
-# Rate Limiting & DoS Protection
-# -----------------------------------------------------------------------------
-REQUESTS_PER_MINUTE = 600
-ip_request_counts = {}
+rate_limiter = TokenBucketLimiter(RATE_LIMIT)
+resource_guard = ResourceGuard(max_memory_percent=95.0)
+audit_log = AuditLog(logging.getLogger("biodockify_api"))
 
-@app.middleware("http")
-async def rate_limit_middleware(request: Request, call_next):
-    client_ip = request.client.host
-    current_time = int(time.time() / 60)
-    
-    key = f"{client_ip}:{current_time}"
-    ip_request_counts[key] = ip_request_counts.get(key, 0) + 1
-    
-    if ip_request_counts[key] > REQUESTS_PER_MINUTE:
-        return JSONResponse(
-            status_code=429,
-            content={"detail": "Too many requests. Please try again later."}
-        )
-        
-    # Periodic cleanup (crude)
-    if len(ip_request_counts) > 10000:
-        ip_request_counts.clear()
-        
-    return await call_next(request)
-
-# Max Request Size Limit (10MB)
-MAX_SIZE = 10 * 1024 * 1024
-@app.middleware("http")
-async def limit_request_size(request: Request, call_next):
-    if request.method in ["POST", "PUT", "PATCH"]:
-        content_length = request.headers.get("Content-Length")
-        if content_length and int(content_length) > MAX_SIZE:
-            return JSONResponse(
-                status_code=413,
-                content={"detail": "Request body too large"}
-            )
-    return await call_next(request)
+app.add_middleware(
+    RequestPipeline,
+    allowed_origins=allowed_origins,
+    limiter=rate_limiter,
+    resource_guard=resource_guard,
+    audit=audit_log,
+    max_body_size=MAX_SIZE,
+    resource_exempt_paths=RESOURCE_EXEMPT_PATHS,
+    metrics=METRICS,
+)
 
 # -----------------------------------------------------------------------------
 # Global Error Handling & Resilience
@@ -599,7 +527,7 @@ def start_surfsense():
 # -----------------------------------------------------------------------------
 # V2 CONNECTIVITY DIAGNOSIS ENDPOINTS (First-Run Self-Healing)
 # -----------------------------------------------------------------------------
-from modules.system.connection_doctor import ConnectionDoctor, run_diagnosis
+ConnectionDoctor = lazy_attr("modules.system.connection_doctor", "ConnectionDoctor")
 
 @app.get("/api/diagnose/connectivity")
 async def diagnose_connectivity():
@@ -720,7 +648,7 @@ async def start_lm_studio():
 # -----------------------------------------------------------------------------
 from fastapi import UploadFile, File, Form
 from modules.library.store import library_store
-from modules.library.ingestor import library_ingestor
+library_ingestor = lazy_attr("modules.library.ingestor", "library_ingestor")
 
 # -----------------------------------------------------------------------------
 # KNOWLEDGE BASE & PODCAST ENDPOINTS (Phase 33)
@@ -883,9 +811,8 @@ async def search_literature_endpoint(req: LitSearchRequest):
             max_results=req.limit
         )
         aggregator = LiteratureAggregator(config)
-        # Using loop.run_in_executor because search might be blocking (PubMed sync part)
-        loop = asyncio.get_event_loop()
-        results = await loop.run_in_executor(None, aggregator.search, req.query)
+        # Sources are queried concurrently; only PubMed (Entrez) runs in a worker thread
+        results = await aggregator.search_async(req.query)
         return {"papers": results}
     except Exception as e:
         logger.error(f"Literature search failed: {e}")
@@ -971,7 +898,7 @@ def register_figure(title: str, caption: str, code: str, path: str):
 # -----------------------------------------------------------------------------
 # STATISTICS & QC ENDPOINTS (Phase 4)
 # -----------------------------------------------------------------------------
-from modules.statistics.engine import StatisticalEngine
+StatisticalEngine = lazy_attr("modules.statistics.engine", "StatisticalEngine")
 
 class StatisticsRequest(BaseModel):
     data: List[Dict[str, Any]]
@@ -1146,6 +1073,7 @@ async def startup_event():
         """Detect available AI providers (Ollama, LM Studio, Cloud APIs)."""
         import socket
         import shutil
+        import subprocess
         
         logger.info("=" * 60)
         logger.info("AI PROVIDER DETECTION")
@@ -1216,29 +1144,16 @@ async def startup_event():
         
         logger.info("=" * 60)
     
-    # Run detection
-    try:
-        import subprocess
-        detect_ai_providers()
-    except Exception as e:
-        logger.warning(f"AI Provider detection failed: {e}")
-    
     # 1. Background Initialization (Models + Services)
-    def background_init():
-        """Runs heavy startup tasks without blocking API availability."""
-        logger.info("Background Init: Starting...")
-        
-        # Start Prometheus metrics server
-        try:
-            from runtime.monitoring import start_monitoring_server
-            start_monitoring_server(8000)
-        except Exception as e:
-            logger.warning(f"Background Init: Failed to start monitoring server: {e}")
-
-        # A. Wait for server bind
-        time.sleep(5) 
-        
-        # B. Warm up Embedding Model with Crash Protection
+    # Everything below runs on the warm-up thread, in registration order, so
+    # the API is ready as soon as routes are registered. GET /api/system/startup
+    # reports how long each step took.
+    def start_metrics_server():
+        from runtime.monitoring import start_monitoring_server
+        start_monitoring_server(8000)
+
+    def warm_embedding_model():
+        """Load the embedding model and run one inference with crash protection."""
         try:
             logger.info("Background Init: Pre-loading Embedding Model...")
             from modules.rag.vector_store import get_vector_store
@@ -1250,7 +1165,7 @@ async def startup_event():
                  
             if hasattr(vs, 'model') and vs.model:
                  logger.info("Background Init: Running warmup inference...")
-                 vs.model.encode(["warmup"])
+                 vs.embeddings.embed(["warmup"]) if vs.embeddings else vs.model.encode(["warmup"])
                  logger.info("Background Init: Embedding Model Ready.")
             else:
                  logger.warning("Background Init: Model not loaded (dependencies missing?).")
@@ -1259,7 +1174,8 @@ async def startup_event():
             logger.warning(f"Background Init: Model warmup failed: {e}")
             # Do NOT re-raise, to keep the thread alive
 
-        # C. Start Background Services (Ollama/SurfSense)
+    def start_background_services():
+        """Start Ollama/SurfSense when auto_start_services is enabled."""
         try:
             from runtime.config_loader import load_config
             from runtime.service_manager import get_service_manager
@@ -1288,104 +1204,31 @@ async def startup_event():
         except Exception as e:
             logger.error(f"Background Init: Service init failed: {e}")
 
-        logger.info("Background Init: Completed.")
-
-    import threading
-    threading.Thread(target=background_init, daemon=True).start()
+    register_warmup("metrics_server", start_metrics_server)
+    register_warmup("ai_provider_detection", detect_ai_providers)
+    register_warmup("deferred_routers", deferred_routers.import_all)
+    register_warmup("embedding_model", warm_embedding_model)
+    register_warmup("background_services", start_background_services)
+    start_warmup()
     logger.info("Background initialization thread launched.")
 
+    # Mount deferred routers as soon as their modules are imported
+    asyncio.create_task(deferred_routers.mount_all())
+
     # 4. Start Background Monitoring Loop
     asyncio.create_task(background_monitor())
+    try:
+        from runtime.instrumentation import start_event_loop_monitor
+        start_event_loop_monitor()
+    except ImportError:
+        pass
 
     # 4. Check for high memory usage warning
     mem_status = psutil.virtual_memory()
     if mem_status.percent > 90:
         logger.warning(f"High Memory Usage on Startup: {mem_status.percent}%")
 
-@app.middleware("http")
-async def resource_monitor_middleware(request: Request, call_next):
-    """
-    Resource Management: Reject heavy requests if system is under stress.
-    """
-    # Skip for simple health checks and critical auth/settings endpoints
-    if request.url.path in ["/health", "/api/system/info", "/api/auth/verify", "/api/auth/verify-emergency", "/api/settings/test"]:
-        return await call_next(request)
-
-    # Check RAM
-    mem = psutil.virtual_memory()
-    if mem.percent > 95: # Critical Threshold
-        return JSONResponse(
-            status_code=503, 
-            content={"detail": "System is under heavy load (Memory > 95%). Please retry later."}
-        )
-        
-    return await call_next(request)
-
-# Rate Limiting & Size Limiting Middleware
-from collections import defaultdict
-import time
-
-request_counts = defaultdict(list)
-RATE_LIMIT = 100 # requests per minute
-MAX_UPLOAD_SIZE = 50 * 1024 * 1024 # 50 MB
-
-@app.middleware("http")
-async def security_middleware(request: Request, call_next):
-    # 1. Size Limiting (Client-Side Check)
-    if request.method == "POST":
-        content_length = request.headers.get("content-length")
-        if content_length and int(content_length) > MAX_UPLOAD_SIZE:
-             return JSONResponse(status_code=413, content={"detail": "File too large. Maximum size is 50MB."})
-
-    # 2. Rate Limiting (Simple Token Bucket per IP)
-    client_ip = request.client.host if request.client else "testclient"
-    now = time.time()
-    
-    # Clean old requests
-    request_counts[client_ip] = [t for t in request_counts[client_ip] if t > now - 60]
-    
-    if len(request_counts[client_ip]) > RATE_LIMIT:
-        return JSONResponse(status_code=429, content={"detail": "Rate limit exceeded. Try again later."})
-        
-    request_counts[client_ip].append(now)
-    
-    return await call_next(request)
-
-@app.middleware("http")
-async def audit_log_middleware(request: Request, call_next):
-    """
-    Structured Logging: Audit Trail for all API interactions.
-    Logs: Method, Path, IP, Status, Duration, User-Agent.
-    """
-    start_time = time.time()
-    
-    # Process Request
-    try:
-        response = await call_next(request)
-        status_code = response.status_code
-    except Exception as e:
-        status_code = 500
-        raise e
-    finally:
-        process_time = (time.time() - start_time) * 1000 # ms
-        
-        # Sanitize sensitive paths if needed (e.g. /auth/login passwords)
-        # For now, we trust the path logs.
-        
-        log_cls = logger.info if status_code < 400 else logger.warning
-        
-        log_data = {
-            "event": "api_request",
-            "method": request.method,
-            "path": request.url.path,
-            "client_ip": request.client.host if request.client else "testclient",
-            "status_code": status_code,
-            "duration_ms": round(process_time, 2),
-            "user_agent": request.headers.get("user-agent", "unknown")
-        }
-        log_cls(json.dumps(log_data))
-        
-    return response
+    mark_ready()
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -1413,8 +1256,9 @@ def safe_request(method, url, max_retries=3, **kwargs):
 # -----------------------------------------------------------------------------
 # Persistence Layer (Disk-Based)
 # -----------------------------------------------------------------------------
-from modules.task_manager.manager import TaskManager
-task_manager = TaskManager(os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./tasks.db"))
+TaskManager = lazy_attr("modules.task_manager.manager", "TaskManager")
+# SQLAlchemy engine is created on the first task read/write
+task_manager = LazyObject(lambda: TaskManager(os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./tasks.db")), "task_manager")
 
 # -----------------------------------------------------------------------------
 # Data Models
@@ -2277,6 +2121,38 @@ def clear_knowledge_base():
 # System Info API (For First Run Wizard)
 # -----------------------------------------------------------------------------
 
+@app.get("/api/system/profile")
+async def profile_system(seconds: float = 10.0, format: str = "json"):
+    """
+    Sample all threads for a few seconds and report where time is spent.
+    Disabled unless BIODOCKIFY_PROFILER=1. format=collapsed returns
+    flamegraph/speedscope input instead of the JSON summary.
+    """
+    if os.getenv("BIODOCKIFY_PROFILER", "0").lower() not in ("1", "true", "yes"):
+        raise HTTPException(status_code=404, detail="Profiler disabled (set BIODOCKIFY_PROFILER=1)")
+    from fastapi.responses import PlainTextResponse
+    from runtime.instrumentation import get_profiler
+    
+    profiler = get_profiler()
+    try:
+        # Sampling blocks its thread, so it runs off the event loop it is observing
+        profile = await asyncio.to_thread(profiler.sample, min(max(seconds, 0.1), 60.0))
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if format == "collapsed":
+        return PlainTextResponse(profiler.collapsed(profile))
+    return profiler.summary(profile)
+
+@app.get("/api/system/startup")
+def get_startup_report():
+    """
+    Startup budget: module import time, time to ready, first-use loads of
+    lazy subsystems, deferred router mounts and background warm-up steps.
+    """
+    report = startup_report()
+    report["deferred_routers"] = deferred_routers.status()
+    return report
+
 @app.get("/api/system/info")
 def get_system_info():
     """
@@ -2764,3 +2640,5 @@ async def verify_citations(request: VerificationRequest):
     except Exception as e:
         logger.error(f"Citation verification failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+record_phase("import api.main", time.perf_counter() - PROCESS_START)
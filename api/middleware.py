@@ -0,0 +1,282 @@
+"""
+BioDockify Request Pipeline.
+
+One pure-ASGI middleware for everything api.main used to do in separate
+@app.middleware("http") layers, in this order:
+
+1. Body size limit (Content-Length)
+2. Per-client rate limit (token bucket)
+3. Memory pressure guard (sampled, not per request)
+4. CSRF Origin/Referer check for state-changing methods
+5. Security headers on every response
+6. HTTP metrics, and an audit log written in batches by a background thread
+
+Pure ASGI avoids BaseHTTPMiddleware's extra task and response re-wrapping
+per layer; the checks themselves are O(1) per request.
+"""
+
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from starlette.responses import JSONResponse
+
+logger = logging.getLogger("biodockify_api")
+
+SECURITY_HEADERS: Dict[str, str] = {
+    "Content-Security-Policy": (
+        "default-src 'self'; "
+        "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
+        "style-src 'self' 'unsafe-inline' https://fonts.googleapis.com; "
+        "font-src 'self' https://fonts.gstatic.com; "
+        "img-src 'self' data: https:; "
+        "connect-src 'self' ws: wss: http://localhost:8234 https://*.google.com;"
+    ),
+    "X-Frame-Options": "DENY",
+    "X-Content-Type-Options": "nosniff",
+    "X-XSS-Protection": "1; mode=block",
+    "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+}
+
+CSRF_METHODS = frozenset({"POST", "PUT", "DELETE", "PATCH"})
+BODY_METHODS = frozenset({"POST", "PUT", "PATCH"})
+
+
+class TokenBucketLimiter:
+    """
+    Per-key token bucket: `rate_per_minute` sustained, bursts up to `burst`.
+
+    Buckets live in an LRU dict capped at `max_clients`; evicting an idle
+    client only forgets that it had spent tokens. allow() is O(1).
+    """
+
+    def __init__(self, rate_per_minute: float, burst: Optional[float] = None, max_clients: int = 10000):
+        self.rate = rate_per_minute / 60.0
+        self.burst = float(burst if burst is not None else rate_per_minute)
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def allow(self, key: str, now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [self.burst, now]
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            if bucket[0] < 1.0:
+                return False
+            bucket[0] -= 1.0
+            return True
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class ResourceGuard:
+    """
+    Memory-pressure check that samples psutil at most every `interval` seconds.
+    overloaded() is a cached comparison on the hot path.
+    """
+
+    def __init__(self, max_memory_percent: float = 95.0, interval: float = 1.0,
+                 sampler: Optional[Callable[[], float]] = None):
+        self.max_memory_percent = max_memory_percent
+        self.interval = interval
+        self._sampler = sampler or self._memory_percent
+        self._next_sample = 0.0
+        self._overloaded = False
+
+    @staticmethod
+    def _memory_percent() -> float:
+        import psutil
+        return psutil.virtual_memory().percent
+
+    def overloaded(self, now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        if now >= self._next_sample:
+            self._next_sample = now + self.interval
+            try:
+                self._overloaded = self._sampler() > self.max_memory_percent
+            except Exception as e:
+                logger.warning(f"Resource sample failed: {e}")
+                self._overloaded = False
+        return self._overloaded
+
+
+class AuditLog:
+    """
+    Buffered audit trail. Requests append a record (O(1), no I/O); a
+    writer thread drains the buffer in batches every `flush_interval`
+    seconds, or as soon as a full batch is waiting. The buffer is bounded:
+    under sustained overload the oldest unwritten records are dropped and
+    counted in `dropped`.
+    """
+
+    def __init__(self, log: logging.Logger = logger, flush_interval: float = 0.5,
+                 batch_size: int = 256, max_pending: int = 10000):
+        self.log = log
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._pending: deque = deque(maxlen=max_pending)
+        self.dropped = 0
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def record(self, entry: Dict[str, Any]):
+        if len(self._pending) == self._pending.maxlen:
+            self.dropped += 1
+        self._pending.append(entry)
+        if self._writer is None:
+            self._start_writer()
+        elif len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    def _start_writer(self):
+        with self._start_lock:
+            if self._writer is None:
+                self._stopped.clear()
+                self._writer = threading.Thread(target=self._run, name="biodockify-audit", daemon=True)
+                self._writer.start()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def _write(self, batch: Iterable[Dict[str, Any]]):
+        for entry in batch:
+            log_cls = self.log.info if entry["status_code"] < 400 else self.log.warning
+            log_cls(json.dumps(entry))
+
+    def flush(self):
+        """Write everything pending in the calling thread."""
+        while self._pending:
+            batch = []
+            while self._pending and len(batch) < self.batch_size:
+                batch.append(self._pending.popleft())
+            self._write(batch)
+
+    def close(self):
+        """Stop the writer and write what is left (server shutdown)."""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._writer is not None:
+            self._writer.join(timeout=5)
+            self._writer = None
+        self.flush()
+
+
+class RequestPipeline:
+    """Pure-ASGI replacement for the stacked HTTP middlewares (see module docstring)."""
+
+    def __init__(
+        self,
+        app,
+        allowed_origins: Iterable[str],
+        limiter: Optional[TokenBucketLimiter] = None,
+        resource_guard: Optional[ResourceGuard] = None,
+        audit: Optional[AuditLog] = None,
+        max_body_size: int = 10 * 1024 * 1024,
+        resource_exempt_paths: Iterable[str] = (),
+        metrics: Optional[Dict[str, Any]] = None,
+        security_headers: Dict[str, str] = SECURITY_HEADERS,
+    ):
+        self.app = app
+        self.allowed_origins = tuple(allowed_origins)
+        self.limiter = limiter
+        self.resource_guard = resource_guard
+        self.audit = audit
+        self.max_body_size = max_body_size
+        self.resource_exempt_paths = frozenset(resource_exempt_paths)
+        self.metrics = metrics
+        self._header_names = {name.lower().encode("latin-1") for name in security_headers}
+        self._headers: List[Tuple[bytes, bytes]] = [
+            (name.lower().encode("latin-1"), value.encode("latin-1"))
+            for name, value in security_headers.items()
+        ]
+
+    def _reject_reason(self, method: str, path: str, headers: Dict[bytes, bytes], client_ip: str) -> Optional[Tuple[int, str]]:
+        if method in BODY_METHODS:
+            content_length = headers.get(b"content-length")
+            if content_length:
+                try:
+                    size = int(content_length)
+                except ValueError:
+                    return 400, "Invalid Content-Length header"
+                if size > self.max_body_size:
+                    return 413, "Request body too large"
+
+        if self.limiter is not None and not self.limiter.allow(client_ip):
+            return 429, "Rate limit exceeded. Try again later."
+
+        if (self.resource_guard is not None and path not in self.resource_exempt_paths
+                and self.resource_guard.overloaded()):
+            limit = self.resource_guard.max_memory_percent
+            return 503, f"System is under heavy load (Memory > {limit:g}%). Please retry later."
+
+        if method in CSRF_METHODS:
+            origin = headers.get(b"origin", b"").decode("latin-1")
+            referer = headers.get(b"referer", b"").decode("latin-1")
+            # Only browser requests (with Origin/Referer) from elsewhere are refused
+            if (origin or referer) and not any(o in origin or o in referer for o in self.allowed_origins):
+                return 403, "CSRF verification failed: Invalid origin or referer"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        method = scope["method"]
+        path = scope["path"]
+        headers = dict(scope["headers"])
+        client = scope.get("client")
+        client_ip = client[0] if client else "testclient"
+        status_code = 500
+
+        async def send_with_headers(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                raw = [h for h in message.get("headers", ()) if h[0].lower() not in self._header_names]
+                message["headers"] = raw + self._headers
+            await send(message)
+
+        try:
+            reason = self._reject_reason(method, path, headers, client_ip)
+            if reason is not None:
+                response = JSONResponse(status_code=reason[0], content={"detail": reason[1]})
+                await response(scope, receive, send_with_headers)
+            else:
+                await self.app(scope, receive, send_with_headers)
+        finally:
+            duration = time.perf_counter() - start
+            if self.metrics:
+                # Route template, not raw path, to keep label cardinality bounded
+                endpoint = getattr(scope.get("route"), "path", "unmatched")
+                self.metrics['http_requests_total'].labels(method, endpoint, str(status_code)).inc()
+                self.metrics['http_request_duration_seconds'].labels(method, endpoint).observe(duration)
+            if self.audit is not None:
+                self.audit.record({
+                    "event": "api_request",
+                    "method": method,
+                    "path": path,
+                    "client_ip": client_ip,
+                    "status_code": status_code,
+                    "duration_ms": round(duration * 1000, 2),
+                    "user_agent": headers.get(b"user-agent", b"unknown").decode("latin-1"),
+                })
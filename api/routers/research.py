@@ -466,6 +466,20 @@ async def get_task_status(task_id: str):
         raise HTTPException(status_code=404, detail="Task not found")
     return task
 
+@router.get("/status/{task_id}/logs")
+async def get_task_logs(task_id: str, offset: int = 0, limit: int = 200, after_id: Optional[int] = None):
+    """Page through a task's logs, or fetch entries newer than after_id."""
+    store = get_task_store()
+    if after_id is not None:
+        entries = await store.get_logs_since(task_id, after_id, limit)
+        return {"task_id": task_id, "entries": entries}
+    return {
+        "task_id": task_id,
+        "total": await store.count_logs(task_id),
+        "offset": offset,
+        "logs": await store.get_logs(task_id, offset, limit)
+    }
+
 @router.get("/tasks", response_model=List[TaskStatus])
 async def list_tasks():
     """List all tasks."""
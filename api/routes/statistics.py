@@ -16,13 +16,16 @@ Complies with:
 
 import os
 import json
+import uuid
 import tempfile
 import logging
+from contextvars import ContextVar
 from datetime import datetime
+from functools import partial
 from typing import Dict, List, Any, Optional, Union
 from pathlib import Path
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks
+from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks, Depends, Header, Cookie, Response
 from fastapi.responses import FileResponse, JSONResponse
 from pydantic import BaseModel, Field
 
@@ -35,7 +38,8 @@ if _project_root not in _sys.path:
 
 import sys
 
-from modules.statistics.orchestrator import StatisticsOrchestrator
+from modules.statistics.orchestrator import StatisticsOrchestrator, active_session, active_dataset
+from modules.statistics.executor import AnalysisTimeout, ExecutorSaturated, get_analysis_executor
 
 # Import new statistics modules
 from modules.statistics.survival_analysis import SurvivalAnalysis
@@ -48,8 +52,51 @@ from modules.statistics.multiplicity_control import MultiplicityControl
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Per-request time budget, set by the analysis_timeout dependency
+_request_timeout: ContextVar[Optional[float]] = ContextVar("analysis_timeout", default=None)
+
+
+async def analysis_timeout(x_analysis_timeout: Optional[float] = Header(None)):
+    """Read an optional per-request time budget (seconds) from X-Analysis-Timeout"""
+    _request_timeout.set(x_analysis_timeout)
+
+
+SESSION_COOKIE = "biodockify_stats_session"
+
+
+async def dataset_scope(
+    response: Response,
+    x_session_id: Optional[str] = Header(None),
+    x_dataset_id: Optional[str] = Header(None),
+    session_cookie: Optional[str] = Cookie(None, alias=SESSION_COOKIE)
+):
+    """Select the session (X-Session-ID) and dataset (X-Dataset-ID) a request works on
+
+    A client that sends neither X-Session-ID nor the session cookie gets a new
+    session id, returned in the X-Session-ID response header and as a cookie,
+    so separate clients never share datasets. Without X-Dataset-ID, analyses
+    use the session's most recently imported dataset.
+    """
+    session_id = x_session_id or session_cookie
+    if not session_id:
+        session_id = uuid.uuid4().hex
+        response.set_cookie(SESSION_COOKIE, session_id, httponly=True, samesite="lax")
+    response.headers["X-Session-ID"] = session_id
+    active_session.set(session_id)
+    if x_dataset_id:
+        try:
+            get_statistics_orchestrator().registry.get_metadata(x_dataset_id, session_id)
+        except KeyError:
+            raise HTTPException(status_code=404, detail=f"Dataset '{x_dataset_id}' not found")
+    active_dataset.set(x_dataset_id)
+
+
 # Initialize router
-router = APIRouter(prefix="/api/statistics", tags=["Statistics"])
+router = APIRouter(
+    prefix="/api/statistics",
+    tags=["Statistics"],
+    dependencies=[Depends(analysis_timeout), Depends(dataset_scope)]
+)
 
 # Global orchestrator instance
 _statistics_orchestrator = None
@@ -64,6 +111,26 @@ def get_statistics_orchestrator():
     return _statistics_orchestrator
 
 
+async def run_analysis(fn, *args, **kwargs):
+    """Run a stateless analysis method in the statistics process pool"""
+    return await _dispatch(get_analysis_executor().run_process, fn, args, kwargs)
+
+
+async def run_in_session(fn, *args, **kwargs):
+    """Run an orchestrator call on the request session's own thread"""
+    runner = partial(get_analysis_executor().run_session, session_key=active_session.get())
+    return await _dispatch(runner, fn, args, kwargs)
+
+
+async def _dispatch(runner, fn, args, kwargs):
+    try:
+        return await runner(fn, *args, timeout=_request_timeout.get(), **kwargs)
+    except AnalysisTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except ExecutorSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
 
 # Request Models
 class TTestRequest(BaseModel):
@@ -726,7 +793,7 @@ class GLMRequest(BaseModel):
 # API Endpoints
 
 @router.get("/health")
-async def health_check():
+def health_check():
     """Health check endpoint"""
     try:
         orchestrator = get_statistics_orchestrator()
@@ -746,8 +813,41 @@ async def health_check():
         }
 
 
+@router.get("/executor/metrics")
+async def get_executor_metrics():
+    """Queue depth, in-flight work and runtimes of the analysis executor"""
+    return {
+        "status": "success",
+        "executor": get_analysis_executor().metrics(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@router.get("/datasets")
+def list_datasets():
+    """List the datasets held for the current session"""
+    registry = get_statistics_orchestrator().registry
+    return {
+        "status": "success",
+        "session_id": active_session.get(),
+        "datasets": registry.list(active_session.get()),
+        "registry": registry.stats()
+    }
+
+
+@router.delete("/datasets/{dataset_id}")
+def delete_dataset(dataset_id: str):
+    """Remove a dataset from the current session (memory and disk)"""
+    if not get_statistics_orchestrator().registry.drop(dataset_id, active_session.get()):
+        raise HTTPException(status_code=404, detail=f"Dataset '{dataset_id}' not found")
+    return {
+        "status": "success",
+        "message": f"Dataset {dataset_id} removed"
+    }
+
+
 @router.get("/available-analyses")
-async def get_available_analyses():
+def get_available_analyses():
     """Get list of available statistical analyses"""
     try:
         orchestrator = get_statistics_orchestrator()
@@ -783,7 +883,7 @@ async def import_data(
 
         # Import data
         orchestrator = get_statistics_orchestrator()
-        result = orchestrator.import_data(
+        result = await run_in_session(orchestrator.import_data,
             tmp_file_path,
             clean_data=clean_data,
             validate_data=validate_data
@@ -795,6 +895,8 @@ async def import_data(
         return {
             "status": "success",
             "message": f"Data imported successfully from {file.filename}",
+            "session_id": active_session.get(),
+            "dataset_id": result['dataset_id'],
             "data_summary": {
                 "rows": result['metadata']['rows'],
                 "columns": result['metadata']['columns'],
@@ -803,13 +905,15 @@ async def import_data(
             "metadata": result['metadata']
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Data import failed: {e}")
         raise HTTPException(status_code=400, detail=f"Data import failed: {str(e)}")
 
 
 @router.get("/data-summary")
-async def get_data_summary():
+def get_data_summary():
     """Get summary of currently loaded data"""
     try:
         orchestrator = get_statistics_orchestrator()
@@ -842,7 +946,7 @@ async def analyze_descriptive(
     """Perform descriptive statistics analysis"""
     try:
         orchestrator = get_statistics_orchestrator()
-        results = orchestrator.analyze_descriptive(
+        results = await run_in_session(orchestrator.analyze_descriptive,
             columns=columns,
             store_results=store_results,
             title=title or "Descriptive Statistics"
@@ -853,6 +957,8 @@ async def analyze_descriptive(
             "results": results
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Descriptive analysis failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -863,7 +969,7 @@ async def analyze_t_test(request: TTestRequest):
     """Perform t-test analysis"""
     try:
         orchestrator = get_statistics_orchestrator()
-        results = orchestrator.analyze_t_test(
+        results = await run_in_session(orchestrator.analyze_t_test,
             group_col=request.group_col,
             value_col=request.value_col,
             test_type=request.test_type,
@@ -877,6 +983,8 @@ async def analyze_t_test(request: TTestRequest):
             "results": results
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"T-test analysis failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -887,7 +995,7 @@ async def analyze_anova(request: ANOVARequest):
     """Perform ANOVA analysis"""
     try:
         orchestrator = get_statistics_orchestrator()
-        results = orchestrator.analyze_anova(
+        results = await run_in_session(orchestrator.analyze_anova,
             value_col=request.value_col,
             group_col=request.group_col,
             post_hoc=request.post_hoc,
@@ -900,6 +1008,8 @@ async def analyze_anova(request: ANOVARequest):
             "results": results
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"ANOVA analysis failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -910,7 +1020,7 @@ async def analyze_correlation(request: CorrelationRequest):
     """Perform correlation analysis"""
     try:
         orchestrator = get_statistics_orchestrator()
-        results = orchestrator.analyze_correlation(
+        results = await run_in_session(orchestrator.analyze_correlation,
             columns=request.columns,
             method=request.method,
             store_results=request.store_results,
@@ -922,6 +1032,8 @@ async def analyze_correlation(request: CorrelationRequest):
             "results": results
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Correlation analysis failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -932,7 +1044,7 @@ async def analyze_mann_whitney(request: MannWhitneyRequest):
     """Perform Mann-Whitney U test"""
     try:
         orchestrator = get_statistics_orchestrator()
-        results = orchestrator.analyze_mann_whitney(
+        results = await run_in_session(orchestrator.analyze_mann_whitney,
             group_col=request.group_col,
             value_col=request.value_col,
             alternative=request.alternative,
@@ -945,6 +1057,8 @@ async def analyze_mann_whitney(request: MannWhitneyRequest):
             "results": results
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Mann-Whitney test failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -955,7 +1069,7 @@ async def analyze_kruskal_wallis(request: KruskalWallisRequest):
     """Perform Kruskal-Wallis test"""
     try:
         orchestrator = get_statistics_orchestrator()
-        results = orchestrator.analyze_kruskal_wallis(
+        results = await run_in_session(orchestrator.analyze_kruskal_wallis,
             value_col=request.value_col,
             group_col=request.group_col,
             post_hoc=request.post_hoc,
@@ -968,6 +1082,8 @@ async def analyze_kruskal_wallis(request: KruskalWallisRequest):
             "results": results
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Kruskal-Wallis test failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -978,7 +1094,7 @@ async def analyze_power(request: PowerAnalysisRequest):
     """Perform power analysis"""
     try:
         orchestrator = get_statistics_orchestrator()
-        results = orchestrator.analyze_power(
+        results = await run_in_session(orchestrator.analyze_power,
             test_type=request.test_type,
             effect_size=request.effect_size,
             alpha=request.alpha,
@@ -993,6 +1109,8 @@ async def analyze_power(request: PowerAnalysisRequest):
             "results": results
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Power analysis failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1006,7 +1124,7 @@ async def export_analysis(request: ExportRequest):
     """
     try:
         orchestrator = get_statistics_orchestrator()
-        output_path = orchestrator.export_for_thesis(
+        output_path = await run_in_session(orchestrator.export_for_thesis,
             analysis_id=request.analysis_id,
             format=request.format
         )
@@ -1019,13 +1137,15 @@ async def export_analysis(request: ExportRequest):
             media_type='application/octet-stream'
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Export failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/analysis/{analysis_id}")
-async def get_analysis(analysis_id: str):
+def get_analysis(analysis_id: str):
     """Retrieve stored analysis by ID"""
     try:
         orchestrator = get_statistics_orchestrator()
@@ -1048,7 +1168,7 @@ async def get_analysis(analysis_id: str):
 
 
 @router.get("/search")
-async def search_analyses(
+def search_analyses(
     query: str,
     limit: int = 10
 ):
@@ -1076,7 +1196,7 @@ async def analyze_wilcoxon_signed_rank(request: WilcoxonRequest):
     """Perform Wilcoxon Signed Rank test"""
     try:
         orchestrator = get_statistics_orchestrator()
-        results = orchestrator.analyze_wilcoxon_signed_rank(
+        results = await run_in_session(orchestrator.analyze_wilcoxon_signed_rank,
             group_col=request.group_col,
             value_col=request.value_col,
             store_results=request.store_results,
@@ -1088,6 +1208,8 @@ async def analyze_wilcoxon_signed_rank(request: WilcoxonRequest):
             "results": results
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Wilcoxon Signed Rank test failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1098,7 +1220,7 @@ async def analyze_sign_test(request: SignTestRequest):
     """Perform Sign test"""
     try:
         orchestrator = get_statistics_orchestrator()
-        results = orchestrator.analyze_sign_test(
+        results = await run_in_session(orchestrator.analyze_sign_test,
             group_col=request.group_col,
             value_col=request.value_col,
             store_results=request.store_results,
@@ -1110,6 +1232,8 @@ async def analyze_sign_test(request: SignTestRequest):
             "results": results
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Sign test failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1120,7 +1244,7 @@ async def analyze_friedman(request: FriedmanRequest):
     """Perform Friedman test"""
     try:
         orchestrator = get_statistics_orchestrator()
-        results = orchestrator.analyze_friedman(
+        results = await run_in_session(orchestrator.analyze_friedman,
             group_col=request.group_col,
             value_col=request.value_col,
             store_results=request.store_results,
@@ -1132,6 +1256,8 @@ async def analyze_friedman(request: FriedmanRequest):
             "results": results
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Friedman test failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1142,7 +1268,7 @@ async def analyze_dunns(request: DunnsRequest):
     """Perform Dunn's post-hoc test"""
     try:
         orchestrator = get_statistics_orchestrator()
-        results = orchestrator.analyze_dunns(
+        results = await run_in_session(orchestrator.analyze_dunns,
             value_col=request.value_col,
             group_col=request.group_col,
             p_adjust=request.p_adjust,
@@ -1155,6 +1281,8 @@ async def analyze_dunns(request: DunnsRequest):
             "results": results
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Dunn's test failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1165,7 +1293,7 @@ async def analyze_chi_square_goodness(request: ChiSquareGoodnessRequest):
     """Perform Chi-Square Goodness of Fit test"""
     try:
         orchestrator = get_statistics_orchestrator()
-        results = orchestrator.analyze_chi_square_goodness_of_fit(
+        results = await run_in_session(orchestrator.analyze_chi_square_goodness_of_fit,
             observed_col=request.observed_col,
             expected=request.expected,
             store_results=request.store_results,
@@ -1177,6 +1305,8 @@ async def analyze_chi_square_goodness(request: ChiSquareGoodnessRequest):
             "results": results
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Chi-Square Goodness of Fit test failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1187,7 +1317,7 @@ async def analyze_chi_square_independence(request: ChiSquareIndependenceRequest)
     """Perform Chi-Square Test of Independence"""
     try:
         orchestrator = get_statistics_orchestrator()
-        results = orchestrator.analyze_chi_square_independence(
+        results = await run_in_session(orchestrator.analyze_chi_square_independence,
             col1=request.col1,
             col2=request.col2,
             store_results=request.store_results,
@@ -1199,6 +1329,8 @@ async def analyze_chi_square_independence(request: ChiSquareIndependenceRequest)
             "results": results
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Chi-Square Test of Independence failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1209,7 +1341,7 @@ async def analyze_fisher_exact(request: FisherExactRequest):
     """Perform Fisher's Exact test"""
     try:
         orchestrator = get_statistics_orchestrator()
-        results = orchestrator.analyze_fisher_exact(
+        results = await run_in_session(orchestrator.analyze_fisher_exact,
             col1=request.col1,
             col2=request.col2,
             alternative=request.alternative,
@@ -1222,6 +1354,8 @@ async def analyze_fisher_exact(request: FisherExactRequest):
             "results": results
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Fisher's Exact test failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1232,7 +1366,7 @@ async def analyze_mcnemar(request: McNemarRequest):
     """Perform McNemar's test"""
     try:
         orchestrator = get_statistics_orchestrator()
-        results = orchestrator.analyze_mcnemar(
+        results = await run_in_session(orchestrator.analyze_mcnemar,
             col1=request.col1,
             col2=request.col2,
             exact=request.exact,
@@ -1245,6 +1379,8 @@ async def analyze_mcnemar(request: McNemarRequest):
             "results": results
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"McNemar's test failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1255,7 +1391,7 @@ async def analyze_cmh(request: CMHRequest):
     """Perform Cochran-Mantel-Haenszel test"""
     try:
         orchestrator = get_statistics_orchestrator()
-        results = orchestrator.analyze_cochran_mantel_haenszel(
+        results = await run_in_session(orchestrator.analyze_cochran_mantel_haenszel,
             col1=request.col1,
             col2=request.col2,
             stratify_by=request.stratify_by,
@@ -1268,21 +1404,27 @@ async def analyze_cmh(request: CMHRequest):
             "results": results
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Cochran-Mantel-Haenszel test failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/clear-data")
-async def clear_data():
-    """Clear currently loaded data"""
+def clear_data():
+    """Clear every dataset loaded in the current session
+
+    Use DELETE /datasets/{dataset_id} to remove a single dataset.
+    """
     try:
         orchestrator = get_statistics_orchestrator()
-        orchestrator.current_data = None
-        orchestrator.current_metadata = None
+        removed = orchestrator.registry.drop_session(active_session.get())
+        active_dataset.set(None)
 
         return {
             "status": "success",
-            "message": "Data cleared successfully"
+            "message": "Data cleared successfully",
+            "datasets_removed": removed
         }
 
     except Exception as e:
@@ -1333,7 +1475,7 @@ async def analyze_kaplan_meier(request: KaplanMeierRequest):
         
         logger.info(f"Performing Kaplan-Meier analysis with columns: time={request.time_col}, event={request.event_col}")
         
-        results = survival.kaplan_meier_estimate(
+        results = await run_analysis(survival.kaplan_meier_estimate,
             df=df,
             time_col=request.time_col,
             event_col=request.event_col,
@@ -1387,7 +1529,7 @@ async def analyze_log_rank(request: LogRankRequest):
         
         logger.info(f"Performing Log-Rank test with columns: time={request.time_col}, event={request.event_col}, group={request.group_col}")
         
-        results = survival.log_rank_test(
+        results = await run_analysis(survival.log_rank_test,
             df=df,
             time_col=request.time_col,
             event_col=request.event_col,
@@ -1441,7 +1583,7 @@ async def analyze_cox_ph(request: CoxRequest):
         
         logger.info(f"Performing Cox PH regression with covariates: {request.covariates}")
         
-        results = survival.cox_proportional_hazards(
+        results = await run_analysis(survival.cox_proportional_hazards,
             df=df,
             time_col=request.time_col,
             event_col=request.event_col,
@@ -1500,7 +1642,7 @@ async def analyze_tost(request: TOSTRequest):
         
         logger.info(f"Performing TOST bioequivalence analysis")
         
-        results = beq.tost_procedure(
+        results = await run_analysis(beq.tost_procedure,
             df=df,
             test_col=request.test_col,
             ref_col=request.reference_col,
@@ -1551,7 +1693,7 @@ async def analyze_crossover(request: CrossoverRequest):
         
         logger.info(f"Performing crossover ANOVA analysis")
         
-        results = beq.crossover_design_anova(
+        results = await run_analysis(beq.crossover_design_anova,
             df=df,
             subject_col=request.subject_col,
             period_col=request.period_col,
@@ -1603,7 +1745,7 @@ async def analyze_bioavailability(request: BioavailabilityRequest):
         
         logger.info(f"Performing bioavailability calculation")
         
-        results = beq.bioavailability_calculation(
+        results = await run_analysis(beq.bioavailability_calculation,
             df=df,
             auc_col=request.auc_col,
             cmax_col=request.cmax_col,
@@ -1660,11 +1802,11 @@ async def test_normality(request: NormalityRequest):
         logger.info(f"Performing normality test using {request.test_method}")
         
         if request.test_method == 'shapiro-wilk':
-            results = diagnostic.test_normality_shapiro_wilk(df, request.column)
+            results = await run_analysis(diagnostic.test_normality_shapiro_wilk, df, request.column)
         elif request.test_method == 'ks':
-            results = diagnostic.test_normality_ks(df, request.column)
+            results = await run_analysis(diagnostic.test_normality_ks, df, request.column)
         elif request.test_method == 'anderson-darling':
-            results = diagnostic.test_normality_anderson_darling(df, request.column)
+            results = await run_analysis(diagnostic.test_normality_anderson_darling, df, request.column)
         else:
             raise HTTPException(
                 status_code=400,
@@ -1715,11 +1857,11 @@ async def test_homogeneity(request: HomogeneityRequest):
         logger.info(f"Performing homogeneity test using {request.test_method}")
         
         if request.test_method == 'levene':
-            results = diagnostic.test_homogeneity_variance_levene(
+            results = await run_analysis(diagnostic.test_homogeneity_variance_levene,
                 df, request.value_col, request.group_col
             )
         elif request.test_method == 'bartlett':
-            results = diagnostic.test_homogeneity_variance_bartlett(
+            results = await run_analysis(diagnostic.test_homogeneity_variance_bartlett,
                 df, request.value_col, request.group_col
             )
         else:
@@ -1742,7 +1884,7 @@ async def test_homogeneity(request: HomogeneityRequest):
 
 
 @router.post("/diagnostic/vif")
-async def test_vif(request: VIFRequest):
+def test_vif(request: VIFRequest):
     """Variance Inflation Factor (VIF) Test
     
     Detects multicollinearity among predictor variables in regression models.
@@ -1811,7 +1953,7 @@ async def test_vif(request: VIFRequest):
 
 
 @router.post("/diagnostic/outliers")
-async def test_outliers(request: OutliersRequest):
+def test_outliers(request: OutliersRequest):
     """Outlier Detection
     
     Detects outliers in data using the specified method.
@@ -1939,7 +2081,7 @@ async def test_comprehensive(request: ComprehensiveDiagnosticRequest):
         # Normality tests
         for col in request.columns:
             if df[col].dtype in ['int64', 'float64']:
-                normality = diagnostic.test_normality_shapiro_wilk(df, col)
+                normality = await run_analysis(diagnostic.test_normality_shapiro_wilk, df, col)
                 results['normality_tests'].append({
                     'column': col,
                     **normality
@@ -1949,7 +2091,7 @@ async def test_comprehensive(request: ComprehensiveDiagnosticRequest):
         if request.group_col:
             for col in request.columns:
                 if df[col].dtype in ['int64', 'float64']:
-                    homogeneity = diagnostic.test_homogeneity_variance_levene(
+                    homogeneity = await run_analysis(diagnostic.test_homogeneity_variance_levene,
                         df, col, request.group_col
                     )
                     results['homogeneity_tests'].append({
@@ -2042,7 +2184,7 @@ async def analyze_logistic_regression(request: LogisticRegressionRequest):
         
         logger.info(f"Performing logistic regression with outcome: {request.y_var}, predictors: {request.x_vars}")
         
-        results = adv.logistic_regression(
+        results = await run_analysis(adv.logistic_regression,
             df=df,
             y_var=request.y_var,
             x_vars=request.x_vars,
@@ -2092,7 +2234,7 @@ async def analyze_poisson_regression(request: PoissonRegressionRequest):
         
         logger.info(f"Performing Poisson regression with outcome: {request.y_var}")
         
-        results = adv.poisson_regression(
+        results = await run_analysis(adv.poisson_regression,
             df=df,
             y_var=request.y_var,
             x_vars=request.x_vars,
@@ -2143,7 +2285,7 @@ async def analyze_negative_binomial(request: NegativeBinomialRequest):
         
         logger.info(f"Performing Negative Binomial regression with outcome: {request.y_var}")
         
-        results = adv.negative_binomial_regression(
+        results = await run_analysis(adv.negative_binomial_regression,
             df=df,
             y_var=request.y_var,
             x_vars=request.x_vars,
@@ -2194,7 +2336,7 @@ async def analyze_mixed_model(request: MixedModelRequest):
         
         logger.info(f"Performing mixed effects model with outcome: {request.y_var}")
         
-        results = adv.mixed_effects_model(
+        results = await run_analysis(adv.mixed_effects_model,
             df=df,
             y_var=request.y_var,
             x_vars=request.x_vars,
@@ -2247,7 +2389,7 @@ async def analyze_meta_analysis(request: MetaAnalysisRequest):
             'study_name': request.study_names if request.study_names else [f'Study_{i+1}' for i in range(len(request.effect_sizes))]
         })
         
-        results = adv.meta_analysis(
+        results = await run_analysis(adv.meta_analysis,
             df=study_df,
             effect_col='effect_size',
             se_col='standard_error',
@@ -2298,7 +2440,7 @@ async def analyze_non_inferiority(request: NonInferiorityRequest):
         
         logger.info(f"Performing non-inferiority test with margin: {request.margin}")
         
-        results = adv.non_inferiority_test(
+        results = await run_analysis(adv.non_inferiority_test,
             df=df,
             group_col=request.group_col,
             value_col=request.value_col,
@@ -2348,7 +2490,7 @@ async def analyze_equivalence(request: EquivalenceRequest):
         
         logger.info(f"Performing equivalence test with margins: [{request.lower_margin}, {request.upper_margin}]")
         
-        results = adv.equivalence_test(
+        results = await run_analysis(adv.equivalence_test,
             df=df,
             group_col=request.group_col,
             value_col=request.value_col,
@@ -2406,7 +2548,7 @@ async def analyze_nca_pk(request: NCAPKRequest):
         
         logger.info(f"Performing NCA PK analysis")
         
-        results = pkpd.non_compartmental_analysis(
+        results = await run_analysis(pkpd.non_compartmental_analysis,
             df=df,
             time_col=request.time_col,
             concentration_col=request.concentration_col,
@@ -2461,7 +2603,7 @@ async def analyze_auc(request: AUCRequest):
         
         logger.info(f"Performing AUC calculation using {request.method} method")
         
-        results = pkpd.calculate_auc(
+        results = await run_analysis(pkpd.calculate_auc,
             df=df,
             time_col=request.time_col,
             concentration_col=request.concentration_col,
@@ -2515,7 +2657,7 @@ async def analyze_cmax_tmax(request: CmaxTmaxRequest):
         
         logger.info(f"Performing Cmax and Tmax calculation")
         
-        results = pkpd.calculate_cmax_tmax(
+        results = await run_analysis(pkpd.calculate_cmax_tmax,
             df=df,
             time_col=request.time_col,
             concentration_col=request.concentration_col,
@@ -2568,7 +2710,7 @@ async def analyze_half_life(request: HalfLifeRequest):
         
         logger.info(f"Performing half-life estimation")
         
-        results = pkpd.estimate_half_life(
+        results = await run_analysis(pkpd.estimate_half_life,
             df=df,
             time_col=request.time_col,
             concentration_col=request.concentration_col,
@@ -2621,7 +2763,7 @@ async def analyze_clearance(request: ClearanceRequest):
         
         logger.info(f"Performing clearance calculation")
         
-        results = pkpd.calculate_clearance(
+        results = await run_analysis(pkpd.calculate_clearance,
             df=df,
             time_col=request.time_col,
             concentration_col=request.concentration_col,
@@ -2676,7 +2818,7 @@ async def analyze_pk_bioavailability(request: PKBioavailabilityRequest):
         
         logger.info(f"Performing PK bioavailability calculation")
         
-        results = pkpd.calculate_bioavailability(
+        results = await run_analysis(pkpd.calculate_bioavailability,
             df=df,
             auc_col=request.auc_col,
             dose_test=request.dose_test,
@@ -2728,7 +2870,7 @@ async def analyze_pd_response(request: PDResponseRequest):
         
         logger.info(f"Performing PD response modeling using {request.model_type}")
         
-        results = pkpd.model_pd_response(
+        results = await run_analysis(pkpd.model_pd_response,
             df=df,
             concentration_col=request.concentration_col,
             response_col=request.response_col,
@@ -2779,7 +2921,7 @@ async def analyze_compartmental(request: CompartmentalRequest):
         
         logger.info(f"Performing compartmental PK modeling ({request.compartments} compartments)")
         
-        results = pkpd.fit_compartmental_model(
+        results = await run_analysis(pkpd.fit_compartmental_model,
             df=df,
             time_col=request.time_col,
             concentration_col=request.concentration_col,
@@ -2832,7 +2974,7 @@ async def analyze_dose_proportionality(request: DoseProportionalityRequest):
         
         logger.info(f"Performing dose proportionality test")
         
-        results = pkpd.test_dose_proportionality(
+        results = await run_analysis(pkpd.test_dose_proportionality,
             df=df,
             dose_col=request.dose_col,
             auc_col=request.auc_col,
@@ -2886,7 +3028,7 @@ async def analyze_pk_summary(request: PKSummaryRequest):
         
         logger.info(f"Performing PK summary statistics")
         
-        results = pkpd.calculate_pk_summary(
+        results = await run_analysis(pkpd.calculate_pk_summary,
             df=df,
             parameters=request.parameters,
             subject_col=request.subject_col,
@@ -2931,7 +3073,7 @@ async def adjust_bonferroni(request: BonferroniRequest):
         
         logger.info(f"Performing Bonferroni correction for {len(request.p_values)} p-values")
         
-        results = mult.bonferroni_correction(
+        results = await run_analysis(mult.bonferroni_correction,
             pvalues=np.array(request.p_values),
             alpha=request.alpha,
             test_names=request.test_names
@@ -2971,7 +3113,7 @@ async def adjust_holm(request: HolmRequest):
         
         logger.info(f"Performing Holm-Bonferroni correction for {len(request.p_values)} p-values")
         
-        results = mult.holm_bonferroni_correction(
+        results = await run_analysis(mult.holm_bonferroni_correction,
             pvalues=np.array(request.p_values),
             alpha=request.alpha,
             test_names=request.test_names
@@ -3011,7 +3153,7 @@ async def adjust_fdr(request: FDRRequest):
         
         logger.info(f"Performing FDR (Benjamini-Hochberg) correction for {len(request.p_values)} p-values")
         
-        results = mult.benjamini_hochberg_fdr(
+        results = await run_analysis(mult.benjamini_hochberg_fdr,
             pvalues=np.array(request.p_values),
             q=request.q,
             test_names=request.test_names
@@ -3051,7 +3193,7 @@ async def adjust_hochberg(request: HochbergRequest):
         
         logger.info(f"Performing Hochberg correction for {len(request.p_values)} p-values")
         
-        results = mult.hochberg_correction(
+        results = await run_analysis(mult.hochberg_correction,
             pvalues=np.array(request.p_values),
             alpha=request.alpha,
             test_names=request.test_names
@@ -3091,7 +3233,7 @@ async def adjust_sidak(request: SidakRequest):
         
         logger.info(f"Performing Sidak correction for {len(request.p_values)} p-values")
         
-        results = mult.sidak_correction(
+        results = await run_analysis(mult.sidak_correction,
             pvalues=np.array(request.p_values),
             alpha=request.alpha,
             test_names=request.test_names
@@ -3131,7 +3273,7 @@ async def adjust_hommel(request: HommelRequest):
         
         logger.info(f"Performing Hommel correction for {len(request.p_values)} p-values")
         
-        results = mult.hommel_correction(
+        results = await run_analysis(mult.hommel_correction,
             pvalues=np.array(request.p_values),
             alpha=request.alpha,
             test_names=request.test_names
@@ -3171,7 +3313,7 @@ async def adjust_benjamini_yekutieli(request: BenjaminiYekutieliRequest):
         
         logger.info(f"Performing Benjamini-Yekutieli correction for {len(request.p_values)} p-values")
         
-        results = mult.benjamini_yekutieli_fdr(
+        results = await run_analysis(mult.benjamini_yekutieli_fdr,
             pvalues=np.array(request.p_values),
             q=request.q,
             test_names=request.test_names
@@ -3196,7 +3338,7 @@ async def adjust_benjamini_yekutieli(request: BenjaminiYekutieliRequest):
 # ----------------------------------------------------------------------------
 
 @router.post("/detect-types")
-async def detect_data_types(request: DetectTypesRequest):
+def detect_data_types(request: DetectTypesRequest):
     """Automatic Data Type Detection
     
     Automatically detects the data types of columns in the dataset,
@@ -3277,7 +3419,7 @@ async def detect_data_types(request: DetectTypesRequest):
 
 
 @router.post("/suggest-tests")
-async def suggest_statistical_tests(request: SuggestTestsRequest):
+def suggest_statistical_tests(request: SuggestTestsRequest):
     """Statistical Test Suggestion
     
     Suggests appropriate statistical tests based on data characteristics
@@ -3399,7 +3541,7 @@ async def suggest_statistical_tests(request: SuggestTestsRequest):
 
 
 @router.post("/auto-recommend")
-async def auto_recommend_analysis(request: AutoRecommendRequest):
+def auto_recommend_analysis(request: AutoRecommendRequest):
     """Automatic Analysis Recommendation
     
     Analyzes a research description and data to recommend
@@ -3550,7 +3692,7 @@ async def auto_analyze_data(request: AutoAnalyzeRequest):
         # Stage 2: Diagnostic tests
         diagnostic = DiagnosticTests(alpha=request.alpha)
         
-        normality = diagnostic.test_normality_shapiro_wilk(df, request.outcome_col)
+        normality = await run_analysis(diagnostic.test_normality_shapiro_wilk, df, request.outcome_col)
         
         diagnostic_tests = {
             'stage': 'Diagnostic Tests',
@@ -3562,7 +3704,7 @@ async def auto_analyze_data(request: AutoAnalyzeRequest):
         
         if request.group_col:
             if df[request.group_col].dtype in ['int64', 'float64'] or df[request.group_col].nunique() > 2:
-                homogeneity = diagnostic.test_homogeneity_variance_levene(
+                homogeneity = await run_analysis(diagnostic.test_homogeneity_variance_levene,
                     df, request.outcome_col, request.group_col
                 )
                 diagnostic_tests['results']['homogeneity'] = homogeneity
@@ -3637,7 +3779,7 @@ async def auto_analyze_data(request: AutoAnalyzeRequest):
 # ----------------------------------------------------------------------------
 
 @router.post("/analyze/z-test")
-async def analyze_z_test(request: ZTestRequest):
+def analyze_z_test(request: ZTestRequest):
     """Z-Test for Population Mean
     
     Performs a Z-test to compare a sample mean to a known population mean
@@ -3749,7 +3891,7 @@ async def analyze_z_test(request: ZTestRequest):
 
 
 @router.post("/analyze/repeated-measures-anova")
-async def analyze_repeated_measures_anova(request: RepeatedMeasuresANOVARequest):
+def analyze_repeated_measures_anova(request: RepeatedMeasuresANOVARequest):
     """Repeated Measures ANOVA
     
     Performs ANOVA for within-subjects designs where the same subjects
@@ -3865,7 +4007,7 @@ async def analyze_repeated_measures_anova(request: RepeatedMeasuresANOVARequest)
 
 
 @router.post("/analyze/ancova")
-async def analyze_ancova(request: ANCOVARequest):
+def analyze_ancova(request: ANCOVARequest):
     """Analysis of Covariance (ANCOVA)
     
     Performs ANCOVA to compare groups while controlling for a covariate,
@@ -3941,7 +4083,7 @@ async def analyze_ancova(request: ANCOVARequest):
 
 
 @router.post("/analyze/manova")
-async def analyze_manova(request: MANOVARequest):
+def analyze_manova(request: MANOVARequest):
     """Multivariate Analysis of Variance (MANOVA)
     
     Performs MANOVA to compare groups across multiple dependent
@@ -4002,7 +4144,7 @@ async def analyze_manova(request: MANOVARequest):
 
 
 @router.post("/analyze/posthoc/tukey")
-async def analyze_tukey_hsd(request: TukeyHSDRequest):
+def analyze_tukey_hsd(request: TukeyHSDRequest):
     """Tukey HSD Post-Hoc Test
     
     Performs Tukey's Honestly Significant Difference post-hoc test to
@@ -4063,7 +4205,7 @@ async def analyze_tukey_hsd(request: TukeyHSDRequest):
 
 
 @router.post("/analyze/posthoc/bonferroni")
-async def analyze_bonferroni_posthoc(request: BonferroniPostHocRequest):
+def analyze_bonferroni_posthoc(request: BonferroniPostHocRequest):
     """Bonferroni Post-Hoc Test
     
     Performs Bonferroni-adjusted pairwise comparisons to control
@@ -4145,7 +4287,7 @@ async def analyze_bonferroni_posthoc(request: BonferroniPostHocRequest):
 
 
 @router.post("/analyze/posthoc/dunnett")
-async def analyze_dunnett_posthoc(request: DunnettPostHocRequest):
+def analyze_dunnett_posthoc(request: DunnettPostHocRequest):
     """Dunnett's Post-Hoc Test
     
     Performs Dunnett's test to compare multiple treatment groups
@@ -4254,7 +4396,7 @@ async def analyze_dunnett_posthoc(request: DunnettPostHocRequest):
 
 
 @router.post("/analyze/posthoc/scheffe")
-async def analyze_scheffe_posthoc(request: ScheffePostHocRequest):
+def analyze_scheffe_posthoc(request: ScheffePostHocRequest):
     """Scheffe's Post-Hoc Test
     
     Performs Scheffe's test, a conservative post-hoc test that
@@ -4357,7 +4499,7 @@ async def analyze_scheffe_posthoc(request: ScheffePostHocRequest):
 
 
 @router.post("/analyze/multiple-regression")
-async def analyze_multiple_regression(request: MultipleRegressionRequest):
+def analyze_multiple_regression(request: MultipleRegressionRequest):
     """Multiple Linear Regression
     
     Performs multiple linear regression to model the relationship
@@ -4446,7 +4588,7 @@ async def analyze_multiple_regression(request: MultipleRegressionRequest):
 
 
 @router.post("/analyze/polynomial-regression")
-async def analyze_polynomial_regression(request: PolynomialRegressionRequest):
+def analyze_polynomial_regression(request: PolynomialRegressionRequest):
     """Polynomial Regression
     
     Performs polynomial regression to model non-linear relationships
@@ -4535,7 +4677,7 @@ async def analyze_polynomial_regression(request: PolynomialRegressionRequest):
 
 
 @router.post("/analyze/mixed-effects")
-async def analyze_mixed_effects(request: MixedEffectsRequest):
+def analyze_mixed_effects(request: MixedEffectsRequest):
     """Mixed Effects Model
     
     Performs linear mixed effects modeling for data with correlated
@@ -4652,7 +4794,7 @@ async def analyze_mixed_effects(request: MixedEffectsRequest):
 
 
 @router.post("/analyze/glm")
-async def analyze_glm(request: GLMRequest):
+def analyze_glm(request: GLMRequest):
     """Generalized Linear Model
     
     Performs generalized linear modeling for various distributions
@@ -4805,7 +4947,7 @@ async def upload_statistics_file(
 
         # Import data using the orchestrator
         orchestrator = get_statistics_orchestrator()
-        result = orchestrator.import_data(
+        result = await run_in_session(orchestrator.import_data,
             tmp_file_path,
             clean_data=clean_data,
             validate_data=validate_data
@@ -4818,10 +4960,13 @@ async def upload_statistics_file(
         return {
             "status": "success",
             "message": f"Data uploaded successfully from {file.filename}",
+            "dataset_id": result['dataset_id'],
             "data": result['data'],
             "metadata": result['metadata']
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Data upload failed: {e}")
         raise HTTPException(status_code=400, detail=f"Data upload failed: {str(e)}")
@@ -4834,6 +4979,12 @@ async def analyze_generic(request: GenericAnalysisRequest):
     This endpoint routes the analysis to the appropriate method based on analysisType.
     Supports all 25+ analysis types.
     """
+    # Loading the request data and analysing it must not interleave with other
+    # requests, so the whole dispatch runs as one job on the session thread
+    return await run_in_session(_analyze_generic, request)
+
+
+def _analyze_generic(request: GenericAnalysisRequest):
     try:
         orchestrator = get_statistics_orchestrator()
         
@@ -4841,333 +4992,333 @@ async def analyze_generic(request: GenericAnalysisRequest):
         import pandas as pd
         df = pd.DataFrame(request.data)
         
-        # Load data into the orchestrator
-        orchestrator.current_data = df
-        orchestrator.current_metadata = {
+        # Analyse the inline frame directly; it is not registered as a session dataset
+        metadata = {
             'rows': len(df),
             'columns': len(df.columns),
             'columns_list': list(df.columns),
             'column_types': dict(df.dtypes.astype(str))
         }
         
-        # Route to appropriate analysis method based on analysisType
-        analysis_type = request.analysisType
-        params = request.parameters
+        with orchestrator.use_frame(df, metadata):
+            # Route to appropriate analysis method based on analysisType
+            analysis_type = request.analysisType
+            params = request.parameters
         
-        results = None
+            results = None
         
-        # Basic Statistics
-        if analysis_type == 'descriptive_statistics':
-            results = orchestrator.analyze_descriptive(
-                columns=params.get('columns'),
-                store_results=False,
-                title="Descriptive Statistics"
-            )
+            # Basic Statistics
+            if analysis_type == 'descriptive_statistics':
+                results = orchestrator.analyze_descriptive(
+                    columns=params.get('columns'),
+                    store_results=False,
+                    title="Descriptive Statistics"
+                )
         
-        elif analysis_type == 't_test':
-            results = orchestrator.analyze_t_test(
-                group_col=params.get('group'),
-                value_col=params.get('outcome'),
-                test_type='independent',
-                equal_var=params.get('variance_assumption') == 'equal',
-                store_results=False,
-                title="T-Test"
-            )
+            elif analysis_type == 't_test':
+                results = orchestrator.analyze_t_test(
+                    group_col=params.get('group'),
+                    value_col=params.get('outcome'),
+                    test_type='independent',
+                    equal_var=params.get('variance_assumption') == 'equal',
+                    store_results=False,
+                    title="T-Test"
+                )
         
-        elif analysis_type == 'anova':
-            results = orchestrator.analyze_anova(
-                value_col=params.get('outcome'),
-                group_col=params.get('group'),
-                post_hoc=params.get('post_hoc', 'none') != 'none',
-                store_results=False,
-                title="ANOVA"
-            )
+            elif analysis_type == 'anova':
+                results = orchestrator.analyze_anova(
+                    value_col=params.get('outcome'),
+                    group_col=params.get('group'),
+                    post_hoc=params.get('post_hoc', 'none') != 'none',
+                    store_results=False,
+                    title="ANOVA"
+                )
         
-        elif analysis_type == 'correlation':
-            results = orchestrator.analyze_correlation(
-                columns=[params.get('variable1'), params.get('variable2')],
-                method=params.get('method', 'pearson'),
-                store_results=False,
-                title="Correlation Analysis"
-            )
+            elif analysis_type == 'correlation':
+                results = orchestrator.analyze_correlation(
+                    columns=[params.get('variable1'), params.get('variable2')],
+                    method=params.get('method', 'pearson'),
+                    store_results=False,
+                    title="Correlation Analysis"
+                )
         
-        elif analysis_type == 'mann_whitney':
-            results = orchestrator.analyze_mann_whitney(
-                group_col=params.get('group'),
-                value_col=params.get('outcome'),
-                alternative=params.get('alternative', 'two-sided'),
-                store_results=False,
-                title="Mann-Whitney U Test"
-            )
+            elif analysis_type == 'mann_whitney':
+                results = orchestrator.analyze_mann_whitney(
+                    group_col=params.get('group'),
+                    value_col=params.get('outcome'),
+                    alternative=params.get('alternative', 'two-sided'),
+                    store_results=False,
+                    title="Mann-Whitney U Test"
+                )
         
-        elif analysis_type == 'kruskal_wallis':
-            results = orchestrator.analyze_kruskal_wallis(
-                value_col=params.get('outcome'),
-                group_col=params.get('group'),
-                post_hoc=params.get('post_hoc', 'none') != 'none',
-                store_results=False,
-                title="Kruskal-Wallis Test"
-            )
+            elif analysis_type == 'kruskal_wallis':
+                results = orchestrator.analyze_kruskal_wallis(
+                    value_col=params.get('outcome'),
+                    group_col=params.get('group'),
+                    post_hoc=params.get('post_hoc', 'none') != 'none',
+                    store_results=False,
+                    title="Kruskal-Wallis Test"
+                )
         
-        elif analysis_type == 'power_analysis':
-            results = orchestrator.analyze_power(
-                test_type=params.get('test_type', 'ttest_ind'),
-                effect_size=params.get('effect_size'),
-                alpha=params.get('alpha', 0.05),
-                power=params.get('power', 0.80),
-                nobs=params.get('sample_size'),
-                store_results=False,
-                title="Power Analysis"
-            )
+            elif analysis_type == 'power_analysis':
+                results = orchestrator.analyze_power(
+                    test_type=params.get('test_type', 'ttest_ind'),
+                    effect_size=params.get('effect_size'),
+                    alpha=params.get('alpha', 0.05),
+                    power=params.get('power', 0.80),
+                    nobs=params.get('sample_size'),
+                    store_results=False,
+                    title="Power Analysis"
+                )
         
-        # Survival Analysis - use survival_analysis module
-        elif analysis_type in ['kaplan_meier', 'log_rank', 'cox_ph']:
-            from modules.statistics.survival_analysis import SurvivalAnalysis
-            survival = SurvivalAnalysis()
+            # Survival Analysis - use survival_analysis module
+            elif analysis_type in ['kaplan_meier', 'log_rank', 'cox_ph']:
+                from modules.statistics.survival_analysis import SurvivalAnalysis
+                survival = SurvivalAnalysis()
             
-            # Prepare data
-            time_col = params.get('time')
-            event_col = params.get('event')
-            group_col = params.get('group')
+                # Prepare data
+                time_col = params.get('time')
+                event_col = params.get('event')
+                group_col = params.get('group')
             
-            if analysis_type == 'kaplan_meier':
-                result = survival.kaplan_meier_estimate(
-                    df, time_col, event_col,
-                    conf_int=True,
-                    conf_level=params.get('confidence_level', 0.95)
-                )
-                results = {
-                    'analysisType': 'kaplan_meier',
-                    'testStatistics': {'survival_function': str(result['survival_function'])},
-                    'pValue': result.get('p_value'),
-                    'confidenceInterval': result.get('confidence_intervals', [0, 1]),
-                    'confidenceLevel': params.get('confidence_level', 0.95),
-                    'sampleSize': len(df),
-                    'conclusion': result.get('interpretation', 'Survival analysis completed'),
-                    'significance': 0.05
-                }
+                if analysis_type == 'kaplan_meier':
+                    result = survival.kaplan_meier_estimate(
+                        df, time_col, event_col,
+                        conf_int=True,
+                        conf_level=params.get('confidence_level', 0.95)
+                    )
+                    results = {
+                        'analysisType': 'kaplan_meier',
+                        'testStatistics': {'survival_function': str(result['survival_function'])},
+                        'pValue': result.get('p_value'),
+                        'confidenceInterval': result.get('confidence_intervals', [0, 1]),
+                        'confidenceLevel': params.get('confidence_level', 0.95),
+                        'sampleSize': len(df),
+                        'conclusion': result.get('interpretation', 'Survival analysis completed'),
+                        'significance': 0.05
+                    }
             
-            elif analysis_type == 'log_rank':
-                result = survival.log_rank_test(
-                    df, time_col, event_col, group_col
-                )
-                results = {
-                    'analysisType': 'log_rank',
-                    'testStatistics': result['test_results'],
-                    'pValue': result['test_results'].get('p_value'),
-                    'confidenceLevel': params.get('confidence_level', 0.95),
-                    'sampleSize': len(df),
-                    'conclusion': result['interpretation'],
-                    'significance': 0.05
-                }
+                elif analysis_type == 'log_rank':
+                    result = survival.log_rank_test(
+                        df, time_col, event_col, group_col
+                    )
+                    results = {
+                        'analysisType': 'log_rank',
+                        'testStatistics': result['test_results'],
+                        'pValue': result['test_results'].get('p_value'),
+                        'confidenceLevel': params.get('confidence_level', 0.95),
+                        'sampleSize': len(df),
+                        'conclusion': result['interpretation'],
+                        'significance': 0.05
+                    }
             
-            elif analysis_type == 'cox_ph':
-                covariates = params.get('covariates', [])
-                strata = params.get('strata', [])
-                result = survival.cox_proportional_hazards(
-                    df, time_col, event_col, covariates,
-                    strata=strata if strata else None
-                )
-                results = {
-                    'analysisType': 'cox_ph',
-                    'testStatistics': result['model_results'],
-                    'pValues': result['model_results'].get('p_values', {}),
-                    'confidenceIntervals': result['model_results'].get('confidence_intervals', {}),
-                    'confidenceLevel': params.get('confidence_level', 0.95),
-                    'sampleSize': len(df),
-                    'conclusion': result['interpretation'],
-                    'significance': 0.05
-                }
+                elif analysis_type == 'cox_ph':
+                    covariates = params.get('covariates', [])
+                    strata = params.get('strata', [])
+                    result = survival.cox_proportional_hazards(
+                        df, time_col, event_col, covariates,
+                        strata=strata if strata else None
+                    )
+                    results = {
+                        'analysisType': 'cox_ph',
+                        'testStatistics': result['model_results'],
+                        'pValues': result['model_results'].get('p_values', {}),
+                        'confidenceIntervals': result['model_results'].get('confidence_intervals', {}),
+                        'confidenceLevel': params.get('confidence_level', 0.95),
+                        'sampleSize': len(df),
+                        'conclusion': result['interpretation'],
+                        'significance': 0.05
+                    }
         
-        # Bioequivalence
-        elif analysis_type in ['tost', 'ci_approach', 'crossover_anova']:
-            from modules.statistics.bioequivalence_analysis import BioequivalenceAnalysis
-            beq = BioequivalenceAnalysis()
+            # Bioequivalence
+            elif analysis_type in ['tost', 'ci_approach', 'crossover_anova']:
+                from modules.statistics.bioequivalence_analysis import BioequivalenceAnalysis
+                beq = BioequivalenceAnalysis()
             
-            test_col = params.get('test')
-            ref_col = params.get('reference')
+                test_col = params.get('test')
+                ref_col = params.get('reference')
             
-            if analysis_type == 'tost':
-                result = beq.two_one_sided_tests(
-                    df, test_col, ref_col,
-                    log_transform=params.get('log_transform', True),
-                    alpha=1 - params.get('confidence_level', 0.90)
-                )
-                results = {
-                    'analysisType': 'tost',
-                    'testStatistics': result['test_results'],
-                    'pValue': result['test_results'].get('p_value'),
-                    'confidenceInterval': result['test_results'].get('confidence_interval', [0, 1]),
-                    'confidenceLevel': params.get('confidence_level', 0.90),
-                    'sampleSize': len(df),
-                    'conclusion': result['interpretation'],
-                    'significance': 0.10
-                }
+                if analysis_type == 'tost':
+                    result = beq.two_one_sided_tests(
+                        df, test_col, ref_col,
+                        log_transform=params.get('log_transform', True),
+                        alpha=1 - params.get('confidence_level', 0.90)
+                    )
+                    results = {
+                        'analysisType': 'tost',
+                        'testStatistics': result['test_results'],
+                        'pValue': result['test_results'].get('p_value'),
+                        'confidenceInterval': result['test_results'].get('confidence_interval', [0, 1]),
+                        'confidenceLevel': params.get('confidence_level', 0.90),
+                        'sampleSize': len(df),
+                        'conclusion': result['interpretation'],
+                        'significance': 0.10
+                    }
             
-            elif analysis_type == 'ci_approach':
-                result = beq.confidence_interval_approach(
-                    df, test_col, ref_col,
-                    log_transform=params.get('log_transform', True)
-                )
-                results = {
-                    'analysisType': 'ci_approach',
-                    'testStatistics': result['test_results'],
-                    'confidenceInterval': result['test_results'].get('confidence_interval', [0, 1]),
-                    'confidenceLevel': params.get('confidence_level', 0.90),
-                    'sampleSize': len(df),
-                    'conclusion': result['interpretation'],
-                    'significance': 0.10
-                }
+                elif analysis_type == 'ci_approach':
+                    result = beq.confidence_interval_approach(
+                        df, test_col, ref_col,
+                        log_transform=params.get('log_transform', True)
+                    )
+                    results = {
+                        'analysisType': 'ci_approach',
+                        'testStatistics': result['test_results'],
+                        'confidenceInterval': result['test_results'].get('confidence_interval', [0, 1]),
+                        'confidenceLevel': params.get('confidence_level', 0.90),
+                        'sampleSize': len(df),
+                        'conclusion': result['interpretation'],
+                        'significance': 0.10
+                    }
         
-        # PK/PD Analysis
-        elif analysis_type in ['nca_pk', 'auc_calculation', 'cmax_tmax', 'half_life', 'clearance', 'pd_response_modeling']:
-            from modules.statistics.pkpd_analysis import PKPDAnalysis
-            pkpd = PKPDAnalysis(
-                df,
-                dose=params.get('dose', 1),
-                route=params.get('route', 'EV')
-            )
+            # PK/PD Analysis
+            elif analysis_type in ['nca_pk', 'auc_calculation', 'cmax_tmax', 'half_life', 'clearance', 'pd_response_modeling']:
+                from modules.statistics.pkpd_analysis import PKPDAnalysis
+                pkpd = PKPDAnalysis(
+                    df,
+                    dose=params.get('dose', 1),
+                    route=params.get('route', 'EV')
+                )
             
-            if analysis_type == 'nca_pk':
-                result = pkpd.non_compartmental_analysis()
-                results = {
-                    'analysisType': 'nca_pk',
-                    'testStatistics': result['parameters'],
-                    'confidenceIntervals': result['confidence_intervals'],
-                    'confidenceLevel': params.get('confidence_level', 0.90),
-                    'sampleSize': len(df),
-                    'conclusion': result['interpretation'],
-                    'significance': 0.10
-                }
+                if analysis_type == 'nca_pk':
+                    result = pkpd.non_compartmental_analysis()
+                    results = {
+                        'analysisType': 'nca_pk',
+                        'testStatistics': result['parameters'],
+                        'confidenceIntervals': result['confidence_intervals'],
+                        'confidenceLevel': params.get('confidence_level', 0.90),
+                        'sampleSize': len(df),
+                        'conclusion': result['interpretation'],
+                        'significance': 0.10
+                    }
             
-            elif analysis_type == 'auc_calculation':
-                time_col = params.get('time')
-                conc_col = params.get('concentration')
-                result = pkpd.calculate_auc(time_col, conc_col)
-                results = {
-                    'analysisType': 'auc_calculation',
-                    'testStatistics': result,
-                    'confidenceLevel': params.get('confidence_level', 0.90),
-                    'sampleSize': len(df),
-                    'conclusion': 'AUC calculation completed',
-                    'significance': 0.10
-                }
+                elif analysis_type == 'auc_calculation':
+                    time_col = params.get('time')
+                    conc_col = params.get('concentration')
+                    result = pkpd.calculate_auc(time_col, conc_col)
+                    results = {
+                        'analysisType': 'auc_calculation',
+                        'testStatistics': result,
+                        'confidenceLevel': params.get('confidence_level', 0.90),
+                        'sampleSize': len(df),
+                        'conclusion': 'AUC calculation completed',
+                        'significance': 0.10
+                    }
         
-        # Categorical Tests
-        elif analysis_type == 'wilcoxon_signed_rank':
-            results = orchestrator.analyze_wilcoxon_signed_rank(
-                group_col=params.get('group'),
-                value_col=params.get('outcome'),
-                store_results=False,
-                title="Wilcoxon Signed Rank Test"
-            )
+            # Categorical Tests
+            elif analysis_type == 'wilcoxon_signed_rank':
+                results = orchestrator.analyze_wilcoxon_signed_rank(
+                    group_col=params.get('group'),
+                    value_col=params.get('outcome'),
+                    store_results=False,
+                    title="Wilcoxon Signed Rank Test"
+                )
         
-        elif analysis_type == 'sign_test':
-            results = orchestrator.analyze_sign_test(
-                group_col=params.get('group'),
-                value_col=params.get('outcome'),
-                store_results=False,
-                title="Sign Test"
-            )
+            elif analysis_type == 'sign_test':
+                results = orchestrator.analyze_sign_test(
+                    group_col=params.get('group'),
+                    value_col=params.get('outcome'),
+                    store_results=False,
+                    title="Sign Test"
+                )
         
-        elif analysis_type == 'friedman':
-            results = orchestrator.analyze_friedman(
-                group_col=params.get('group'),
-                value_col=params.get('outcome'),
-                store_results=False,
-                title="Friedman Test"
-            )
+            elif analysis_type == 'friedman':
+                results = orchestrator.analyze_friedman(
+                    group_col=params.get('group'),
+                    value_col=params.get('outcome'),
+                    store_results=False,
+                    title="Friedman Test"
+                )
         
-        elif analysis_type == 'dunns':
-            results = orchestrator.analyze_dunns(
-                value_col=params.get('outcome'),
-                group_col=params.get('group'),
-                p_adjust=params.get('p_adjust', 'bonferroni'),
-                store_results=False,
-                title="Dunn's Post-Hoc Test"
-            )
+            elif analysis_type == 'dunns':
+                results = orchestrator.analyze_dunns(
+                    value_col=params.get('outcome'),
+                    group_col=params.get('group'),
+                    p_adjust=params.get('p_adjust', 'bonferroni'),
+                    store_results=False,
+                    title="Dunn's Post-Hoc Test"
+                )
         
-        elif analysis_type == 'chi_square':
-            col1 = params.get('variable1')
-            col2 = params.get('variable2')
-            results = orchestrator.analyze_chi_square_independence(
-                col1=col1,
-                col2=col2,
-                store_results=False,
-                title="Chi-Square Test"
-            )
+            elif analysis_type == 'chi_square':
+                col1 = params.get('variable1')
+                col2 = params.get('variable2')
+                results = orchestrator.analyze_chi_square_independence(
+                    col1=col1,
+                    col2=col2,
+                    store_results=False,
+                    title="Chi-Square Test"
+                )
         
-        elif analysis_type == 'fisher_exact':
-            col1 = params.get('variable1')
-            col2 = params.get('variable2')
-            results = orchestrator.analyze_fisher_exact(
-                col1=col1,
-                col2=col2,
-                alternative=params.get('alternative', 'two-sided'),
-                store_results=False,
-                title="Fisher's Exact Test"
-            )
+            elif analysis_type == 'fisher_exact':
+                col1 = params.get('variable1')
+                col2 = params.get('variable2')
+                results = orchestrator.analyze_fisher_exact(
+                    col1=col1,
+                    col2=col2,
+                    alternative=params.get('alternative', 'two-sided'),
+                    store_results=False,
+                    title="Fisher's Exact Test"
+                )
         
-        elif analysis_type == 'mcnemar':
-            col1 = params.get('variable1')
-            col2 = params.get('variable2')
-            results = orchestrator.analyze_mcnemar(
-                col1=col1,
-                col2=col2,
-                exact=params.get('correction', True),
-                store_results=False,
-                title="McNemar's Test"
-            )
+            elif analysis_type == 'mcnemar':
+                col1 = params.get('variable1')
+                col2 = params.get('variable2')
+                results = orchestrator.analyze_mcnemar(
+                    col1=col1,
+                    col2=col2,
+                    exact=params.get('correction', True),
+                    store_results=False,
+                    title="McNemar's Test"
+                )
         
-        elif analysis_type == 'cmh':
-            col1 = params.get('variable1')
-            col2 = params.get('variable2')
-            strata = params.get('strata')
-            results = orchestrator.analyze_cochran_mantel_haenszel(
-                col1=col1,
-                col2=col2,
-                stratify_by=strata,
-                store_results=False,
-                title="Cochran-Mantel-Haenszel Test"
-            )
+            elif analysis_type == 'cmh':
+                col1 = params.get('variable1')
+                col2 = params.get('variable2')
+                strata = params.get('strata')
+                results = orchestrator.analyze_cochran_mantel_haenszel(
+                    col1=col1,
+                    col2=col2,
+                    stratify_by=strata,
+                    store_results=False,
+                    title="Cochran-Mantel-Haenszel Test"
+                )
         
-        # Multiplicity Control
-        elif analysis_type in ['bonferroni', 'holm', 'bh_fdr']:
-            from modules.statistics.multiplicity_control import MultiplicityControl
-            multi = MultiplicityControl()
+            # Multiplicity Control
+            elif analysis_type in ['bonferroni', 'holm', 'bh_fdr']:
+                from modules.statistics.multiplicity_control import MultiplicityControl
+                multi = MultiplicityControl()
             
-            p_value_cols = params.get('p_values', [])
-            p_values = []
-            for col in p_value_cols:
-                if col in df.columns:
-                    p_values.extend(df[col].dropna().tolist())
+                p_value_cols = params.get('p_values', [])
+                p_values = []
+                for col in p_value_cols:
+                    if col in df.columns:
+                        p_values.extend(df[col].dropna().tolist())
             
-            if analysis_type == 'bonferroni':
-                result = multi.bonferroni_correction(p_values, alpha=params.get('alpha', 0.05))
-            elif analysis_type == 'holm':
-                result = multi.holm_method(p_values, alpha=params.get('alpha', 0.05))
-            elif analysis_type == 'bh_fdr':
-                result = multi.benjamini_hochberg(p_values, q=params.get('q', 0.05))
+                if analysis_type == 'bonferroni':
+                    result = multi.bonferroni_correction(p_values, alpha=params.get('alpha', 0.05))
+                elif analysis_type == 'holm':
+                    result = multi.holm_method(p_values, alpha=params.get('alpha', 0.05))
+                elif analysis_type == 'bh_fdr':
+                    result = multi.benjamini_hochberg(p_values, q=params.get('q', 0.05))
             
-            results = {
-                'analysisType': analysis_type,
-                'adjustedPValues': result['adjusted_p_values'],
-                'sampleSize': len(p_values),
-                'conclusion': result['interpretation'],
-                'significance': params.get('alpha', params.get('q', 0.05))
-            }
+                results = {
+                    'analysisType': analysis_type,
+                    'adjustedPValues': result['adjusted_p_values'],
+                    'sampleSize': len(p_values),
+                    'conclusion': result['interpretation'],
+                    'significance': params.get('alpha', params.get('q', 0.05))
+                }
         
-        else:
-            raise HTTPException(status_code=400, detail=f"Unsupported analysis type: {analysis_type}")
+            else:
+                raise HTTPException(status_code=400, detail=f"Unsupported analysis type: {analysis_type}")
         
-        # Format results for UI
-        if results:
-            return {
-                "status": "success",
-                "results": results
-            }
-        else:
-            raise HTTPException(status_code=500, detail="Analysis returned no results")
+            # Format results for UI
+            if results:
+                return {
+                    "status": "success",
+                    "results": results
+                }
+            else:
+                raise HTTPException(status_code=500, detail="Analysis returned no results")
 
     except HTTPException:
         raise
@@ -5177,7 +5328,7 @@ async def analyze_generic(request: GenericAnalysisRequest):
 
 
 @router.post("/assumptions")
-async def test_assumptions(request: AssumptionsRequest):
+def test_assumptions(request: AssumptionsRequest):
     """Test assumptions for selected analysis
 
     Returns a list of assumptions with their status (passed/failed/warning),
@@ -5271,7 +5422,7 @@ async def test_assumptions(request: AssumptionsRequest):
 
 
 @router.post("/export/docx")
-async def export_docx(request: ExportDocxRequest):
+def export_docx(request: ExportDocxRequest):
     """Export analysis results to DOCX format
 
     Returns a downloadable DOCX file with comprehensive analysis report.
@@ -5479,7 +5630,7 @@ async def kaplan_meier_estimate(request: KaplanMeierRequest, data: Dict[str, Any
             confidence_level=request.confidence_level
         )
 
-        results = analyzer.kaplan_meier_estimate(
+        results = await run_analysis(analyzer.kaplan_meier_estimate,
             df=df,
             time_col=request.time_col,
             event_col=request.event_col,
@@ -5500,6 +5651,8 @@ async def kaplan_meier_estimate(request: KaplanMeierRequest, data: Dict[str, Any
                 "groups": request.group_values or ["all"]
             }
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Kaplan-Meier analysis failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
@@ -5524,7 +5677,7 @@ async def log_rank_test(request: LogRankRequest, data: Dict[str, Any]):
         df = orchestrator._prepare_dataframe(data)
 
         analyzer = SurvivalAnalysis(alpha=0.05)
-        results = analyzer.log_rank_test(
+        results = await run_analysis(analyzer.log_rank_test,
             df=df,
             time_col=request.time_col,
             event_col=request.event_col,
@@ -5545,6 +5698,8 @@ async def log_rank_test(request: LogRankRequest, data: Dict[str, Any]):
                 "groups_compared": [request.group_a, request.group_b]
             }
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Log-Rank test failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Test failed: {str(e)}")
@@ -5569,7 +5724,7 @@ async def cox_proportional_hazards(request: CoxRequest, data: Dict[str, Any]):
         df = orchestrator._prepare_dataframe(data)
 
         analyzer = SurvivalAnalysis(alpha=0.05)
-        results = analyzer.cox_proportional_hazards(
+        results = await run_analysis(analyzer.cox_proportional_hazards,
             df=df,
             time_col=request.time_col,
             event_col=request.event_col,
@@ -5590,6 +5745,8 @@ async def cox_proportional_hazards(request: CoxRequest, data: Dict[str, Any]):
                 "stratified": request.stratify_by is not None
             }
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Cox PH model failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Model failed: {str(e)}")
@@ -5618,7 +5775,7 @@ async def tost_procedure(request: TOSTRequest, data: Optional[Dict[str, Any]] =
             equivalence_limits=request.equivalence_limits or [0.80, 1.25]
         )
 
-        results = analyzer.tost_procedure(
+        results = await run_analysis(analyzer.tost_procedure,
             test_data=request.test_data,
             ref_data=request.ref_data,
             log_transform=request.log_transform
@@ -5638,6 +5795,8 @@ async def tost_procedure(request: TOSTRequest, data: Optional[Dict[str, Any]] =
                 "log_transformed": request.log_transform
             }
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"TOST failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Test failed: {str(e)}")
@@ -5661,7 +5820,7 @@ async def crossover_design_anova(request: CrossoverRequest, data: Dict[str, Any]
         df = orchestrator._prepare_dataframe(data)
 
         analyzer = BioequivalenceTests(alpha=0.05, equivalence_limits=[0.80, 1.25])
-        results = analyzer.crossover_design_anova(
+        results = await run_analysis(analyzer.crossover_design_anova,
             data=df,
             pk_parameter=request.pk_parameter,
             treatment_col=request.treatment_col,
@@ -5685,6 +5844,8 @@ async def crossover_design_anova(request: CrossoverRequest, data: Dict[str, Any]
                 "pk_parameter": request.pk_parameter
             }
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Crossover ANOVA failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
@@ -5706,7 +5867,7 @@ async def bioavailability_calculation(request: BioavailabilityRequest):
     try:
         analyzer = BioequivalenceTests(alpha=0.05, equivalence_limits=[0.80, 1.25])
 
-        results = analyzer.bioavailability_calculation(
+        results = await run_analysis(analyzer.bioavailability_calculation,
             test_auc=request.test_auc,
             test_dose=request.test_dose,
             test_cmax=request.test_cmax,
@@ -5729,6 +5890,8 @@ async def bioavailability_calculation(request: BioavailabilityRequest):
                 "absolute_f": request.iv_auc is not None
             }
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Bioavailability calculation failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Calculation failed: {str(e)}")
@@ -5758,7 +5921,7 @@ async def comprehensive_diagnostics(request: ComprehensiveDiagnosticRequest, dat
 
         numeric_cols = request.numeric_cols or df.select_dtypes(include=[np.number]).columns.tolist()
 
-        results = analyzer.comprehensive_diagnostics(
+        results = await run_analysis(analyzer.comprehensive_diagnostics,
             df=df,
             numeric_cols=numeric_cols,
             group_col=request.group_col,
@@ -5806,7 +5969,7 @@ async def logistic_regression_analysis(request: LogisticRegressionRequest, data:
         df = orchestrator._prepare_dataframe(data)
 
         analyzer = AdvancedBiostatistics(alpha=0.05)
-        results = analyzer.logistic_regression(
+        results = await run_analysis(analyzer.logistic_regression,
             df=df,
             y_var=request.y_var,
             x_vars=request.x_vars,
@@ -5826,6 +5989,8 @@ async def logistic_regression_analysis(request: LogisticRegressionRequest, data:
                 "independent_variables": request.x_vars
             }
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Logistic regression failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
@@ -5849,7 +6014,7 @@ async def poisson_regression_analysis(request: PoissonRegressionRequest, data: D
         df = orchestrator._prepare_dataframe(data)
 
         analyzer = AdvancedBiostatistics(alpha=0.05)
-        results = analyzer.poisson_regression(
+        results = await run_analysis(analyzer.poisson_regression,
             df=df,
             y_var=request.y_var,
             x_vars=request.x_vars,
@@ -5870,6 +6035,8 @@ async def poisson_regression_analysis(request: PoissonRegressionRequest, data: D
                 "offset": request.offset
             }
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Poisson regression failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
@@ -5893,7 +6060,7 @@ async def negative_binomial_analysis(request: NegativeBinomialRequest, data: Dic
         df = orchestrator._prepare_dataframe(data)
 
         analyzer = AdvancedBiostatistics(alpha=0.05)
-        results = analyzer.negative_binomial_regression(
+        results = await run_analysis(analyzer.negative_binomial_regression,
             df=df,
             y_var=request.y_var,
             x_vars=request.x_vars,
@@ -5913,6 +6080,8 @@ async def negative_binomial_analysis(request: NegativeBinomialRequest, data: Dic
                 "dependent_variable": request.y_var
             }
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Negative binomial regression failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
@@ -5936,7 +6105,7 @@ async def linear_mixed_effects_analysis(request: MixedModelRequest, data: Dict[s
         df = orchestrator._prepare_dataframe(data)
 
         analyzer = AdvancedBiostatistics(alpha=0.05)
-        results = analyzer.linear_mixed_effects(
+        results = await run_analysis(analyzer.linear_mixed_effects,
             df=df,
             y_var=request.y_var,
             x_vars=request.x_vars,
@@ -5958,6 +6127,8 @@ async def linear_mixed_effects_analysis(request: MixedModelRequest, data: Dict[s
                 "grouping_variable": request.group_var
             }
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Mixed-effects model failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
@@ -5980,13 +6151,13 @@ async def meta_analysis(request: MetaAnalysisRequest):
         analyzer = AdvancedBiostatistics(alpha=0.05)
 
         if request.method == "fixed":
-            results = analyzer.meta_analysis_fixed_effects(
+            results = await run_analysis(analyzer.meta_analysis_fixed_effects,
                 effect_sizes=request.effect_sizes,
                 standard_errors=request.standard_errors,
                 study_labels=request.study_labels
             )
         else:
-            results = analyzer.meta_analysis_random_effects(
+            results = await run_analysis(analyzer.meta_analysis_random_effects,
                 effect_sizes=request.effect_sizes,
                 standard_errors=request.standard_errors,
                 study_labels=request.study_labels,
@@ -6006,6 +6177,8 @@ async def meta_analysis(request: MetaAnalysisRequest):
                 "method": request.method
             }
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Meta-analysis failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
@@ -6026,7 +6199,7 @@ async def non_inferiority_test(request: NonInferiorityRequest):
     """
     try:
         analyzer = AdvancedBiostatistics(alpha=0.05)
-        results = analyzer.non_inferiority_test(
+        results = await run_analysis(analyzer.non_inferiority_test,
             treatment_mean=request.treatment_mean,
             control_mean=request.control_mean,
             treatment_std=request.treatment_std,
@@ -6050,6 +6223,8 @@ async def non_inferiority_test(request: NonInferiorityRequest):
                 "test_type": request.test_type
             }
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Non-inferiority test failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Test failed: {str(e)}")
@@ -6070,7 +6245,7 @@ async def equivalence_test(request: EquivalenceRequest):
     """
     try:
         analyzer = AdvancedBiostatistics(alpha=0.05)
-        results = analyzer.equivalence_test(
+        results = await run_analysis(analyzer.equivalence_test,
             treatment_mean=request.treatment_mean,
             control_mean=request.control_mean,
             treatment_std=request.treatment_std,
@@ -6094,6 +6269,8 @@ async def equivalence_test(request: EquivalenceRequest):
                 "test_type": request.test_type
             }
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Equivalence test failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Test failed: {str(e)}")
@@ -6132,7 +6309,7 @@ async def non_compartmental_analysis(request: NCAPKRequest, data: Dict[str, Any]
                 subject_id=request.subject_col
             )
 
-            results = analyzer.non_compartmental_analysis(
+            results = await run_analysis(analyzer.non_compartmental_analysis,
                 alpha=request.alpha,
                 lambda_z_timepoints=3
             )
@@ -6156,6 +6333,8 @@ async def non_compartmental_analysis(request: NCAPKRequest, data: Dict[str, Any]
                 "route": request.route
             }
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"NCA failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
@@ -6189,7 +6368,7 @@ async def calculate_auc(request: AUCRequest, data: Dict[str, Any]):
                 subject_id=request.subject_col
             )
 
-            results = analyzer.calculate_auc(
+            results = await run_analysis(analyzer.calculate_auc,
                 method="linear",
                 extrapolate=True,
                 lambda_z_timepoints=3
@@ -6207,6 +6386,8 @@ async def calculate_auc(request: AUCRequest, data: Dict[str, Any]):
                 "timestamp": datetime.utcnow().isoformat()
             }
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"AUC calculation failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Calculation failed: {str(e)}")
@@ -6240,7 +6421,7 @@ async def calculate_cmax_tmax(request: CmaxTmaxRequest, data: Dict[str, Any]):
                 subject_id=request.subject_col
             )
 
-            results = analyzer.calculate_cmax_tmax(
+            results = await run_analysis(analyzer.calculate_cmax_tmax,
                 alpha=request.alpha,
                 interpolation="linear"
             )
@@ -6257,6 +6438,8 @@ async def calculate_cmax_tmax(request: CmaxTmaxRequest, data: Dict[str, Any]):
                 "timestamp": datetime.utcnow().isoformat()
             }
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Cmax/Tmax calculation failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Calculation failed: {str(e)}")
@@ -6290,7 +6473,7 @@ async def estimate_half_life(request: HalfLifeRequest, data: Dict[str, Any]):
                 subject_id=request.subject_col
             )
 
-            results = analyzer.estimate_half_life(
+            results = await run_analysis(analyzer.estimate_half_life,
                 method="linear",
                 lambda_z_timepoints=3,
                 alpha=request.alpha
@@ -6308,6 +6491,8 @@ async def estimate_half_life(request: HalfLifeRequest, data: Dict[str, Any]):
                 "timestamp": datetime.utcnow().isoformat()
             }
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Half-life estimation failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Estimation failed: {str(e)}")
@@ -6341,7 +6526,7 @@ async def calculate_clearance(request: ClearanceRequest, data: Dict[str, Any]):
                 subject_id=request.subject_col
             )
 
-            results = analyzer.calculate_clearance(
+            results = await run_analysis(analyzer.calculate_clearance,
                 bioavailability=None,
                 alpha=request.alpha
             )
@@ -6358,13 +6543,15 @@ async def calculate_clearance(request: ClearanceRequest, data: Dict[str, Any]):
                 "timestamp": datetime.utcnow().isoformat()
             }
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Clearance calculation failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Calculation failed: {str(e)}")
 
 
 @router.post("/pkpd/bioavailability")
-async def calculate_bioavailability(request: PKBioavailabilityRequest, data: Dict[str, Any]):
+def calculate_bioavailability(request: PKBioavailabilityRequest, data: Dict[str, Any]):
     """Calculate bioavailability
 
     Pharmaceutical Example:
@@ -6414,7 +6601,7 @@ async def calculate_bioavailability(request: PKBioavailabilityRequest, data: Dic
 
 
 @router.post("/pkpd/pd-response")
-async def pd_response_modeling(request: PDResponseRequest):
+def pd_response_modeling(request: PDResponseRequest):
     """Perform PD response modeling
 
     Pharmaceutical Example:
@@ -6454,7 +6641,7 @@ async def pd_response_modeling(request: PDResponseRequest):
 
 
 @router.post("/pkpd/compartmental")
-async def compartmental_analysis(request: CompartmentalRequest, data: Dict[str, Any]):
+def compartmental_analysis(request: CompartmentalRequest, data: Dict[str, Any]):
     """Perform compartmental PK analysis
 
     Pharmaceutical Example:
@@ -6515,7 +6702,7 @@ async def dose_proportionality_test(request: DoseProportionalityRequest):
             subject_id="subject"
         )
 
-        results = analyzer.dose_proportionality_pk(
+        results = await run_analysis(analyzer.dose_proportionality_pk,
             dose_data=request.doses,
             pk_values=request.pk_values,
             parameter=request.parameter,
@@ -6535,6 +6722,8 @@ async def dose_proportionality_test(request: DoseProportionalityRequest):
                 "dose_levels": request.doses
             }
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Dose proportionality test failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Test failed: {str(e)}")
@@ -6583,6 +6772,8 @@ async def pk_summary_statistics(request: PKSummaryRequest, data: Dict[str, Any])
                 "format": request.format
             }
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"PK summary statistics failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Summary failed: {str(e)}")
@@ -6606,7 +6797,7 @@ async def benjamini_yekutieli_correction(request: FDRRequest):
     """
     try:
         analyzer = MultiplicityControl(alpha=request.alpha, family_wise=False)
-        results = analyzer.benjamini_yekutieli(
+        results = await run_analysis(analyzer.benjamini_yekutieli,
             p_values=request.p_values,
             q_value=request.alpha
         )
@@ -6648,7 +6839,7 @@ async def glm_analysis(request: GLMRequest, data: Dict[str, Any]):
         df = orchestrator._prepare_dataframe(data)
 
         analyzer = StatisticalTests(alpha=0.05, power=0.80)
-        results = analyzer.generalized_linear_model(
+        results = await run_analysis(analyzer.generalized_linear_model,
             data=df,
             dependent_var=request.dependent_var,
             independent_vars=request.independent_vars,
@@ -6693,7 +6884,7 @@ async def auto_analyze(request: AutoAnalyzeRequest, data: Dict[str, Any]):
         orchestrator = get_statistics_orchestrator()
         df = orchestrator._prepare_dataframe(data)
 
-        results = orchestrator.auto_analyze(
+        results = await run_in_session(orchestrator.auto_analyze,
             df=df,
             research_question=request.research_question,
             analysis_goal=request.analysis_goal
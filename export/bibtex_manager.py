@@ -11,15 +11,24 @@ including:
 - Reference validation
 - Duplicate detection and merging
 
+Entries are indexed by ID, normalized title, DOI and PMID, so duplicate
+checks and lookups are O(1) per entry; search() goes through an inverted
+token index. Batch imports fetch PubMed records in comma-separated efetch
+chunks and CrossRef records concurrently, through the literature response
+cache.
+
 Export Pipeline:
 Research Data → PubMed/DOI API → BibTeX Entries → Formatting → Bibliography Output
 """
 
 import requests
-from typing import Dict, List, Optional, Union, Set
+from typing import Callable, Dict, Iterable, List, Optional, Union, Set
 from pathlib import Path
 import logging
 import re
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
@@ -42,6 +51,105 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+EFETCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
+CROSSREF_URL = "https://api.crossref.org/works/{doi}"
+CROSSREF_HEADERS = {
+    'Accept': 'application/x-bibtex',
+    'User-Agent': 'BioDockify/1.0 (mailto:example@email.com)'
+}
+
+_PUNCT = re.compile(r'[^\w\s]')
+_TOKEN = re.compile(r'\w+')
+
+
+def _title_key(title: Optional[str]) -> str:
+    """Normalized title used for duplicate detection"""
+    return _PUNCT.sub('', (title or '').lower().strip())
+
+
+class _RequestSpacer:
+    """Thread-safe request spacing: at most `requests_per_second` request starts"""
+
+    def __init__(self, requests_per_second: float):
+        self.delay = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.delay
+        if wait > 0:
+            time.sleep(wait)
+
+
+class _TokenIndex:
+    """
+    Inverted index of one field: token -> entry positions, plus an n-gram
+    index (every substring of up to GRAM characters) -> tokens, so the tokens
+    containing a query token are looked up instead of scanned.
+    """
+
+    GRAM = 3
+
+    def __init__(self):
+        self.postings: Dict[str, Set[int]] = {}
+        self.grams: Dict[str, Set[str]] = {}
+
+    def add(self, value, position: int):
+        if not value:
+            return
+        for token in set(_TOKEN.findall(str(value).lower())):
+            postings = self.postings.get(token)
+            if postings is None:
+                postings = self.postings[token] = set()
+                for gram in self._grams(token):
+                    self.grams.setdefault(gram, set()).add(token)
+            postings.add(position)
+
+    def _grams(self, token: str) -> Set[str]:
+        return {
+            token[i:i + n]
+            for n in range(1, min(self.GRAM, len(token)) + 1)
+            for i in range(len(token) - n + 1)
+        }
+
+    def containing(self, query_token: str) -> Set[int]:
+        """Positions with a token that contains query_token"""
+        if len(query_token) <= self.GRAM:
+            tokens = self.grams.get(query_token, set())
+        else:
+            # Tokens holding every trigram of the query token, then verified
+            gram_sets = []
+            for i in range(len(query_token) - self.GRAM + 1):
+                found = self.grams.get(query_token[i:i + self.GRAM])
+                if not found:
+                    return set()
+                gram_sets.append(found)
+            gram_sets.sort(key=len)
+            tokens = set(gram_sets[0]).intersection(*gram_sets[1:])
+            tokens = {token for token in tokens if query_token in token}
+
+        matched: Set[int] = set()
+        for token in tokens:
+            matched |= self.postings[token]
+        return matched
+
+    def candidates(self, query_tokens: Set[str]) -> Set[int]:
+        """
+        Positions whose field holds, for every query token, a token containing it.
+        A substring match implies this, so no true match is dropped.
+        """
+        candidates: Optional[Set[int]] = None
+        # Longest query tokens first: they match the fewest index tokens
+        for query_token in sorted(query_tokens, key=len, reverse=True):
+            matched = self.containing(query_token)
+            candidates = matched if candidates is None else candidates & matched
+            if not candidates:
+                return set()
+        return candidates or set()
+
 
 @dataclass
 class BibEntry:
@@ -99,12 +207,25 @@ class BibTeXManager:
         'techreport': ['ID', 'ENTRYTYPE', 'title', 'author', 'institution', 'year']
     }
 
-    def __init__(self, entries: Optional[List[Dict]] = None):
+    # E-utilities accepts comma-separated IDs; NCBI allows 3 requests/s without an API key
+    PUBMED_BATCH_SIZE = 200
+    PUBMED_WORKERS = 3
+    PUBMED_REQUESTS_PER_SECOND = 3.0
+    # CrossRef polite pool
+    CROSSREF_WORKERS = 4
+    CROSSREF_REQUESTS_PER_SECOND = 5.0
+
+    DEFAULT_SEARCH_FIELDS = ('title', 'author', 'journal', 'abstract')
+
+    def __init__(self, entries: Optional[List[Dict]] = None, cache=None, use_cache: bool = True):
         """
         Initialize BibTeX manager
 
         Args:
             entries: Optional list of existing BibTeX entries
+            cache: ResponseCache for PubMed/CrossRef responses
+                (default: the shared literature response cache)
+            use_cache: Set False to always hit the network
         """
         if not BIBTEXPARSER_AVAILABLE:
             raise ImportError(
@@ -112,8 +233,83 @@ class BibTeXManager:
             )
 
         self.entries = entries or []
+        self._cache = cache
+        self._use_cache = use_cache
+        self._session = requests.Session()
+        self._pubmed_spacer = _RequestSpacer(self.PUBMED_REQUESTS_PER_SECOND)
+        self._crossref_spacer = _RequestSpacer(self.CROSSREF_REQUESTS_PER_SECOND)
+        self._rebuild_indexes()
         logger.info(f"BibTeX manager initialized with {len(self.entries)} entries")
 
+    # ------------------------------------------------------------------
+    # Indexes
+    # ------------------------------------------------------------------
+
+    def _rebuild_indexes(self):
+        """Index every entry from scratch (after merges or outside edits of self.entries)"""
+        self._by_id: Dict[str, Dict] = {}
+        self._by_title: Dict[str, Dict] = {}
+        self._by_doi: Dict[str, Dict] = {}
+        self._by_pmid: Dict[str, Dict] = {}
+        # field -> token index over positions in self.entries; built per field on first search
+        self._search_index: Dict[str, _TokenIndex] = {}
+        self._indexed_list = self.entries
+        self._indexed_count = 0
+        for entry in self.entries:
+            self._index_entry(entry)
+
+    def reindex(self):
+        """Rebuild the indexes after entries were edited in place"""
+        self._rebuild_indexes()
+
+    def _ensure_indexes(self):
+        """
+        Entries appended to self.entries directly, or a replaced list, are
+        picked up here; in-place edits of indexed entries need reindex().
+        """
+        if self._indexed_list is not self.entries or self._indexed_count > len(self.entries):
+            self._rebuild_indexes()
+        elif self._indexed_count < len(self.entries):
+            for entry in self.entries[self._indexed_count:]:
+                self._index_entry(entry)
+
+    def _index_entry(self, entry: Dict):
+        """Add the entry at position self._indexed_count to every index"""
+        position = self._indexed_count
+        self._indexed_count += 1
+
+        entry_id = entry.get('ID')
+        if entry_id:
+            self._by_id.setdefault(entry_id, entry)
+        title_key = _title_key(entry.get('title'))
+        if title_key:
+            self._by_title.setdefault(title_key, entry)
+        doi = (entry.get('doi') or '').strip().lower()
+        if doi:
+            self._by_doi.setdefault(doi, entry)
+        pmid = str(entry.get('pmid') or '').strip()
+        if pmid:
+            self._by_pmid.setdefault(pmid, entry)
+
+        for field, index in self._search_index.items():
+            index.add(entry.get(field), position)
+
+    def _field_index(self, field: str) -> _TokenIndex:
+        index = self._search_index.get(field)
+        if index is None:
+            index = self._search_index[field] = _TokenIndex()
+            for position, entry in enumerate(self.entries[:self._indexed_count]):
+                index.add(entry.get(field), position)
+        return index
+
+    def _append(self, entry: Dict) -> bool:
+        """Append the entry unless it duplicates an existing one. Returns True if added."""
+        if self._is_duplicate(entry):
+            return False
+        self.entries.append(entry)
+        self._index_entry(entry)
+        return True
+
     def add_from_pubmed(
         self,
         pmid: str,
@@ -136,42 +332,27 @@ class BibTeXManager:
         """
         logger.info(f"Fetching from PubMed: PMID {pmid}")
 
-        # Build API URL
-        base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
-        params = {
-            'db': 'pubmed',
-            'id': pmid,
-            'retmode': 'xml'
-        }
-
         try:
-            response = requests.get(base_url, params=params, timeout=10)
-
-            if response.status_code != 200:
-                raise Exception(
-                    f"PubMed API error: HTTP {response.status_code}"
-                )
-
-            # Parse XML and convert to BibTeX
-            entry = self._parse_pubmed_xml(
-                response.text,
-                pmid,
-                fetch_abstract=fetch_abstract
-            )
-
-            # Check for duplicates
-            if not self._is_duplicate(entry):
-                self.entries.append(entry)
-                logger.info(f"Added PubMed entry: {entry.get('title', 'Unknown')}")
-            else:
-                logger.warning(f"Duplicate entry detected for PMID {pmid}")
-
-            return entry
-
+            xml_text = self._efetch_pubmed([pmid])
         except requests.exceptions.RequestException as e:
             logger.error(f"Network error fetching PubMed: {e}")
             raise Exception(f"PubMed API request failed: {str(e)}")
 
+        # Parse XML and convert to BibTeX
+        entry = self._parse_pubmed_xml(
+            xml_text,
+            pmid,
+            fetch_abstract=fetch_abstract
+        )
+
+        # Check for duplicates
+        if self._append(entry):
+            logger.info(f"Added PubMed entry: {entry.get('title', 'Unknown')}")
+        else:
+            logger.warning(f"Duplicate entry detected for PMID {pmid}")
+
+        return entry
+
     def add_from_doi(self, doi: str) -> Dict:
         """
         Fetch citation from DOI
@@ -189,45 +370,20 @@ class BibTeXManager:
         """
         logger.info(f"Fetching from DOI: {doi}")
 
-        # Build API URL
-        url = f"https://api.crossref.org/works/{doi}"
-        headers = {
-            'Accept': 'application/x-bibtex',
-            'User-Agent': 'BioDockify/1.0 (mailto:example@email.com)'
-        }
-
         try:
-            response = requests.get(url, headers=headers, timeout=10)
-
-            if response.status_code != 200:
-                raise Exception(
-                    f"CrossRef API error: HTTP {response.status_code}"
-                )
-
-            # Parse BibTeX response
-            bib_database = bibtexparser.loads(response.text)
-
-            if not bib_database.entries:
-                raise Exception("No BibTeX entry found in response")
-
-            entry = bib_database.entries[0]
-
-            # Add DOI to entry
-            entry['doi'] = doi
-
-            # Check for duplicates
-            if not self._is_duplicate(entry):
-                self.entries.append(entry)
-                logger.info(f"Added DOI entry: {entry.get('title', 'Unknown')}")
-            else:
-                logger.warning(f"Duplicate entry detected for DOI {doi}")
-
-            return entry
-
+            entry = self._entry_from_crossref(self._fetch_crossref_bibtex(doi), doi)
         except requests.exceptions.RequestException as e:
             logger.error(f"Network error fetching DOI: {e}")
             raise Exception(f"CrossRef API request failed: {str(e)}")
 
+        # Check for duplicates
+        if self._append(entry):
+            logger.info(f"Added DOI entry: {entry.get('title', 'Unknown')}")
+        else:
+            logger.warning(f"Duplicate entry detected for DOI {doi}")
+
+        return entry
+
     def add_manual(self, entry: Union[Dict, BibEntry]) -> Dict:
         """
         Add manual BibTeX entry
@@ -250,11 +406,10 @@ class BibTeXManager:
         self._validate_entry(entry_dict)
 
         # Check for duplicates
-        if self._is_duplicate(entry_dict):
-            logger.warning(f"Duplicate entry detected: {entry_dict.get('ID', 'Unknown')}")
-        else:
-            self.entries.append(entry_dict)
+        if self._append(entry_dict):
             logger.info(f"Added manual entry: {entry_dict.get('title', 'Unknown')}")
+        else:
+            logger.warning(f"Duplicate entry detected: {entry_dict.get('ID', 'Unknown')}")
 
         return entry_dict
 
@@ -266,6 +421,9 @@ class BibTeXManager:
         """
         Batch fetch from PubMed
 
+        PMIDs are fetched PUBMED_BATCH_SIZE at a time in comma-separated
+        efetch requests, up to PUBMED_WORKERS chunks concurrently.
+
         Args:
             pmids: List of PubMed IDs
             fetch_abstract: Whether to fetch abstracts
@@ -275,13 +433,34 @@ class BibTeXManager:
         """
         logger.info(f"Fetching {len(pmids)} entries from PubMed")
 
-        added_entries = []
-        for pmid in pmids:
+        unique = list(dict.fromkeys(str(pmid).strip() for pmid in pmids if str(pmid).strip()))
+        chunks = [
+            unique[i:i + self.PUBMED_BATCH_SIZE]
+            for i in range(0, len(unique), self.PUBMED_BATCH_SIZE)
+        ]
+
+        def fetch_chunk(chunk: List[str]) -> Dict[str, Dict]:
             try:
-                entry = self.add_from_pubmed(pmid, fetch_abstract=fetch_abstract)
-                added_entries.append(entry)
+                xml_text = self._efetch_pubmed(chunk)
+                return self._parse_pubmed_batch(xml_text, fetch_abstract=fetch_abstract)
             except Exception as e:
-                logger.error(f"Failed to fetch PMID {pmid}: {e}")
+                logger.error(f"Failed to fetch PMIDs {chunk[0]}..{chunk[-1]}: {e}")
+                return {}
+
+        parsed: Dict[str, Dict] = {}
+        for result in self._map_concurrent(fetch_chunk, chunks, self.PUBMED_WORKERS):
+            parsed.update(result)
+
+        # Add in input order so entry positions do not depend on response timing
+        added_entries = []
+        for pmid in unique:
+            entry = parsed.get(pmid)
+            if entry is None:
+                logger.error(f"Failed to fetch PMID {pmid}: not in PubMed response")
+                continue
+            if not self._append(entry):
+                logger.warning(f"Duplicate entry detected for PMID {pmid}")
+            added_entries.append(entry)
 
         logger.info(f"Successfully added {len(added_entries)}/{len(pmids)} entries")
         return added_entries
@@ -290,6 +469,9 @@ class BibTeXManager:
         """
         Batch fetch from DOI
 
+        CrossRef has no batch BibTeX endpoint, so DOIs are fetched
+        concurrently (CROSSREF_WORKERS at a time).
+
         Args:
             dois: List of DOIs
 
@@ -298,17 +480,94 @@ class BibTeXManager:
         """
         logger.info(f"Fetching {len(dois)} entries from DOI")
 
-        added_entries = []
-        for doi in dois:
+        def fetch(doi: str) -> Optional[Dict]:
             try:
-                entry = self.add_from_doi(doi)
-                added_entries.append(entry)
+                return self._entry_from_crossref(self._fetch_crossref_bibtex(doi), doi)
             except Exception as e:
                 logger.error(f"Failed to fetch DOI {doi}: {e}")
+                return None
+
+        added_entries = []
+        for doi, entry in zip(dois, self._map_concurrent(fetch, dois, self.CROSSREF_WORKERS)):
+            if entry is None:
+                continue
+            if not self._append(entry):
+                logger.warning(f"Duplicate entry detected for DOI {doi}")
+            added_entries.append(entry)
 
         logger.info(f"Successfully added {len(added_entries)}/{len(dois)} entries")
         return added_entries
 
+    # ------------------------------------------------------------------
+    # Fetching
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _map_concurrent(fn: Callable, items: List, max_workers: int) -> List:
+        """fn over items on a small thread pool, results in input order"""
+        if len(items) <= 1 or max_workers <= 1:
+            return [fn(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+            return list(pool.map(fn, items))
+
+    def _response_cache(self):
+        if not self._use_cache:
+            return None
+        if self._cache is None:
+            from modules.literature.response_cache import get_response_cache
+            self._cache = get_response_cache()
+        return self._cache
+
+    def _cached(self, source: str, key_data: Dict, producer: Callable[[], str]) -> str:
+        cache = self._response_cache()
+        if cache is None:
+            return producer()
+        return cache.memoize(source, key_data, producer)
+
+    def _efetch_pubmed(self, pmids: List[str]) -> str:
+        """PubMed XML for the given PMIDs, in one efetch request"""
+        ids = ','.join(pmids)
+
+        def fetch() -> str:
+            self._pubmed_spacer.wait()
+            response = self._session.get(
+                EFETCH_URL,
+                params={'db': 'pubmed', 'id': ids, 'retmode': 'xml'},
+                timeout=10 + len(pmids) // 20
+            )
+            if response.status_code != 200:
+                raise Exception(f"PubMed API error: HTTP {response.status_code}")
+            return response.text
+
+        return self._cached('pubmed', {'efetch': ids}, fetch)
+
+    def _fetch_crossref_bibtex(self, doi: str) -> str:
+        """BibTeX text for a DOI from CrossRef"""
+        def fetch() -> str:
+            self._crossref_spacer.wait()
+            response = self._session.get(
+                CROSSREF_URL.format(doi=doi), headers=CROSSREF_HEADERS, timeout=10
+            )
+            if response.status_code != 200:
+                raise Exception(f"CrossRef API error: HTTP {response.status_code}")
+            return response.text
+
+        return self._cached('crossref', {'bibtex': doi}, fetch)
+
+    @staticmethod
+    def _entry_from_crossref(bibtex_text: str, doi: str) -> Dict:
+        """Parse a CrossRef BibTeX response"""
+        bib_database = bibtexparser.loads(bibtex_text)
+
+        if not bib_database.entries:
+            raise Exception("No BibTeX entry found in response")
+
+        entry = bib_database.entries[0]
+
+        # Add DOI to entry
+        entry['doi'] = doi
+        return entry
+
     def export(self, filepath: str, encoding: str = 'utf-8') -> str:
         """
         Export entries to .bib file
@@ -379,7 +638,7 @@ class BibTeXManager:
         Returns:
             Formatted citation string
         """
-        entry = next((e for e in self.entries if e.get('ID') == entry_id), None)
+        entry = self._get_entry_by_id(entry_id)
 
         if not entry:
             logger.warning(f"Entry not found: {entry_id}")
@@ -431,8 +690,7 @@ class BibTeXManager:
         seen_titles = {}
 
         for entry in self.entries:
-            title = entry.get('title', '').lower().strip()
-            title_key = re.sub(r'[^\w\s]', '', title)
+            title_key = _title_key(entry.get('title'))
 
             if title_key in seen_titles:
                 # Found duplicate
@@ -459,6 +717,7 @@ class BibTeXManager:
         """
         duplicates = self.find_duplicates()
         merged_count = 0
+        remove_ids: Set[int] = set()
 
         for original_id, duplicate_entries in duplicates.items():
             if len(duplicate_entries) > 1:
@@ -476,11 +735,14 @@ class BibTeXManager:
                     keep_entry = duplicate_entries[0]
                     remove_entries = duplicate_entries[1:]
 
-                # Remove duplicates
-                for entry in remove_entries:
-                    if entry in self.entries:
-                        self.entries.remove(entry)
-                        merged_count += 1
+                remove_ids.update(id(entry) for entry in remove_entries)
+
+        # Remove duplicates in one pass
+        if remove_ids:
+            kept = [entry for entry in self.entries if id(entry) not in remove_ids]
+            merged_count = len(self.entries) - len(kept)
+            self.entries[:] = kept
+            self._rebuild_indexes()
 
         logger.info(f"Merged {merged_count} duplicate entries")
         return merged_count
@@ -500,8 +762,42 @@ class BibTeXManager:
             logger.error(f"Failed to parse PubMed XML: {e}")
             raise
 
+        record = root.find('.//PubmedArticle')
+        return self._parse_pubmed_article(
+            record if record is not None else root, pmid, fetch_abstract=fetch_abstract
+        )
+
+    def _parse_pubmed_batch(self, xml_text: str, fetch_abstract: bool = False) -> Dict[str, Dict]:
+        """Convert a multi-record efetch response to {pmid: BibTeX entry}"""
+        import xml.etree.ElementTree as ET
+
+        try:
+            root = ET.fromstring(xml_text)
+        except ET.ParseError as e:
+            logger.error(f"Failed to parse PubMed XML: {e}")
+            raise
+
+        entries = {}
+        for record in root.iter('PubmedArticle'):
+            pmid_elem = record.find('MedlineCitation/PMID')
+            if pmid_elem is None or not pmid_elem.text:
+                continue
+            pmid = pmid_elem.text.strip()
+            try:
+                entries[pmid] = self._parse_pubmed_article(record, pmid, fetch_abstract=fetch_abstract)
+            except Exception as e:
+                logger.error(f"Failed to parse PMID {pmid}: {e}")
+        return entries
+
+    def _parse_pubmed_article(
+        self,
+        record,
+        pmid: str,
+        fetch_abstract: bool = False
+    ) -> Dict:
+        """Convert one PubmedArticle element to BibTeX entry"""
         # Find article
-        article = root.find('.//Article')
+        article = record.find('.//Article')
 
         if article is None:
             raise Exception("Article not found in PubMed XML")
@@ -543,7 +839,7 @@ class BibTeXManager:
 
         # Extract DOI
         doi = ''
-        article_ids = root.find('.//ArticleIdList')
+        article_ids = record.find('.//ArticleIdList')
         if article_ids is not None:
             for aid in article_ids.findall('.//ArticleId'):
                 if aid.get('IdType') == 'doi':
@@ -735,25 +1031,24 @@ class BibTeXManager:
         return True
 
     def _is_duplicate(self, entry: Dict) -> bool:
-        """Check if entry is duplicate"""
-        title = entry.get('title', '').lower().strip()
-        title_key = re.sub(r'[^\w\s]', '', title)
+        """Check if entry is duplicate (same normalized title, DOI or PMID)"""
+        self._ensure_indexes()
 
-        for existing in self.entries:
-            existing_title = existing.get('title', '').lower().strip()
-            existing_key = re.sub(r'[^\w\s]', '', existing_title)
+        title_key = _title_key(entry.get('title'))
+        if title_key and title_key in self._by_title:
+            return True
 
-            if title_key == existing_key:
-                return True
+        doi = (entry.get('doi') or '').strip().lower()
+        if doi and doi in self._by_doi:
+            return True
 
-        return False
+        pmid = str(entry.get('pmid') or '').strip()
+        return bool(pmid) and pmid in self._by_pmid
 
     def _get_entry_by_id(self, entry_id: str) -> Optional[Dict]:
         """Get entry by ID"""
-        for entry in self.entries:
-            if entry.get('ID') == entry_id:
-                return entry
-        return None
+        self._ensure_indexes()
+        return self._by_id.get(entry_id)
 
     def search(
         self,
@@ -763,6 +1058,9 @@ class BibTeXManager:
         """
         Search entries by query
 
+        Case-insensitive substring match, as before; the inverted token
+        index narrows the candidates so only those are checked.
+
         Args:
             query: Search query string
             fields: Fields to search (default: all)
@@ -771,12 +1069,24 @@ class BibTeXManager:
             List of matching entries
         """
         if fields is None:
-            fields = ['title', 'author', 'journal', 'abstract']
+            fields = list(self.DEFAULT_SEARCH_FIELDS)
 
+        self._ensure_indexes()
         query_lower = query.lower()
-        results = []
+        query_tokens = set(_TOKEN.findall(query_lower))
 
-        for entry in self.entries:
+        if query_tokens:
+            candidates: Set[int] = set()
+            for field in fields:
+                candidates |= self._field_index(field).candidates(query_tokens)
+            positions: Iterable[int] = sorted(candidates)
+        else:
+            # Punctuation-only query: nothing to look up
+            positions = range(len(self.entries))
+
+        results = []
+        for position in positions:
+            entry = self.entries[position]
             for field in fields:
                 field_value = entry.get(field, '')
 
@@ -824,8 +1134,7 @@ class BibTeXManager:
 
         loaded_count = 0
         for entry in bib_database.entries:
-            if not self._is_duplicate(entry):
-                self.entries.append(entry)
+            if self._append(entry):
                 loaded_count += 1
 
         logger.info(f"Loaded {loaded_count} entries from {filepath}")
@@ -4,6 +4,7 @@ Bio-NER Module
 Biomedical Named Entity Recognition tools.
 """
 
-from .ner_engine import BioNER
+from .ner_engine import BioNER, RegexMatcher
+from .lexicon import LexiconMatcher, get_default_lexicon
 
-__all__ = ['BioNER']
+__all__ = ['BioNER', 'RegexMatcher', 'LexiconMatcher', 'get_default_lexicon']
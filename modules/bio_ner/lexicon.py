@@ -0,0 +1,204 @@
+"""
+Bio-NER Lexicon Matcher
+-----------------------
+Dictionary lookup of drug, disease and gene names in a single pass.
+
+Terms are compiled into an Aho-Corasick automaton over word tokens, so a
+text is scanned once regardless of lexicon size, and multi-word terms
+("non-small cell lung cancer") match as a unit. Overlapping hits resolve
+to the longest term. Gene symbols match case-sensitively to avoid
+false positives such as CAT (gene) vs "cat".
+
+Lexicon files are plain text, one term per line, named <category>.txt:
+
+    rituximab
+    Rituxan<TAB>rituximab      # optional canonical name after a tab
+
+The bundled lexicons live next to this module; extra files are read from
+$BIODOCKIFY_NER_LEXICON_DIR and <data dir>/ner/lexicons.
+"""
+
+import os
+import re
+import logging
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("BioDockify.NER")
+
+BUNDLED_LEXICON_DIR = Path(__file__).parent / "lexicons"
+
+# Categories whose terms must match with the exact casing of the lexicon
+CASE_SENSITIVE_CATEGORIES = {"genes"}
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+# Characters allowed between the words of a multi-word term
+_JOINERS = re.compile(r"[\s\-/'’]*")
+
+
+class LexiconMatcher:
+    """
+    Aho-Corasick automaton over lowercase word tokens.
+
+    Build with add()/load_dir(), then call find(). The automaton is
+    (re)compiled lazily on the first find() after a change.
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        self._depth: List[int] = [0]
+        # (token count, category, canonical, exact tokens or None)
+        self._entries: List[Tuple[int, str, str, Optional[Tuple[str, ...]]]] = []
+        self._compiled = True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, term: str, category: str, canonical: Optional[str] = None):
+        tokens = _TOKEN_RE.findall(term)
+        if not tokens:
+            return
+        exact = tuple(tokens) if category in CASE_SENSITIVE_CATEGORIES else None
+        node = 0
+        for tok in tokens:
+            tok = tok.lower()
+            nxt = self._goto[node].get(tok)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][tok] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._depth.append(self._depth[node] + 1)
+            node = nxt
+        self._entries.append((len(tokens), category, canonical or term.strip(), exact))
+        self._out[node].append(len(self._entries) - 1)
+        self._compiled = False
+
+    def load_file(self, path: Path, category: Optional[str] = None) -> int:
+        """Add the terms of one lexicon file. Returns the number of terms read."""
+        category = category or path.stem
+        count = 0
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.split("#", 1)[0].rstrip()
+                if not line.strip():
+                    continue
+                term, _, canonical = line.partition("\t")
+                self.add(term.strip(), category, canonical.strip() or None)
+                count += 1
+        return count
+
+    def load_dir(self, directory: Path) -> int:
+        """Add every <category>.txt file in a directory."""
+        directory = Path(directory)
+        if not directory.is_dir():
+            return 0
+        return sum(self.load_file(p) for p in sorted(directory.glob("*.txt")))
+
+    def _compile(self):
+        """Breadth-first failure links; outputs are merged along the fail chain."""
+        for node in range(len(self._fail)):
+            self._fail[node] = 0
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for tok, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and tok not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(tok, 0)
+                self._fail[child] = target if target != child else 0
+                own = [e for e in self._out[child] if self._entries[e][0] == self._depth[child]]
+                self._out[child] = own + self._out[self._fail[child]]
+                queue.append(child)
+        self._compiled = True
+
+    def find(self, text: str) -> List[Tuple[int, int, str, str]]:
+        """
+        All lexicon terms in text, longest match first on overlap.
+
+        Returns:
+            (start, end, category, canonical) character spans, in text order
+        """
+        if not self._compiled:
+            self._compile()
+        goto, fail, out, entries = self._goto, self._fail, self._out, self._entries
+
+        # Lowercase once when offsets survive it (they do unless e.g. 'İ' expands)
+        lowered = text.lower()
+        folded = len(lowered) == len(text)
+        tokens = list(_TOKEN_RE.finditer(lowered if folded else text))
+        hits = []
+        node = 0
+        for i, match in enumerate(tokens):
+            tok = match.group() if folded else match.group().lower()
+            while node and tok not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(tok, 0)
+            for e in out[node]:
+                n, category, canonical, exact = entries[e]
+                first = i - n + 1
+                if n > 1 and not self._contiguous(text, tokens, first, i):
+                    continue
+                if exact is not None and tuple(text[t.start():t.end()] for t in tokens[first:i + 1]) != exact:
+                    continue
+                hits.append((first, i + 1, category, canonical))
+
+        # Leftmost-longest, non-overlapping
+        hits.sort(key=lambda h: (h[0], h[0] - h[1]))
+        spans = []
+        last_end = 0
+        for first, end, category, canonical in hits:
+            if first >= last_end:
+                spans.append((tokens[first].start(), tokens[end - 1].end(), category, canonical))
+                last_end = end
+        return spans
+
+    @staticmethod
+    def _contiguous(text: str, tokens: list, first: int, last: int) -> bool:
+        for j in range(first, last):
+            gap_start, gap_end = tokens[j].end(), tokens[j + 1].start()
+            if _JOINERS.fullmatch(text, gap_start, gap_end) is None:
+                return False
+        return True
+
+
+def lexicon_dirs() -> List[Path]:
+    dirs = [BUNDLED_LEXICON_DIR]
+    extra = os.getenv("BIODOCKIFY_NER_LEXICON_DIR")
+    if extra:
+        dirs.append(Path(extra))
+    data_dir = os.getenv("BIODOCKIFY_DATA_DIR")
+    base = Path(data_dir) if data_dir else Path.home() / ".biodockify" / "data"
+    dirs.append(base / "ner" / "lexicons")
+    return dirs
+
+
+def build_lexicon(directories: Iterable[Path]) -> LexiconMatcher:
+    matcher = LexiconMatcher()
+    for directory in directories:
+        count = matcher.load_dir(directory)
+        if count:
+            logger.info(f"Loaded {count} lexicon terms from {directory}")
+    return matcher
+
+
+_default_lexicon: Optional[LexiconMatcher] = None
+_default_lock = threading.Lock()
+
+
+def get_default_lexicon() -> LexiconMatcher:
+    """Process-wide lexicon, built once from the bundled and user lexicon directories."""
+    global _default_lexicon
+    if _default_lexicon is None:
+        with _default_lock:
+            if _default_lexicon is None:
+                matcher = build_lexicon(lexicon_dirs())
+                matcher.find("")  # compile up front, not on the first request
+                _default_lexicon = matcher
+    return _default_lexicon
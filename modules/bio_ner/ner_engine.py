@@ -1,14 +1,20 @@
 """
 Bio-NER Engine - BioDockify Pharma Research AI
-Biomedical Named Entity Recognition with Hybrid Transformers/Regex Logic.
+Biomedical Named Entity Recognition with Hybrid Transformers/Lexicon/Regex Logic.
+
+Without a transformer model, each text is scanned once by the lexicon
+automaton (known drug/disease/gene names) and once per category by a
+precompiled pattern; extract_many() streams whole corpora through it.
 """
 
 import os
 import re
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Iterator, Optional
 from pathlib import Path
 
+from .lexicon import LexiconMatcher, get_default_lexicon
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("BioDockify.NER")
@@ -21,20 +27,15 @@ class RegexMatcher:
     
     PATTERNS = {
         "drugs": [
-            r"\b\w+vir\b",       # Antivirals (e.g., acyclovir)
-            r"\b\w+mab\b",       # Monoclonal antibodies (e.g., rituximab)
-            r"\b\w+ib\b",        # Tyrosine kinase inhibitors (e.g., imatinib)
-            r"\b\w+stat\b",      # Enzyme inhibitors
+            # Antivirals (acyclovir), monoclonal antibodies (rituximab),
+            # tyrosine kinase inhibitors (imatinib), enzyme inhibitors (-stat)
+            r"\b\w+(?:vir|mab|ib|stat)\b",
         ],
         "diseases": [
-            r"\b\w+ syndrome\b",
-            r"\b\w+ disease\b",
-            r"\bcancer\b",
-            r"\btumor\b",
-            r"\b\w+itis\b",      # Inflammation
-            r"\b\w+osis\b",      # Condition
-            r"\b\w+emia\b",      # Blood condition
-            r"\b\w+pathy\b"      # Disorder
+            r"\b\w+ (?:syndrome|disease)\b",
+            r"\b(?:cancer|tumor)\b",
+            # Inflammation, condition, blood condition, disorder
+            r"\b\w+(?:itis|osis|emia|pathy)\b",
         ],
         "genes": [
             r"\b[A-Z]{2,}[0-9]+\b",  # Gene symbols like BRCA1, TP53, EGFR
@@ -42,35 +43,49 @@ class RegexMatcher:
         ]
     }
 
+    # One alternation per category, compiled once
+    COMPILED = {
+        category: re.compile("|".join(patterns), re.IGNORECASE if category == "diseases" else 0)
+        for category, patterns in PATTERNS.items()
+    }
+
+    def iter_matches(self, text: str) -> Iterator[tuple]:
+        """Yield (start, end, category, word) for every pattern hit."""
+        for category, pattern in self.COMPILED.items():
+            for match in pattern.finditer(text):
+                word = match.group(0)
+                # Simple filter to avoid common stop words if needed
+                if len(word) > 3:
+                    yield match.start(), match.end(), category, word
+
     def extract(self, text: str) -> Dict[str, List[str]]:
-        results = {
-            "drugs": [],
-            "diseases": [],
-            "genes": []
-        }
-        
-        for category, patterns in self.PATTERNS.items():
-            for pattern in patterns:
-                matches = re.finditer(pattern, text, re.IGNORECASE if category == "diseases" else 0)
-                for match in matches:
-                    word = match.group(0)
-                    # Simple filter to avoid common stop words if needed
-                    if len(word) > 3 and word not in results[category]:
-                        results[category].append(word)
-                        
-        return results
+        # dicts as ordered sets: first-seen order, O(1) dedupe
+        results = {category: {} for category in self.PATTERNS}
+        for _, _, category, word in self.iter_matches(text):
+            results[category][word] = None
+        return {category: list(words) for category, words in results.items()}
 
 class BioNER:
     """
     Main Bio-NER Engine.
-    Attempts to load local Transformer models; falls back to RegexMatcher.
+    Attempts to load local Transformer models; falls back to the lexicon
+    automaton plus RegexMatcher.
     """
     
-    def __init__(self, model_path: str = None):
+    CATEGORIES = ("drugs", "diseases", "genes")
+    # Substrings of transformer entity labels -> categories
+    LABEL_CATEGORIES = (
+        ("CHEM", "drugs"), ("DRUG", "drugs"),
+        ("DISEASE", "diseases"), ("DISO", "diseases"),
+        ("GENE", "genes"), ("PROTEIN", "genes"),
+    )
+    
+    def __init__(self, model_path: str = None, lexicon: Optional[LexiconMatcher] = None, use_lexicon: bool = True):
         self.use_transformers = False
         self.model = None
         self.tokenizer = None
         self.fallback_matcher = RegexMatcher()
+        self.lexicon = (lexicon or get_default_lexicon()) if use_lexicon else None
         
         # Check for models in brain/models
         # For MVP/Zero-cost, we default to Regex unless user downloaded a model
@@ -104,19 +119,70 @@ class BioNER:
         if self.use_transformers:
             return self._extract_with_transformers(text)
         else:
-            return self.fallback_matcher.extract(text)
+            return self._extract_fast(text)
+
+    def extract_many(self, texts: Iterable[str], batch_size: int = 32) -> Iterator[Dict[str, List[str]]]:
+        """
+        Extract entities from a stream of texts (e.g. a corpus of abstracts).
+        Yields one result per text, in order, without materialising the corpus.
+        Transformer models receive the texts in batches of batch_size.
+        """
+        if not self.use_transformers:
+            for text in texts:
+                yield self._extract_fast(text or "")
+            return
+        
+        batch: List[str] = []
+        for text in texts:
+            batch.append(text or "")
+            if len(batch) >= batch_size:
+                yield from self._extract_batch_with_transformers(batch, batch_size)
+                batch = []
+        if batch:
+            yield from self._extract_batch_with_transformers(batch, batch_size)
+
+    def _extract_fast(self, text: str) -> Dict[str, List[str]]:
+        """Lexicon hits first; pattern hits only where no lexicon term matched."""
+        results = {category: {} for category in self.CATEGORIES}
+        taken = None
+        if self.lexicon is not None:
+            for start, end, category, name in self.lexicon.find(text):
+                results.setdefault(category, {})[name] = None
+                if taken is None:
+                    taken = bytearray(len(text))
+                taken[start:end] = b"\x01" * (end - start)
+        
+        for start, end, category, word in self.fallback_matcher.iter_matches(text):
+            if taken is not None and taken.find(1, start, end) != -1:
+                continue
+            results[category][word] = None
+        return {category: list(names) for category, names in results.items()}
+
+    def _categorize(self, predictions: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+        results = {category: {} for category in self.CATEGORIES}
+        for pred in predictions:
+            label = str(pred.get("entity_group") or pred.get("entity") or "").upper()
+            word = (pred.get("word") or "").strip()
+            if not word:
+                continue
+            for key, category in self.LABEL_CATEGORIES:
+                if key in label:
+                    results[category][word] = None
+                    break
+        return {category: list(words) for category, words in results.items()}
 
     def _extract_with_transformers(self, text: str) -> Dict[str, List[str]]:
-        # Placeholder for transformer logic mapping pipeline output to dict
-        results = {"drugs": [], "diseases": [], "genes": []}
-        predictions = self.nlp(text)
-        # Map based on model labels (e.g. B-DISEASE -> diseases)
-        # This implementation depends on specific model schema
-        return results
+        # Map model labels (e.g. B-DISEASE, Chemical) to categories
+        return self._categorize(self.nlp(text))
+
+    def _extract_batch_with_transformers(self, texts: List[str], batch_size: int) -> List[Dict[str, List[str]]]:
+        predictions = self.nlp(texts, batch_size=batch_size)
+        return [self._categorize(p) for p in predictions]
 
     def get_model_info(self) -> Dict[str, Any]:
         return {
             "type": "Transformer" if self.use_transformers else "RegexMatcher",
+            "lexicon_terms": len(self.lexicon) if self.lexicon is not None else 0,
             "active": True
         }
 
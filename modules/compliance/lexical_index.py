@@ -0,0 +1,276 @@
+"""
+Corpus-level lexical index for plagiarism checks.
+
+Fits one TF-IDF vocabulary over the knowledge base chunks held by the RAG
+metadata store and keeps the L2-normalised document matrix on disk next to
+the vector index. A check transforms its chunks once and scores them against
+every stored chunk with a single sparse matrix product.
+
+On disk the fitted matrix is a base snapshot plus small delta segments, one
+per incremental update (rows added, ids removed). The base is only rewritten
+when the vocabulary is refitted or the segments are compacted.
+"""
+
+import os
+import glob
+import json
+import logging
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from runtime.lazy import lazy_attr
+
+# scikit-learn costs ~2s to import; deferred until the first fit/load
+TfidfVectorizer = lazy_attr("sklearn.feature_extraction.text", "TfidfVectorizer")
+
+logger = logging.getLogger("compliance.lexical_index")
+
+
+class LexicalIndex:
+    """
+    Fitted-once TF-IDF index over the knowledge base.
+
+    New chunks are appended with the existing vocabulary and deleted chunks'
+    rows are dropped from the matrix, both without refitting. The vocabulary
+    is refitted once the corpus grew past `refit_growth` times its size at
+    the last fit, or more than `refit_removed` of the fitted chunks were
+    deleted since. Incremental updates are persisted as delta segments and
+    folded into the base snapshot every `compact_segments` updates.
+    """
+
+    def __init__(
+        self,
+        metadata_store,
+        storage_dir: str,
+        refit_growth: float = 1.25,
+        refit_removed: float = 0.25,
+        block_size: int = 256,
+        compact_segments: int = 32,
+    ):
+        self.metadata_store = metadata_store
+        self.storage_dir = storage_dir
+        self.refit_growth = refit_growth
+        self.refit_removed = refit_removed
+        self.block_size = block_size
+        self.compact_segments = compact_segments
+
+        self.vectorizer = None
+        self.matrix: Optional[sparse.csr_matrix] = None
+        self.ids = np.empty(0, dtype="int64")
+        self.fitted_docs = 0
+        self.removed_since_fit = 0
+        self.max_id = -1
+        # Base snapshot generation and the delta segments written on top of it
+        self.generation = 0
+        self.segments = 0
+        # (row count, max id) of the metadata store when last synced
+        self._synced: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+
+        os.makedirs(storage_dir, exist_ok=True)
+        self._load()
+
+    @property
+    def size(self) -> int:
+        return len(self.ids)
+
+    def refresh(self):
+        """Bring the index in line with the metadata store."""
+        stats = self.metadata_store.stats()
+        if self.vectorizer is not None and stats == self._synced:
+            return
+        if self.vectorizer is None:
+            self.fit()
+            return
+
+        count, max_id = stats
+        new_ids, new_texts = self._collect(self.max_id) if max_id > self.max_id else ([], [])
+        removed_ids = np.empty(0, dtype="int64")
+        if count != self.size + len(new_ids):
+            # Chunks were deleted: drop their rows (a slice, not a refit)
+            alive = np.isin(self.ids, np.asarray(self.metadata_store.ids(max_id=self.max_id), dtype="int64"))
+            removed_ids = self.ids[~alive]
+            if len(removed_ids):
+                self.matrix = self.matrix[alive]
+                self.ids = self.ids[alive]
+                self.removed_since_fit += len(removed_ids)
+
+        if (self.size + len(new_ids) > self.refit_growth * max(self.fitted_docs, 1)
+                or self.removed_since_fit > self.refit_removed * max(self.fitted_docs, 1)):
+            self.fit()
+            return
+
+        added = sparse.csr_matrix((0, self.matrix.shape[1]))
+        if new_ids:
+            added = self.vectorizer.transform(new_texts).tocsr()
+            self.matrix = sparse.vstack([self.matrix, added], format="csr")
+            self.ids = np.concatenate([self.ids, np.asarray(new_ids, dtype="int64")])
+            self.max_id = max(self.max_id, int(new_ids[-1]))
+        self._synced = stats
+        if new_ids or len(removed_ids):
+            if self.segments + 1 >= self.compact_segments:
+                self._save()
+            else:
+                self._save_delta(np.asarray(new_ids, dtype="int64"), added, removed_ids)
+        logger.info(
+            f"Lexical index updated: +{len(new_ids)} / -{len(removed_ids)} chunks ({self.size} total)."
+        )
+
+    def fit(self):
+        """Refit the vocabulary over every chunk in the knowledge base."""
+        stats = self.metadata_store.stats()
+        ids, texts = self._collect(-1)
+        self.removed_since_fit = 0
+        if not any(texts):
+            self.vectorizer, self.matrix = None, None
+            self.ids, self.fitted_docs, self.max_id = np.empty(0, dtype="int64"), 0, -1
+            return
+
+        self.vectorizer = TfidfVectorizer(stop_words='english')
+        try:
+            self.matrix = self.vectorizer.fit_transform(texts).tocsr()
+        except ValueError:
+            # Only stop words in the corpus
+            self.vectorizer, self.matrix = None, None
+            self.ids, self.fitted_docs, self.max_id = np.empty(0, dtype="int64"), 0, -1
+            return
+        self.ids = np.asarray(ids, dtype="int64")
+        self.fitted_docs = len(ids)
+        self.max_id = int(self.ids.max())
+        self._synced = stats
+        self._save()
+        logger.info(f"Fitted lexical index over {self.size} chunks ({len(self.vectorizer.vocabulary_)} terms).")
+
+    def best_matches(self, texts: List[str]) -> List[Tuple[float, int]]:
+        """
+        Return (cosine similarity, vector id) of the closest stored chunk for each text.
+        Vector id is -1 when nothing overlaps.
+        """
+        with self._lock:
+            self.refresh()
+            vectorizer, matrix, ids = self.vectorizer, self.matrix, self.ids
+        if vectorizer is None or not texts:
+            return [(0.0, -1) for _ in texts]
+
+        queries = vectorizer.transform(texts)
+        matrix_t = matrix.T
+        results: List[Tuple[float, int]] = []
+        # Row blocks keep the product's memory bounded on large corpora
+        for start in range(0, queries.shape[0], self.block_size):
+            scores = (queries[start:start + self.block_size] @ matrix_t).tocsr()
+            best = np.asarray(scores.argmax(axis=1)).ravel()
+            best_scores = np.asarray(scores.max(axis=1).todense()).ravel()
+            for col, score in zip(best, best_scores):
+                results.append((float(score), int(ids[col])) if score > 0 else (0.0, -1))
+        return results
+
+    def _collect(self, min_id: int) -> Tuple[List[int], List[str]]:
+        ids: List[int] = []
+        texts: List[str] = []
+        for batch in self.metadata_store.iter_texts(min_id=min_id):
+            for vector_id, text in batch:
+                ids.append(vector_id)
+                texts.append(text)
+        return ids, texts
+
+    def _paths(self):
+        return (
+            os.path.join(self.storage_dir, "state.json"),
+            os.path.join(self.storage_dir, "matrix.npz"),
+            os.path.join(self.storage_dir, "ids.npy"),
+        )
+
+    def _segment_paths(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.storage_dir, "delta-*.npz")))
+
+    def _save(self):
+        """Write the base snapshot (a new generation) and drop the delta segments."""
+        state_path, matrix_path, ids_path = self._paths()
+        sparse.save_npz(matrix_path, self.matrix)
+        np.save(ids_path, self.ids)
+        self.generation += 1
+        state = {
+            "generation": self.generation,
+            "vocabulary": {term: int(col) for term, col in self.vectorizer.vocabulary_.items()},
+            "idf": self.vectorizer.idf_.tolist(),
+            "fitted_docs": self.fitted_docs,
+            "removed_since_fit": self.removed_since_fit,
+            "max_id": self.max_id,
+        }
+        tmp_path = state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, state_path)
+        # Segments of the previous generation are ignored on load even if this is interrupted
+        for path in self._segment_paths():
+            os.remove(path)
+        self.segments = 0
+
+    def _save_delta(self, added_ids: np.ndarray, added: sparse.csr_matrix, removed_ids: np.ndarray):
+        """Persist one incremental update as a segment on top of the base snapshot."""
+        self.segments += 1
+        path = os.path.join(self.storage_dir, f"delta-{self.generation:06d}-{self.segments:06d}.npz")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                generation=self.generation,
+                added_ids=added_ids,
+                data=added.data,
+                indices=added.indices,
+                indptr=added.indptr,
+                removed_ids=removed_ids,
+                removed_since_fit=self.removed_since_fit,
+                max_id=self.max_id,
+            )
+        os.replace(tmp_path, path)
+
+    def _load(self):
+        state_path, matrix_path, ids_path = self._paths()
+        if not all(os.path.exists(p) for p in (state_path, matrix_path, ids_path)):
+            return
+        try:
+            with open(state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            vectorizer = TfidfVectorizer(stop_words='english', vocabulary=state["vocabulary"])
+            vectorizer.idf_ = np.asarray(state["idf"])
+            self.matrix = sparse.load_npz(matrix_path).tocsr()
+            self.ids = np.load(ids_path)
+            self.vectorizer = vectorizer
+            self.fitted_docs = state["fitted_docs"]
+            self.removed_since_fit = state.get("removed_since_fit", 0)
+            self.max_id = state["max_id"]
+            self.generation = state.get("generation", 0)
+            self._apply_segments()
+        except Exception as e:
+            logger.warning(f"Lexical index unreadable, will refit: {e}")
+            self.vectorizer, self.matrix = None, None
+            self.ids = np.empty(0, dtype="int64")
+
+    def _apply_segments(self):
+        """Replay the delta segments of the current generation onto the base matrix."""
+        self.segments = 0
+        for path in self._segment_paths():
+            with np.load(path) as segment:
+                if int(segment["generation"]) != self.generation:
+                    os.remove(path)
+                    continue
+                removed_ids = segment["removed_ids"]
+                if len(removed_ids):
+                    alive = ~np.isin(self.ids, removed_ids)
+                    self.matrix = self.matrix[alive]
+                    self.ids = self.ids[alive]
+                added_ids = segment["added_ids"]
+                if len(added_ids):
+                    added = sparse.csr_matrix(
+                        (segment["data"], segment["indices"], segment["indptr"]),
+                        shape=(len(added_ids), self.matrix.shape[1]),
+                    )
+                    self.matrix = sparse.vstack([self.matrix, added], format="csr")
+                    self.ids = np.concatenate([self.ids, added_ids])
+                self.removed_since_fit = int(segment["removed_since_fit"])
+                self.max_id = int(segment["max_id"])
+            self.segments += 1
@@ -4,25 +4,28 @@ Enforces mandatory similarity checks against the internal Knowledge Base.
 """
 import logging
 import asyncio
+import os
 from typing import Dict, List, Any
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
 
-# We assume sentence-transformers is installed for semantics
-# from sentence_transformers import SentenceTransformer, util
-# For lightness/dependency management, we will use the vector_store's existing embeddings if possible,
-# or a simple TF-IDF for the 'fast' check first.
-
-from modules.rag.vector_store import get_vector_store
+from modules.compliance.lexical_index import LexicalIndex
+from runtime.lazy import LazyObject
 
 logger = logging.getLogger("compliance.plagiarism")
 
 class PlagiarismChecker:
+    # Embedding cosine at or above which a chunk counts as a paraphrase of a KB chunk
+    semantic_threshold = 0.9
+
     def __init__(self):
+        # Imported here: the vector store pulls in sentence-transformers/torch
+        from modules.rag.vector_store import get_vector_store
+
         self.vector_store = get_vector_store()
-        # Initialize a basic vectorizer for lexical checks
-        self.tfidf = TfidfVectorizer(stop_words='english')
+        # Corpus-level TF-IDF fitted once over the KB, stored next to the vector index
+        self.lexical_index = LexicalIndex(
+            self.vector_store.metadata,
+            os.path.join(self.vector_store.storage_dir, "lexical"),
+        )
 
     async def check_content(self, text: str, threshold: float = 0.15) -> Dict[str, Any]:
         """
@@ -36,69 +39,81 @@ class PlagiarismChecker:
         """
         logger.info(f"Running plagiarism check on {len(text)} chars...")
         
-        # 1. Semantic Check (using Vector Store)
-        # We chunk the text and query the vector store to see if any chunk
-        # is too close to existing documents.
         chunks = self._chunk_text(text)
-        max_semantic_score = 0.0
+        max_similarity = 0.0
+        max_semantic = 0.0
         flagged_sections = []
         
-        for chunk in chunks:
-            # Search KB for this chunk
-            results = await self.vector_store.search(chunk, k=1)
-            if results:
-                # Assuming vector store returns a score/distance
-                # We need to normalize it. 
-                # If using FAISS L2, lower is better. If Inner Product, higher is better.
-                # Let's rely on a lexical fallback if semantic score isn't normalized.
-                
-                # For robustness in this v1, let's use the explicit Lexical Check against retrieved context
-                # Retreive candidate source
-                source_text = results[0].get('text', '')
-                similarity = self._calculate_lexical_similarity(chunk, source_text)
+        # 1. Semantic candidates: nearest KB chunk per chunk, one batched encode + FAISS query.
+        # Catches paraphrases that share little vocabulary with their source.
+        semantic_results = await self.vector_store.search_many(chunks, k=1)
+        
+        # 2. Lexical check against the whole Knowledge Base:
+        # every chunk is scored against every stored chunk in one sparse product.
+        loop = asyncio.get_running_loop()
+        matches = await loop.run_in_executor(None, self.lexical_index.best_matches, chunks)
+        
+        # Merge both result sets per chunk
+        merged = []
+        for (similarity, vector_id), hits in zip(matches, semantic_results):
+            semantic = self._semantic_similarity(hits[0]["score"]) if hits else 0.0
+            semantic_id = hits[0].get("id", -1) if hits else -1
+            merged.append((similarity, vector_id, semantic, semantic_id))
+        
+        source_ids = set()
+        for similarity, vector_id, semantic, semantic_id in merged:
+            if similarity > threshold:
+                source_ids.add(vector_id)
+            elif semantic >= self.semantic_threshold:
+                source_ids.add(semantic_id)
+        sources = self.vector_store.metadata.get_many(source_ids, include_text=False)
+        
+        for chunk, (similarity, vector_id, semantic, semantic_id) in zip(chunks, merged):
+            max_similarity = max(max_similarity, similarity)
+            max_semantic = max(max_semantic, semantic)
                 
-                if similarity > max_semantic_score:
-                    max_semantic_score = similarity
-                    
-                if similarity > threshold:
-                    flagged_sections.append({
-                        "text": chunk[:50] + "...",
-                        "similarity": round(similarity * 100, 1),
-                        # "source": results[0].get('metadata', {}).get('source', 'Unknown')
-                        "source": "Internal KB Match" # quick fix for metadata access
-                    })
+            if similarity > threshold:
+                match, source_id, score = "lexical", vector_id, similarity
+            elif semantic >= self.semantic_threshold:
+                match, source_id, score = "semantic", semantic_id, semantic
+            else:
+                continue
+            meta = sources.get(source_id, {})
+            flagged_sections.append({
+                "text": chunk[:50] + "...",
+                "similarity": round(score * 100, 1),
+                "match": match,
+                "source": meta.get('source') or meta.get('filename') or meta.get('title') or "Internal KB Match"
+            })
         
         status = "PASSED"
         risk_level = "LOW"
         
-        if max_semantic_score > 0.25:
+        if max_similarity > 0.25:
             status = "BLOCKED"
             risk_level = "HIGH"
-        elif max_semantic_score > 0.15:
+        elif max_similarity > 0.15 or max_semantic >= self.semantic_threshold:
+            # Close paraphrases need a rewrite even when few words are shared
             status = "FLAGGED"
             risk_level = "MEDIUM"
             
         return {
             "status": status,
-            "overall_similarity": round(max_semantic_score * 100, 1),
+            "overall_similarity": round(max_similarity * 100, 1),
+            "semantic_similarity": round(max_semantic * 100, 1),
             "risk_level": risk_level,
             "flagged_sections": flagged_sections,
-            "details": f"Max similarity {round(max_semantic_score * 100, 1)}% against internal headers."
+            "details": f"Max similarity {round(max_similarity * 100, 1)}% against internal headers."
         }
 
+    @staticmethod
+    def _semantic_similarity(distance: float) -> float:
+        """Cosine similarity from a squared L2 distance between unit-length embeddings."""
+        return min(1.0, max(0.0, 1.0 - distance / 2.0))
+
     def _chunk_text(self, text: str, chunk_size: int = 500) -> List[str]:
         """Split text into checking chunks."""
         return [text[i:i+chunk_size] for i in range(0, len(text), chunk_size)]
 
-    def _calculate_lexical_similarity(self, text1: str, text2: str) -> float:
-        """Calculate cosine similarity of TF-IDF vectors."""
-        if not text1 or not text2:
-            return 0.0
-        try:
-            tfidf_matrix = self.tfidf.fit_transform([text1, text2])
-            return cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-        except Exception:
-            return 0.0
-
-# Singleton
-plagiarism_checker = PlagiarismChecker()
+# Singleton, built on the first check, not when modules.compliance is imported
+plagiarism_checker = LazyObject(PlagiarismChecker, "plagiarism_checker")
@@ -1,4 +1,4 @@
 """Headless Research Module"""
-from .engine import HeadlessResearcher, deep_research
+from .engine import HeadlessResearcher, PagePool, DomainLimiter, deep_research
 
-__all__ = ['HeadlessResearcher', 'deep_research']
+__all__ = ['HeadlessResearcher', 'PagePool', 'DomainLimiter', 'deep_research']
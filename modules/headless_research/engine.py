@@ -2,12 +2,19 @@
 Headless Research Engine
 Main orchestrator for stealth browsing, content extraction, and SurfSense sync.
 Constraints: No Docker, strictly Playwright Python.
+
+Concurrent crawling (research_many):
+- PagePool: bounded set of pre-warmed, stealth-patched pages that are reused
+- DomainLimiter: per-domain concurrency cap and minimum request spacing
+- Extraction workers feed an upload queue, so SurfSense/KB sync never holds a page
 """
 import os
+import time
 import asyncio
 import logging
 from pathlib import Path
 from typing import Optional, Dict, Any, List
+from urllib.parse import urlparse
 try:
     from playwright.async_api import async_playwright, Page, Browser, BrowserContext
     PLAYWRIGHT_AVAILABLE = True
@@ -25,13 +32,120 @@ from modules.surfsense import get_surfsense_client
 
 logger = logging.getLogger("headless_research.engine")
 
+
+class PagePool:
+    """
+    Bounded pool of pre-warmed browser pages.
+    Pages get stealth scripts once and are reset to about:blank between uses.
+    """
+
+    def __init__(self, context, stealth: StealthContext, size: int):
+        self.context = context
+        self.stealth = stealth
+        self.size = size
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._pages: List[Page] = []
+
+    async def _new_page(self) -> Page:
+        page = await self.context.new_page()
+        await self.stealth.apply_stealth(page)
+        self._pages.append(page)
+        return page
+
+    async def start(self):
+        pages = await asyncio.gather(*(self._new_page() for _ in range(self.size)))
+        for page in pages:
+            self._idle.put_nowait(page)
+        logger.info(f"Page pool ready ({self.size} pages)")
+
+    async def acquire(self) -> Page:
+        page = await self._idle.get()
+        if page.is_closed():
+            # A crashed or closed page is replaced instead of shrinking the pool
+            self._pages.remove(page)
+            try:
+                page = await self._new_page()
+            except Exception:
+                # Keep the slot: the next acquire retries the replacement
+                self._pages.append(page)
+                self._idle.put_nowait(page)
+                raise
+        return page
+
+    async def release(self, page: Page):
+        try:
+            if not page.is_closed():
+                await page.goto("about:blank")
+        except Exception as e:
+            logger.debug(f"Page reset failed, it will be replaced: {e}")
+            try:
+                await page.close()
+            except Exception:
+                pass
+        self._idle.put_nowait(page)
+
+    async def close(self):
+        for page in self._pages:
+            try:
+                if not page.is_closed():
+                    await page.close()
+            except Exception:
+                pass
+        self._pages.clear()
+
+
+class DomainLimiter:
+    """Per-domain politeness: at most max_concurrent requests and min_interval seconds between starts."""
+
+    def __init__(self, max_concurrent: int = 2, min_interval: float = 1.0):
+        self.max_concurrent = max_concurrent
+        self.min_interval = min_interval
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._last_start: Dict[str, float] = {}
+
+    def slot(self, url: str) -> "_DomainSlot":
+        domain = urlparse(url).netloc.lower()
+        if domain not in self._semaphores:
+            self._semaphores[domain] = asyncio.Semaphore(self.max_concurrent)
+            self._locks[domain] = asyncio.Lock()
+        return _DomainSlot(self, domain)
+
+
+class _DomainSlot:
+    def __init__(self, limiter: DomainLimiter, domain: str):
+        self.limiter = limiter
+        self.domain = domain
+
+    async def __aenter__(self):
+        limiter = self.limiter
+        await limiter._semaphores[self.domain].acquire()
+        async with limiter._locks[self.domain]:
+            wait = limiter._last_start.get(self.domain, 0.0) + limiter.min_interval - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            limiter._last_start[self.domain] = time.monotonic()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.limiter._semaphores[self.domain].release()
+
+
 class HeadlessResearcher:
     """
     Main class for autonomous deep research.
     Manages browser lifecycle, applies stealth, handles extraction, and syncs to SurfSense.
     """
     
-    def __init__(self, headless: bool = True, profile_path: str = "./data/browser_profile"):
+    def __init__(
+        self,
+        headless: bool = True,
+        profile_path: str = "./data/browser_profile",
+        concurrency: int = 1,
+        per_domain_limit: int = 2,
+        domain_interval: float = 1.0,
+        upload_workers: int = 2,
+    ):
         self.headless = headless
         self.profile_path = Path(profile_path)
         self.profile_path.mkdir(parents=True, exist_ok=True)
@@ -44,6 +158,11 @@ class HeadlessResearcher:
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
         self.playwright = None
+
+        self.concurrency = max(1, concurrency)
+        self.upload_workers = max(1, upload_workers)
+        self.pool: Optional[PagePool] = None
+        self.domains = DomainLimiter(per_domain_limit, domain_interval)
         
         self.timeout = int(os.getenv("BROWSER_TIMEOUT", "60000"))
 
@@ -67,14 +186,24 @@ class HeadlessResearcher:
             viewport={'width': 1280, 'height': 800}
         )
         self.browser = self.context.browser # For abstraction compatibility
+        if self.concurrency > 1:
+            await self._ensure_pool()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self.pool:
+            await self.pool.close()
+            self.pool = None
         if self.context:
             await self.context.close()
         if self.playwright:
             await self.playwright.stop()
 
+    async def _ensure_pool(self):
+        if self.pool is None:
+            self.pool = PagePool(self.context, self.stealth, self.concurrency)
+            await self.pool.start()
+
     async def research(self, url: str) -> Dict[str, Any]:
         """
         Deep research a URL:
@@ -88,19 +217,101 @@ class HeadlessResearcher:
         
         logger.info(f"Starting deep research on: {url}")
         
-        # Reuse or create page
-        page = await self.context.new_page()
+        if self.pool:
+            page = await self.pool.acquire()
+        else:
+            page = await self.context.new_page()
+            # Inject Stealth Scripts
+            await self.stealth.apply_stealth(page)
         self.page = page
         
-        # Inject Stealth Scripts
-        await self.stealth.apply_stealth(page)
+        try:
+            async with self.domains.slot(url):
+                result = await self._extract(page, url)
+        finally:
+            if self.pool:
+                await self.pool.release(page)
+            else:
+                await page.close() # Close page but keep context
+        
+        # 4. Sync to SurfSense
+        if result.get("status") == "success":
+            await self._sync_to_surfsense(result)
+        return result
+
+    async def research_many(self, urls: List[str]) -> List[Dict[str, Any]]:
+        """
+        Research several URLs concurrently.
+        
+        Up to `concurrency` pages crawl at once (within per-domain limits);
+        extracted results are queued for SurfSense/KB sync by separate upload
+        workers. Returns one result per URL, in input order, each with a
+        'sync' entry once its upload has finished.
+        """
+        if not self.context:
+            raise RuntimeError("Browser not started. Use 'async with' context manager.")
+        if not urls:
+            return []
+        
+        await self._ensure_pool()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(urls)
+        work: asyncio.Queue = asyncio.Queue()
+        uploads: asyncio.Queue = asyncio.Queue()
+        for item in enumerate(urls):
+            work.put_nowait(item)
+        
+        async def crawl():
+            while True:
+                try:
+                    i, url = work.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    page = await self.pool.acquire()
+                except Exception as e:
+                    logger.error(f"Could not get a browser page for {url}: {e}")
+                    results[i] = {"status": "error", "url": url, "error": f"Page unavailable: {e}"}
+                    continue
+                try:
+                    async with self.domains.slot(url):
+                        logger.info(f"Crawling ({i + 1}/{len(urls)}): {url}")
+                        results[i] = await self._extract(page, url)
+                except Exception as e:
+                    results[i] = {"status": "error", "url": url, "error": str(e)}
+                finally:
+                    await self.pool.release(page)
+                if results[i].get("status") == "success":
+                    uploads.put_nowait(i)
+        
+        async def upload():
+            while True:
+                i = await uploads.get()
+                try:
+                    results[i]["sync"] = await self._sync_to_surfsense(results[i])
+                finally:
+                    uploads.task_done()
+        
+        uploaders = [asyncio.create_task(upload()) for _ in range(self.upload_workers)]
+        try:
+            await asyncio.gather(*(crawl() for _ in range(min(self.concurrency, len(urls)))))
+            await uploads.join()
+        finally:
+            for task in uploaders:
+                task.cancel()
+            await asyncio.gather(*uploaders, return_exceptions=True)
         
+        succeeded = sum(1 for r in results if r.get("status") == "success")
+        logger.info(f"Crawled {succeeded}/{len(urls)} URLs")
+        return results
+
+    async def _extract(self, page: Page, url: str) -> Dict[str, Any]:
+        """Navigate a page to url, simulate reading and extract its content."""
         try:
             # 1. Navigate with robust timeout
             response = await page.goto(url, wait_until="domcontentloaded", timeout=self.timeout)
             if not response or response.status >= 400:
                 logger.warning(f"Navigation failed with status {response.status if response else 'Unknown'}")
-                return {"status": "failed", "error": f"Navigation failed: {response.status if response else 'Unknown'}"}
+                return {"status": "failed", "url": url, "error": f"Navigation failed: {response.status if response else 'Unknown'}"}
             
             # 2. Simulate Human Behavior
             await self.behavior.simulate_reading(page)
@@ -114,7 +325,7 @@ class HeadlessResearcher:
             if not markdown_content or len(markdown_content) < 50:
                 logger.warning(f"Scrape produced very low content for {url}")
             
-            result = {
+            return {
                 "status": "success",
                 "url": url,
                 "title": metadata.get("title", "Untitled"),
@@ -122,11 +333,6 @@ class HeadlessResearcher:
                 "length": len(markdown_content)
             }
             
-            # 4. Sync to SurfSense
-            await self._sync_to_surfsense(result)
-            
-            return result
-            
         except Exception as e:
             logger.error(f"Research failed for {url}: {e}")
             screenshot_path = f"error_{url.replace('://', '_').replace('/', '_')[:100]}.png"
@@ -134,9 +340,7 @@ class HeadlessResearcher:
                 await page.screenshot(path=screenshot_path)
             except:
                 pass
-            return {"status": "error", "error": str(e)}
-        finally:
-            await page.close() # Close page but keep context
+            return {"status": "error", "url": url, "error": str(e)}
 
     async def _sync_to_surfsense(self, result: Dict[str, Any]) -> Dict[str, str]:
         """Upload research result to SurfSense as a document."""
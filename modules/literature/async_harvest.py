@@ -0,0 +1,170 @@
+"""
+Async Harvest Support
+Pooled HTTP client and per-source concurrency / rate-limit budgets used by
+LiteratureAggregator.search_async to query all literature sources in parallel.
+"""
+
+import asyncio
+import time
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional, Any
+
+import httpx
+
+from modules.literature.response_cache import ResponseCache
+
+logger = logging.getLogger("literature.async_harvest")
+
+
+@dataclass
+class SourceBudget:
+    """Concurrency and request-rate budget for one upstream API."""
+    concurrency: int = 2
+    requests_per_second: float = 3.0
+
+
+# Conservative defaults based on each provider's published polite-use limits
+DEFAULT_BUDGETS: Dict[str, SourceBudget] = {
+    "europe_pmc": SourceBudget(concurrency=4, requests_per_second=10),
+    "openalex": SourceBudget(concurrency=4, requests_per_second=10),
+    "crossref": SourceBudget(concurrency=2, requests_per_second=5),
+    "pubmed": SourceBudget(concurrency=1, requests_per_second=3),
+    "unpaywall": SourceBudget(concurrency=5, requests_per_second=10),
+    "bohrium": SourceBudget(concurrency=2, requests_per_second=5),
+}
+
+
+class AsyncRateLimiter:
+    """
+    Async counterpart of RateLimitHandler.
+    Caps in-flight requests with a semaphore and spaces request starts evenly.
+    """
+
+    def __init__(self, budget: SourceBudget):
+        self.delay = 1.0 / budget.requests_per_second if budget.requests_per_second > 0 else 0.0
+        self._semaphore = asyncio.Semaphore(budget.concurrency)
+        self._lock = asyncio.Lock()
+        self._next_slot = 0.0
+
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.delay
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._semaphore.release()
+
+
+class AsyncHarvestClient:
+    """
+    One pooled httpx.AsyncClient shared by every source in a harvest,
+    with a rate limiter per source. When a ResponseCache is given, fresh
+    entries skip the network and stale ones are revalidated conditionally.
+
+    Usage:
+        async with AsyncHarvestClient() as client:
+            data = await client.get_json("openalex", url, params=params)
+    """
+
+    def __init__(
+        self,
+        budgets: Optional[Dict[str, SourceBudget]] = None,
+        timeout: float = 15.0,
+        max_connections: int = 20,
+        max_retries: int = 2,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        cache: Optional[ResponseCache] = None,
+    ):
+        self.budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_retries = max_retries
+        self.transport = transport
+        self.cache = cache
+        self._limiters: Dict[str, AsyncRateLimiter] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self):
+        self._client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+            follow_redirects=True,
+            transport=self.transport,
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def limiter(self, source: str) -> AsyncRateLimiter:
+        """Rate limiter for a source, created on first use."""
+        if source not in self._limiters:
+            self._limiters[source] = AsyncRateLimiter(self.budgets.get(source, SourceBudget()))
+        return self._limiters[source]
+
+    async def get_json(
+        self,
+        source: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        allow_404: bool = False,
+    ) -> Optional[Any]:
+        """
+        GET a JSON document within the source's budget.
+        Retries 429/5xx with backoff (honouring Retry-After). Returns None on a
+        404 when allow_404 is set; raises httpx.HTTPError otherwise.
+        """
+        key, entry = None, None
+        if self.cache is not None:
+            key = self.cache.make_key(source, url, params)
+            entry = await asyncio.to_thread(self.cache.lookup, key)
+            if entry is not None and entry.fresh:
+                self.cache.hits += 1
+                return entry.value
+            headers = {**(headers or {}), **self.cache.conditional_headers(entry)}
+
+        for attempt in range(self.max_retries + 1):
+            async with self.limiter(source):
+                response = await self._client.get(url, params=params, headers=headers)
+
+            if response.status_code == 304 and entry is not None:
+                self.cache.revalidated += 1
+                await asyncio.to_thread(self.cache.touch, key, source)
+                return entry.value
+            if response.status_code == 404 and allow_404:
+                if self.cache is not None:
+                    self.cache.misses += 1
+                    await asyncio.to_thread(self.cache.store, key, source, None)
+                return None
+            if response.status_code == 429 or response.status_code >= 500:
+                if attempt < self.max_retries:
+                    retry_after = response.headers.get("Retry-After", "")
+                    delay = float(retry_after) if retry_after.isdigit() else 2 ** attempt
+                    logger.warning(f"{source} returned {response.status_code}; retrying in {delay}s")
+                    await asyncio.sleep(min(delay, 30))
+                    continue
+            response.raise_for_status()
+            value = response.json()
+            if self.cache is not None:
+                self.cache.misses += 1
+                await asyncio.to_thread(
+                    self.cache.store, key, source, value,
+                    response.headers.get("ETag"), response.headers.get("Last-Modified"),
+                )
+            return value
+        return None
@@ -32,16 +32,20 @@ class BioRxivScraper:
         """
         logger.info(f"Searching bioRxiv via Europe PMC proxy for: {query}")
         
-        # We construct a Europe PMC query specific to bioRxiv
-        proxy_query = f"{query} AND (SRC:PPR OR PUBLISHER:\"Cold Spring Harbor Laboratory\")"
-        
         # Import here to avoid circular dependency at top level if not careful, though usually fine.
         from modules.literature.europe_pmc import EuropePMCScraper
         
         proxy = EuropePMCScraper()
-        results = proxy.search_papers(proxy_query, max_results)
+        results = proxy.search_papers(self.build_query(query), max_results)
         
-        # Post-process to tag as Preprint
+        return self.tag_results(results)
+
+    def build_query(self, query: str) -> str:
+        """Europe PMC query restricted to bioRxiv preprints."""
+        return f"{query} AND (SRC:PPR OR PUBLISHER:\"Cold Spring Harbor Laboratory\")"
+
+    def tag_results(self, results: List[Dict]) -> List[Dict]:
+        """Post-process Europe PMC results to tag them as preprints."""
         for p in results:
             p["source"] = "bioRxiv (Preprint)"
             p["is_peer_reviewed"] = False
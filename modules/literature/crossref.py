@@ -3,9 +3,10 @@ CrossRef Scraper Module
 Provides metadata and DOI resolution for general academic verification.
 """
 
-import requests
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+
+from modules.literature.response_cache import ResponseCache, get_response_cache
 
 logger = logging.getLogger(__name__)
 
@@ -17,13 +18,28 @@ class CrossRefScraper:
     
     BASE_URL = "https://api.crossref.org/works"
     
-    def __init__(self, email: Optional[str] = None):
+    def __init__(self, email: Optional[str] = None, cache: Optional[ResponseCache] = None):
         self.email = email
+        self.cache = cache or get_response_cache()
 
     def search_papers(self, query: str, max_results: int = 10) -> List[Dict]:
         """
         Search CrossRef.
         """
+        params, headers = self.build_request(query, max_results)
+            
+        try:
+            logger.info(f"Searching CrossRef for: {query}")
+            data = self.cache.get_json("crossref", self.BASE_URL, params=params, headers=headers, timeout=12)
+            
+            return self.parse_results(data)
+            
+        except Exception as e:
+            logger.error(f"CrossRef Search Failed: {e}")
+            return []
+
+    def build_request(self, query: str, max_results: int = 10) -> Tuple[Dict, Dict]:
+        """Query parameters and headers for a search request."""
         params = {
             "query": query,
             "rows": max_results,
@@ -33,42 +49,35 @@ class CrossRefScraper:
         headers = {}
         if self.email:
             headers["User-Agent"] = f"BioDockify/1.0 (mailto:{self.email})"
+        return params, headers
+
+    def parse_results(self, data: Dict) -> List[Dict]:
+        """Normalize a search response into paper dicts."""
+        items = data.get("message", {}).get("items", [])
+        results = []
+        
+        for item in items:
+            # Titles in CrossRef are lists
+            title_list = item.get("title", [])
+            title = title_list[0] if title_list else "No Title"
             
-        try:
-            logger.info(f"Searching CrossRef for: {query}")
-            resp = requests.get(self.BASE_URL, params=params, headers=headers, timeout=12)
-            resp.raise_for_status()
+            # Dates are nested structures
+            date_parts = item.get("published-print", {}).get("date-parts", [[None]])
+            year = str(date_parts[0][0]) if date_parts[0][0] else "Unknown"
             
-            data = resp.json()
-            items = data.get("message", {}).get("items", [])
-            results = []
+            # Authors
+            authors = [f"{a.get('given','')} {a.get('family','')}".strip() for a in item.get("author", [])]
             
-            for item in items:
-                # Titles in CrossRef are lists
-                title_list = item.get("title", [])
-                title = title_list[0] if title_list else "No Title"
-                
-                # Dates are nested structures
-                date_parts = item.get("published-print", {}).get("date-parts", [[None]])
-                year = str(date_parts[0][0]) if date_parts[0][0] else "Unknown"
-                
-                # Authors
-                authors = [f"{a.get('given','')} {a.get('family','')}".strip() for a in item.get("author", [])]
-                
-                paper = {
-                    "title": title,
-                    "abstract": item.get("abstract", "Abstract not available (CrossRef)."), # Often missing in CrossRef
-                    "doi": item.get("DOI", ""),
-                    "publication_date": year,
-                    "journal": item.get("container-title", ["Unknown"])[0],
-                    "source": "CrossRef",
-                    "authors": authors,
-                    "citation_count": item.get("is-referenced-by-count", 0)
-                }
-                results.append(paper)
-                
-            return results
+            paper = {
+                "title": title,
+                "abstract": item.get("abstract", "Abstract not available (CrossRef)."), # Often missing in CrossRef
+                "doi": item.get("DOI", ""),
+                "publication_date": year,
+                "journal": item.get("container-title", ["Unknown"])[0],
+                "source": "CrossRef",
+                "authors": authors,
+                "citation_count": item.get("is-referenced-by-count", 0)
+            }
+            results.append(paper)
             
-        except Exception as e:
-            logger.error(f"CrossRef Search Failed: {e}")
-            return []
+        return results
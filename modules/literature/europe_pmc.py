@@ -3,11 +3,11 @@ Europe PMC Scraper Module
 Provides access to bio-literature text mining and open access full text.
 """
 
-import requests
 import logging
 from typing import List, Dict, Optional
 
 from runtime.robust_connection import with_retry
+from modules.literature.response_cache import ResponseCache, get_response_cache
 
 logger = logging.getLogger(__name__)
 
@@ -19,30 +19,34 @@ class EuropePMCScraper:
     
     BASE_URL = "https://www.ebi.ac.uk/europepmc/webservices/rest/search"
     
-    def __init__(self, email: Optional[str] = None):
+    def __init__(self, email: Optional[str] = None, cache: Optional[ResponseCache] = None):
         self.email = email
+        self.cache = cache or get_response_cache()
 
     @with_retry(max_retries=3, circuit_name="europe_pmc")
     def search_papers(self, query: str, max_results: int = 10) -> List[Dict]:
         """
         Search Europe PMC. 
         """
+        logger.info(f"Searching Europe PMC for: {query}")
+        data = self.cache.get_json("europe_pmc", self.BASE_URL, params=self.build_params(query, max_results), timeout=15)
+        
+        return self.parse_results(data)
+
+    def build_params(self, query: str, max_results: int = 10) -> Dict:
+        """Query parameters for a search request."""
         # query params usually require specific format
-        params = {
+        # CursorMark handling could be added for deep paging, but start simple.
+        return {
             "query": query,
             "format": "json",
             "pageSize": max_results,
             "resultType": "core", # lighter weight, standard metadata
             "synonym": "true" # auto-expand query terms
         }
-        
-        # CursorMark handling could be added for deep paging, but start simple.
-        
-        logger.info(f"Searching Europe PMC for: {query}")
-        resp = requests.get(self.BASE_URL, params=params, timeout=15)
-        resp.raise_for_status()
-        
-        data = resp.json()
+
+    def parse_results(self, data: Dict) -> List[Dict]:
+        """Normalize a search response into paper dicts."""
         results = []
         
         result_list = data.get("resultList", {}).get("result", [])
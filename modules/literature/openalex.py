@@ -3,11 +3,12 @@ OpenAlex Scraper Module
 Provides access to scientific literature via the OpenAlex API (Free, No Auth Required).
 """
 
-import requests
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import time
 
+from modules.literature.response_cache import ResponseCache, get_response_cache
+
 logger = logging.getLogger(__name__)
 
 class OpenAlexScraper:
@@ -18,17 +19,33 @@ class OpenAlexScraper:
     
     BASE_URL = "https://api.openalex.org/works"
     
-    def __init__(self, email: Optional[str] = None):
+    def __init__(self, email: Optional[str] = None, cache: Optional[ResponseCache] = None):
         """
         Initialize OpenAlex scraper.
         email: Optional, puts you in the 'polite pool' for faster/better access.
+        cache: Response cache (defaults to the shared on-disk cache).
         """
         self.email = email
+        self.cache = cache or get_response_cache()
 
     def search_papers(self, query: str, max_results: int = 10) -> List[Dict]:
         """
         Search OpenAlex for works matching the query.
         """
+        params, headers = self.build_request(query, max_results)
+            
+        try:
+            logger.info(f"Searching OpenAlex for: {query}")
+            data = self.cache.get_json("openalex", self.BASE_URL, params=params, headers=headers, timeout=10)
+            
+            return self.parse_results(data)
+            
+        except Exception as e:
+            logger.error(f"OpenAlex Search Failed: {e}")
+            return []
+
+    def build_request(self, query: str, max_results: int = 10) -> Tuple[Dict, Dict]:
+        """Query parameters and headers for a search request."""
         params = {
             "search": query,
             "per-page": max_results,
@@ -41,43 +58,36 @@ class OpenAlexScraper:
         headers = {
             "User-Agent": f"BioDockify/1.0 ({self.email or 'anon'})"
         }
+        return params, headers
+
+    def parse_results(self, data: Dict) -> List[Dict]:
+        """Normalize a search response into paper dicts."""
+        results = []
+        
+        for item in data.get("results", []):
+            # Safely extract abstract (OpenAlex uses an inverted index, so we need to reconstruct perfectly or use snippet)
+            # Actually OpenAlex recently added 'abstract' mostly or we use the inverted index.
+            # For simplicity in this v1, we used the 'display_name' as title and construct a basic record.
+            # Reconstructing abstract from inverted index is complex; we'll check if 'abstract_inverted_index' exists.
             
-        try:
-            logger.info(f"Searching OpenAlex for: {query}")
-            resp = requests.get(self.BASE_URL, params=params, headers=headers, timeout=10)
-            resp.raise_for_status()
-            
-            data = resp.json()
-            results = []
+            abstract = self._reconstruct_abstract(item.get("abstract_inverted_index"))
+            if not abstract:
+                abstract = "Abstract not available directly from OpenAlex metadata."
             
-            for item in data.get("results", []):
-                # Safely extract abstract (OpenAlex uses an inverted index, so we need to reconstruct perfectly or use snippet)
-                # Actually OpenAlex recently added 'abstract' mostly or we use the inverted index.
-                # For simplicity in this v1, we used the 'display_name' as title and construct a basic record.
-                # Reconstructing abstract from inverted index is complex; we'll check if 'abstract_inverted_index' exists.
-                
-                abstract = self._reconstruct_abstract(item.get("abstract_inverted_index"))
-                if not abstract:
-                    abstract = "Abstract not available directly from OpenAlex metadata."
-                
-                paper = {
-                    "title": item.get("display_name", "No Title"),
-                    "abstract": abstract,
-                    "pmid": item.get("ids", {}).get("pmid", "").replace("https://pubmed.ncbi.nlm.nih.gov/", ""),
-                    "doi": item.get("doi", "").replace("https://doi.org/", ""),
-                    "publication_date": str(item.get("publication_year", "Unknown")),
-                    "journal": item.get("primary_location", {}).get("source", {}).get("display_name", "Unknown"),
-                    "source": "OpenAlex",
-                    "authors": [a.get("author", {}).get("display_name", "") for a in item.get("authorships", [])],
-                    "url": item.get("doi") or item.get("id")
-                }
-                results.append(paper)
-                
-            return results
+            paper = {
+                "title": item.get("display_name", "No Title"),
+                "abstract": abstract,
+                "pmid": item.get("ids", {}).get("pmid", "").replace("https://pubmed.ncbi.nlm.nih.gov/", ""),
+                "doi": item.get("doi", "").replace("https://doi.org/", ""),
+                "publication_date": str(item.get("publication_year", "Unknown")),
+                "journal": item.get("primary_location", {}).get("source", {}).get("display_name", "Unknown"),
+                "source": "OpenAlex",
+                "authors": [a.get("author", {}).get("display_name", "") for a in item.get("authorships", [])],
+                "url": item.get("doi") or item.get("id")
+            }
+            results.append(paper)
             
-        except Exception as e:
-            logger.error(f"OpenAlex Search Failed: {e}")
-            return []
+        return results
 
     def _reconstruct_abstract(self, inverted_index: Optional[Dict]) -> str:
         """Reconstruct abstract from OpenAlex inverted index."""
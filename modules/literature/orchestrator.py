@@ -2,6 +2,7 @@
 Deep Research Orchestrator
 Main pipeline connecting Discovery, Screening, Headless Retrieval, and Synthesis.
 """
+import os
 import logging
 import asyncio
 from typing import Dict, Any
@@ -13,6 +14,8 @@ from modules.headless_research import HeadlessResearcher
 
 logger = logging.getLogger("literature.orchestrator")
 
+CRAWL_CONCURRENCY = int(os.getenv("DEEP_RESEARCH_CONCURRENCY", "4"))
+
 class DeepResearchOrchestrator:
     def __init__(self):
         self.screener = ContentScreener()
@@ -43,19 +46,24 @@ class DeepResearchOrchestrator:
             return {"error": "No papers selected after screening", "status": status}
             
         status.append(f"Phase 3: Retrieval - Reading {len(selected_papers)} papers...")
-        async with HeadlessResearcher() as researcher:
-            for i, paper in enumerate(selected_papers):
-                # Try to find a link
-                # Priority: PDF URL -> DOI Link -> URL
-                target_url = paper.pdf_url or (f"https://doi.org/{paper.doi}" if paper.doi else paper.url)
-                
-                if target_url:
-                    logger.info(f"Crawling ({i+1}/{len(selected_papers)}): {paper.title}")
-                    try:
-                        await researcher.research(target_url)
-                        # research() automatically syncs to KB/SurfSense
-                    except Exception as e:
-                        logger.error(f"Failed to crawl {paper.title}: {e}")
+        targets = []
+        for paper in selected_papers:
+            # Priority: PDF URL -> DOI Link -> URL
+            target_url = paper.pdf_url or (f"https://doi.org/{paper.doi}" if paper.doi else paper.url)
+            if target_url:
+                targets.append(target_url)
+            else:
+                logger.info(f"No link to crawl for: {paper.title}")
+
+        # Papers are crawled concurrently on pooled pages; research_many() syncs each to KB/SurfSense
+        async with HeadlessResearcher(concurrency=CRAWL_CONCURRENCY) as researcher:
+            try:
+                crawled = await researcher.research_many(targets)
+                failed = [r["url"] for r in crawled if r.get("status") != "success"]
+                if failed:
+                    logger.error(f"Failed to crawl {len(failed)} papers: {failed}")
+            except Exception as e:
+                logger.error(f"Crawling failed: {e}")
         
         # Phase 4: Synthesis
         status.append("Phase 4: Synthesis - Writing report...")
@@ -0,0 +1,281 @@
+"""
+Literature Response Cache
+Persistent on-disk cache shared by the literature source connectors.
+
+- Content-addressed keys: sha256 over (source, url, sorted params)
+- Per-source TTLs (search results expire faster than DOI lookups)
+- Size-bounded LRU eviction on total stored bytes
+- ETag / Last-Modified revalidation once an entry goes stale
+"""
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+logger = logging.getLogger("literature.response_cache")
+
+DAY = 24 * 3600
+
+# Seconds before an entry must be revalidated
+DEFAULT_TTLS: Dict[str, int] = {
+    "europe_pmc": 1 * DAY,
+    "pubmed": 1 * DAY,
+    "openalex": 1 * DAY,
+    "crossref": 7 * DAY,
+    "semantic_scholar": 1 * DAY,
+    "unpaywall": 30 * DAY,
+}
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    etag: Optional[str]
+    last_modified: Optional[str]
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+
+class ResponseCache:
+    """
+    SQLite-backed response cache with LRU eviction.
+
+    Usage:
+        cache = get_response_cache()
+        data = cache.get_json("openalex", url, params=params)
+        papers = cache.memoize("pubmed", {"query": q, "limit": 10}, lambda: fetch(q))
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttls: Optional[Dict[str, int]] = None,
+        default_ttl: int = DAY,
+    ):
+        if db_path is None:
+            data_dir = os.getenv("BIODOCKIFY_DATA_DIR")
+            base = Path(data_dir) if data_dir else Path.home() / ".biodockify" / "data"
+            db_path = str(base / "cache" / "literature_http.db")
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    source TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            ''')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access)')
+        self._total_bytes = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Keys and raw entries
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def make_key(source: str, url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Content-addressed key for a request."""
+        key_data = {"source": source, "url": url, "params": params or {}}
+        return hashlib.sha256(json.dumps(key_data, sort_keys=True, default=str).encode()).hexdigest()
+
+    def ttl_for(self, source: str) -> int:
+        return self.ttls.get(source, self.default_ttl)
+
+    def lookup(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry for key (fresh or stale), marking it recently used."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT body, etag, last_modified, expires_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            with self._conn:
+                self._conn.execute('UPDATE responses SET last_access = ? WHERE key = ?', (time.time(), key))
+        value = json.loads(zlib.decompress(row[0]))
+        return CacheEntry(value=value, etag=row[1], last_modified=row[2], expires_at=row[3])
+
+    def store(
+        self,
+        key: str,
+        source: str,
+        value: Any,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        ttl: Optional[int] = None,
+    ):
+        """Store a JSON-serialisable value and evict LRU entries over the size bound."""
+        body = zlib.compress(json.dumps(value, default=str).encode("utf-8"))
+        now = time.time()
+        expires_at = now + (ttl if ttl is not None else self.ttl_for(source))
+        with self._lock:
+            old = self._conn.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+            with self._conn:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO responses '
+                    '(key, source, body, size, etag, last_modified, expires_at, last_access) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (key, source, body, len(body), etag, last_modified, expires_at, now),
+                )
+            self._total_bytes += len(body) - (old[0] if old else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def touch(self, key: str, source: str):
+        """Extend an entry's lifetime after a 304 Not Modified."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                'UPDATE responses SET expires_at = ?, last_access = ? WHERE key = ?',
+                (time.time() + self.ttl_for(source), time.time(), key),
+            )
+
+    def _evict(self):
+        """Drop least recently used entries until 90% of max_bytes. Caller holds the lock."""
+        target = int(self.max_bytes * 0.9)
+        cursor = self._conn.execute('SELECT key, size FROM responses ORDER BY last_access ASC')
+        doomed = []
+        for key, size in cursor:
+            if self._total_bytes <= target:
+                break
+            doomed.append((key,))
+            self._total_bytes -= size
+        with self._conn:
+            self._conn.executemany('DELETE FROM responses WHERE key = ?', doomed)
+        logger.debug(f"Evicted {len(doomed)} cached literature responses")
+
+    # ------------------------------------------------------------------
+    # HTTP helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CacheEntry]) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for revalidating entry."""
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def get_json(
+        self,
+        source: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 15,
+        allow_404: bool = False,
+        before_request: Optional[Callable[[], None]] = None,
+    ) -> Optional[Any]:
+        """
+        GET a JSON document through the cache.
+        Fresh entries are served from disk; stale ones are revalidated with
+        ETag/Last-Modified. Returns None for a 404 when allow_404 is set;
+        raises requests.HTTPError for other failures. before_request (e.g. a
+        rate limiter's wait) only runs when the network is actually hit.
+        """
+        key = self.make_key(source, url, params)
+        entry = self.lookup(key)
+        if entry is not None and entry.fresh:
+            self.hits += 1
+            return entry.value
+
+        request_headers = {**(headers or {}), **self.conditional_headers(entry)}
+        if before_request:
+            before_request()
+        response = self._session.get(url, params=params, headers=request_headers, timeout=timeout)
+
+        if response.status_code == 304 and entry is not None:
+            self.revalidated += 1
+            self.touch(key, source)
+            return entry.value
+
+        self.misses += 1
+        if response.status_code == 404 and allow_404:
+            self.store(key, source, None)
+            return None
+        response.raise_for_status()
+        value = response.json()
+        self.store(
+            key, source, value,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        return value
+
+    def memoize(self, source: str, key_data: Dict[str, Any], producer: Callable[[], Any], ttl: Optional[int] = None) -> Any:
+        """Cache the result of a non-HTTP call (e.g. Entrez) under a content-addressed key."""
+        key = self.make_key(source, "memo", key_data)
+        entry = self.lookup(key)
+        if entry is not None and entry.fresh:
+            self.hits += 1
+            return entry.value
+        self.misses += 1
+        value = producer()
+        if value:
+            self.store(key, source, value, ttl=ttl)
+        return value
+
+    def clear(self, source: Optional[str] = None):
+        with self._lock, self._conn:
+            if source:
+                self._conn.execute('DELETE FROM responses WHERE source = ?', (source,))
+            else:
+                self._conn.execute('DELETE FROM responses')
+            self._total_bytes = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+        return {
+            "entries": entries,
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+        }
+
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Process-wide literature response cache."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache()
+    return _response_cache
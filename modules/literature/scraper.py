@@ -7,6 +7,7 @@ import re
 import socket
 import time
 import os
+import asyncio
 from pathlib import Path
 from typing import List, Dict, Optional, Union
 from dataclasses import dataclass
@@ -22,6 +23,8 @@ from modules.literature.europe_pmc import EuropePMCScraper
 from modules.literature.crossref import CrossRefScraper
 from modules.literature.biorxiv import BioRxivScraper
 from modules.literature.bohrium import BohriumConnector
+from modules.literature.async_harvest import AsyncHarvestClient, SourceBudget
+from modules.literature.response_cache import ResponseCache, get_response_cache
 
 from runtime.robust_connection import with_retry
 
@@ -85,9 +88,10 @@ class PubmedScraper:
     Robust PubMed scraper with offline handling and batch capabilities.
     """
     
-    def __init__(self, config: Optional[PubmedScraperConfig] = None):
+    def __init__(self, config: Optional[PubmedScraperConfig] = None, cache: Optional[ResponseCache] = None):
         """Initialize the scraper with configuration."""
         self.config = config or PubmedScraperConfig()
+        self.cache = cache or get_response_cache()
         
         if Entrez:
             Entrez.email = self.config.email
@@ -132,6 +136,14 @@ class PubmedScraper:
             logger.error("Biopython missing. Please run: pip install biopython")
             return []
 
+        # Entrez responses are parsed objects, so cache the normalised results
+        return self.cache.memoize(
+            "pubmed", {"query": query, "limit": limit},
+            lambda: self._fetch_from_entrez(query, limit)
+        )
+
+    def _fetch_from_entrez(self, query: str, limit: int) -> List[Dict]:
+        """Run esearch + efetch and normalise the PubMed records."""
         # 2. Search for IDs
         logger.info("Searching PubMed for: %s", query)
         rate_limiter.wait()
@@ -222,6 +234,8 @@ class LiteratureConfig:
     max_results: int = 15
     tool_name: str = "BioDockify"
     bohrium_url: Optional[str] = None
+    # Per-source overrides for search_async, e.g. {"crossref": SourceBudget(1, 2)}
+    source_budgets: Optional[Dict[str, SourceBudget]] = None
 
 class LiteratureAggregator:
     """
@@ -243,6 +257,7 @@ class LiteratureAggregator:
         self.crossref = CrossRefScraper(email=self.config.email)
         self.biorxiv = BioRxivScraper()
         self.bohrium = BohriumConnector(endpoint=self.config.bohrium_url)
+        self.cache = get_response_cache()
         
     def search(self, query: str) -> List[Dict]:
         """
@@ -266,21 +281,8 @@ class LiteratureAggregator:
         if results:
             try:
                 from modules.knowledge.client import surfsense
-                import asyncio
-                import json
-                
-                # Format as structured Markdown for better RAG retrieval
-                md_lines = [f"# Literature Review: {query}", f"Date: {time.strftime('%Y-%m-%d')}", ""]
-                for p in results:
-                    md_lines.append(f"## {p.get('title')}")
-                    md_lines.append(f"**Source:** {p.get('source')} | **Year:** {p.get('year')}")
-                    md_lines.append(f"**Authors:** {', '.join(p.get('authors', [])[:3])}")
-                    md_lines.append(f"**Abstract:** {p.get('abstract')}")
-                    md_lines.append(f"**Link:** {p.get('full_text_url') or p.get('doi')}")
-                    md_lines.append(f"---")
                 
-                content = "\n".join(md_lines).encode('utf-8')
-                filename = f"lit_review_{int(time.time())}.md"
+                content, filename = self._format_review_upload(query, results)
                 
                 # Async Handling (similar to web_scraper)
                 try:
@@ -301,6 +303,47 @@ class LiteratureAggregator:
         logger.info(f"Harvest Complete. Found {len(processed_papers)} papers ({sum(1 for p in processed_papers if p.is_open_access)} Open Access).")
         return results
 
+    async def search_async(self, query: str) -> List[Dict]:
+        """
+        Execute the Three-Layer Strategy with concurrent source queries.
+        All sources share one pooled HTTP client; each source runs within its
+        own concurrency / rate-limit budget (see LiteratureConfig.source_budgets),
+        so a harvest takes about as long as the slowest source.
+        """
+        async with AsyncHarvestClient(budgets=self.config.source_budgets, cache=self.cache) as client:
+            raw_results = await self._layer_1_discovery_async(query, client)
+            processed_papers = await self._layer_2_oa_detection_async(raw_results, client)
+        
+        results = [p.to_dict() for p in processed_papers]
+        
+        if results:
+            try:
+                from modules.knowledge.client import surfsense
+                
+                content, filename = self._format_review_upload(query, results)
+                await surfsense.upload_file(content, filename)
+                logger.info(f"Uploaded literature review to SurfSense: {filename}")
+            except Exception as e:
+                logger.error(f"Failed to upload literature review to SurfSense: {e}")
+        
+        logger.info(f"Harvest Complete. Found {len(processed_papers)} papers ({sum(1 for p in processed_papers if p.is_open_access)} Open Access).")
+        return results
+
+    def _format_review_upload(self, query: str, results: List[Dict]):
+        """Format results as structured Markdown for better RAG retrieval."""
+        md_lines = [f"# Literature Review: {query}", f"Date: {time.strftime('%Y-%m-%d')}", ""]
+        for p in results:
+            md_lines.append(f"## {p.get('title')}")
+            md_lines.append(f"**Source:** {p.get('source')} | **Year:** {p.get('year')}")
+            md_lines.append(f"**Authors:** {', '.join(p.get('authors', [])[:3])}")
+            md_lines.append(f"**Abstract:** {p.get('abstract')}")
+            md_lines.append(f"**Link:** {p.get('full_text_url') or p.get('doi')}")
+            md_lines.append(f"---")
+        
+        content = "\n".join(md_lines).encode('utf-8')
+        filename = f"lit_review_{int(time.time())}.md"
+        return content, filename
+
     def _layer_1_discovery(self, query: str) -> List[Dict]:
         """Query indexes to find everything that exists."""
         results = []
@@ -336,68 +379,162 @@ class LiteratureAggregator:
              try:
                  # Bohrium returns list of dicts naturally
                  res = asyncio.run(self.bohrium.search_literature(query, limit=5))
-                 # Normalize keys if needed
-                 normalized_res = []
-                 for item in res:
-                     normalized_res.append({
-                         "title": item.get('title', 'Untitled'),
-                         "abstract": item.get('abstract', '') or item.get('content', '')[:500],
-                         "authors": item.get('authors', []),
-                         "year": item.get('year', '2024'),
-                         "source": "Bohrium Agent",
-                         "url": item.get('url', ''),
-                         "doi": item.get('doi')
-                     })
-                 self._deduplicate_and_add(results, normalized_res, seen_titles)
+                 self._deduplicate_and_add(results, self._normalize_bohrium(res), seen_titles)
              except Exception as e:
                  logger.warning(f"Bohrium search failed: {e}")
             
         return results
 
+    async def _layer_1_discovery_async(self, query: str, client: AsyncHarvestClient) -> List[Dict]:
+        """Query every configured index concurrently."""
+        sources = self.config.sources
+        limit = self.config.max_results
+        tasks = []
+        
+        # Same priority order as the sequential path so dedup keeps the same winners
+        if "europe_pmc" in sources:
+            tasks.append(("europe_pmc", self._fetch_europe_pmc(client, query, limit)))
+        if "pubmed" in sources:
+            # Entrez is synchronous; run it off-loop within the pubmed budget
+            tasks.append(("pubmed", self._fetch_pubmed(client, query, limit)))
+        if "openalex" in sources:
+            # The sequential path trims OpenAlex once other sources fill up; in parallel we
+            # cannot know that yet, so fetch the full limit and let dedup absorb overlap.
+            tasks.append(("openalex", self._fetch_openalex(client, query, limit)))
+        if "crossref" in sources:
+            tasks.append(("crossref", self._fetch_crossref(client, query, 5)))
+        if self.config.include_preprints:
+            tasks.append(("biorxiv", self._fetch_biorxiv(client, query, 5)))
+        if "bohrium" in sources:
+            tasks.append(("bohrium", self._fetch_bohrium(client, query, 5)))
+        
+        responses = await asyncio.gather(*(coro for _, coro in tasks), return_exceptions=True)
+        
+        results = []
+        seen_titles = set()
+        for (name, _), res in zip(tasks, responses):
+            if isinstance(res, Exception):
+                logger.warning(f"{name} search failed: {res}")
+                continue
+            self._deduplicate_and_add(results, res, seen_titles)
+        return results
+
+    async def _fetch_europe_pmc(self, client: AsyncHarvestClient, query: str, limit: int) -> List[Dict]:
+        logger.info(f"Searching Europe PMC for: {query}")
+        data = await client.get_json("europe_pmc", self.europe_pmc.BASE_URL,
+                                     params=self.europe_pmc.build_params(query, limit))
+        return self.europe_pmc.parse_results(data or {})
+
+    async def _fetch_pubmed(self, client: AsyncHarvestClient, query: str, limit: int) -> List[Dict]:
+        async with client.limiter("pubmed"):
+            return await asyncio.to_thread(self.pubmed.search_papers, query, max_results=limit)
+
+    async def _fetch_openalex(self, client: AsyncHarvestClient, query: str, limit: int) -> List[Dict]:
+        logger.info(f"Searching OpenAlex for: {query}")
+        params, headers = self.openalex.build_request(query, limit)
+        data = await client.get_json("openalex", self.openalex.BASE_URL, params=params, headers=headers)
+        return self.openalex.parse_results(data or {})
+
+    async def _fetch_crossref(self, client: AsyncHarvestClient, query: str, limit: int) -> List[Dict]:
+        logger.info(f"Searching CrossRef for: {query}")
+        params, headers = self.crossref.build_request(query, limit)
+        data = await client.get_json("crossref", self.crossref.BASE_URL, params=params, headers=headers)
+        return self.crossref.parse_results(data or {})
+
+    async def _fetch_biorxiv(self, client: AsyncHarvestClient, query: str, limit: int) -> List[Dict]:
+        logger.info(f"Searching bioRxiv via Europe PMC proxy for: {query}")
+        data = await client.get_json("europe_pmc", self.europe_pmc.BASE_URL,
+                                     params=self.europe_pmc.build_params(self.biorxiv.build_query(query), limit))
+        return self.biorxiv.tag_results(self.europe_pmc.parse_results(data or {}))
+
+    async def _fetch_bohrium(self, client: AsyncHarvestClient, query: str, limit: int) -> List[Dict]:
+        async with client.limiter("bohrium"):
+            res = await self.bohrium.search_literature(query, limit=limit)
+        return self._normalize_bohrium(res)
+
+    def _normalize_bohrium(self, res: List[Dict]) -> List[Dict]:
+        """Normalize Bohrium keys to the aggregator's raw item format."""
+        normalized_res = []
+        for item in res:
+            normalized_res.append({
+                "title": item.get('title', 'Untitled'),
+                "abstract": item.get('abstract', '') or item.get('content', '')[:500],
+                "authors": item.get('authors', []),
+                "year": item.get('year', '2024'),
+                "source": "Bohrium Agent",
+                "url": item.get('url', ''),
+                "doi": item.get('doi')
+            })
+        return normalized_res
+
     def _layer_2_oa_detection(self, raw_items: List[Dict]) -> List[Paper]:
         """Enforce OA rules and normalize data."""
         papers = []
         for item in raw_items:
-            # 1. Normalize into strict Paper model
-            paper = Paper(
-                title=item.get("title", "Unknown"),
-                abstract=item.get("abstract", ""),
-                authors=item.get("authors", []) if isinstance(item.get("authors"), list) else [],
-                year=str(item.get("publication_date", "")),
-                source=item.get("source", "Unknown"),
-                doi=item.get("doi"),
-                pmid=item.get("pmid"),
-                is_peer_reviewed=item.get("is_peer_reviewed", True) # Default true unless tagged otherwise
-            )
+            paper = self._to_paper(item)
             
-            # 2. Apply OA Logic
-            # Rule A: Europe PMC Flag
-            if item.get("is_open_access") is True:
-                paper.is_open_access = True
-                paper.open_access_source = "Europe PMC"
-                paper.license = "OA (Unspecified)" # ideally we'd parse this deeper
-                
-                # Construct Full Text URL if possible (Europe PMC specific)
-                if paper.pmid:
-                    paper.full_text_url = f"https://www.europepmc.org/backend/ptpmcrender.fcgi?accid=PMID{paper.pmid}&blobtype=pdf"
-                elif paper.doi:
-                     # Fallback to DOI resolver which might paywall, so be careful. 
-                     # For OA, usually EuroPMC links are safer.
-                     pass
             # Rule B: Unpaywall Check - Query Unpaywall API for OA version
             if paper.doi and not paper.is_open_access:
                 try:
-                    unpaywall_result = self._check_unpaywall(paper.doi)
-                    if unpaywall_result:
-                        paper.is_open_access = True
-                        paper.open_access_source = "Unpaywall"
-                        paper.license = unpaywall_result.get("license", "OA")
-                        paper.full_text_url = unpaywall_result.get("url")
+                    self._apply_unpaywall(paper, self._check_unpaywall(paper.doi))
                 except Exception as e:
                     logger.debug(f"Unpaywall check failed for {paper.doi}: {e}")
             
             papers.append(paper)
         return papers
+
+    async def _layer_2_oa_detection_async(self, raw_items: List[Dict], client: AsyncHarvestClient) -> List[Paper]:
+        """Same rules as _layer_2_oa_detection, with Unpaywall lookups batched concurrently."""
+        papers = [self._to_paper(item) for item in raw_items]
+        pending = [p for p in papers if p.doi and not p.is_open_access]
+        
+        lookups = await asyncio.gather(
+            *(self._check_unpaywall_async(client, p.doi) for p in pending),
+            return_exceptions=True
+        )
+        for paper, result in zip(pending, lookups):
+            if isinstance(result, Exception):
+                logger.debug(f"Unpaywall check failed for {paper.doi}: {result}")
+                continue
+            self._apply_unpaywall(paper, result)
+        return papers
+
+    def _to_paper(self, item: Dict) -> Paper:
+        """Normalize a raw item into the strict Paper model and apply source OA flags."""
+        # 1. Normalize into strict Paper model
+        paper = Paper(
+            title=item.get("title", "Unknown"),
+            abstract=item.get("abstract", ""),
+            authors=item.get("authors", []) if isinstance(item.get("authors"), list) else [],
+            year=str(item.get("publication_date", "")),
+            source=item.get("source", "Unknown"),
+            doi=item.get("doi"),
+            pmid=item.get("pmid"),
+            is_peer_reviewed=item.get("is_peer_reviewed", True) # Default true unless tagged otherwise
+        )
+        
+        # 2. Apply OA Logic
+        # Rule A: Europe PMC Flag
+        if item.get("is_open_access") is True:
+            paper.is_open_access = True
+            paper.open_access_source = "Europe PMC"
+            paper.license = "OA (Unspecified)" # ideally we'd parse this deeper
+            
+            # Construct Full Text URL if possible (Europe PMC specific)
+            if paper.pmid:
+                paper.full_text_url = f"https://www.europepmc.org/backend/ptpmcrender.fcgi?accid=PMID{paper.pmid}&blobtype=pdf"
+            elif paper.doi:
+                 # Fallback to DOI resolver which might paywall, so be careful. 
+                 # For OA, usually EuroPMC links are safer.
+                 pass
+        return paper
+
+    def _apply_unpaywall(self, paper: Paper, unpaywall_result: Optional[Dict[str, str]]):
+        if unpaywall_result:
+            paper.is_open_access = True
+            paper.open_access_source = "Unpaywall"
+            paper.license = unpaywall_result.get("license", "OA")
+            paper.full_text_url = unpaywall_result.get("url")
     
     def _check_unpaywall(self, doi: str) -> Optional[Dict[str, str]]:
         """
@@ -411,37 +548,42 @@ class LiteratureAggregator:
         """
         import requests
         
-        # Use configured email for API
-        email = self.config.email
-        url = f"https://api.unpaywall.org/v2/{doi}?email={email}"
-        
         try:
-            rate_limiter.wait()  # Be polite
-            response = requests.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Check if open access
-                if data.get("is_oa"):
-                    best_oa = data.get("best_oa_location", {})
-                    if best_oa:
-                        return {
-                            "url": best_oa.get("url_for_pdf") or best_oa.get("url"),
-                            "license": best_oa.get("license") or "OA",
-                            "source": best_oa.get("host_type", "Unknown")
-                        }
-            elif response.status_code == 404:
-                # DOI not found in Unpaywall - this is normal
-                pass
-            else:
-                logger.debug(f"Unpaywall returned {response.status_code} for {doi}")
+            # DOI not found in Unpaywall (404) is normal and cached as None
+            data = self.cache.get_json(
+                "unpaywall", f"https://api.unpaywall.org/v2/{doi}",
+                params={"email": self.config.email}, timeout=10,
+                allow_404=True, before_request=rate_limiter.wait  # Be polite
+            )
+            if data:
+                return self._parse_unpaywall(data)
                 
         except requests.exceptions.RequestException as e:
             logger.debug(f"Unpaywall request failed: {e}")
         
         return None
 
+    async def _check_unpaywall_async(self, client: AsyncHarvestClient, doi: str) -> Optional[Dict[str, str]]:
+        """Async Unpaywall lookup within the shared client's unpaywall budget."""
+        data = await client.get_json(
+            "unpaywall", f"https://api.unpaywall.org/v2/{doi}",
+            params={"email": self.config.email}, allow_404=True
+        )
+        return self._parse_unpaywall(data) if data else None
+
+    def _parse_unpaywall(self, data: Dict) -> Optional[Dict[str, str]]:
+        """Extract the best OA location from an Unpaywall record."""
+        # Check if open access
+        if data.get("is_oa"):
+            best_oa = data.get("best_oa_location", {})
+            if best_oa:
+                return {
+                    "url": best_oa.get("url_for_pdf") or best_oa.get("url"),
+                    "license": best_oa.get("license") or "OA",
+                    "source": best_oa.get("host_type", "Unknown")
+                }
+        return None
+
     def _deduplicate_and_add(self, master_list, new_items, seen_set):
         for item in new_items:
             # Normalize title for dedup
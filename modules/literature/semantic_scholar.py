@@ -8,6 +8,8 @@ import logging
 from typing import List, Dict, Optional
 from datetime import datetime
 
+from modules.literature.response_cache import ResponseCache, get_response_cache
+
 logger = logging.getLogger(__name__)
 
 class SemanticScholarSearcher:
@@ -19,8 +21,9 @@ class SemanticScholarSearcher:
     API_URL = "https://api.semanticscholar.org/graph/v1/paper/search"
     DETAILS_URL = "https://api.semanticscholar.org/graph/v1/paper/"
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[ResponseCache] = None):
         self.headers = {}
+        self.cache = cache or get_response_cache()
         if api_key:
             self.headers["x-api-key"] = api_key
             
@@ -43,16 +46,13 @@ class SemanticScholarSearcher:
         }
         
         try:
-            response = requests.get(self.API_URL, params=params, headers=self.headers, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                raw_papers = data.get("data", [])
-                return self._rank_and_filter(raw_papers, min_citations, limit)
-            else:
-                logger.error(f"Semantic Scholar Error {response.status_code}: {response.text}")
-                return []
+            data = self.cache.get_json("semantic_scholar", self.API_URL, params=params, headers=self.headers, timeout=10)
+            raw_papers = data.get("data", [])
+            return self._rank_and_filter(raw_papers, min_citations, limit)
                 
+        except requests.HTTPError as e:
+            logger.error(f"Semantic Scholar Error {e.response.status_code}: {e.response.text}")
+            return []
         except Exception as e:
             logger.error(f"Semantic Scholar Search Failed: {e}")
             return []
@@ -93,9 +93,7 @@ class SemanticScholarSearcher:
         url = f"{self.DETAILS_URL}{paper_id}"
         params = {"fields": "references.title,references.paperId"}
         try:
-            response = requests.get(url, params=params, headers=self.headers, timeout=5)
-            if response.status_code == 200:
-                return response.json()
+            return self.cache.get_json("semantic_scholar", url, params=params, headers=self.headers, timeout=5) or {}
         except Exception:
             pass
         return {}
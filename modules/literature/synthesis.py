@@ -70,12 +70,12 @@ class ReviewSynthesizer:
         full_report = f"# Systematic Review: {topic}\n\n"
         full_report += f"*Synthesized from {len(papers)} research papers*\n\n---\n\n"
         
-        for section_title, section_focus in self.SECTIONS:
+        # Get relevant context for every section from the vector store in one batch
+        contexts = await self._get_section_contexts(topic, self.SECTIONS)
+        
+        for (section_title, section_focus), context in zip(self.SECTIONS, contexts):
             logger.info(f"Generating section: {section_title}")
             
-            # Get relevant context from vector store
-            context = await self._get_section_context(topic, section_title, section_focus)
-            
             if agent_generate:
                 # Agent Zero generates content
                 content = agent_generate(topic, section_title, context)
@@ -98,16 +98,19 @@ class ReviewSynthesizer:
     async def _index_papers(self, papers: List[Paper]) -> bool:
         """Index papers in vector store for RAG."""
         try:
+            contents = []
+            metadatas = []
             for paper in papers:
                 if paper.abstract:
-                    content = f"Title: {paper.title}\nAbstract: {paper.abstract}"
-                    metadata = {
+                    contents.append(f"Title: {paper.title}\nAbstract: {paper.abstract}")
+                    metadatas.append({
                         "title": paper.title,
                         "year": paper.year,
                         "source": paper.source,
                         "doi": paper.doi or ""
-                    }
-                    await self.vector_store.add_documents([content], [metadata])
+                    })
+            if contents:
+                await self.vector_store.add_documents(contents, metadatas)
             logger.debug(f"Indexed {len(papers)} papers")
             return True
         except Exception as e:
@@ -116,20 +119,27 @@ class ReviewSynthesizer:
     
     async def _get_section_context(self, topic: str, section: str, focus: str) -> str:
         """Retrieve relevant context from vector store."""
-        query = f"{topic} {section} {focus}"
+        contexts = await self._get_section_contexts(topic, [(section, focus)])
+        return contexts[0]
+    
+    async def _get_section_contexts(self, topic: str, sections: List[tuple]) -> List[str]:
+        """Retrieve context for several (section, focus) pairs with one batched search."""
+        queries = [f"{topic} {section} {focus}" for section, focus in sections]
         try:
-            results = await self.vector_store.search(query, k=5)
+            all_results = await self.vector_store.search_many(queries, k=5)
             
-            context_parts = []
-            for r in results:
-                text = r.get('text', '')[:600]
-                if text:
-                    context_parts.append(text)
-            
-            return "\n".join(context_parts) if context_parts else "No specific context available."
+            contexts = []
+            for results in all_results:
+                context_parts = []
+                for r in results:
+                    text = r.get('text', '')[:600]
+                    if text:
+                        context_parts.append(text)
+                contexts.append("\n".join(context_parts) if context_parts else "No specific context available.")
+            return contexts
         except Exception as e:
             logger.warning(f"Context retrieval failed: {e}")
-            return "Context retrieval failed."
+            return ["Context retrieval failed."] * len(queries)
     
     def _build_section_prompt(self, topic: str, section: str, focus: str, context: str) -> str:
         """Build prompt for Agent Zero to generate section content."""
@@ -176,19 +186,19 @@ Write the section:"""
         """
         # Index papers first
         try:
-            for paper in papers:
-                if paper.abstract:
-                    await self.vector_store.add_documents(
-                        [f"Title: {paper.title}\nAbstract: {paper.abstract}"],
-                        [{"title": paper.title}]
-                    )
+            indexed = [p for p in papers if p.abstract]
+            if indexed:
+                await self.vector_store.add_documents(
+                    [f"Title: {p.title}\nAbstract: {p.abstract}" for p in indexed],
+                    [{"title": p.title} for p in indexed]
+                )
         except Exception as e:
             logger.warning(f"Failed to index papers for agent preparation: {e}")
         
         # Prepare section contexts
         sections_data = []
-        for section_title, section_focus in self.SECTIONS:
-            context = await self._get_section_context(topic, section_title, section_focus)
+        contexts = await self._get_section_contexts(topic, self.SECTIONS)
+        for (section_title, section_focus), context in zip(self.SECTIONS, contexts):
             sections_data.append({
                 "section": section_title,
                 "focus": section_focus,
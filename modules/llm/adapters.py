@@ -1,16 +1,27 @@
 """
 LLM Adapters
 Encapsulates API interaction logic for various AI providers.
+
+HTTP adapters share pooled connections (see modules.llm.http_client):
+generate() reuses one keep-alive requests session, async_generate() and
+stream() run natively on a shared httpx.AsyncClient instead of a thread.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, Optional, Tuple
+import functools
 import requests
 import json
-import litellm
+import httpx
 import asyncio
 from runtime.robust_connection import with_retry, async_with_retry, get_circuit_breaker
-from runtime.cache import cache_llm_call
+from runtime.cache import cache_llm_call, async_cache_llm_call
+from modules.llm.http_client import get_http_session, get_async_client, iter_sse_data, iter_ndjson
+from runtime.instrumentation import provider_name, record_llm_tokens, token_usage, track_llm
+from runtime.lazy import lazy_import
+
+# LiteLLM takes seconds to import; only the cloud adapters below need it
+litellm = lazy_import("litellm")
 
 class BaseLLMAdapter(ABC):
     """Abstract base class for LLM providers."""
@@ -22,59 +33,171 @@ class BaseLLMAdapter(ABC):
 
     async def async_generate(self, prompt: str, **kwargs) -> str:
         """Generate text from prompt asynchronously. Default implementation runs in thread."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, lambda: self.generate(prompt, **kwargs))
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(self.generate, prompt, **kwargs))
+
+    async def stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """Yield the response as text chunks as they arrive.
+        Adapters without a streaming API yield the whole response once."""
+        yield await self.async_generate(prompt, **kwargs)
+
+class HTTPChatAdapter(BaseLLMAdapter):
+    """
+    Base for REST adapters. Subclasses describe the request and how to read
+    the response; sync, async and streaming calls share that description.
+    """
+
+    circuit_name = "llm"
+    # 'sse' (data: lines), 'ndjson' (one object per line) or None (no streaming API)
+    stream_format: Optional[str] = None
+
+    @abstractmethod
+    def _build_request(self, prompt: str, stream: bool = False, **kwargs) -> Tuple[str, Dict[str, Any], Dict[str, str], float]:
+        """Return (url, json payload, headers, timeout)."""
+
+    @abstractmethod
+    def _parse_response(self, data: Any) -> str:
+        """Extract the generated text from a JSON response."""
+
+    def _parse_stream_chunk(self, event: Dict[str, Any]) -> Optional[str]:
+        """Extract the text delta from one streamed event."""
+        return None
+
+    def _stream_usage(self, usage: Any, event: Dict[str, Any]) -> Any:
+        """Fold one streamed event into the token usage of the stream.
+        By default the last event that reports usage wins (final totals)."""
+        return event if any(token_usage(event)) else usage
+
+    def _check_status(self, status_code: int, url: str):
+        """Hook for provider-specific HTTP error messages."""
+
+    @cache_llm_call
+    def generate(self, prompt: str, **kwargs) -> str:
+        return with_retry(max_retries=3, circuit_name=self.circuit_name)(self._post)(prompt, **kwargs)
+
+    @async_cache_llm_call
+    async def async_generate(self, prompt: str, **kwargs) -> str:
+        return await async_with_retry(max_retries=3, circuit_name=self.circuit_name)(self._async_post)(prompt, **kwargs)
+
+    def _post(self, prompt: str, **kwargs) -> str:
+        url, payload, headers, timeout = self._build_request(prompt, **kwargs)
+        with track_llm(provider_name(self), "generate"):
+            resp = get_http_session().post(url, json=payload, headers=headers, timeout=timeout)
+            self._check_status(resp.status_code, url)
+            resp.raise_for_status()
+            data = resp.json()
+        record_llm_tokens(provider_name(self), data)
+        return self._parse_response(data)
+
+    async def _async_post(self, prompt: str, **kwargs) -> str:
+        url, payload, headers, timeout = self._build_request(prompt, **kwargs)
+        with track_llm(provider_name(self), "async_generate"):
+            resp = await get_async_client().post(url, json=payload, headers=headers, timeout=timeout)
+            self._check_status(resp.status_code, url)
+            resp.raise_for_status()
+            data = resp.json()
+        record_llm_tokens(provider_name(self), data)
+        return self._parse_response(data)
+
+    async def stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        if self.stream_format is None:
+            async for chunk in super().stream(prompt, **kwargs):
+                yield chunk
+            return
+
+        circuit = get_circuit_breaker(self.circuit_name)
+        if not circuit.can_execute():
+            raise ConnectionError(f"Service '{self.circuit_name}' is temporarily unavailable")
+
+        url, payload, headers, timeout = self._build_request(prompt, stream=True, **kwargs)
+        events = iter_sse_data if self.stream_format == "sse" else iter_ndjson
+        usage = None
+        try:
+            with track_llm(provider_name(self), "stream"):
+                async with get_async_client().stream("POST", url, json=payload, headers=headers, timeout=timeout) as resp:
+                    self._check_status(resp.status_code, url)
+                    if resp.is_error:
+                        await resp.aread()
+                        resp.raise_for_status()
+                    async for event in events(resp):
+                        usage = self._stream_usage(usage, event)
+                        text = self._parse_stream_chunk(event)
+                        if text:
+                            yield text
+        except (httpx.TransportError, ConnectionError):
+            circuit.record_failure()
+            raise
+        finally:
+            record_llm_tokens(provider_name(self), usage)
+        circuit.record_success()
+
+class OpenAICompatibleAdapter(HTTPChatAdapter):
+    """Response handling shared by OpenAI-style /chat/completions APIs."""
+
+    stream_format = "sse"
+
+    def _parse_response(self, data: Any) -> str:
+        return data["choices"][0]["message"]["content"]
 
-class GoogleGeminiAdapter(BaseLLMAdapter):
+    def _parse_stream_chunk(self, event: Dict[str, Any]) -> Optional[str]:
+        choices = event.get("choices") or [{}]
+        return (choices[0].get("delta") or {}).get("content")
+
+class GoogleGeminiAdapter(HTTPChatAdapter):
     """Adapter for Google Gemini API (REST)."""
+
+    circuit_name = "google_gemini"
+    stream_format = "sse"
     
     def __init__(self, api_key: str, model: str = "gemini-pro"):
         self.api_key = api_key
         self.model = model
         self.base_url = "https://generativelanguage.googleapis.com/v1beta/models"
 
-    @cache_llm_call
-    @with_retry(max_retries=3, circuit_name="google_gemini")
-    def generate(self, prompt: str, **kwargs) -> str:
-        url = f"{self.base_url}/{self.model}:generateContent?key={self.api_key}"
+    def _build_request(self, prompt: str, stream: bool = False, **kwargs):
+        if stream:
+            url = f"{self.base_url}/{self.model}:streamGenerateContent?alt=sse&key={self.api_key}"
+        else:
+            url = f"{self.base_url}/{self.model}:generateContent?key={self.api_key}"
         payload = {"contents": [{"parts": [{"text": prompt}]}]}
-        
-        resp = requests.post(url, json=payload, headers={"Content-Type": "application/json"}, timeout=30)
-        resp.raise_for_status()
-        data = resp.json()
+        return url, payload, {"Content-Type": "application/json"}, 30
+
+    def _parse_response(self, data: Any) -> str:
         return data["candidates"][0]["content"]["parts"][0]["text"]
 
-class OpenRouterAdapter(BaseLLMAdapter):
+    def _parse_stream_chunk(self, event: Dict[str, Any]) -> Optional[str]:
+        try:
+            return "".join(p.get("text", "") for p in event["candidates"][0]["content"]["parts"])
+        except (KeyError, IndexError):
+            return None
+
+class OpenRouterAdapter(OpenAICompatibleAdapter):
     """Adapter for OpenRouter API."""
+
+    circuit_name = "openrouter"
     
     def __init__(self, api_key: str, model: str = "mistralai/mistral-7b-instruct"):
         self.api_key = api_key
         self.model = model
         self.url = "https://openrouter.ai/api/v1/chat/completions"
 
-    @cache_llm_call
-    @with_retry(max_retries=3, circuit_name="openrouter")
-    def generate(self, prompt: str, **kwargs) -> str:
+    def _build_request(self, prompt: str, stream: bool = False, **kwargs):
         payload = {
             "model": self.model,
             "messages": [{"role": "user", "content": prompt}]
         }
-        
-        resp = requests.post(
-            self.url, 
-            json=payload, 
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }, 
-            timeout=30
-        )
-        resp.raise_for_status()
-        data = resp.json()
-        return data["choices"][0]["message"]["content"]
+        if stream:
+            payload["stream"] = True
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        return self.url, payload, headers, 30
 
-class HuggingFaceAdapter(BaseLLMAdapter):
+class HuggingFaceAdapter(HTTPChatAdapter):
     """Adapter for HuggingFace Inference API."""
+
+    circuit_name = "huggingface"
     
     def __init__(self, api_key: str, model: str = "mistralai/Mixtral-8x7B-Instruct-v0.1"):
         self.api_key = api_key
@@ -82,9 +205,7 @@ class HuggingFaceAdapter(BaseLLMAdapter):
         # Note: HF URL format depends on model
         self.url = f"https://api-inference.huggingface.co/models/{self.model}"
 
-    @cache_llm_call
-    @with_retry(max_retries=3, circuit_name="huggingface")
-    def generate(self, prompt: str, **kwargs) -> str:
+    def _build_request(self, prompt: str, stream: bool = False, **kwargs):
         # HF Inference API parameters
         payload = {
             "inputs": prompt, 
@@ -93,15 +214,9 @@ class HuggingFaceAdapter(BaseLLMAdapter):
                 "return_full_text": False
             }
         }
-        
-        resp = requests.post(
-            self.url, 
-            json=payload, 
-            headers={"Authorization": f"Bearer {self.api_key}"}, 
-            timeout=30
-        )
-        resp.raise_for_status()
-        data = resp.json()
+        return self.url, payload, {"Authorization": f"Bearer {self.api_key}"}, 30
+
+    def _parse_response(self, data: Any) -> str:
         # HF returns a list of result objects
         if isinstance(data, list) and len(data) > 0:
             return data[0].get("generated_text", "")
@@ -110,8 +225,10 @@ class HuggingFaceAdapter(BaseLLMAdapter):
         else:
             raise ValueError(f"Unexpected HF Response: {data}")
 
-class CustomAdapter(BaseLLMAdapter):
+class CustomAdapter(OpenAICompatibleAdapter):
     """Generic OpenAI-Compatible Adapter."""
+
+    circuit_name = "custom_llm"
     
     def __init__(self, api_key: str, base_url: str, model: str):
         self.api_key = api_key
@@ -126,64 +243,73 @@ class CustomAdapter(BaseLLMAdapter):
             api_key = api_key.replace("Bearer ", "")
         self.api_key = api_key
 
-    @cache_llm_call
-    @with_retry(max_retries=3, circuit_name="custom_llm")
-    def generate(self, prompt: str, **kwargs) -> str:
+    def _build_request(self, prompt: str, stream: bool = False, **kwargs):
         url = f"{self.base_url}/chat/completions"
         payload = {
             "model": self.model,
             "messages": [{"role": "user", "content": prompt}],
             "temperature": kwargs.get("temperature", 0.7)
         }
+        if stream:
+            payload["stream"] = True
         
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
-        resp = requests.post(url, json=payload, headers=headers, timeout=60)
-        
-        if resp.status_code == 401:
+        return url, payload, headers, 60
+
+    def _check_status(self, status_code: int, url: str):
+        if status_code == 401:
             raise ValueError("Invalid API Key (401 Unauthorized)")
-        elif resp.status_code == 404:
+        elif status_code == 404:
             raise ValueError(f"Endpoint not found (404). Check Base URL: {url}")
-        elif resp.status_code == 403:
+        elif status_code == 403:
             raise ValueError("Access Denied (403 Forbidden)")
-            
-        resp.raise_for_status()
-        data = resp.json()
-        return data["choices"][0]["message"]["content"]
 
-class AnthropicAdapter(BaseLLMAdapter):
+class AnthropicAdapter(HTTPChatAdapter):
     """Adapter for Anthropic API."""
+
+    circuit_name = "anthropic"
+    stream_format = "sse"
     
     def __init__(self, api_key: str, model: str = "claude-3-opus-20240229"):
         self.api_key = api_key
         self.model = model
         self.url = "https://api.anthropic.com/v1/messages"
 
-    @cache_llm_call
-    @with_retry(max_retries=3, circuit_name="anthropic")
-    def generate(self, prompt: str, **kwargs) -> str:
+    def _build_request(self, prompt: str, stream: bool = False, **kwargs):
         payload = {
             "model": self.model,
             "max_tokens": kwargs.get("max_tokens", 4096),
             "messages": [{"role": "user", "content": prompt}]
         }
-        
-        resp = requests.post(
-            self.url, 
-            json=payload, 
-            headers={
-                "x-api-key": self.api_key,
-                "anthropic-version": "2023-06-01",
-                "Content-Type": "application/json"
-            }, 
-            timeout=60
-        )
-        resp.raise_for_status()
-        data = resp.json()
+        if stream:
+            payload["stream"] = True
+        headers = {
+            "x-api-key": self.api_key,
+            "anthropic-version": "2023-06-01",
+            "Content-Type": "application/json"
+        }
+        return self.url, payload, headers, 60
+
+    def _parse_response(self, data: Any) -> str:
         return data["content"][0]["text"]
 
+    def _parse_stream_chunk(self, event: Dict[str, Any]) -> Optional[str]:
+        if event.get("type") == "content_block_delta":
+            return (event.get("delta") or {}).get("text")
+
+    def _stream_usage(self, usage: Any, event: Dict[str, Any]) -> Any:
+        # Input tokens arrive in message_start, the output count in message_delta
+        usage = usage or {"usage": {}}
+        if event.get("type") == "message_start":
+            usage["usage"].update((event.get("message") or {}).get("usage") or {})
+        elif event.get("type") == "message_delta":
+            usage["usage"].update(event.get("usage") or {})
+        return usage
+        return None
+
 class LMStudioAdapter(BaseLLMAdapter):
     """
     Dedicated Adapter for LM Studio Local Inference using LiteLLM.
@@ -226,7 +352,7 @@ class LMStudioAdapter(BaseLLMAdapter):
         try:
             url = f"{self.base_url}/models"
             # Fast timeout for detection
-            r = requests.get(url, timeout=2)
+            r = get_http_session().get(url, timeout=2)
             r.raise_for_status()
             
             data = r.json().get("data", [])
@@ -264,85 +390,119 @@ class LMStudioAdapter(BaseLLMAdapter):
             print(f"[WARN] Model Auto-Detection Warning: {e}")
             return self.config_model if self.config_model != "auto" else "local-model"
 
+    def _completion_kwargs(self, effective_model: str, prompt: str, **kwargs) -> Dict[str, Any]:
+        messages = [{"role": "user", "content": prompt}]
+        
+        # Check if we should enforce JSON mode
+        response_format = None
+        if "json" in prompt.lower():
+            response_format = {"type": "json_object"}
+
+        return dict(
+            model=f"openai/{effective_model}", 
+            api_base=self.api_base,
+            api_key="lm-studio", 
+            messages=messages,
+            temperature=kwargs.get("temperature", 0.7),
+            max_tokens=kwargs.get("max_tokens", 2048),
+            response_format=response_format,
+            timeout=300 # 5 minutes for slow local hardware
+        )
+
+    def _effective_model(self) -> str:
+        if self.config_model == "auto" or self.config_model == "local-model":
+            return self._auto_select_model()
+        return self.config_model
+
+    async def _async_effective_model(self) -> str:
+        if self._detected_model or self.config_model not in ("auto", "local-model"):
+            return self._effective_model()
+        # Detection is a one-off blocking probe; keep it off the event loop
+        return await asyncio.to_thread(self._auto_select_model)
+
+    def _wrap_error(self, e: Exception) -> ValueError:
+        msg = str(e)
+        if "Connection" in msg or "refused" in msg:
+            return ValueError(
+                f"LM Studio Connection Failed: Could not connect to {self.base_url}. "
+                "Please ensure LM Studio is running and the 'Local Server' is started."
+            )
+        if "formatted" in msg or "404" in msg:
+            # Likely model not found issue if auto-detect failed or wasn't used
+            return ValueError(
+                f"LM Studio Error: Model '{self.config_model}' not found or server error. "
+                f"Ensure a model is loaded in LM Studio. Details: {e}"
+            )
+        return ValueError(f"LM Studio/LiteLLM Error: {e}")
+
     @cache_llm_call
     def generate(self, prompt: str, **kwargs) -> str:
         try:
-            # Determine effective model
-            if self.config_model == "auto" or self.config_model == "local-model":
-                effective_model = self._auto_select_model()
-            else:
-                effective_model = self.config_model
-            
-            messages = [{"role": "user", "content": prompt}]
-            
-            # Check if we should enforce JSON mode
-            response_format = None
-            if "json" in prompt.lower():
-                response_format = {"type": "json_object"}
-
-            # LiteLLM call
-            response = litellm.completion(
-                model=f"openai/{effective_model}", 
-                api_base=self.api_base,
-                api_key="lm-studio", 
-                messages=messages,
-                temperature=kwargs.get("temperature", 0.7),
-                max_tokens=kwargs.get("max_tokens", 2048),
-                response_format=response_format,
-                timeout=300 # 5 minutes for slow local hardware
-            )
-            
+            completion_kwargs = self._completion_kwargs(self._effective_model(), prompt, **kwargs)
+            with track_llm(provider_name(self), "generate"):
+                response = litellm.completion(**completion_kwargs)
+            record_llm_tokens(provider_name(self), response)
+            return response.choices[0].message.content
+        except Exception as e:
+            raise self._wrap_error(e)
+
+    @async_cache_llm_call
+    async def async_generate(self, prompt: str, **kwargs) -> str:
+        try:
+            effective_model = await self._async_effective_model()
+            with track_llm(provider_name(self), "async_generate"):
+                response = await litellm.acompletion(**self._completion_kwargs(effective_model, prompt, **kwargs))
+            record_llm_tokens(provider_name(self), response)
             return response.choices[0].message.content
-            
         except Exception as e:
-            msg = str(e)
-            if "Connection" in msg or "refused" in msg:
-                 raise ValueError(
-                    f"LM Studio Connection Failed: Could not connect to {self.base_url}. "
-                    "Please ensure LM Studio is running and the 'Local Server' is started."
-                )
-            if "formatted" in msg or "404" in msg:
-                 # Likely model not found issue if auto-detect failed or wasn't used
-                 raise ValueError(
-                    f"LM Studio Error: Model '{self.config_model}' not found or server error. "
-                    f"Ensure a model is loaded in LM Studio. Details: {e}"
-                 )
-            raise ValueError(f"LM Studio/LiteLLM Error: {e}")
-
-class ZhipuAdapter(BaseLLMAdapter):
+            raise self._wrap_error(e)
+
+    async def stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        try:
+            effective_model = await self._async_effective_model()
+            async for text in _litellm_stream(
+                provider_name(self), self._completion_kwargs(effective_model, prompt, **kwargs)
+            ):
+                yield text
+        except Exception as e:
+            raise self._wrap_error(e)
+
+class ZhipuAdapter(OpenAICompatibleAdapter):
     """Adapter for Zhipu AI (GLM-4)."""
+
+    circuit_name = "zhipu"
     
     def __init__(self, api_key: str, model: str = "glm-5"):
         self.api_key = api_key
         self.model = model
         self.url = "https://open.bigmodel.cn/api/paas/v4/chat/completions"
 
-    @cache_llm_call
-    @with_retry(max_retries=3, circuit_name="zhipu")
-    def generate(self, prompt: str, **kwargs) -> str:
+    def _build_request(self, prompt: str, stream: bool = False, **kwargs):
         payload = {
             "model": self.model,
             "messages": [{"role": "user", "content": prompt}],
             "temperature": 0.7
         }
+        if stream:
+            payload["stream"] = True
         
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
-        resp = requests.post(self.url, json=payload, headers=headers, timeout=60)
-        resp.raise_for_status()
-        data = resp.json()
-        return data["choices"][0]["message"]["content"]
+        return self.url, payload, headers, 60
 
 
-class OllamaAdapter(BaseLLMAdapter):
+class OllamaAdapter(HTTPChatAdapter):
     """
     Robust adapter for local Ollama LLM with retry logic and graceful fallbacks.
     """
     
     MAX_RETRIES = 3
     RETRY_DELAY = 2.0
+
+    circuit_name = "ollama"
+    stream_format = "ndjson"
     
     def __init__(self, base_url: str = "http://localhost:11434", model: str = "llama2"):
         self.base_url = base_url.rstrip('/')
@@ -354,10 +514,11 @@ class OllamaAdapter(BaseLLMAdapter):
         self._available_models_cache = None
         self._models_cache_time = 0
 
-    def model_exists(self, model_name: str = None) -> bool:
+    def model_exists(self, model_name: str = None, available: Optional[list] = None) -> bool:
         """Check if a model exists in Ollama."""
         model_to_check = model_name or self.model
-        available = self.list_models()
+        if available is None:
+            available = self.list_models()
         
         # Check exact match or base model name match
         for m in available:
@@ -365,13 +526,13 @@ class OllamaAdapter(BaseLLMAdapter):
                 return True
         return False
 
-    def _verify_model_or_fallback(self) -> str:
+    def _verify_model_or_fallback(self, available: Optional[list] = None) -> str:
         """Verify model exists, try to find alternative, or return error message."""
-        if self.model_exists():
+        if available is None:
+            available = self.list_models()
+        if self.model_exists(available=available):
             return ""  # Model exists, no error
         
-        available = self.list_models()
-        
         if not available:
             return (
                 f"[Model Not Found] No models available in Ollama. "
@@ -387,49 +548,88 @@ class OllamaAdapter(BaseLLMAdapter):
             f"To install the model run: ollama pull {self.model}"
         )
 
-    @cache_llm_call
-    @with_retry(max_retries=3, circuit_name="ollama")
-    def generate(self, prompt: str, **kwargs) -> str:
-        """Generate text with automatic retries and model verification."""
-        # Pre-check: Verify model exists
-        model_error = self._verify_model_or_fallback()
-        if model_error:
-            return model_error
-        
+    def _build_request(self, prompt: str, stream: bool = False, **kwargs):
         url = f"{self.base_url}/api/generate"
         payload = {
             "model": self.model,
             "prompt": prompt,
-            "stream": False,
+            "stream": stream,
             "options": {
                 "temperature": kwargs.get("temperature", 0.7),
                 "num_predict": kwargs.get("max_tokens", 1024)
             }
         }
-        
-        resp = requests.post(url, json=payload, timeout=120)
-        
-        # Handle specific HTTP errors
-        if resp.status_code == 404:
-            return self._model_not_found_error()
-        
-        resp.raise_for_status()
-        data = resp.json()
-        
+        return url, payload, {}, 120
+
+    def _parse_response(self, data: Any) -> Optional[str]:
+        """Text of a generate response, or None when Ollama reports a missing model."""
         # Check for Ollama-specific error in response
         if "error" in data:
             error_msg = data.get("error", "")
             if "not found" in error_msg.lower() or "doesn't exist" in error_msg.lower():
-                return self._model_not_found_error()
+                return None
             return f"[Ollama Error] {error_msg}"
         
         import time as t
         self._last_success = t.time()
         return data.get("response", "")
+
+    def _parse_stream_chunk(self, event: Dict[str, Any]) -> Optional[str]:
+        if "error" in event:
+            raise ValueError(f"[Ollama Error] {event['error']}")
+        return event.get("response")
+
+    @cache_llm_call
+    @with_retry(max_retries=3, circuit_name="ollama")
+    def generate(self, prompt: str, **kwargs) -> str:
+        """Generate text with automatic retries and model verification."""
+        # Pre-check: Verify model exists
+        model_error = self._verify_model_or_fallback()
+        if model_error:
+            return model_error
+        
+        url, payload, headers, timeout = self._build_request(prompt, **kwargs)
+        with track_llm(provider_name(self), "generate"):
+            resp = get_http_session().post(url, json=payload, timeout=timeout)
+            if resp.status_code != 404:
+                resp.raise_for_status()
+                data = resp.json()
+        
+        # Handle specific HTTP errors
+        if resp.status_code == 404:
+            return self._model_not_found_error()
+        record_llm_tokens(provider_name(self), data)
+        text = self._parse_response(data)
+        return text if text is not None else self._model_not_found_error()
+
+    @async_cache_llm_call
+    @async_with_retry(max_retries=3, circuit_name="ollama")
+    async def async_generate(self, prompt: str, **kwargs) -> str:
+        """Async generate on the pooled client, with the same checks as generate()."""
+        available = await self.async_list_models()
+        model_error = self._verify_model_or_fallback(available)
+        if model_error:
+            return model_error
+        
+        url, payload, headers, timeout = self._build_request(prompt, **kwargs)
+        with track_llm(provider_name(self), "async_generate"):
+            resp = await get_async_client().post(url, json=payload, timeout=timeout)
+            if resp.status_code != 404:
+                resp.raise_for_status()
+                data = resp.json()
+        
+        if resp.status_code == 404:
+            return self._model_not_found_error(await self.async_list_models())
+        record_llm_tokens(provider_name(self), data)
+        text = self._parse_response(data)
+        if text is None:
+            return self._model_not_found_error(await self.async_list_models())
+        return text
     
-    def _model_not_found_error(self) -> str:
+    def _model_not_found_error(self, available: Optional[list] = None) -> str:
         """Return a helpful error message when model is not found."""
-        available = self.list_models()
+        if available is None:
+            available = self.list_models()
         if available:
             return (
                 f"[Model Not Found] Model '{self.model}' is not installed.\n"
@@ -457,9 +657,11 @@ class OllamaAdapter(BaseLLMAdapter):
         
         for attempt in range(self.MAX_RETRIES):
             try:
-                resp = requests.post(url, json=payload, timeout=120)
-                resp.raise_for_status()
-                data = resp.json()
+                with track_llm(provider_name(self), "chat"):
+                    resp = get_http_session().post(url, json=payload, timeout=120)
+                    resp.raise_for_status()
+                    data = resp.json()
+                record_llm_tokens(provider_name(self), data)
                 self._failure_count = 0
                 return data.get("message", {}).get("content", "")
                 
@@ -484,7 +686,7 @@ class OllamaAdapter(BaseLLMAdapter):
             return self._is_available_cache
         
         try:
-            resp = requests.get(f"{self.base_url}/api/tags", timeout=10)
+            resp = get_http_session().get(f"{self.base_url}/api/tags", timeout=10)
             self._is_available_cache = resp.status_code == 200
         except:
             self._is_available_cache = False
@@ -495,12 +697,22 @@ class OllamaAdapter(BaseLLMAdapter):
     def list_models(self) -> list:
         """List available models in Ollama."""
         try:
-            resp = requests.get(f"{self.base_url}/api/tags", timeout=10)
+            resp = get_http_session().get(f"{self.base_url}/api/tags", timeout=10)
             resp.raise_for_status()
             data = resp.json()
             return [m.get("name", "") for m in data.get("models", [])]
         except:
             return []
+
+    async def async_list_models(self) -> list:
+        """List available models in Ollama without blocking the event loop."""
+        try:
+            resp = await get_async_client().get(f"{self.base_url}/api/tags", timeout=10)
+            resp.raise_for_status()
+            data = resp.json()
+            return [m.get("name", "") for m in data.get("models", [])]
+        except Exception:
+            return []
     
     def _graceful_fallback(self, error: str) -> str:
         """Return a helpful message instead of crashing."""
@@ -518,6 +730,21 @@ class OllamaAdapter(BaseLLMAdapter):
         else:
             return f"[Ollama Error] {error}. Please check Ollama logs or use a cloud API."
 
+async def _litellm_stream(provider: str, completion_kwargs: Dict[str, Any]) -> AsyncIterator[str]:
+    """Yield text deltas of a streamed LiteLLM completion, timing the whole stream."""
+    usage = None
+    try:
+        with track_llm(provider, "stream"):
+            response = await litellm.acompletion(stream=True, **completion_kwargs)
+            async for chunk in response:
+                if any(token_usage(chunk)):
+                    usage = chunk
+                text = chunk.choices[0].delta.content if chunk.choices else None
+                if text:
+                    yield text
+    finally:
+        record_llm_tokens(provider, usage)
+
 class AzureAdapter(BaseLLMAdapter):
     """Adapter for Azure OpenAI Service using LiteLLM."""
     
@@ -527,9 +754,7 @@ class AzureAdapter(BaseLLMAdapter):
         self.deployment_name = deployment_name
         self.api_version = api_version
         
-    @cache_llm_call
-    @with_retry(max_retries=3, circuit_name="azure_openai")
-    def generate(self, prompt: str, **kwargs) -> str:
+    def _completion_kwargs(self, prompt: str, **kwargs) -> Dict[str, Any]:
         messages = [{"role": "user", "content": prompt}]
         
         # Azure requires: 
@@ -538,7 +763,7 @@ class AzureAdapter(BaseLLMAdapter):
         # api_key=key
         # api_version=ver
         
-        response = litellm.completion(
+        return dict(
             model=f"azure/{self.deployment_name}",
             api_key=self.api_key,
             api_base=self.endpoint,
@@ -548,8 +773,27 @@ class AzureAdapter(BaseLLMAdapter):
             max_tokens=kwargs.get("max_tokens", 4096),
             timeout=60
         )
+
+    @cache_llm_call
+    @with_retry(max_retries=3, circuit_name="azure_openai")
+    def generate(self, prompt: str, **kwargs) -> str:
+        with track_llm(provider_name(self), "generate"):
+            response = litellm.completion(**self._completion_kwargs(prompt, **kwargs))
+        record_llm_tokens(provider_name(self), response)
+        return response.choices[0].message.content
+
+    @async_cache_llm_call
+    @async_with_retry(max_retries=3, circuit_name="azure_openai")
+    async def async_generate(self, prompt: str, **kwargs) -> str:
+        with track_llm(provider_name(self), "async_generate"):
+            response = await litellm.acompletion(**self._completion_kwargs(prompt, **kwargs))
+        record_llm_tokens(provider_name(self), response)
         return response.choices[0].message.content
 
+    async def stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        async for text in _litellm_stream(provider_name(self), self._completion_kwargs(prompt, **kwargs)):
+            yield text
+
 class AWSAdapter(BaseLLMAdapter):
     """Adapter for AWS Bedrock using LiteLLM."""
     
@@ -569,12 +813,10 @@ class AWSAdapter(BaseLLMAdapter):
         # Better: LiteLLM allows passing `aws_access_key_id` in `completion` in newer versions.
         # If not, we fall back to os.environ.
     
-    @cache_llm_call
-    @with_retry(max_retries=3, circuit_name="aws_bedrock")
-    def generate(self, prompt: str, **kwargs) -> str:
+    def _completion_kwargs(self, prompt: str, **kwargs) -> Dict[str, Any]:
         messages = [{"role": "user", "content": prompt}]
         
-        response = litellm.completion(
+        return dict(
             model=f"bedrock/{self.model_id}",
             aws_access_key_id=self.access_key,
             aws_secret_access_key=self.secret_key,
@@ -584,8 +826,27 @@ class AWSAdapter(BaseLLMAdapter):
             max_tokens=kwargs.get("max_tokens", 4096),
             timeout=60
         )
+
+    @cache_llm_call
+    @with_retry(max_retries=3, circuit_name="aws_bedrock")
+    def generate(self, prompt: str, **kwargs) -> str:
+        with track_llm(provider_name(self), "generate"):
+            response = litellm.completion(**self._completion_kwargs(prompt, **kwargs))
+        record_llm_tokens(provider_name(self), response)
+        return response.choices[0].message.content
+
+    @async_cache_llm_call
+    @async_with_retry(max_retries=3, circuit_name="aws_bedrock")
+    async def async_generate(self, prompt: str, **kwargs) -> str:
+        with track_llm(provider_name(self), "async_generate"):
+            response = await litellm.acompletion(**self._completion_kwargs(prompt, **kwargs))
+        record_llm_tokens(provider_name(self), response)
         return response.choices[0].message.content
 
+    async def stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        async for text in _litellm_stream(provider_name(self), self._completion_kwargs(prompt, **kwargs)):
+            yield text
+
 
 class MiniMaxAdapter(BaseLLMAdapter):
     """MiniMax API Adapter for Chinese LLM services."""
@@ -613,16 +874,17 @@ class MiniMaxAdapter(BaseLLMAdapter):
         if self.group_id:
             headers['GroupId'] = self.group_id
 
-        import requests
-        response = requests.post(
-            f"{self.base_url}/chat/completions",
-            headers=headers,
-            json=payload,
-            timeout=30
-        )
-
-        response.raise_for_status()
-        return response.json()['choices'][0]['message']['content']
+        with track_llm(provider_name(self), "chat"):
+            response = get_http_session().post(
+                f"{self.base_url}/chat/completions",
+                headers=headers,
+                json=payload,
+                timeout=30
+            )
+            response.raise_for_status()
+            data = response.json()
+        record_llm_tokens(provider_name(self), data)
+        return data['choices'][0]['message']['content']
 
     def embed(self, text: str) -> list:
         """Generate embeddings using MiniMax API."""
@@ -634,8 +896,7 @@ class MiniMaxAdapter(BaseLLMAdapter):
         if self.group_id:
             headers['GroupId'] = self.group_id
 
-        import requests
-        response = requests.post(
+        response = get_http_session().post(
             f"{self.base_url}/embeddings",
             headers=headers,
             json={'model': self.model, 'input': text},
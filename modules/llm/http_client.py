@@ -0,0 +1,104 @@
+"""
+Shared HTTP Clients for LLM Adapters
+Pooled keep-alive connections reused by every adapter instance, so parallel
+agents do not redo TCP/TLS handshakes or tie up threads for each call.
+
+- get_http_session(): requests.Session for the synchronous generate() path
+- get_async_client(): httpx.AsyncClient (HTTP/2 when the 'h2' package is
+  installed) for async_generate() and stream(); one per event loop
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+from typing import AsyncIterator, Dict, Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger("llm.http_client")
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+MAX_CONNECTIONS = int(os.getenv("BIODOCKIFY_LLM_MAX_CONNECTIONS", 64))
+KEEPALIVE_EXPIRY = 60.0
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_async_clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+
+
+def get_http_session() -> requests.Session:
+    """Process-wide pooled requests session."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=16, pool_maxsize=MAX_CONNECTIONS)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Pooled async client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        # Drop clients whose loop has gone away
+        for stale in [l for l in _async_clients if l.is_closed()]:
+            _async_clients.pop(stale, None)
+        client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+            follow_redirects=True,
+        )
+        _async_clients[loop] = client
+        logger.debug(f"Opened pooled LLM client (http2={HTTP2_AVAILABLE})")
+    return client
+
+
+async def close_async_clients():
+    """Close the pooled async client of the running loop (call on shutdown)."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def iter_sse_data(response: httpx.Response) -> AsyncIterator[dict]:
+    """Yield the JSON payloads of a server-sent event stream ('data: {...}' lines)."""
+    async for line in response.aiter_lines():
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if not data or data == "[DONE]":
+            continue
+        try:
+            yield json.loads(data)
+        except json.JSONDecodeError:
+            logger.debug(f"Skipping malformed stream chunk: {data[:80]}")
+
+
+async def iter_ndjson(response: httpx.Response) -> AsyncIterator[dict]:
+    """Yield the objects of a newline-delimited JSON stream."""
+    async for line in response.aiter_lines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            logger.debug(f"Skipping malformed stream chunk: {line[:80]}")
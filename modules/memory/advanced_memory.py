@@ -99,6 +99,7 @@ class AdvancedMemorySystem:
         self._initialize_collections()
 
         self.embedder = None
+        self.embedding_service = None
         self._initialize_embedder()
 
         self.working_memory: List[Memory] = []
@@ -161,9 +162,11 @@ class AdvancedMemorySystem:
     def _initialize_embedder(self):
         """Initialize sentence transformer for embeddings"""
         try:
-            from sentence_transformers import SentenceTransformer
+            from modules.rag.embedding_service import get_embedding_service
 
-            self.embedder = SentenceTransformer(self.embedding_model_name)
+            # Shared, micro-batched and cached model instead of a private copy
+            self.embedding_service = get_embedding_service(self.embedding_model_name)
+            self.embedder = self.embedding_service.model
             logger.info(f"Loaded embedding model: {self.embedding_model_name}")
         except ImportError:
             logger.warning(
@@ -176,9 +179,14 @@ class AdvancedMemorySystem:
 
     def _generate_embedding(self, text: str) -> List[float]:
         """Generate embedding for text"""
-        if self.embedder:
-            embedding = self.embedder.encode(text, convert_to_numpy=True)
-            return embedding.tolist()
+        if self.embedding_service:
+            return self.embedding_service.embed([text])[0].tolist()
+        return [0.0] * 384
+
+    async def _agenerate_embedding(self, text: str) -> List[float]:
+        """Generate embedding for text without blocking the event loop"""
+        if self.embedding_service:
+            return (await self.embedding_service.aembed([text]))[0].tolist()
         return [0.0] * 384
 
     async def add_memory(
@@ -207,7 +215,7 @@ class AdvancedMemorySystem:
             metadata=metadata or {},
         )
 
-        embedding = self._generate_embedding(content)
+        embedding = await self._agenerate_embedding(content)
         memory.embedding = embedding
 
         collection_name = f"{memory_type.value}_memory"
@@ -297,7 +305,7 @@ class AdvancedMemorySystem:
         else:
             collections_to_search = list(self.collections.keys())
 
-        query_embedding = self._generate_embedding(query)
+        query_embedding = await self._agenerate_embedding(query)
 
         for collection_name in collections_to_search:
             try:
@@ -6,14 +6,23 @@ Features:
 - Resource management
 - Progress tracking
 - Conflict detection
+
+Scheduling keeps a priority heap of ready tasks and a dependency DAG with
+indegree counts, so adding and dispatching a task is O(log n). State is
+persisted as a snapshot plus an append-only JSON-lines journal; the snapshot
+is only rewritten when the journal is compacted.
 """
 
+import os
 import uuid
+import heapq
+import itertools
 import asyncio
 import logging
 import json
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime, timezone
 from enum import Enum
 from dataclasses import dataclass, field, asdict
@@ -52,6 +61,33 @@ class ExecutableTask:
     device_session_id: Optional[str] = None
 
 
+_TERMINAL = (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED)
+
+
+def _serialize(obj):
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return obj
+
+
+def _task_to_dict(task: ExecutableTask) -> Dict[str, Any]:
+    return asdict(task)
+
+
+def _dict_to_task(d: Dict[str, Any]) -> ExecutableTask:
+    d = dict(d)
+    # Handle datetime parsing - ensure timezone-aware datetimes
+    for key in ("started_at", "completed_at"):
+        if d.get(key):
+            dt = datetime.fromisoformat(d[key])
+            # Make naive datetime timezone-aware (assume UTC)
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            d[key] = dt
+    d["status"] = TaskStatus(d.get("status", TaskStatus.QUEUED))
+    return ExecutableTask(**d)
+
+
 class MultiTaskScheduler:
     """
     Multi-Task Scheduler
@@ -59,7 +95,7 @@ class MultiTaskScheduler:
     Features:
     - Execute multiple tasks in parallel
     - Manage task dependencies
-    - Prioritize and queue tasks
+    - Prioritize and queue tasks (lower priority value runs first)
     - Track progress
     - Handle task conflicts
     - Resource allocation
@@ -70,14 +106,33 @@ class MultiTaskScheduler:
         max_parallel_tasks=5,
         task_manager=None,
         persistence_path: str = "./data/scheduler_state.json",
+        completed_retention: int = 1000,
+        journal_compact_every: int = 5000,
     ):
         self.max_parallel_tasks = max_parallel_tasks
         self.task_manager = task_manager
         self.persistence_path = Path(persistence_path)
-        self.task_queue: List[ExecutableTask] = []
+        self.journal_path = self.persistence_path.with_suffix(".journal")
+        self.completed_retention = completed_retention
+        self.journal_compact_every = journal_compact_every
+
+        self.queued_tasks: Dict[str, ExecutableTask] = {}
         self.running_tasks: Dict[str, ExecutableTask] = {}
         self.paused_tasks: Dict[str, ExecutableTask] = {}
-        self.completed_tasks: List[ExecutableTask] = []
+        # Most recent finished/cancelled tasks, oldest first
+        self.completed_tasks: "OrderedDict[str, ExecutableTask]" = OrderedDict()
+
+        # Ready heap of (priority, sequence, task_id); entries for tasks that
+        # left the queue are skipped when popped
+        self._ready: List[Tuple[int, int, str]] = []
+        self._seq = itertools.count()
+        self._indegree: Dict[str, int] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+        # Number of tasks that ever finished (completed or failed)
+        self._finished_count = 0
+
+        self._journal = None
+        self._journal_records = 0
         self.executor = ThreadPoolExecutor(max_workers=max_parallel_tasks)
 
         # Ensure directory exists
@@ -88,6 +143,80 @@ class MultiTaskScheduler:
     def _setup_logging(self):
         logger.info("Multi-Task Scheduler initialized")
 
+    @property
+    def task_queue(self) -> List[ExecutableTask]:
+        """Queued tasks in dispatch order (ready or waiting on dependencies)"""
+        return sorted(self.queued_tasks.values(), key=lambda t: t.priority)
+
+    # ------------------------------------------------------------------
+    # Dependency graph
+    # ------------------------------------------------------------------
+
+    def _enqueue(self, task: ExecutableTask):
+        """Queue a task, linking it to its unfinished dependencies"""
+        task.status = TaskStatus.QUEUED
+        self.queued_tasks[task.id] = task
+        pending = [d for d in set(task.dependencies) if not self._is_finished(d)]
+        self._indegree[task.id] = len(pending)
+        for dep in pending:
+            self._dependents.setdefault(dep, set()).add(task.id)
+        if not pending:
+            heapq.heappush(self._ready, (task.priority, next(self._seq), task.id))
+
+    def _dequeue(self, task_id: str) -> Optional[ExecutableTask]:
+        task = self.queued_tasks.pop(task_id, None)
+        if task is not None:
+            self._indegree.pop(task_id, None)
+            for dep in task.dependencies:
+                waiting = self._dependents.get(dep)
+                if waiting:
+                    waiting.discard(task_id)
+                    if not waiting:
+                        del self._dependents[dep]
+        return task
+
+    def _is_finished(self, task_id: str) -> bool:
+        """A dependency is satisfied by a retained task that completed or failed"""
+        task = self.completed_tasks.get(task_id)
+        return task is not None and task.status in (TaskStatus.COMPLETED, TaskStatus.FAILED)
+
+    def _release_dependents(self, task_id: str):
+        """Mark a task finished and move dependents with no open deps to the ready heap"""
+        self._finished_count += 1
+        for dependent in self._dependents.pop(task_id, ()):
+            if dependent not in self._indegree:
+                continue
+            self._indegree[dependent] -= 1
+            if self._indegree[dependent] == 0:
+                task = self.queued_tasks[dependent]
+                heapq.heappush(self._ready, (task.priority, next(self._seq), dependent))
+
+    def _cancel_dependents(self, task_id: str):
+        """Cancel queued tasks that wait, directly or transitively, on a cancelled task"""
+        stack = [task_id]
+        while stack:
+            cancelled = stack.pop()
+            for dependent in self._dependents.pop(cancelled, ()):
+                task = self._dequeue(dependent)
+                if task is None:
+                    continue
+                task.status = TaskStatus.CANCELLED
+                task.error = f"Dependency {cancelled} was cancelled"
+                self._retain(task)
+                self._log("update", id=dependent, fields={"status": task.status, "error": task.error})
+                logger.info(f"Cancelled task {dependent}: dependency {cancelled} was cancelled")
+                stack.append(dependent)
+
+    def _retain(self, task: ExecutableTask):
+        self.completed_tasks[task.id] = task
+        self.completed_tasks.move_to_end(task.id)
+        while len(self.completed_tasks) > self.completed_retention:
+            self.completed_tasks.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
     async def add_task(
         self,
         task_id: str,
@@ -110,10 +239,11 @@ class MultiTaskScheduler:
             device_session_id=device_session_id,
         )
 
-        self.task_queue.append(task)
-        self.task_queue.sort(key=lambda t: t.priority)
+        # Re-adding an id replaces the queued entry
+        self._dequeue(task_id)
+        self._enqueue(task)
 
-        await self.save_state()
+        self._log("add", task=_task_to_dict(task))
         logger.info(f"Added task to queue: {task_id} - {title} (priority: {priority})")
         return task
 
@@ -121,111 +251,148 @@ class MultiTaskScheduler:
         """Update progress for a running task"""
         if task_id in self.running_tasks:
             self.running_tasks[task_id].progress = progress
-            await self.save_state()
+            self._log("update", id=task_id, fields={"progress": progress})
             return True
         return False
 
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _log(self, op: str, **record):
+        """Append one state change to the journal"""
+        try:
+            if self._journal is None:
+                self._journal = open(self.journal_path, "a", encoding="utf-8")
+            self._journal.write(json.dumps({"op": op, **record}, default=_serialize) + "\n")
+            self._journal.flush()
+            self._journal_records += 1
+        except Exception as e:
+            logger.error(f"Failed to journal scheduler state: {e}")
+            return
+        if self._journal_records >= self.journal_compact_every:
+            self._write_snapshot()
+
     async def save_state(self):
-        """Save current scheduler state to disk"""
+        """Write a full snapshot to disk and truncate the journal"""
+        self._write_snapshot()
+
+    def _write_snapshot(self):
         try:
             state = {
-                "queued": [asdict(t) for t in self.task_queue],
-                "running": [asdict(t) for t in self.running_tasks.values()],
-                "paused": [asdict(t) for t in self.paused_tasks.values()],
-                "completed": [asdict(t) for t in self.completed_tasks],
+                "queued": [_task_to_dict(t) for t in self.task_queue],
+                "running": [_task_to_dict(t) for t in self.running_tasks.values()],
+                "paused": [_task_to_dict(t) for t in self.paused_tasks.values()],
+                "completed": [_task_to_dict(t) for t in self.completed_tasks.values()],
+                "finished_count": self._finished_count,
             }
 
-            # Serialize datetimes
-            def serializer(obj):
-                if isinstance(obj, datetime):
-                    return obj.isoformat()
-                return obj
-
-            with open(self.persistence_path, "w") as f:
-                json.dump(state, f, indent=2, default=serializer)
+            tmp_path = self.persistence_path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(state, f, default=_serialize)
+            os.replace(tmp_path, self.persistence_path)
+
+            # Everything in the journal is now in the snapshot
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            open(self.journal_path, "w").close()
+            self._journal_records = 0
         except Exception as e:
             logger.error(f"Failed to save scheduler state: {e}")
 
     async def load_state(self):
-        """Load scheduler state from disk"""
-        if not self.persistence_path.exists():
+        """Load scheduler state from the snapshot and replay the journal"""
+        if not self.persistence_path.exists() and not self.journal_path.exists():
             return
 
         try:
-            with open(self.persistence_path, "r") as f:
-                state = json.load(f)
-
-            def dict_to_task(d):
-                # Handle datetime parsing - ensure timezone-aware datetimes
-                if d.get("started_at"):
-                    dt = datetime.fromisoformat(d["started_at"])
-                    # Make naive datetime timezone-aware (assume UTC)
-                    if dt.tzinfo is None:
-                        dt = dt.replace(tzinfo=timezone.utc)
-                    d["started_at"] = dt
-                if d.get("completed_at"):
-                    dt = datetime.fromisoformat(d["completed_at"])
-                    # Make naive datetime timezone-aware (assume UTC)
-                    if dt.tzinfo is None:
-                        dt = dt.replace(tzinfo=timezone.utc)
-                    d["completed_at"] = dt
-                return ExecutableTask(**d)
-
-            self.task_queue = [dict_to_task(t) for t in state.get("queued", [])]
-            self.running_tasks = {
-                t["id"]: dict_to_task(t) for t in state.get("running", [])
-            }
-            self.paused_tasks = {
-                t["id"]: dict_to_task(t) for t in state.get("paused", [])
-            }
-            self.completed_tasks = [dict_to_task(t) for t in state.get("completed", [])]
-
-            # Re-queue running tasks if they weren't finished
-            for tid, task in list(self.running_tasks.items()):
-                task.status = TaskStatus.QUEUED
-                self.task_queue.append(task)
-                del self.running_tasks[tid]
-
+            tasks: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+            finished_count = 0
+            if self.persistence_path.exists():
+                with open(self.persistence_path, "r") as f:
+                    state = json.load(f)
+                for section in ("completed", "paused", "running", "queued"):
+                    for t in state.get(section, []):
+                        tasks[t["id"]] = t
+                # Older snapshots listed every finished id
+                finished_count = state.get("finished_count", len(state.get("finished_ids", [])))
+
+            if self.journal_path.exists():
+                with open(self.journal_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError:
+                            # A torn final line from a crash mid-write
+                            continue
+                        if record["op"] == "add":
+                            tasks.pop(record["task"]["id"], None)
+                            tasks[record["task"]["id"]] = record["task"]
+                        elif record["op"] == "update" and record["id"] in tasks:
+                            tasks[record["id"]].update(record["fields"])
+                            status = record["fields"].get("status")
+                            if status in _TERMINAL:
+                                tasks.move_to_end(record["id"])
+                            if status in (TaskStatus.COMPLETED, TaskStatus.FAILED):
+                                finished_count += 1
+
+            self.queued_tasks.clear()
+            self.running_tasks.clear()
+            self.paused_tasks.clear()
+            self.completed_tasks.clear()
+            self._ready.clear()
+            self._indegree.clear()
+            self._dependents.clear()
+            self._finished_count = finished_count
+
+            restored = [_dict_to_task(d) for d in tasks.values()]
+            # History first, so queued tasks see which dependencies are satisfied
+            for task in restored:
+                if task.status in _TERMINAL:
+                    self._retain(task)
+            for task in restored:
+                if task.status in _TERMINAL:
+                    continue
+                elif task.status == TaskStatus.PAUSED:
+                    self.paused_tasks[task.id] = task
+                else:
+                    # Re-queue running tasks if they weren't finished
+                    self._enqueue(task)
+
+            self._write_snapshot()
             logger.info("Scheduler state loaded successfully")
         except Exception as e:
             logger.error(f"Failed to load scheduler state: {e}")
 
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
     async def start_next_tasks(self):
         """Start next available tasks"""
         if len(self.running_tasks) >= self.max_parallel_tasks:
             logger.info(f"Maximum parallel tasks reached ({self.max_parallel_tasks})")
             return
 
-        available_tasks = []
-        for task in self.task_queue:
-            if task.status == TaskStatus.QUEUED:
-                deps_satisfied = await self._check_dependencies(task.dependencies)
-                if deps_satisfied:
-                    available_tasks.append(task)
-
-        available_tasks.sort(key=lambda t: t.priority)
-
-        for task in available_tasks[
-            : self.max_parallel_tasks - len(self.running_tasks)
-        ]:
+        while self._ready and len(self.running_tasks) < self.max_parallel_tasks:
+            _, _, task_id = heapq.heappop(self._ready)
+            task = self.queued_tasks.get(task_id)
+            if task is None or self._indegree.get(task_id):
+                continue
             await self._start_task(task)
 
     async def _check_dependencies(self, dependencies: List[str]) -> bool:
         """Check if all dependencies are satisfied"""
-        completed_ids = {t.id for t in self.completed_tasks}
-        for dep_id in dependencies:
-            if dep_id not in completed_ids:
-                return False
-        return True
+        return all(self._is_finished(dep_id) for dep_id in dependencies)
 
     async def _start_task(self, task: ExecutableTask):
         """Start a task for execution"""
+        self._dequeue(task.id)
         task.status = TaskStatus.RUNNING
         task.started_at = datetime.now(timezone.utc)
         self.running_tasks[task.id] = task
-
-        # Remove from queue
-        self.task_queue = [t for t in self.task_queue if t.id != task.id]
+        self._log("update", id=task.id, fields={"status": task.status, "started_at": task.started_at})
 
         logger.info(f"Starting task: {task.id} - {task.title}")
         asyncio.create_task(self._execute_task(task))
@@ -238,15 +405,18 @@ class MultiTaskScheduler:
             task.completed_at = datetime.now(timezone.utc)
             task.result = result
             task.progress = 100.0
-            self.completed_tasks.append(task)
         except Exception as e:
             task.status = TaskStatus.FAILED
             task.error = str(e)
-            self.completed_tasks.append(task)
             logger.error(f"Task failed: {task.id} - {str(e)}")
         finally:
-            if task.id in self.running_tasks:
-                del self.running_tasks[task.id]
+            if self.running_tasks.pop(task.id, None) is not None:
+                self._retain(task)
+                self._release_dependents(task.id)
+                self._log("update", id=task.id, fields={
+                    "status": task.status, "completed_at": task.completed_at,
+                    "result": task.result, "error": task.error, "progress": task.progress,
+                })
             await self.start_next_tasks()
 
     async def _execute_task_logic(self, task: ExecutableTask) -> Dict[str, Any]:
@@ -280,52 +450,47 @@ class MultiTaskScheduler:
 
     async def pause_task(self, task_id: str):
         if task_id in self.running_tasks:
-            task = self.running_tasks[task_id]
+            task = self.running_tasks.pop(task_id)
             task.status = TaskStatus.PAUSED
             self.paused_tasks[task_id] = task
-            del self.running_tasks[task_id]
+            self._log("update", id=task_id, fields={"status": task.status})
             return True
         return False
 
     async def resume_task(self, task_id: str):
         if task_id in self.paused_tasks:
-            task = self.paused_tasks[task_id]
-            task.status = TaskStatus.QUEUED
-            self.task_queue.append(task)
-            del self.paused_tasks[task_id]
+            task = self.paused_tasks.pop(task_id)
+            self._enqueue(task)
+            self._log("update", id=task_id, fields={"status": task.status})
             await self.start_next_tasks()
             return True
         return False
 
     async def cancel_task(self, task_id: str):
-        for i, task in enumerate(self.task_queue):
-            if task.id == task_id:
-                task.status = TaskStatus.CANCELLED
-                self.task_queue.pop(i)
-                return True
-        if task_id in self.running_tasks:
-            self.running_tasks[task_id].status = TaskStatus.CANCELLED
-            del self.running_tasks[task_id]
-            return True
-        return False
+        task = self._dequeue(task_id) or self.running_tasks.pop(task_id, None)
+        if task is None:
+            return False
+        task.status = TaskStatus.CANCELLED
+        self._retain(task)
+        self._log("update", id=task_id, fields={"status": task.status})
+        # Dependents can never start now
+        self._cancel_dependents(task_id)
+        return True
 
     async def get_task_status(self, task_id: str) -> Optional[Dict[str, Any]]:
-        for task in (
-            self.task_queue
-            + list(self.running_tasks.values())
-            + list(self.paused_tasks.values())
-            + self.completed_tasks
-        ):
-            if task.id == task_id:
+        for tasks in (self.queued_tasks, self.running_tasks, self.paused_tasks, self.completed_tasks):
+            task = tasks.get(task_id)
+            if task is not None:
                 return asdict(task)
         return None
 
     async def get_queue_status(self) -> Dict[str, Any]:
         return {
-            "queued": len(self.task_queue),
+            "queued": len(self.queued_tasks),
+            "ready": sum(1 for d in self._indegree.values() if d == 0),
             "running": len(self.running_tasks),
             "paused": len(self.paused_tasks),
-            "completed": len(self.completed_tasks),
+            "completed": self._finished_count,
             "max_parallel": self.max_parallel_tasks,
             "utilization": (len(self.running_tasks) / self.max_parallel_tasks * 100)
             if self.max_parallel_tasks > 0
@@ -335,6 +500,10 @@ class MultiTaskScheduler:
     async def shutdown(self):
         for task in self.running_tasks.values():
             task.status = TaskStatus.CANCELLED
+        self._write_snapshot()
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
         self.executor.shutdown(wait=True)
         logger.info("Multi-Task Scheduler shutdown complete")
 
@@ -0,0 +1,379 @@
+"""
+ID-addressable approximate nearest neighbour index for the RAG vector store.
+
+Wraps a FAISS index (flat, IVF or HNSW) behind stable int64 vector ids and
+persists it as an append-only log:
+
+    ann/
+      manifest.json         small pointer file, rewritten atomically
+      snapshot_<gen>.faiss  full index written by the last compaction
+      seg_<n>.npz           (ids, vectors) batches added since the snapshot
+      tombstones_<gen>.bin  int64 ids removed since the snapshot
+
+Adds and deletes only touch their own batch, so ingest cost is O(batch).
+Compaction folds segments and tombstones into a fresh snapshot, physically
+drops removed vectors (HNSW cannot remove in place) and trains the IVF
+quantizer once enough vectors are available.
+"""
+
+import os
+import json
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from runtime.instrumentation import VECTOR_SEARCH_SECONDS, track
+
+try:
+    import faiss
+except Exception as e:
+    logging.getLogger(__name__).warning(f"FAISS failed to load: {e}")
+    faiss = None
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_BACKENDS = ("flat", "ivf", "hnsw")
+
+
+class ANNIndex:
+    """
+    FAISS index with stable ids, real deletes and segment persistence.
+
+    Args:
+        storage_dir: Directory holding the manifest, snapshot and segments.
+        dimension: Embedding dimension.
+        backend: "flat" (exact), "ivf" (inverted lists) or "hnsw" (graph).
+        nlist: Number of IVF cells.
+        nprobe: IVF cells visited per query.
+        hnsw_m: HNSW graph degree.
+        ef_search: HNSW search beam width.
+        max_segments: Compact once this many segments are pending.
+        compact_ratio: Compact once removed/total exceeds this ratio.
+    """
+
+    def __init__(
+        self,
+        storage_dir: str,
+        dimension: int,
+        backend: str = "flat",
+        nlist: int = 1024,
+        nprobe: int = 16,
+        hnsw_m: int = 32,
+        ef_search: int = 64,
+        max_segments: int = 64,
+        compact_ratio: float = 0.2,
+    ):
+        if backend not in SUPPORTED_BACKENDS:
+            raise ValueError(f"Unsupported index backend '{backend}'. Use one of {SUPPORTED_BACKENDS}.")
+        if not faiss:
+            raise ImportError("faiss is required for ANNIndex. Install faiss-cpu.")
+
+        self.storage_dir = storage_dir
+        self.dimension = dimension
+        self.backend = backend
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.hnsw_m = hnsw_m
+        self.ef_search = ef_search
+        self.max_segments = max_segments
+        self.compact_ratio = compact_ratio
+
+        # "ivf" starts out flat until there is enough data to train the quantizer
+        self.active_backend = "flat" if backend == "ivf" else backend
+        self.next_id = 0
+        self.generation = 0
+        self.snapshot: Optional[str] = None
+        self.segments: List[str] = []
+        self._segment_seq = 0
+        self._tombstones: set = set()  # ids still physically present in the index
+        self._removed_since_snapshot = 0
+        self.index = None
+
+        os.makedirs(storage_dir, exist_ok=True)
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    @property
+    def ntotal(self) -> int:
+        """Number of live (searchable) vectors."""
+        if self.index is None:
+            return 0
+        return int(self.index.ntotal) - len(self._tombstones)
+
+    @property
+    def ivf_train_size(self) -> int:
+        """Vectors needed before an IVF quantizer is trained."""
+        return self.nlist * 39
+
+    def add(self, vectors: np.ndarray, ids: Optional[np.ndarray] = None) -> np.ndarray:
+        """Add vectors and persist them as a new segment. Returns assigned ids."""
+        vectors = np.ascontiguousarray(vectors, dtype="float32").reshape(-1, self.dimension)
+        if ids is None:
+            ids = np.arange(self.next_id, self.next_id + len(vectors), dtype="int64")
+        else:
+            ids = np.ascontiguousarray(ids, dtype="int64")
+        if len(vectors) == 0:
+            return ids
+
+        self.index.add_with_ids(vectors, ids)
+        self.next_id = max(self.next_id, int(ids.max()) + 1)
+
+        self._segment_seq += 1
+        name = f"seg_{self._segment_seq:06d}.npz"
+        np.savez(os.path.join(self.storage_dir, name), ids=ids, vectors=vectors)
+        self.segments.append(name)
+        self._write_manifest()
+        return ids
+
+    def remove(self, ids) -> int:
+        """Remove vectors by id. Returns the number of ids removed."""
+        ids = np.unique(np.asarray(list(ids), dtype="int64"))
+        if len(ids) == 0 or self.index is None:
+            return 0
+
+        with open(self._tombstone_path(), "ab") as f:
+            f.write(ids.tobytes())
+
+        removed = self._apply_removals(ids)
+        self._removed_since_snapshot += removed
+        return removed
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Search k nearest neighbours. Returns (distances, ids), -1 for empty slots."""
+        queries = np.ascontiguousarray(queries, dtype="float32").reshape(-1, self.dimension)
+        n = len(queries)
+        if self.ntotal == 0 or k <= 0:
+            return np.full((n, max(k, 0)), np.inf, dtype="float32"), np.full((n, max(k, 0)), -1, dtype="int64")
+
+        # Over-fetch to make room for tombstoned hits that have to be filtered out
+        fetch = min(k + len(self._tombstones), int(self.index.ntotal))
+        with track(VECTOR_SEARCH_SECONDS, self.active_backend):
+            distances, ids = self.index.search(queries, fetch)
+        if not self._tombstones:
+            return distances[:, :k], ids[:, :k]
+
+        out_d = np.full((n, k), np.inf, dtype="float32")
+        out_i = np.full((n, k), -1, dtype="int64")
+        dead = np.fromiter(self._tombstones, dtype="int64", count=len(self._tombstones))
+        for row in range(n):
+            keep = ~np.isin(ids[row], dead) & (ids[row] != -1)
+            live_i = ids[row][keep][:k]
+            out_i[row, :len(live_i)] = live_i
+            out_d[row, :len(live_i)] = distances[row][keep][:k]
+        return out_d, out_i
+
+    def reconstruct_all(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (ids, vectors) for every live vector."""
+        ids, vectors = self._export(self.index)
+        if self._tombstones and len(ids):
+            dead = np.fromiter(self._tombstones, dtype="int64", count=len(self._tombstones))
+            keep = ~np.isin(ids, dead)
+            ids, vectors = ids[keep], vectors[keep]
+        return ids, vectors
+
+    @property
+    def needs_compaction(self) -> bool:
+        if len(self.segments) > self.max_segments:
+            return True
+        stored = int(self.index.ntotal) if self.index is not None else 0
+        if self._removed_since_snapshot and self._removed_since_snapshot > self.compact_ratio * max(stored, 1):
+            return True
+        return (
+            self.backend == "ivf"
+            and self.active_backend == "flat"
+            and self.ntotal >= self.ivf_train_size
+        )
+
+    def maybe_compact(self) -> bool:
+        """Compact if thresholds are exceeded. Returns True if compaction ran."""
+        if self.needs_compaction:
+            self.compact()
+            return True
+        return False
+
+    def compact(self):
+        """Fold segments and tombstones into a fresh snapshot."""
+        if self._tombstones or (self.backend == "ivf" and self.active_backend == "flat"
+                                and self.ntotal >= self.ivf_train_size):
+            ids, vectors = self.reconstruct_all()
+            if self.backend == "ivf" and len(ids) >= self.ivf_train_size:
+                self.active_backend = "ivf"
+            self.index = self._build_index(self.active_backend, vectors)
+            if len(ids):
+                self.index.add_with_ids(vectors, ids)
+            self._tombstones = set()
+
+        old_files = list(self.segments)
+        if self.snapshot:
+            old_files.append(self.snapshot)
+        old_tombstones = self._tombstone_path()
+
+        self.generation += 1
+        self.snapshot = f"snapshot_{self.generation:06d}.faiss"
+        faiss.write_index(self.index, os.path.join(self.storage_dir, self.snapshot))
+        self.segments = []
+        self._removed_since_snapshot = 0
+        self._write_manifest()
+
+        for name in old_files:
+            self._unlink(os.path.join(self.storage_dir, name))
+        self._unlink(old_tombstones)
+        logger.info(
+            f"Compacted vector index to generation {self.generation} "
+            f"({self.ntotal} vectors, backend={self.active_backend})."
+        )
+
+    def reset(self):
+        """Drop every vector and all persisted state."""
+        for name in os.listdir(self.storage_dir):
+            if name == "manifest.json" or name.startswith(("seg_", "snapshot_", "tombstones_")):
+                self._unlink(os.path.join(self.storage_dir, name))
+        self.active_backend = "flat" if self.backend == "ivf" else self.backend
+        self.next_id = 0
+        self.generation = 0
+        self.snapshot = None
+        self.segments = []
+        self._segment_seq = 0
+        self._tombstones = set()
+        self._removed_since_snapshot = 0
+        self.index = self._build_index(self.active_backend)
+        self._write_manifest()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _build_index(self, backend: str, train_vectors: Optional[np.ndarray] = None):
+        if backend == "hnsw":
+            inner = faiss.IndexHNSWFlat(self.dimension, self.hnsw_m)
+            inner.hnsw.efSearch = self.ef_search
+            return faiss.IndexIDMap2(inner)
+        if backend == "ivf":
+            quantizer = faiss.IndexFlatL2(self.dimension)
+            index = faiss.IndexIVFFlat(quantizer, self.dimension, self.nlist)
+            sample = train_vectors
+            max_train = self.nlist * 256
+            if len(sample) > max_train:
+                rng = np.random.default_rng(0)
+                sample = sample[rng.choice(len(sample), max_train, replace=False)]
+            index.train(sample)
+            index.nprobe = self.nprobe
+            return index
+        return faiss.IndexIDMap2(faiss.IndexFlatL2(self.dimension))
+
+    def _export(self, index) -> Tuple[np.ndarray, np.ndarray]:
+        """Extract every stored (id, vector) pair from a FAISS index."""
+        if index is None or index.ntotal == 0:
+            return np.empty(0, dtype="int64"), np.empty((0, self.dimension), dtype="float32")
+
+        if isinstance(index, faiss.IndexIVF):
+            from faiss.contrib.inspect_tools import get_invlist
+
+            invlists = index.invlists
+            all_ids, all_vecs = [], []
+            for list_no in range(index.nlist):
+                ids, codes = get_invlist(invlists, list_no)
+                if len(ids):
+                    all_ids.append(ids)
+                    all_vecs.append(codes.view("float32").reshape(-1, self.dimension))
+            return np.concatenate(all_ids).astype("int64"), np.concatenate(all_vecs)
+
+        ids = faiss.vector_to_array(index.id_map).astype("int64")
+        vectors = index.index.reconstruct_n(0, index.index.ntotal)
+        return ids, vectors
+
+    def _apply_removals(self, ids: np.ndarray) -> int:
+        if self.active_backend == "hnsw":
+            present = ids[np.isin(ids, faiss.vector_to_array(self.index.id_map))]
+            new = set(present.tolist()) - self._tombstones
+            self._tombstones.update(new)
+            return len(new)
+        return int(self.index.remove_ids(ids))
+
+    def _tombstone_path(self) -> str:
+        return os.path.join(self.storage_dir, f"tombstones_{self.generation:06d}.bin")
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.storage_dir, "manifest.json")
+
+    def _write_manifest(self):
+        manifest = {
+            "version": 1,
+            "backend": self.backend,
+            "active_backend": self.active_backend,
+            "dimension": self.dimension,
+            "next_id": self.next_id,
+            "generation": self.generation,
+            "snapshot": self.snapshot,
+            "segments": self.segments,
+            "segment_seq": self._segment_seq,
+        }
+        tmp_path = self._manifest_path() + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self._manifest_path())
+
+    def _load(self):
+        if not os.path.exists(self._manifest_path()):
+            self.index = self._build_index(self.active_backend)
+            self._write_manifest()
+            return
+
+        with open(self._manifest_path(), "r", encoding="utf-8") as f:
+            manifest: Dict[str, Any] = json.load(f)
+
+        if manifest.get("dimension") != self.dimension:
+            raise ValueError(
+                f"Index dimension {manifest.get('dimension')} does not match model dimension {self.dimension}."
+            )
+        if manifest.get("backend") != self.backend:
+            logger.info(f"Index backend changed from {manifest.get('backend')} to {self.backend}; will rebuild on compaction.")
+
+        self.active_backend = manifest.get("active_backend", "flat")
+        self.next_id = manifest.get("next_id", 0)
+        self.generation = manifest.get("generation", 0)
+        self.snapshot = manifest.get("snapshot")
+        self.segments = manifest.get("segments", [])
+        self._segment_seq = manifest.get("segment_seq", len(self.segments))
+
+        if self.snapshot:
+            self.index = faiss.read_index(os.path.join(self.storage_dir, self.snapshot))
+            if isinstance(self.index, faiss.IndexIVF):
+                self.index.nprobe = self.nprobe
+        else:
+            self.index = self._build_index(self.active_backend)
+
+        for name in self.segments:
+            with np.load(os.path.join(self.storage_dir, name)) as seg:
+                self.index.add_with_ids(seg["vectors"], seg["ids"])
+
+        tombstone_path = self._tombstone_path()
+        if os.path.exists(tombstone_path):
+            ids = np.fromfile(tombstone_path, dtype="int64")
+            self._removed_since_snapshot = self._apply_removals(np.unique(ids))
+
+        # A backend switch (e.g. flat -> hnsw) is applied by rebuilding once
+        target = self.backend
+        if self.backend == "ivf" and self.active_backend != "ivf":
+            target = "flat"
+        if self.active_backend != target:
+            self.active_backend = target
+            ids, vectors = self.reconstruct_all()
+            self.index = self._build_index(target)
+            if len(ids):
+                self.index.add_with_ids(vectors, ids)
+            self._tombstones = set()
+            self.compact()
+
+        logger.info(f"Loaded vector index ({self.ntotal} vectors, {len(self.segments)} pending segments).")
+
+    @staticmethod
+    def _unlink(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,390 @@
+"""
+Shared embedding service for sentence encoders.
+
+One model copy serves every caller. Concurrent encode requests are merged
+into micro-batches so the model runs one forward pass per window instead of
+one per caller:
+- Requests arriving within max_wait_ms are merged (up to max_batch_size texts)
+- Identical texts are encoded once, also across overlapping requests
+- Embeddings are cached by content hash in memory (LRU) and in SQLite, so a
+  repeated chunk or query is not re-encoded, even after a restart
+- aembed() only checks the memory tier on the event loop; disk lookups run
+  on the batching worker, and last_access updates are written in batches
+"""
+
+import os
+import time
+import queue
+import sqlite3
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from runtime.instrumentation import EMBEDDING_BATCH_SECONDS, EMBEDDING_BATCH_SIZE, record_cache, track
+
+logger = logging.getLogger(__name__)
+
+# Stay under SQLITE_MAX_VARIABLE_NUMBER on older builds
+_SQL_BATCH = 900
+
+
+class EmbeddingService:
+    """
+    Micro-batching, caching front end for an encode(List[str]) function.
+
+    Usage:
+        service = get_embedding_service("all-MiniLM-L6-v2")
+        vectors = service.embed(["text a", "text b"])     # (2, dim) float32
+        vectors = await service.aembed(["query"])         # from async code
+    """
+
+    # Pending last_access updates are written once this many accumulate, or
+    # after TOUCH_FLUSH_SECONDS, or with the next disk write
+    TOUCH_BATCH = 1024
+    TOUCH_FLUSH_SECONDS = 5.0
+
+    def __init__(
+        self,
+        encode: Callable[[List[str]], Any],
+        model_id: str,
+        model: Any = None,
+        db_path: Optional[str] = None,
+        persistent: bool = True,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        memory_entries: int = 20000,
+        max_disk_bytes: Optional[int] = None,
+    ):
+        self.encode_fn = encode
+        self.model_id = model_id
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.memory_entries = memory_entries
+        if max_disk_bytes is None:
+            max_disk_bytes = int(float(os.getenv("BIODOCKIFY_EMBEDDING_CACHE_MB", 512)) * 1024 * 1024)
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Serializes use of the SQLite connection; taken before _lock, never inside it
+        self._disk_lock = threading.Lock()
+        self._touched: Dict[str, float] = {}
+        self._touch_flushed = time.monotonic()
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._metrics = {
+            "requests": 0, "texts": 0, "memory_hits": 0, "disk_hits": 0,
+            "encoded": 0, "deduplicated": 0, "batches": 0, "disk_evictions": 0,
+        }
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disk_bytes = 0
+        if persistent:
+            if db_path is None:
+                data_dir = os.getenv("BIODOCKIFY_DATA_DIR")
+                base = Path(data_dir) if data_dir else Path.home() / ".biodockify" / "data"
+                db_path = str(base / "cache" / "embeddings.db")
+            try:
+                Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=5)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+                with self._conn:
+                    self._conn.execute("""
+                        CREATE TABLE IF NOT EXISTS embeddings (
+                            key TEXT PRIMARY KEY,
+                            vector BLOB NOT NULL,
+                            last_access REAL NOT NULL
+                        )
+                    """)
+                    self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_access ON embeddings(last_access)")
+                self._disk_bytes = self._conn.execute(
+                    "SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings"
+                ).fetchone()[0]
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache disk tier unavailable ({e}); using memory only")
+                self._conn = None
+        self.db_path = db_path
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_id}\0{text}".encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Embeddings for texts as a (len(texts), dim) float32 array. Blocks until ready."""
+        keys, found, pending = self._prepare(texts, check_disk=True)
+        if pending is not None:
+            found.update(pending.result())
+        return self._assemble(keys, found)
+
+    async def aembed(self, texts: List[str]) -> np.ndarray:
+        """Async embed(); waits on the batch without holding the event loop.
+        Texts not in memory, including disk-cached ones, are resolved by the worker."""
+        keys, found, pending = self._prepare(texts, check_disk=False)
+        if pending is not None:
+            found.update(await asyncio.wrap_future(pending))
+        return self._assemble(keys, found)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._metrics,
+                "model_id": self.model_id,
+                "memory_entries": len(self._memory),
+                "disk_bytes": self._disk_bytes,
+                "persistent": self._conn is not None,
+                "queued": self._queue.qsize(),
+            }
+
+    def clear_cache(self):
+        with self._lock:
+            self._memory.clear()
+        if self._conn is not None:
+            with self._disk_lock:
+                self._touched.clear()
+                with self._conn:
+                    self._conn.execute("DELETE FROM embeddings")
+                self._disk_bytes = 0
+
+    def flush(self):
+        """Write pending last_access updates to disk."""
+        if self._conn is not None:
+            with self._disk_lock:
+                self._flush_touches()
+
+    # ------------------------------------------------------------------
+    # Caller side
+    # ------------------------------------------------------------------
+
+    def _prepare(self, texts: List[str], check_disk: bool):
+        keys = [self.key(t) for t in texts]
+        with self._lock:
+            self._metrics["requests"] += 1
+            self._metrics["texts"] += len(texts)
+        found = self._lookup(keys) if check_disk else self._memory_lookup(keys)[0]
+        missing = {k: t for k, t in zip(keys, texts) if k not in found}
+        # Keys sent to the worker are counted there, once it has checked the cache
+        record_cache("embedding", hits=len(keys) - len(missing))
+        if not missing:
+            return keys, found, None
+
+        future: Future = Future()
+        self._queue.put((missing, future))
+        self._ensure_worker()
+        return keys, found, future
+
+    @staticmethod
+    def _assemble(keys: List[str], found: Dict[str, np.ndarray]) -> np.ndarray:
+        if not keys:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.stack([found[k] for k in keys])
+
+    # ------------------------------------------------------------------
+    # Batching worker
+    # ------------------------------------------------------------------
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name=f"embed-{self.model_id}", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            size = len(batch[0][0])
+            deadline = time.monotonic() + self.max_wait
+            while size < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(request)
+                size += len(request[0])
+            self._process(batch)
+
+    def _process(self, batch: List[tuple]):
+        unique: Dict[str, str] = {}
+        for missing, _ in batch:
+            unique.update(missing)
+
+        try:
+            with self._lock:
+                self._metrics["batches"] += 1
+                self._metrics["deduplicated"] += sum(len(m) for m, _ in batch) - len(unique)
+            # Disk-cached texts from aembed(), or ones an earlier batch produced meanwhile
+            vectors = self._lookup(list(unique))
+            todo = [k for k in unique if k not in vectors]
+            record_cache("embedding", hits=len(unique) - len(todo), misses=len(todo))
+            if todo:
+                EMBEDDING_BATCH_SIZE.labels(self.model_id).observe(len(todo))
+                with track(EMBEDDING_BATCH_SECONDS, self.model_id):
+                    encoded = np.asarray(self.encode_fn([unique[k] for k in todo]), dtype=np.float32)
+                fresh = dict(zip(todo, encoded))
+                with self._lock:
+                    self._metrics["encoded"] += len(todo)
+                self._store(fresh)
+                vectors.update(fresh)
+        except Exception as e:
+            logger.error(f"Embedding batch failed ({len(unique)} texts): {e}")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for missing, future in batch:
+            future.set_result({k: vectors[k] for k in missing})
+
+    # ------------------------------------------------------------------
+    # Cache tiers
+    # ------------------------------------------------------------------
+
+    def _lookup(self, keys: Iterable[str]) -> Dict[str, np.ndarray]:
+        """Memory tier, then disk tier for the rest (promoting disk hits)."""
+        found, on_disk = self._memory_lookup(keys)
+        if on_disk:
+            found.update(self._disk_lookup(on_disk))
+        return found
+
+    def _memory_lookup(self, keys: Iterable[str]):
+        found: Dict[str, np.ndarray] = {}
+        absent = []
+        with self._lock:
+            for k in dict.fromkeys(keys):
+                vec = self._memory.get(k)
+                if vec is not None:
+                    self._memory.move_to_end(k)
+                    found[k] = vec
+                    self._metrics["memory_hits"] += 1
+                else:
+                    absent.append(k)
+        return found, absent
+
+    def _disk_lookup(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        if self._conn is None:
+            return {}
+        try:
+            hits = {}
+            with self._disk_lock:
+                for i in range(0, len(keys), _SQL_BATCH):
+                    chunk = keys[i:i + _SQL_BATCH]
+                    marks = ",".join("?" * len(chunk))
+                    hits.update(self._conn.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({marks})", chunk
+                    ).fetchall())
+                self._touch(hits)
+        except sqlite3.Error as e:
+            logger.debug(f"Embedding cache disk read failed: {e}")
+            return {}
+        vectors = {k: np.frombuffer(blob, dtype=np.float32) for k, blob in hits.items()}
+        if vectors:
+            with self._lock:
+                self._remember(vectors)
+                self._metrics["disk_hits"] += len(vectors)
+        return vectors
+
+    def _touch(self, keys: Iterable[str]):
+        """Queue last_access updates. Caller holds _disk_lock."""
+        now = time.time()
+        for k in keys:
+            self._touched[k] = now
+        if (len(self._touched) >= self.TOUCH_BATCH
+                or time.monotonic() - self._touch_flushed >= self.TOUCH_FLUSH_SECONDS):
+            self._flush_touches()
+
+    def _flush_touches(self):
+        """Write queued last_access updates in one transaction. Caller holds _disk_lock."""
+        self._touch_flushed = time.monotonic()
+        if not self._touched:
+            return
+        touched = [(at, k) for k, at in self._touched.items()]
+        self._touched.clear()
+        with self._conn:
+            self._conn.executemany("UPDATE embeddings SET last_access = ? WHERE key = ?", touched)
+
+    def _remember(self, vectors: Dict[str, np.ndarray]):
+        """Caller holds _lock."""
+        for k, vec in vectors.items():
+            self._memory[k] = vec
+            self._memory.move_to_end(k)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _store(self, vectors: Dict[str, np.ndarray]):
+        with self._lock:
+            self._remember(vectors)
+        if self._conn is None:
+            return
+        try:
+            now = time.time()
+            rows = [(k, np.ascontiguousarray(v, dtype=np.float32).tobytes(), now) for k, v in vectors.items()]
+            with self._disk_lock:
+                self._flush_touches()
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO embeddings (key, vector, last_access) VALUES (?, ?, ?)", rows
+                    )
+                self._disk_bytes += sum(len(r[1]) for r in rows)
+                if self._disk_bytes > self.max_disk_bytes:
+                    self._evict_disk()
+        except sqlite3.Error as e:
+            logger.debug(f"Embedding cache disk write failed: {e}")
+
+    def _evict_disk(self):
+        """Drop least recently used vectors until 90% of max_disk_bytes. Caller holds _disk_lock."""
+        target = int(self.max_disk_bytes * 0.9)
+        doomed = []
+        for key, size in self._conn.execute(
+            "SELECT key, LENGTH(vector) FROM embeddings ORDER BY last_access ASC"
+        ):
+            if self._disk_bytes <= target:
+                break
+            doomed.append((key,))
+            self._disk_bytes -= size
+        with self._conn:
+            self._conn.executemany("DELETE FROM embeddings WHERE key = ?", doomed)
+        with self._lock:
+            self._metrics["disk_evictions"] += len(doomed)
+
+
+_services: Dict[str, EmbeddingService] = {}
+_services_lock = threading.Lock()
+
+
+def get_embedding_service(model_name: str = "all-MiniLM-L6-v2") -> EmbeddingService:
+    """
+    Process-wide service for a sentence-transformers model, loaded once.
+    Raises ImportError when sentence-transformers is not installed.
+    """
+    service = _services.get(model_name)
+    if service is None:
+        with _services_lock:
+            service = _services.get(model_name)
+            if service is None:
+                from sentence_transformers import SentenceTransformer
+
+                logger.info(f"Loading shared embedding model: {model_name}")
+                model = SentenceTransformer(model_name)
+
+                def encode(texts: List[str]) -> np.ndarray:
+                    return model.encode(texts, convert_to_numpy=True)
+
+                service = _services[model_name] = EmbeddingService(encode, model_name, model=model)
+    return service
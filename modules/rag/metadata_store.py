@@ -0,0 +1,159 @@
+"""
+SQLite-backed chunk metadata for the RAG vector store.
+
+Rows are keyed by FAISS vector id, so search hits resolve with a primary-key
+lookup and nothing is parsed at startup. Chunk text lives in its own column
+and is only read when a caller asks for it.
+"""
+
+import os
+import json
+import sqlite3
+import logging
+import threading
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Stay under SQLITE_MAX_VARIABLE_NUMBER on older builds
+_SQL_BATCH = 900
+
+
+class ChunkMetadataStore:
+    """
+    Persistent id -> metadata mapping for vector store chunks.
+    Uses a single long-lived SQLite connection in WAL mode.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_db()
+
+    def _init_db(self):
+        with self._lock, self._conn:
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS chunks (
+                    id INTEGER PRIMARY KEY,
+                    document_id TEXT,
+                    item_id TEXT,
+                    text TEXT,
+                    metadata TEXT NOT NULL
+                )
+            ''')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS idx_chunks_document ON chunks(document_id)')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS idx_chunks_item ON chunks(item_id)')
+
+    def add(self, ids: Iterable[int], metadatas: Iterable[Dict[str, Any]]):
+        """Insert (or replace) metadata rows for the given vector ids."""
+        rows = []
+        for vector_id, meta in zip(ids, metadatas):
+            meta = dict(meta)
+            text = meta.pop('text', None)
+            rows.append((
+                int(vector_id),
+                _as_key(meta.get('document_id')),
+                _as_key(meta.get('id')),
+                text,
+                json.dumps(meta, ensure_ascii=False, default=str),
+            ))
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO chunks (id, document_id, item_id, text, metadata) VALUES (?, ?, ?, ?, ?)',
+                rows,
+            )
+
+    def get(self, vector_id: int, include_text: bool = True) -> Optional[Dict[str, Any]]:
+        """Fetch metadata for one vector id."""
+        return self.get_many([vector_id], include_text=include_text).get(int(vector_id))
+
+    def get_many(self, ids: Iterable[int], include_text: bool = True) -> Dict[int, Dict[str, Any]]:
+        """Fetch metadata for several vector ids. Missing ids are omitted."""
+        ids = [int(i) for i in ids if int(i) >= 0]
+        columns = 'id, metadata, text' if include_text else 'id, metadata'
+        results: Dict[int, Dict[str, Any]] = {}
+        with self._lock:
+            for start in range(0, len(ids), _SQL_BATCH):
+                batch = ids[start:start + _SQL_BATCH]
+                placeholders = ','.join('?' * len(batch))
+                cursor = self._conn.execute(
+                    f'SELECT {columns} FROM chunks WHERE id IN ({placeholders})', batch
+                )
+                for row in cursor:
+                    meta = json.loads(row[1])
+                    if include_text:
+                        meta['text'] = row[2] or ""
+                    results[row[0]] = meta
+        return results
+
+    def ids_for_document(self, document_id: str) -> List[int]:
+        """Vector ids whose metadata 'document_id' or 'id' equals document_id."""
+        key = _as_key(document_id)
+        with self._lock:
+            cursor = self._conn.execute(
+                'SELECT id FROM chunks WHERE document_id = ? OR item_id = ?', (key, key)
+            )
+            return [row[0] for row in cursor]
+
+    def delete(self, ids: Iterable[int]) -> int:
+        """Delete rows for the given vector ids. Returns rows removed."""
+        ids = [int(i) for i in ids]
+        removed = 0
+        with self._lock, self._conn:
+            for start in range(0, len(ids), _SQL_BATCH):
+                batch = ids[start:start + _SQL_BATCH]
+                placeholders = ','.join('?' * len(batch))
+                cursor = self._conn.execute(f'DELETE FROM chunks WHERE id IN ({placeholders})', batch)
+                removed += cursor.rowcount
+        return removed
+
+    def iter_texts(self, min_id: int = -1, batch_size: int = 5000) -> Iterator[List[Tuple[int, str]]]:
+        """Yield batches of (id, text) in id order, starting after min_id."""
+        last_id = min_id
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, COALESCE(text, '') FROM chunks WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1][0]
+
+    def ids(self, max_id: Optional[int] = None) -> List[int]:
+        """All vector ids in ascending order, optionally only those <= max_id."""
+        with self._lock:
+            if max_id is None:
+                cursor = self._conn.execute('SELECT id FROM chunks ORDER BY id')
+            else:
+                cursor = self._conn.execute('SELECT id FROM chunks WHERE id <= ? ORDER BY id', (max_id,))
+            return [row[0] for row in cursor]
+
+    def stats(self) -> Tuple[int, int]:
+        """Return (row count, max id); max id is -1 when empty."""
+        with self._lock:
+            count, max_id = self._conn.execute('SELECT COUNT(*), MAX(id) FROM chunks').fetchone()
+        return count, -1 if max_id is None else max_id
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM chunks').fetchone()[0]
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM chunks')
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _as_key(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
@@ -1,46 +1,59 @@
 import os
 import json
+import time
 import numpy as np
 import logging
 import asyncio
 from typing import List, Dict, Any, Optional
 
-# Lazy imports to avoid startup overhead if RAG is unused
-try:
-    import faiss
-    from sentence_transformers import SentenceTransformer
-except Exception as e:
-    # Catching broad Exception because transformers can throw NameError/RuntimeError
-    # when PyTorch is missing or version mismatched (e.g. "name 'nn' is not defined")
-    logging.getLogger(__name__).warning(f"RAG dependencies failed to load: {e}")
-    faiss = None
-    SentenceTransformer = None
+from modules.rag.ann_index import ANNIndex, faiss
+from modules.rag.embedding_service import EmbeddingService, get_embedding_service
+from modules.rag.metadata_store import ChunkMetadataStore
+from runtime.lazy import is_available, lazy_attr
+
+# sentence-transformers (and torch) are imported when the model is first
+# loaded, not with this module; None when the package is not installed
+SentenceTransformer = (
+    lazy_attr("sentence_transformers", "SentenceTransformer")
+    if is_available("sentence_transformers") else None
+)
 
 logger = logging.getLogger(__name__)
 
 class VectorStore:
-    def __init__(self, storage_dir: str = "data/vectors", model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        storage_dir: str = "data/vectors",
+        model_name: str = "all-MiniLM-L6-v2",
+        index_backend: Optional[str] = None,
+    ):
         self.storage_dir = storage_dir
         self.model_name = model_name
-        self.index = None
+        # flat (exact), ivf or hnsw; overridable via BIO_VECTOR_INDEX
+        self.index_backend = index_backend or os.getenv("BIO_VECTOR_INDEX", "flat")
+        self.index: Optional[ANNIndex] = None
         self.model = None
-        self.metadata: List[Dict[str, Any]] = []
+        self.embeddings: Optional[EmbeddingService] = None
         self.dimension = 384  # Default for all-MiniLM-L6-v2
         
         if not os.path.exists(storage_dir):
             os.makedirs(storage_dir)
+
+        # vector id -> chunk metadata, looked up per hit instead of loaded up front
+        self.metadata = ChunkMetadataStore(os.path.join(storage_dir, "metadata.db"))
             
         self._load_dependencies()
         self._load_index()
 
     def _load_dependencies(self):
-        if not faiss or not SentenceTransformer:
+        if not faiss or SentenceTransformer is None:
             logger.warning("RAG dependencies (faiss/sentence-transformers) not installed. Vector search disabled.")
             return
 
         try:
-            logger.info(f"Loading embedding model: {self.model_name}")
-            self.model = SentenceTransformer(self.model_name)
+            # Shared with every other user of this model; encodes are micro-batched and cached
+            self.embeddings = get_embedding_service(self.model_name)
+            self.model = self.embeddings.model
         except Exception as e:
             logger.error(f"Failed to load embedding model: {e}")
 
@@ -48,28 +61,100 @@ class VectorStore:
         if not faiss:
             return
 
-        index_path = os.path.join(self.storage_dir, "index.faiss")
         meta_path = os.path.join(self.storage_dir, "metadata.json")
+        legacy_index_path = os.path.join(self.storage_dir, "index.faiss")
+        ann_dir = os.path.join(self.storage_dir, "ann")
 
-        if os.path.exists(index_path) and os.path.exists(meta_path):
-            try:
-                self.index = faiss.read_index(index_path)
-                with open(meta_path, 'r', encoding='utf-8') as f:
-                    self.metadata = json.load(f)
-                logger.info(f"Loaded existing index with {self.index.ntotal} vectors.")
-            except Exception as e:
-                logger.error(f"Failed to load index: {e}")
-                self._create_new_index()
-        else:
+        try:
+            self.index = ANNIndex(ann_dir, self.dimension, backend=self.index_backend)
+        except Exception as e:
+            logger.critical(f"Failed to load vector index from {ann_dir}: {e}", exc_info=True)
             self._create_new_index()
 
+        # Legacy files are renamed once migrated, so an interrupted or failed
+        # migration is retried on the next start
+        try:
+            if os.path.exists(legacy_index_path):
+                self._migrate_legacy_index(legacy_index_path, meta_path)
+            elif os.path.exists(meta_path):
+                self._migrate_metadata_json(meta_path)
+        except Exception as e:
+            logger.error(f"Failed to migrate legacy vector store files (kept for a later retry): {e}", exc_info=True)
+        logger.info(f"Loaded existing index with {self.index.ntotal} vectors.")
+
+    def _migrate_legacy_index(self, index_path: str, meta_path: str):
+        """Import a pre-ID-map IndexFlatL2 + positional metadata list."""
+        legacy = faiss.read_index(index_path)
+        metadata: List[Dict[str, Any]] = []
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+
+        if legacy.ntotal == len(metadata):
+            # No deletes ever happened: row i still belongs to entry i
+            vectors = legacy.reconstruct_n(0, legacy.ntotal) if metadata else None
+        else:
+            # The old simulated delete dropped metadata entries from anywhere in
+            # the list but kept their vectors, so rows and entries no longer line
+            # up. The texts are in the metadata; embed them again.
+            if self.embeddings is None:
+                raise RuntimeError(
+                    f"Legacy index has {legacy.ntotal} vectors for {len(metadata)} metadata entries; "
+                    "re-embedding them needs the embedding model"
+                )
+            logger.warning(
+                f"Legacy index rows ({legacy.ntotal}) do not match metadata ({len(metadata)}); "
+                "re-embedding legacy chunks"
+            )
+            texts = [meta.get('text', '') for meta in metadata]
+            vectors = self.embeddings.embed(texts) if texts else None
+
+        count = len(metadata)
+        if vectors is not None and count:
+            ids = self.index.add(np.asarray(vectors, dtype='float32'))
+            self.metadata.add(ids, metadata)
+            self.index.compact()
+        os.replace(index_path, index_path + ".legacy")
+        if os.path.exists(meta_path):
+            os.replace(meta_path, meta_path + ".legacy")
+        logger.info(f"Migrated legacy FAISS index ({count} vectors) to ID-mapped storage.")
+
+    def _migrate_metadata_json(self, meta_path: str):
+        """Import an id-keyed metadata.json into the SQLite metadata store."""
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+        if not isinstance(metadata, dict):
+            logger.warning(f"Ignoring positional metadata list without a matching index: {meta_path}")
+            return
+        self.metadata.add((int(k) for k in metadata), metadata.values())
+        os.replace(meta_path, meta_path + ".legacy")
+        logger.info(f"Migrated {len(metadata)} metadata entries to {self.metadata.db_path}.")
+
     def _create_new_index(self):
+        """
+        Start from an empty index after the stored one failed to load.
+        Nothing is deleted: ann/ and metadata.db are renamed with a
+        .broken-<timestamp> suffix so they can be inspected or restored.
+        """
         if not faiss:
             return
-        # L2 Distance Index (Euclidean)
-        self.index = faiss.IndexFlatL2(self.dimension)
-        self.metadata = []
-        logger.info("Created new FAISS index.")
+        suffix = f".broken-{time.strftime('%Y%m%d-%H%M%S')}"
+        ann_dir = os.path.join(self.storage_dir, "ann")
+        if os.path.exists(ann_dir):
+            os.replace(ann_dir, ann_dir + suffix)
+
+        db_path = self.metadata.db_path
+        self.metadata.close()
+        for path in (db_path, db_path + "-wal", db_path + "-shm"):
+            if os.path.exists(path):
+                os.replace(path, path + suffix)
+        self.metadata = ChunkMetadataStore(db_path)
+
+        self.index = ANNIndex(ann_dir, self.dimension, backend=self.index_backend)
+        logger.critical(
+            f"Started a new, empty vector index; the unreadable one was moved to {ann_dir + suffix} "
+            f"and its metadata to {db_path + suffix}"
+        )
 
     async def add_documents(self, documents: List[Any], metadatas: Optional[List[Dict[str, Any]]] = None):
         """
@@ -114,120 +199,104 @@ class VectorStore:
             return
 
         try:
-            loop = asyncio.get_event_loop()
-            embeddings = await loop.run_in_executor(None, self.model.encode, texts)
-            embeddings = np.array(embeddings).astype('float32')
+            embeddings = await self._encode(texts)
             
             # Normalize for cosine similarity if needed, but L2 is fine for basic RAG
             # faiss.normalize_L2(embeddings)
 
-            self.index.add(embeddings)
-            self.metadata.extend(final_metadatas)
-            
-            self._save_index()
+            # Metadata goes in first so a crash never leaves an unresolvable vector
+            ids = np.arange(self.index.next_id, self.index.next_id + len(embeddings), dtype='int64')
+            self.metadata.add(ids, final_metadatas)
+            self.index.add(embeddings, ids)
+            self.index.maybe_compact()
             logger.info(f"Added {len(texts)} documents to index. Total: {self.index.ntotal}")
         except Exception as e:
             logger.error(f"Error adding documents: {e}")
 
+    async def _encode(self, texts: List[str]) -> np.ndarray:
+        if self.embeddings is not None:
+            return await self.embeddings.aembed(texts)
+        # A model assigned directly (no shared service) is encoded off the event loop
+        loop = asyncio.get_running_loop()
+        vectors = await loop.run_in_executor(None, self.model.encode, texts)
+        return np.array(vectors).astype('float32')
+
     async def search(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
         """
         Search for relevant documents.
         Returns list of results with text and metadata.
         """
-        if not self.model or not self.index or self.index.ntotal == 0:
+        results = await self.search_many([query], k=k)
+        return results[0] if results else []
+
+    async def search_many(self, queries: List[str], k: int = 5) -> List[List[Dict[str, Any]]]:
+        """
+        Search several queries at once.
+        Encodes all queries in one model batch and runs a single FAISS matrix search.
+        Returns one result list per query, in the same order as `queries`.
+        """
+        if not queries:
             return []
+        if not self.model or not self.index or self.index.ntotal == 0:
+            return [[] for _ in queries]
 
         try:
-            loop = asyncio.get_event_loop()
-            query_vector = await loop.run_in_executor(None, self.model.encode, [query])
-            query_vector = np.array(query_vector).astype('float32')
+            query_vectors = await self._encode(list(queries))
             
-            distances, indices = self.index.search(query_vector, k)
-            
-            results = []
-            for i, idx in enumerate(indices[0]):
-                if idx != -1 and idx < len(self.metadata):
-                    meta = self.metadata[idx]
-                    results.append({
-                        "score": float(distances[0][i]),
-                        "metadata": meta,
-                        "text": meta.get('text', "") # Expose text directly
-                    })
+            distances, indices = self.index.search(query_vectors, k)
+            hits = self.metadata.get_many(np.unique(indices[indices != -1]))
+
+            all_results = []
+            for row, row_indices in enumerate(indices):
+                results = []
+                for i, idx in enumerate(row_indices):
+                    meta = hits.get(int(idx))
+                    if meta is not None:
+                        results.append({
+                            "id": int(idx),
+                            "score": float(distances[row][i]),
+                            "metadata": meta,
+                            "text": meta.get('text', "") # Expose text directly
+                        })
+                all_results.append(results)
             
-            return results
+            return all_results
         except Exception as e:
             logger.error(f"Error during search: {e}")
-            return []
+            return [[] for _ in queries]
 
     def delete(self, document_id: str):
         """
-        Delete documents from index based on a metadata field (e.g. document_id).
-        Note: FAISS IndexFlatL2 doesn't support easy ID-based deletion without ID mapping.
-        We rebuild/filter the index as a workaround for this implementation.
+        Delete every chunk whose metadata 'document_id' or 'id' matches.
+        Vectors are removed from the index by id; space is reclaimed on compaction.
         """
         if not self.index or self.index.ntotal == 0:
             return
 
-        indices_to_keep = []
-        new_metadata = []
-        
-        for i, meta in enumerate(self.metadata):
-            if meta.get('document_id') != document_id and meta.get('id') != document_id:
-                indices_to_keep.append(i)
-                new_metadata.append(meta)
-        
-        if len(indices_to_keep) == len(self.metadata):
-            # Nothing to delete
-            return
-            
-        if not indices_to_keep:
-            self.clear()
+        doomed = self.metadata.ids_for_document(document_id)
+        if not doomed:
             return
 
-        # Reconstruct index
         try:
-            # Get all vectors
-            all_vectors = []
-            for i in indices_to_keep:
-                # FAISS doesn't allow easy single vector extraction from IndexFlatL2 
-                # if not previously stored or if we don't have the original embeddings.
-                # For this MVP, we log that deletion requires a re-index if we don't 
-                # cache the embeddings, but typically in FAISS you'd use ID-based removal 
-                # with a different index type.
-                pass
-            
-            # Since IndexFlatL2 doesn't let us extract vectors easily, 
-            # and we don't cache them in memory, we provide a warning 
-            # or use a simple metadata filtering for the search results instead.
-            
-            logger.warning(f"Deletion from FAISS IndexFlatL2 is simulated via metadata filtering. Document: {document_id}")
-            self.metadata = new_metadata
-            self._save_index()
+            self.index.remove(doomed)
+            self.metadata.delete(doomed)
+            self.index.maybe_compact()
+            logger.info(f"Deleted {len(doomed)} vectors for document {document_id}")
         except Exception as e:
             logger.error(f"Failed to delete from vector index: {e}")
 
+    def compact(self):
+        """Fold pending segments and deletions into a fresh index snapshot."""
+        if self.index:
+            self.index.compact()
+
     def clear(self):
         """Clear the vector index and metadata."""
-        if not faiss:
+        if not faiss or not self.index:
             return
         self.index.reset()
-        self.metadata = []
-        self._save_index()
+        self.metadata.clear()
         logger.info("Vector store cleared.")
-            
-    def _save_index(self):
-        if not self.index:
-            return
-            
-        index_path = os.path.join(self.storage_dir, "index.faiss")
-        meta_path = os.path.join(self.storage_dir, "metadata.json")
-        
-        try:
-            faiss.write_index(self.index, index_path)
-            with open(meta_path, 'w', encoding='utf-8') as f:
-                json.dump(self.metadata, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"Failed to save index: {e}")
 
 # Global instance
 _vector_store = None
@@ -0,0 +1,416 @@
+"""Dataset Registry for BioDockify AI
+
+Holds imported datasets for many concurrent researchers:
+- Datasets are addressed by ID and scoped to a session
+- Memory accounting against a configurable budget
+- Least recently used datasets spill to Parquet on disk (pickle when no
+  Parquet engine is installed) and reload transparently on next use
+- A SQLite catalog keeps spilled datasets available across restarts
+- Sessions idle for longer than a TTL expire, and a global size cap evicts
+  the least recently used datasets; both delete the spilled files
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    try:
+        import fastparquet  # noqa: F401
+        PARQUET_AVAILABLE = True
+    except ImportError:
+        PARQUET_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SESSION = "default"
+
+
+@dataclass
+class DatasetEntry:
+    """Catalog record for one dataset"""
+    dataset_id: str
+    session_id: str
+    rows: int
+    columns: int
+    nbytes: int
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    path: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    last_access: float = field(default_factory=time.time)
+
+    def describe(self, in_memory: bool) -> Dict[str, Any]:
+        return {
+            'dataset_id': self.dataset_id,
+            'session_id': self.session_id,
+            'rows': self.rows,
+            'columns': self.columns,
+            'memory_usage_mb': self.nbytes / (1024 * 1024),
+            'in_memory': in_memory,
+            'created_at': self.created_at,
+            'last_access': self.last_access,
+        }
+
+
+class DatasetRegistry:
+    """Session-scoped, memory-bounded store of DataFrames
+
+    Args:
+        storage_dir: Directory for spilled datasets and the catalog
+        memory_budget_mb: Resident size above which LRU datasets spill to disk
+        max_datasets_per_session: Older datasets beyond this are dropped
+        session_ttl: Seconds without access after which a session's datasets are dropped
+        max_total_mb: Total size of all datasets (memory and disk) before LRU eviction
+    """
+
+    # Minimum seconds between idle-session sweeps and between last_access writes
+    SWEEP_INTERVAL = 60.0
+
+    def __init__(
+        self,
+        storage_dir: Optional[str] = None,
+        memory_budget_mb: Optional[float] = None,
+        max_datasets_per_session: int = 20,
+        session_ttl: Optional[float] = None,
+        max_total_mb: Optional[float] = None
+    ):
+        if storage_dir is None:
+            data_dir = os.getenv('BIODOCKIFY_DATA_DIR')
+            base = Path(data_dir) if data_dir else Path.home() / '.biodockify' / 'data'
+            storage_dir = str(base / 'statistics' / 'datasets')
+        os.makedirs(storage_dir, exist_ok=True)
+
+        if memory_budget_mb is None:
+            memory_budget_mb = float(os.getenv('BIODOCKIFY_STATS_MEMORY_MB', 1024))
+        if session_ttl is None:
+            session_ttl = float(os.getenv('BIODOCKIFY_STATS_SESSION_TTL', 24 * 3600))
+        if max_total_mb is None:
+            max_total_mb = float(os.getenv('BIODOCKIFY_STATS_MAX_TOTAL_MB', 4096))
+        self.storage_dir = storage_dir
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.max_datasets_per_session = max_datasets_per_session
+        self.session_ttl = session_ttl
+        self.max_total_bytes = int(max_total_mb * 1024 * 1024)
+
+        self._lock = threading.RLock()
+        self._frames: "OrderedDict[str, pd.DataFrame]" = OrderedDict()  # LRU order, oldest first
+        self._entries: Dict[str, DatasetEntry] = {}
+        self._resident_bytes = 0
+        self._total_bytes = 0
+        # last_access value last written to the catalog, per dataset
+        self._saved_access: Dict[str, float] = {}
+        self._last_sweep = 0.0
+        self.spills = 0
+        self.loads = 0
+        self.expired = 0
+        self.evicted = 0
+
+        self._conn = sqlite3.connect(os.path.join(storage_dir, 'catalog.db'), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS datasets (
+                    dataset_id TEXT PRIMARY KEY,
+                    session_id TEXT NOT NULL,
+                    rows INTEGER, columns INTEGER, nbytes INTEGER,
+                    metadata TEXT, path TEXT,
+                    created_at REAL, last_access REAL
+                )
+            ''')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS idx_datasets_session ON datasets(session_id)')
+        self._load_catalog()
+        with self._lock:
+            self._expire_idle_sessions()
+            self._enforce_total_cap(keep=None)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def register(
+        self,
+        df: pd.DataFrame,
+        metadata: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+        dataset_id: Optional[str] = None
+    ) -> str:
+        """Add a dataset and return its ID (replaces an existing ID in the same session)"""
+        session_id = session_id or DEFAULT_SESSION
+        dataset_id = dataset_id or uuid.uuid4().hex
+        nbytes = int(df.memory_usage(deep=True).sum())
+
+        with self._lock:
+            existing = self._entries.get(dataset_id)
+            if existing is not None:
+                if existing.session_id != session_id:
+                    raise KeyError(f"Dataset '{dataset_id}' belongs to another session")
+                self._discard(dataset_id)
+
+            entry = DatasetEntry(
+                dataset_id=dataset_id,
+                session_id=session_id,
+                rows=int(df.shape[0]),
+                columns=int(df.shape[1]),
+                nbytes=nbytes,
+                metadata=dict(metadata or {}),
+            )
+            self._entries[dataset_id] = entry
+            self._frames[dataset_id] = df
+            self._resident_bytes += nbytes
+            self._total_bytes += nbytes
+            self._write_entry(entry)
+
+            self._enforce_session_cap(session_id)
+            self._maybe_sweep()
+            self._enforce_total_cap(keep=dataset_id)
+            self._enforce_budget(keep=dataset_id)
+
+        logger.info(f"Registered dataset {dataset_id} ({entry.rows}x{entry.columns}, session={session_id})")
+        return dataset_id
+
+    def get(self, dataset_id: str, session_id: Optional[str] = None) -> pd.DataFrame:
+        """Return a dataset, reloading it from disk if it was spilled"""
+        with self._lock:
+            entry = self._entry(dataset_id, session_id)
+            self._touch(entry)
+            if dataset_id in self._frames:
+                self._frames.move_to_end(dataset_id)
+                return self._frames[dataset_id]
+
+            df = self._read(entry.path)
+            self.loads += 1
+            self._frames[dataset_id] = df
+            self._resident_bytes += entry.nbytes
+            self._enforce_budget(keep=dataset_id)
+            return df
+
+    def get_metadata(self, dataset_id: str, session_id: Optional[str] = None) -> Dict[str, Any]:
+        with self._lock:
+            return self._entry(dataset_id, session_id).metadata
+
+    def update_metadata(self, dataset_id: str, metadata: Optional[Dict[str, Any]], session_id: Optional[str] = None):
+        with self._lock:
+            entry = self._entry(dataset_id, session_id)
+            entry.metadata = dict(metadata or {})
+            self._write_entry(entry)
+
+    def latest(self, session_id: Optional[str] = None) -> Optional[str]:
+        """ID of the most recently registered dataset in a session"""
+        session_id = session_id or DEFAULT_SESSION
+        with self._lock:
+            candidates = [e for e in self._entries.values() if e.session_id == session_id]
+            if not candidates:
+                return None
+            return max(candidates, key=lambda e: e.created_at).dataset_id
+
+    def list(self, session_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Describe the datasets of a session, newest first"""
+        session_id = session_id or DEFAULT_SESSION
+        with self._lock:
+            entries = [e for e in self._entries.values() if e.session_id == session_id]
+            entries.sort(key=lambda e: e.created_at, reverse=True)
+            return [e.describe(e.dataset_id in self._frames) for e in entries]
+
+    def drop(self, dataset_id: str, session_id: Optional[str] = None) -> bool:
+        with self._lock:
+            try:
+                self._entry(dataset_id, session_id)
+            except KeyError:
+                return False
+            self._discard(dataset_id)
+            return True
+
+    def drop_session(self, session_id: str) -> int:
+        with self._lock:
+            ids = [e.dataset_id for e in self._entries.values() if e.session_id == session_id]
+            for dataset_id in ids:
+                self._discard(dataset_id)
+            return len(ids)
+
+    def expire_idle_sessions(self) -> int:
+        """Drop sessions not used for session_ttl seconds. Returns datasets removed."""
+        with self._lock:
+            return self._expire_idle_sessions()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'datasets': len(self._entries),
+                'in_memory': len(self._frames),
+                'resident_mb': self._resident_bytes / (1024 * 1024),
+                'memory_budget_mb': self.memory_budget / (1024 * 1024),
+                'total_mb': self._total_bytes / (1024 * 1024),
+                'max_total_mb': self.max_total_bytes / (1024 * 1024),
+                'sessions': len({e.session_id for e in self._entries.values()}),
+                'spills': self.spills,
+                'loads': self.loads,
+                'expired': self.expired,
+                'evicted': self.evicted,
+                'format': 'parquet' if PARQUET_AVAILABLE else 'pickle',
+            }
+
+    # ------------------------------------------------------------------
+    # Internals (caller holds the lock)
+    # ------------------------------------------------------------------
+
+    def _entry(self, dataset_id: str, session_id: Optional[str]) -> DatasetEntry:
+        entry = self._entries.get(dataset_id)
+        if entry is None or (session_id is not None and entry.session_id != session_id):
+            raise KeyError(f"Dataset '{dataset_id}' not found")
+        return entry
+
+    def _touch(self, entry: DatasetEntry):
+        """Record an access; the catalog copy (used for expiry after a restart) is
+        refreshed at most once per SWEEP_INTERVAL"""
+        entry.last_access = time.time()
+        if entry.last_access - self._saved_access.get(entry.dataset_id, 0.0) >= self.SWEEP_INTERVAL:
+            self._write_entry(entry)
+
+    def _maybe_sweep(self):
+        if time.monotonic() - self._last_sweep >= self.SWEEP_INTERVAL:
+            self._expire_idle_sessions()
+
+    def _expire_idle_sessions(self) -> int:
+        self._last_sweep = time.monotonic()
+        if self.session_ttl <= 0:
+            return 0
+        last_used: Dict[str, float] = {}
+        for entry in self._entries.values():
+            last_used[entry.session_id] = max(last_used.get(entry.session_id, 0.0), entry.last_access)
+        cutoff = time.time() - self.session_ttl
+        removed = 0
+        for session_id, last_access in last_used.items():
+            if last_access < cutoff:
+                ids = [e.dataset_id for e in self._entries.values() if e.session_id == session_id]
+                for dataset_id in ids:
+                    self._discard(dataset_id)
+                removed += len(ids)
+                logger.info(f"Expired idle statistics session {session_id} ({len(ids)} datasets)")
+        self.expired += removed
+        return removed
+
+    def _enforce_total_cap(self, keep: Optional[str]):
+        """Drop least recently used datasets (any session) until the total size fits"""
+        if self._total_bytes <= self.max_total_bytes:
+            return
+        for entry in sorted(self._entries.values(), key=lambda e: e.last_access):
+            if self._total_bytes <= self.max_total_bytes:
+                break
+            if entry.dataset_id == keep:
+                continue
+            logger.info(f"Evicting dataset {entry.dataset_id} (session={entry.session_id}): size cap reached")
+            self._discard(entry.dataset_id)
+            self.evicted += 1
+
+    def _enforce_budget(self, keep: str):
+        """Spill least recently used datasets until resident size fits the budget"""
+        for dataset_id in list(self._frames):
+            if self._resident_bytes <= self.memory_budget:
+                break
+            if dataset_id == keep:
+                continue
+            self._spill(dataset_id)
+
+    def _enforce_session_cap(self, session_id: str):
+        entries = [e for e in self._entries.values() if e.session_id == session_id]
+        if len(entries) <= self.max_datasets_per_session:
+            return
+        entries.sort(key=lambda e: e.last_access)
+        for entry in entries[:len(entries) - self.max_datasets_per_session]:
+            self._discard(entry.dataset_id)
+
+    def _spill(self, dataset_id: str):
+        entry = self._entries[dataset_id]
+        df = self._frames.pop(dataset_id)
+        self._resident_bytes -= entry.nbytes
+        # Datasets are immutable once registered, so an existing spill file is still valid
+        if entry.path is None or not os.path.exists(entry.path):
+            entry.path = self._write(dataset_id, df)
+            self._write_entry(entry)
+        self.spills += 1
+        logger.debug(f"Spilled dataset {dataset_id} to {entry.path}")
+
+    def _discard(self, dataset_id: str):
+        entry = self._entries.pop(dataset_id)
+        self._total_bytes -= entry.nbytes
+        self._saved_access.pop(dataset_id, None)
+        if self._frames.pop(dataset_id, None) is not None:
+            self._resident_bytes -= entry.nbytes
+        if entry.path and os.path.exists(entry.path):
+            os.remove(entry.path)
+        with self._conn:
+            self._conn.execute('DELETE FROM datasets WHERE dataset_id = ?', (dataset_id,))
+
+    def _write(self, dataset_id: str, df: pd.DataFrame) -> str:
+        if PARQUET_AVAILABLE:
+            path = os.path.join(self.storage_dir, f"{dataset_id}.parquet")
+            try:
+                df.to_parquet(path)
+                return path
+            except Exception as e:
+                # Mixed-type object columns are not representable in Parquet
+                logger.debug(f"Parquet spill failed for {dataset_id}, using pickle: {e}")
+        path = os.path.join(self.storage_dir, f"{dataset_id}.pkl")
+        df.to_pickle(path)
+        return path
+
+    @staticmethod
+    def _read(path: str) -> pd.DataFrame:
+        if path.endswith('.parquet'):
+            return pd.read_parquet(path)
+        return pd.read_pickle(path)
+
+    def _write_entry(self, entry: DatasetEntry):
+        self._saved_access[entry.dataset_id] = entry.last_access
+        with self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO datasets '
+                '(dataset_id, session_id, rows, columns, nbytes, metadata, path, created_at, last_access) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (entry.dataset_id, entry.session_id, entry.rows, entry.columns, entry.nbytes,
+                 json.dumps(entry.metadata, default=str), entry.path, entry.created_at, entry.last_access)
+            )
+
+    def _load_catalog(self):
+        """Restore spilled datasets; in-memory ones from a previous run are gone"""
+        stale = []
+        for row in self._conn.execute('SELECT * FROM datasets'):
+            entry = DatasetEntry(
+                dataset_id=row[0], session_id=row[1], rows=row[2], columns=row[3], nbytes=row[4],
+                metadata=json.loads(row[5] or '{}'), path=row[6], created_at=row[7], last_access=row[8]
+            )
+            if entry.path and os.path.exists(entry.path):
+                self._entries[entry.dataset_id] = entry
+                self._total_bytes += entry.nbytes
+                self._saved_access[entry.dataset_id] = entry.last_access
+            else:
+                stale.append((entry.dataset_id,))
+        if stale:
+            with self._conn:
+                self._conn.executemany('DELETE FROM datasets WHERE dataset_id = ?', stale)
+        if self._entries:
+            logger.info(f"Restored {len(self._entries)} spilled datasets from {self.storage_dir}")
+
+
+_dataset_registry: Optional[DatasetRegistry] = None
+
+
+def get_dataset_registry() -> DatasetRegistry:
+    """Get or initialize the shared dataset registry"""
+    global _dataset_registry
+    if _dataset_registry is None:
+        _dataset_registry = DatasetRegistry()
+    return _dataset_registry
@@ -0,0 +1,314 @@
+"""Analysis Executor for BioDockify AI
+
+Runs CPU-bound statistical analyses off the API event loop:
+- Stateless analyses (survival, PK/PD, bioequivalence, ...) run in a
+  bounded process pool so they use other cores
+- Orchestrator calls, which read and mutate session state, run on one
+  dedicated thread per statistics session: a session's calls keep their
+  order while different sessions proceed concurrently
+- Bounded admission queue, per-call timeouts and cancellation of work
+  that has not started yet
+- Queue-depth and runtime metrics for monitoring
+"""
+
+import os
+import time
+import asyncio
+import logging
+import contextvars
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+from runtime.instrumentation import ANALYSIS_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisTimeout(Exception):
+    """Raised when an analysis exceeds its time budget."""
+
+
+class ExecutorSaturated(Exception):
+    """Raised when the admission queue is full."""
+
+
+@dataclass
+class ExecutorMetrics:
+    """Counters for one execution lane."""
+    queued: int = 0
+    running: int = 0
+    completed: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    cancelled: int = 0
+    rejected: int = 0
+    total_runtime: float = 0.0
+    max_runtime: float = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        data = asdict(self)
+        finished = self.completed + self.failed
+        data['avg_runtime'] = self.total_runtime / finished if finished else 0.0
+        return data
+
+
+def _method_name(fn: Callable) -> str:
+    """Metric label for an analysis callable (bound methods and partials included)."""
+    fn = getattr(fn, 'func', fn)
+    return getattr(fn, '__name__', type(fn).__name__)
+
+
+def _init_worker():
+    """Keep worker processes quiet and single-threaded in BLAS."""
+    for var in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+        os.environ.setdefault(var, '1')
+    logging.getLogger().setLevel(logging.WARNING)
+
+
+class _Lane:
+    """One executor plus its concurrency slots and metrics."""
+
+    def __init__(self, name: str, factory: Callable[[], Executor], slots: int, max_queue: int):
+        self.name = name
+        self.slots = slots
+        self.max_queue = max_queue
+        self.metrics = ExecutorMetrics()
+        self._factory = factory
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = self._factory()
+        return self._executor
+
+    def semaphore(self) -> asyncio.Semaphore:
+        # Semaphores bind to the running loop; recreate if the loop changed (tests, reloads)
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.slots)
+            self._loop = loop
+        return self._semaphore
+
+    def idle(self) -> bool:
+        return self.metrics.queued == 0 and self.metrics.running == 0
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+class AnalysisExecutor:
+    """Bounded, observable execution of blocking statistical analyses
+
+    A call first waits for a free slot (at most `max_queue` calls may wait),
+    then runs on its lane. Waiting calls are cancelled cleanly. A call that
+    has already started in a worker cannot be interrupted; on timeout the
+    caller gets AnalysisTimeout straight away while the slot stays occupied
+    until the worker finishes, so the pool never oversubscribes the CPU.
+
+    Session calls get one single-thread lane per session key. At most
+    `max_sessions` lanes are kept; the least recently used idle lane is
+    retired to make room for a new session.
+    """
+
+    DEFAULT_SESSION_KEY = 'default'
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        default_timeout: Optional[float] = None,
+        max_timeout: float = 3600.0,
+        max_sessions: Optional[int] = None,
+    ):
+        cpu = os.cpu_count() or 2
+        self.max_workers = max_workers or int(os.getenv('BIODOCKIFY_STATS_WORKERS', max(1, min(4, cpu - 1))))
+        self.max_queue = max_queue if max_queue is not None else int(os.getenv('BIODOCKIFY_STATS_MAX_QUEUE', 32))
+        self.default_timeout = default_timeout or float(os.getenv('BIODOCKIFY_STATS_TIMEOUT', 300))
+        self.max_timeout = max_timeout
+        self.max_sessions = max_sessions or int(os.getenv('BIODOCKIFY_STATS_SESSIONS', 16))
+
+        # spawn: forking a threaded server process is not safe
+        self._process = _Lane(
+            'process',
+            lambda: ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+            ),
+            slots=self.max_workers,
+            max_queue=self.max_queue,
+        )
+        self._sessions: 'OrderedDict[str, _Lane]' = OrderedDict()
+        # Counters of retired session lanes, so metrics() stays cumulative
+        self._retired = ExecutorMetrics()
+
+    async def run_process(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """Run a picklable callable in the process pool."""
+        return await self._run(self._process, partial(fn, *args, **kwargs), timeout, _method_name(fn))
+
+    async def run_session(
+        self,
+        fn: Callable,
+        *args,
+        timeout: Optional[float] = None,
+        session_key: Optional[str] = None,
+        **kwargs
+    ) -> Any:
+        """Run a callable on the session's own thread (for stateful orchestrator calls).
+        Calls with the same session_key run one at a time, in order. The caller's
+        context variables (active session/dataset) carry over."""
+        lane = self._session_lane(session_key or self.DEFAULT_SESSION_KEY)
+        context = contextvars.copy_context()
+        return await self._run(lane, partial(context.run, fn, *args, **kwargs), timeout, _method_name(fn))
+
+    def _session_lane(self, key: str) -> _Lane:
+        lane = self._sessions.get(key)
+        if lane is not None:
+            self._sessions.move_to_end(key)
+            return lane
+
+        if len(self._sessions) >= self.max_sessions:
+            idle = next((k for k, l in self._sessions.items() if l.idle()), None)
+            if idle is None:
+                self._retired.rejected += 1
+                raise ExecutorSaturated(f"All {self.max_sessions} statistics session lanes are busy")
+            self._retire(self._sessions.pop(idle))
+
+        lane = _Lane(
+            'session',
+            lambda: ThreadPoolExecutor(max_workers=1, thread_name_prefix='stats-session'),
+            slots=1,
+            max_queue=self.max_queue,
+        )
+        self._sessions[key] = lane
+        return lane
+
+    def _retire(self, lane: _Lane):
+        lane.shutdown()
+        for field in ('completed', 'failed', 'timed_out', 'cancelled', 'rejected', 'total_runtime'):
+            setattr(self._retired, field, getattr(self._retired, field) + getattr(lane.metrics, field))
+        self._retired.max_runtime = max(self._retired.max_runtime, lane.metrics.max_runtime)
+
+    def _session_metrics(self) -> Dict[str, Any]:
+        total = ExecutorMetrics(**asdict(self._retired))
+        for lane in self._sessions.values():
+            for field in ('queued', 'running', 'completed', 'failed', 'timed_out',
+                          'cancelled', 'rejected', 'total_runtime'):
+                setattr(total, field, getattr(total, field) + getattr(lane.metrics, field))
+            total.max_runtime = max(total.max_runtime, lane.metrics.max_runtime)
+        data = total.snapshot()
+        data['sessions'] = len(self._sessions)
+        return data
+
+    async def _run(self, lane: _Lane, call: Callable, timeout: Optional[float], method: str = "unknown") -> Any:
+        timeout = min(timeout or self.default_timeout, self.max_timeout)
+        metrics = lane.metrics
+        if metrics.queued >= lane.max_queue:
+            metrics.rejected += 1
+            raise ExecutorSaturated(f"Statistics {lane.name} queue is full ({lane.max_queue} waiting)")
+
+        deadline = time.monotonic() + timeout
+        semaphore = lane.semaphore()
+        metrics.queued += 1
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout)
+        except asyncio.TimeoutError:
+            metrics.timed_out += 1
+            raise AnalysisTimeout(f"Analysis did not start within {timeout:g}s")
+        except asyncio.CancelledError:
+            metrics.cancelled += 1
+            raise
+        finally:
+            metrics.queued -= 1
+
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        metrics.running += 1
+        try:
+            job = lane.executor().submit(call)
+        except Exception:
+            metrics.running -= 1
+            semaphore.release()
+            raise
+
+        def _finished(job):
+            elapsed = time.monotonic() - started
+            metrics.running -= 1
+            if job.cancelled():
+                metrics.cancelled += 1
+            else:
+                if job.exception() is None:
+                    metrics.completed += 1
+                else:
+                    metrics.failed += 1
+                metrics.total_runtime += elapsed
+                metrics.max_runtime = max(metrics.max_runtime, elapsed)
+                status = "ok" if job.exception() is None else "error"
+                ANALYSIS_SECONDS.labels(method, lane.name, status).observe(elapsed)
+            semaphore.release()
+
+        def _on_done(job):
+            try:
+                loop.call_soon_threadsafe(_finished, job)
+            except RuntimeError:
+                pass  # loop already closed (shutdown)
+
+        # The slot is released when the job itself ends, not when the caller gives up
+        job.add_done_callback(_on_done)
+
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(job)),
+                max(deadline - time.monotonic(), 0.001)
+            )
+        except asyncio.TimeoutError:
+            metrics.timed_out += 1
+            # Only succeeds while the job is still queued inside the pool
+            job.cancel()
+            raise AnalysisTimeout(f"Analysis exceeded {timeout:g}s time limit")
+        except asyncio.CancelledError:
+            job.cancel()
+            raise
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            'max_workers': self.max_workers,
+            'max_queue': self.max_queue,
+            'default_timeout': self.default_timeout,
+            'process': self._process.metrics.snapshot(),
+            'max_sessions': self.max_sessions,
+            'session': self._session_metrics(),
+        }
+
+    def shutdown(self):
+        """Cancel pending work and release worker processes."""
+        self._process.shutdown()
+        for lane in self._sessions.values():
+            lane.shutdown()
+        self._sessions.clear()
+
+
+_analysis_executor: Optional[AnalysisExecutor] = None
+
+
+def get_analysis_executor() -> AnalysisExecutor:
+    """Get or initialize the shared analysis executor"""
+    global _analysis_executor
+    if _analysis_executor is None:
+        _analysis_executor = AnalysisExecutor()
+    return _analysis_executor
+
+
+def shutdown_analysis_executor():
+    global _analysis_executor
+    if _analysis_executor is not None:
+        _analysis_executor.shutdown()
+        _analysis_executor = None
@@ -0,0 +1,298 @@
+"""
+Grouped Non-Compartmental Analysis Engine
+==========================================
+
+Computes per-subject NCA parameters for a whole study at once. The data is
+sorted by (subject, time) a single time and every parameter is obtained with
+NumPy segment operations over the sorted arrays, instead of filtering the
+DataFrame and building a PKPDAnalysis object for each subject.
+
+Results match the single-subject methods of PKPDAnalysis:
+- Linear and logarithmic trapezoidal AUC0-t
+- Cmax/Tmax (first observed maximum, optional quadratic interpolation)
+- Terminal-phase lambda_z regression on the last log-positive points
+
+Author: BioDockify AI
+Version: 1.0.0
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+from typing import Dict, Optional, Tuple
+
+
+class GroupedNCA:
+    """
+    Vectorized NCA over all subjects of a concentration-time dataset.
+
+    Attributes:
+        subject_ids (np.ndarray): Subject identifiers, in order of appearance
+        n_samples (np.ndarray): Number of samples per subject
+
+    Example:
+        >>> engine = GroupedNCA(data)
+        >>> auc = engine.auc()
+        >>> cmax, tmax = engine.cmax_tmax()
+        >>> terminal = engine.lambda_z(timepoints=3)
+    """
+
+    def __init__(
+        self,
+        data: pd.DataFrame,
+        subject_col: str = 'subject_id',
+        time_col: str = 'time',
+        conc_col: str = 'concentration'
+    ):
+        """
+        Sort the dataset once by subject and time.
+
+        Parameters:
+        -----------
+        data : pd.DataFrame
+            Long-format data with one row per sample
+        subject_col, time_col, conc_col : str
+            Column names for subject, time (hours) and concentration
+        """
+        codes, self.subject_ids = pd.factorize(data[subject_col], sort=False)
+        time = data[time_col].to_numpy(dtype=float)
+        conc = data[conc_col].to_numpy(dtype=float)
+
+        order = np.lexsort((time, codes))
+        self.codes = codes[order]
+        self.time = time[order]
+        self.conc = conc[order]
+
+        self.n_subjects = len(self.subject_ids)
+        self.n_samples = np.bincount(self.codes, minlength=self.n_subjects)
+        self.starts = np.concatenate(([0], np.cumsum(self.n_samples)[:-1]))
+        self.ends = self.starts + self.n_samples - 1
+
+        # Adjacent sample pairs that belong to the same subject
+        self._pair = self.codes[1:] == self.codes[:-1]
+        self._lambda_cache: Dict[Optional[int], Dict[str, np.ndarray]] = {}
+
+    def _segment_sum(self, codes: np.ndarray, values: np.ndarray) -> np.ndarray:
+        return np.bincount(codes, weights=values, minlength=self.n_subjects)
+
+    @property
+    def last_conc(self) -> np.ndarray:
+        """Last observed concentration per subject."""
+        return self.conc[self.ends]
+
+    @property
+    def max_conc(self) -> np.ndarray:
+        """Maximum observed concentration per subject."""
+        return np.maximum.reduceat(self.conc, self.starts)
+
+    def auc(self, method: str = 'linear') -> np.ndarray:
+        """
+        AUC0-t per subject using the trapezoidal rule.
+
+        Parameters:
+        -----------
+        method : str
+            'linear' for linear trapezoidal, 'log' for logarithmic
+
+        Returns:
+        --------
+        np.ndarray
+            AUC0-t for each subject
+        """
+        dt = np.diff(self.time)
+        c0, c1 = self.conc[:-1], self.conc[1:]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if method == 'log':
+                partial = dt * (c1 - c0) / (np.log(c1) - np.log(c0))
+            else:
+                partial = dt * (c1 + c0) / 2
+        return self._segment_sum(self.codes[:-1][self._pair], partial[self._pair])
+
+    def cmax_tmax(self, interpolation: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Cmax and Tmax per subject.
+
+        Parameters:
+        -----------
+        interpolation : bool
+            Refine an interior peak with a parabola through it and its two
+            neighbours (kept only when it opens downward and its vertex lies
+            between the neighbours)
+
+        Returns:
+        --------
+        cmax, tmax : np.ndarray
+            Maximum concentration and the first time it is reached
+        """
+        peak = self.max_conc
+        at_peak = self.conc == peak[self.codes]
+        positions = np.where(at_peak, np.arange(len(self.conc)), len(self.conc))
+        peak_idx = np.minimum.reduceat(positions, self.starts)
+
+        cmax = self.conc[peak_idx].copy()
+        tmax = self.time[peak_idx].copy()
+        if not interpolation:
+            return cmax, tmax
+
+        interior = (self.n_samples > 2) & (peak_idx > self.starts) & (peak_idx < self.ends)
+        idx = peak_idx[interior]
+        x0, x1, x2 = self.time[idx - 1], self.time[idx], self.time[idx + 1]
+        y0, y1, y2 = self.conc[idx - 1], self.conc[idx], self.conc[idx + 1]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slope_01 = (y1 - y0) / (x1 - x0)
+            a = ((y2 - y1) / (x2 - x1) - slope_01) / (x2 - x0)
+            b = slope_01 - a * (x0 + x1)
+            c = y0 - a * x0 ** 2 - b * x0
+            t_vertex = -b / (2 * a)
+            c_vertex = a * t_vertex ** 2 + b * t_vertex + c
+        use = (a < 0) & (x0 <= t_vertex) & (t_vertex <= x2)
+
+        targets = np.flatnonzero(interior)[use]
+        cmax[targets] = c_vertex[use]
+        tmax[targets] = t_vertex[use]
+        return cmax, tmax
+
+    def lambda_z(self, timepoints: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Terminal elimination rate constant per subject.
+
+        Fits log(concentration) against time over the last positive samples
+        of each subject (the last 4 when timepoints is None). Subjects with
+        fewer than 3 positive samples get lambda_z = 0 and NaN statistics.
+
+        Parameters:
+        -----------
+        timepoints : int, optional
+            Number of terminal points to use
+
+        Returns:
+        --------
+        dict
+            'lambda_z', 'ci_lower', 'ci_upper', 'r_squared' (NaN when fewer
+            than 3 points were fitted) and 'n_points' arrays
+        """
+        if timepoints in self._lambda_cache:
+            return self._lambda_cache[timepoints]
+
+        positive = self.conc > 0
+        codes = self.codes[positive]
+        x = self.time[positive]
+        y = np.log(self.conc[positive])
+
+        n_valid = np.bincount(codes, minlength=self.n_subjects)
+        if timepoints is None:
+            n_points = np.minimum(4, n_valid)
+        elif timepoints == 0:
+            n_points = n_valid
+        else:
+            n_points = np.minimum(timepoints, n_valid)
+
+        # Rank of each positive sample counted from the end of its subject
+        first = np.cumsum(n_valid) - n_valid
+        from_end = n_valid[codes] - 1 - (np.arange(len(codes)) - first[codes])
+        terminal = from_end < n_points[codes]
+        codes, x, y = codes[terminal], x[terminal], y[terminal]
+
+        n = n_points.astype(float)
+        fitted = n_valid >= 3
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_mean = self._segment_sum(codes, x) / n
+            y_mean = self._segment_sum(codes, y) / n
+            dx = x - x_mean[codes]
+            dy = y - y_mean[codes]
+            ssxm = self._segment_sum(codes, dx * dx)
+            ssym = self._segment_sum(codes, dy * dy)
+            ssxym = self._segment_sum(codes, dx * dy)
+
+            slope = ssxym / ssxm
+            r = np.where((ssxm == 0) | (ssym == 0), 0.0, ssxym / np.sqrt(ssxm * ssym))
+            r = np.clip(r, -1.0, 1.0)
+            std_err = np.sqrt((1 - r ** 2) * ssym / ssxm / (n - 2))
+            margin = stats.t.ppf(0.975, n - 2) * std_err
+
+        raw = -slope
+        result = {
+            'lambda_z': np.where(fitted, np.maximum(0, raw), 0.0),
+            'ci_lower': np.where(fitted, raw - margin, np.nan),
+            'ci_upper': np.where(fitted, raw + margin, np.nan),
+            'r_squared': np.where(fitted & (n_points >= 3), r ** 2, np.nan),
+            'n_points': n_points,
+        }
+        self._lambda_cache[timepoints] = result
+        return result
+
+    def pk_parameters(
+        self,
+        dose: float,
+        route: str = 'EV',
+        tau: Optional[float] = None,
+        lambda_z_timepoints: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Comprehensive PK parameter set per subject.
+
+        Same parameters as PKPDAnalysis.pk_parameter_estimation for a single
+        subject, one row per subject.
+
+        Parameters:
+        -----------
+        dose : float
+            Administered dose in mg
+        route : str
+            'IV' or 'EV'
+        tau : float, optional
+            Dosing interval for the accumulation ratio
+        lambda_z_timepoints : int, optional
+            Number of terminal points for lambda_z
+
+        Returns:
+        --------
+        pd.DataFrame
+            Columns 'subject_id', 'AUC0-t', 'AUC0-inf', 'AUC_extrap',
+            '%AUC_extrap', 'Cmax', 'Tmax', 't1/2', 'lambda_z', 'CL', 'Vd',
+            'Vss', 'MRT', 'Accumulation' and 'Dose'
+        """
+        auc_0_t = self.auc()
+        cmax, tmax = self.cmax_tmax()
+        lambda_z = self.lambda_z(lambda_z_timepoints)['lambda_z']
+        last_conc = self.last_conc
+        eliminating = lambda_z > 0
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            half_life = np.where(eliminating, np.log(2) / lambda_z, np.nan)
+            auc_extrap = np.where(eliminating & (last_conc > 0), last_conc / lambda_z, 0.0)
+            auc_0_inf = auc_0_t + auc_extrap
+            extrap_percent = np.where(auc_0_inf > 0, auc_extrap / auc_0_inf * 100, 0.0)
+
+            if route.upper() == 'IV':
+                cl = dose / auc_0_inf
+                mrt = np.where(eliminating, 1 / lambda_z, np.nan)
+            else:
+                cl = np.full(self.n_subjects, np.nan)
+                mrt = np.where(eliminating, 1 / lambda_z - tmax / 2, np.nan)
+            vd = np.where(~np.isnan(cl) & eliminating, cl / lambda_z, np.nan)
+            vss = cl * mrt
+
+            if tau:
+                accumulation = np.where(eliminating, 1 / (1 - np.exp(-lambda_z * tau)), 1.0)
+            else:
+                accumulation = np.ones(self.n_subjects)
+
+        return pd.DataFrame({
+            'subject_id': self.subject_ids,
+            'AUC0-t': auc_0_t,
+            'AUC0-inf': auc_0_inf,
+            'AUC_extrap': auc_extrap,
+            '%AUC_extrap': extrap_percent,
+            'Cmax': cmax,
+            'Tmax': tmax,
+            't1/2': half_life,
+            'lambda_z': lambda_z,
+            'CL': cl,
+            'Vd': vd,
+            'Vss': vss,
+            'MRT': mrt,
+            'Accumulation': accumulation,
+            'Dose': float(dose),
+        })
@@ -26,6 +26,8 @@ from datetime import datetime
 from pathlib import Path
 import logging
 from io import BytesIO
+from contextlib import contextmanager
+from contextvars import ContextVar
 
 from .data_importer import DataImporter
 from .enhanced_engine import EnhancedStatisticalEngine
@@ -39,10 +41,17 @@ from .diagnostic_tests import DiagnosticTests
 from .advanced_biostatistics import AdvancedBiostatistics
 from .pkpd_analysis import PKPDAnalysis
 from .multiplicity_control import MultiplicityControl
+from .dataset_registry import DatasetRegistry, get_dataset_registry, DEFAULT_SESSION
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Session and dataset the current request works on (set by the API layer)
+active_session: ContextVar[str] = ContextVar('statistics_session', default=DEFAULT_SESSION)
+active_dataset: ContextVar[Optional[str]] = ContextVar('statistics_dataset', default=None)
+# Inline (DataFrame, metadata) analysed in place of a registered dataset
+active_frame: ContextVar[Optional[Tuple[pd.DataFrame, Dict[str, Any]]]] = ContextVar('statistics_frame', default=None)
+
 
 class StatisticsOrchestrator:
     """Main orchestrator for statistical analysis workflow
@@ -63,7 +72,8 @@ class StatisticsOrchestrator:
         self,
         surfsense_url: str = "http://localhost:8000",
         alpha: float = 0.05,
-        auto_clean: bool = True
+        auto_clean: bool = True,
+        registry: Optional[DatasetRegistry] = None
     ):
         """Initialize statistics orchestrator
 
@@ -71,6 +81,7 @@ class StatisticsOrchestrator:
             surfsense_url: SurfSense service URL
             alpha: Significance level for all analyses
             auto_clean: Automatically clean data after import
+            registry: Dataset registry (defaults to the shared registry)
         """
         self.data_importer = DataImporter()
         self.statistical_engine = EnhancedStatisticalEngine(alpha=alpha)
@@ -88,14 +99,104 @@ class StatisticsOrchestrator:
         
         self.auto_clean = auto_clean
         self.analysis_cache = {}
-        self.current_data = None
-        self.current_metadata = None
+        self.registry = registry or get_dataset_registry()
+
+    # Datasets live in the registry; current_data resolves the dataset selected
+    # for this request, falling back to the session's most recent import.
+    # An inline frame bound with use_frame() takes precedence and is never registered.
+
+    @property
+    def current_dataset_id(self) -> Optional[str]:
+        if active_frame.get() is not None:
+            return None
+        return active_dataset.get() or self.registry.latest(active_session.get())
+
+    @property
+    def current_data(self) -> Optional[pd.DataFrame]:
+        frame = active_frame.get()
+        if frame is not None:
+            return frame[0]
+        dataset_id = self.current_dataset_id
+        if dataset_id is None:
+            return None
+        try:
+            return self.registry.get(dataset_id, active_session.get())
+        except KeyError:
+            return None
+
+    @current_data.setter
+    def current_data(self, df: Optional[pd.DataFrame]):
+        if df is None:
+            dataset_id = self.current_dataset_id
+            if dataset_id is not None:
+                self.registry.drop(dataset_id, active_session.get())
+            active_dataset.set(None)
+            return
+        active_dataset.set(self.registry.register(df, session_id=active_session.get()))
+
+    @property
+    def current_metadata(self) -> Optional[Dict[str, Any]]:
+        frame = active_frame.get()
+        if frame is not None:
+            return frame[1]
+        dataset_id = self.current_dataset_id
+        if dataset_id is None:
+            return None
+        try:
+            return self.registry.get_metadata(dataset_id, active_session.get())
+        except KeyError:
+            return None
+
+    @current_metadata.setter
+    def current_metadata(self, metadata: Optional[Dict[str, Any]]):
+        frame = active_frame.get()
+        if frame is not None:
+            active_frame.set((frame[0], dict(metadata or {})))
+            return
+        dataset_id = self.current_dataset_id
+        if dataset_id is not None:
+            self.registry.update_metadata(dataset_id, metadata, active_session.get())
+
+    @contextmanager
+    def use_dataset(self, dataset_id: Optional[str] = None, session_id: Optional[str] = None):
+        """Run analyses against a specific session and dataset
+
+        Example:
+            >>> with orchestrator.use_dataset(dataset_id, session_id='alice'):
+            ...     orchestrator.analyze_descriptive()
+        """
+        session_token = active_session.set(session_id or active_session.get())
+        dataset_token = active_dataset.set(dataset_id)
+        try:
+            yield self
+        finally:
+            active_dataset.reset(dataset_token)
+            active_session.reset(session_token)
+
+    @contextmanager
+    def use_frame(self, df: pd.DataFrame, metadata: Optional[Dict[str, Any]] = None):
+        """Run analyses against an inline DataFrame without registering it
+
+        The frame does not count against the session's dataset cap and is
+        gone when the block exits.
+
+        Example:
+            >>> with orchestrator.use_frame(df):
+            ...     orchestrator.analyze_descriptive(store_results=False)
+        """
+        token = active_frame.set((df, dict(metadata or {})))
+        try:
+            yield self
+        finally:
+            active_frame.reset(token)
 
     def import_data(
         self,
         file_path: Union[str, Path],
         clean_data: Optional[bool] = None,
-        validate_data: bool = True
+        validate_data: bool = True,
+        dataset_id: Optional[str] = None,
+        session_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """Import and optionally clean data
 
@@ -103,9 +204,11 @@ class StatisticsOrchestrator:
             file_path: Path to data file
             clean_data: Whether to clean data (None uses auto_clean setting)
             validate_data: Validate data integrity
+            dataset_id: ID to register the dataset under (generated if omitted)
+            session_id: Owning session (defaults to the active session)
 
         Returns:
-            Dictionary with DataFrame and metadata
+            Dictionary with DataFrame, metadata and dataset ID
 
         Example:
             >>> orchestrator = StatisticsOrchestrator()
@@ -123,15 +226,20 @@ class StatisticsOrchestrator:
             df, cleaning_report = self.data_importer.clean_data(df)
             metadata['cleaning_report'] = cleaning_report
 
-        # Store in cache
-        self.current_data = df
-        self.current_metadata = metadata
+        # Register and select for the rest of this request
+        dataset_id = self.registry.register(
+            df, metadata,
+            session_id=session_id or active_session.get(),
+            dataset_id=dataset_id
+        )
+        active_dataset.set(dataset_id)
 
         logger.info(f"Data imported successfully: {df.shape[0]} rows, {df.shape[1]} columns")
 
         return {
             'data': df,
             'metadata': metadata,
+            'dataset_id': dataset_id,
             'status': 'success'
         }
 
@@ -3091,16 +3199,18 @@ plt.show()
         Returns:
             Data summary
         """
-        if self.current_data is None:
+        df = self.current_data
+        if df is None:
             return {'status': 'no_data', 'message': 'No data loaded'}
 
         return {
             'status': 'loaded',
-            'shape': self.current_data.shape,
-            'columns': self.current_data.columns.tolist(),
-            'dtypes': self.current_data.dtypes.astype(str).to_dict(),
-            'memory_usage_mb': self.current_data.memory_usage(deep=True).sum() / (1024 * 1024),
-            'missing_values': self.current_data.isnull().sum().to_dict(),
+            'dataset_id': self.current_dataset_id,
+            'shape': df.shape,
+            'columns': df.columns.tolist(),
+            'dtypes': df.dtypes.astype(str).to_dict(),
+            'memory_usage_mb': df.memory_usage(deep=True).sum() / (1024 * 1024),
+            'missing_values': df.isnull().sum().to_dict(),
             'metadata': self.current_metadata
         }
 
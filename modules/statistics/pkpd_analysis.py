@@ -23,6 +23,8 @@ from typing import Dict, List, Tuple, Optional, Union
 import warnings
 from dataclasses import dataclass
 
+from .grouped_nca import GroupedNCA
+
 
 @dataclass
 class PKPDResult:
@@ -197,6 +199,30 @@ class PKPDAnalysis:
         
         return (mean - margin, mean + margin)
     
+    def _grouped_nca(self, df: pd.DataFrame) -> GroupedNCA:
+        """
+        Build the vectorized NCA engine for a multi-subject dataset.
+        
+        Subjects with fewer than 3 samples are skipped with a warning.
+        
+        Raises:
+        -------
+        ValueError:
+            If no subject has enough samples
+        """
+        df = df.dropna(subset=['subject_id'])
+        counts = df.groupby('subject_id', sort=False).size()
+        too_short = counts.index[counts < 3]
+        for subject_id in too_short:
+            self.warnings.append(
+                f"Subject {subject_id}: At least 3 time points required for PK analysis"
+            )
+        if len(too_short):
+            df = df[~df['subject_id'].isin(too_short)]
+        if df.empty:
+            raise ValueError("No valid results from multiple subjects")
+        return GroupedNCA(df)
+    
     def non_compartmental_analysis(
         self,
         alpha: float = 0.05,
@@ -367,51 +393,21 @@ class PKPDAnalysis:
         lambda_z_timepoints: Optional[int]
     ) -> PKPDResult:
         """Perform NCA for multiple subjects."""
-        subject_ids = df['subject_id'].unique()
-        results = []
-        
-        for subject_id in subject_ids:
-            subject_data = df[df['subject_id'] == subject_id].drop('subject_id', axis=1)
-            pkpd = PKPDAnalysis(
-                subject_data,
-                self.dose,
-                self.route,
-                self.tau,
-                subject_id=subject_id
-            )
-            try:
-                result = pkpd.non_compartmental_analysis(alpha, lambda_z_timepoints)
-                results.append({
-                    'subject_id': subject_id,
-                    **result.parameters
-                })
-            except Exception as e:
-                self.warnings.append(f"Subject {subject_id}: {str(e)}")
-        
-        if not results:
-            raise ValueError("No valid results from multiple subjects")
-        
-        results_df = pd.DataFrame(results)
+        engine = self._grouped_nca(df)
+        results_df = engine.pk_parameters(
+            self.dose, self.route, self.tau, lambda_z_timepoints
+        )[['subject_id', 'AUC0-t', 'AUC0-inf', 'AUC_extrap', 'Cmax', 'Tmax',
+           'lambda_z', 't1/2', 'CL', 'Vd', 'MRT', '%AUC_extrap']]
+        subject_ids = engine.subject_ids
         
         # Calculate statistics across subjects
-        parameters = {
-            'mean_' + col: results_df[col].mean()
-            for col in results_df.columns if col != 'subject_id'
-        }
-        
-        parameters.update({
-            'median_' + col: results_df[col].median()
-            for col in results_df.columns if col != 'subject_id'
-        })
-        
+        summary = results_df.drop(columns='subject_id').agg(['mean', 'median', 'std'])
+        parameters = {'mean_' + col: summary.at['mean', col] for col in summary.columns}
+        parameters.update({'median_' + col: summary.at['median', col] for col in summary.columns})
+        parameters.update({'sd_' + col: summary.at['std', col] for col in summary.columns})
         parameters.update({
-            'sd_' + col: results_df[col].std()
-            for col in results_df.columns if col != 'subject_id'
-        })
-        
-        parameters.update({
-            'cv_' + col: (results_df[col].std() / results_df[col].mean() * 100)
-            for col in results_df.columns if col != 'subject_id' and results_df[col].mean() > 0
+            'cv_' + col: summary.at['std', col] / summary.at['mean', col] * 100
+            for col in summary.columns if summary.at['mean', col] > 0
         })
         
         # Confidence intervals
@@ -429,7 +425,8 @@ class PKPDAnalysis:
             't1/2': 'h',
             'lambda_z': '1/h',
             'CL': 'L/h',
-            'Vd': 'L'
+            'Vd': 'L',
+            'MRT': 'h'
         }
         
         interpretation = self._generate_nca_interpretation(parameters, units, n_subjects=len(subject_ids))
@@ -741,19 +738,27 @@ class PKPDAnalysis:
         lambda_z_timepoints: Optional[int]
     ) -> PKPDResult:
         """Calculate AUC for multiple subjects."""
-        subject_ids = df['subject_id'].unique()
-        results = []
+        engine = self._grouped_nca(df)
+        subject_ids = engine.subject_ids
+        auc_0_t = engine.auc(method)
         
-        for subject_id in subject_ids:
-            subject_data = df[df['subject_id'] == subject_id].drop('subject_id', axis=1)
-            pkpd = PKPDAnalysis(subject_data, self.dose, self.route, self.tau, subject_id)
-            result = pkpd.calculate_auc(method, extrapolate, lambda_z_timepoints)
-            results.append({
-                'subject_id': subject_id,
-                **result.parameters
-            })
+        if extrapolate:
+            lambda_z = engine.lambda_z(lambda_z_timepoints)['lambda_z']
+            last_conc = engine.last_conc
+            with np.errstate(divide='ignore', invalid='ignore'):
+                auc_extrap = np.where((lambda_z > 0) & (last_conc > 0), last_conc / lambda_z, 0.0)
+                auc_0_inf = auc_0_t + auc_extrap
+                extrapolation_percent = np.where(auc_extrap > 0, auc_extrap / auc_0_inf * 100, 0.0)
+        else:
+            auc_0_inf = auc_0_t
+            extrapolation_percent = np.zeros(engine.n_subjects)
         
-        results_df = pd.DataFrame(results)
+        results_df = pd.DataFrame({
+            'subject_id': subject_ids,
+            'AUC0-t': auc_0_t,
+            'AUC0-inf': auc_0_inf,
+            '%AUC_extrap': extrapolation_percent
+        })
         
         # Calculate statistics
         parameters = {
@@ -772,7 +777,7 @@ class PKPDAnalysis:
             'mean_AUC0-inf': self._calculate_confidence_interval(results_df['AUC0-inf'].values)
         }
         
-        conc_unit = 'ng/mL' if results_df['Cmax'].mean() < 1000 else 'μg/mL' if 'Cmax' in results_df.columns else 'μg/mL'
+        conc_unit = 'ng/mL' if engine.max_conc.mean() < 1000 else 'μg/mL'
         units = {
             'AUC0-t': conc_unit + '·h',
             'AUC0-inf': conc_unit + '·h'
@@ -973,19 +978,10 @@ class PKPDAnalysis:
         interpolation: bool
     ) -> PKPDResult:
         """Calculate Cmax/Tmax for multiple subjects."""
-        subject_ids = df['subject_id'].unique()
-        results = []
-        
-        for subject_id in subject_ids:
-            subject_data = df[df['subject_id'] == subject_id].drop('subject_id', axis=1)
-            pkpd = PKPDAnalysis(subject_data, self.dose, self.route, self.tau, subject_id)
-            result = pkpd.calculate_cmax_tmax(alpha, interpolation)
-            results.append({
-                'subject_id': subject_id,
-                **result.parameters
-            })
-        
-        results_df = pd.DataFrame(results)
+        engine = self._grouped_nca(df)
+        subject_ids = engine.subject_ids
+        cmax, tmax = engine.cmax_tmax(interpolation)
+        results_df = pd.DataFrame({'subject_id': subject_ids, 'Cmax': cmax, 'Tmax': tmax})
         
         parameters = {
             'mean_Cmax': results_df['Cmax'].mean(),
@@ -1197,19 +1193,18 @@ class PKPDAnalysis:
         alpha: float
     ) -> PKPDResult:
         """Calculate half-life for multiple subjects."""
-        subject_ids = df['subject_id'].unique()
-        results = []
-        
-        for subject_id in subject_ids:
-            subject_data = df[df['subject_id'] == subject_id].drop('subject_id', axis=1)
-            pkpd = PKPDAnalysis(subject_data, self.dose, self.route, self.tau, subject_id)
-            result = pkpd.estimate_half_life(method, lambda_z_timepoints, alpha)
-            results.append({
-                'subject_id': subject_id,
-                **result.parameters
-            })
-        
-        results_df = pd.DataFrame(results)
+        engine = self._grouped_nca(df)
+        subject_ids = engine.subject_ids
+        terminal = engine.lambda_z(lambda_z_timepoints)
+        lambda_z = terminal['lambda_z']
+        with np.errstate(divide='ignore'):
+            half_life = np.where(lambda_z > 0, np.log(2) / lambda_z, np.nan)
+        results_df = pd.DataFrame({
+            'subject_id': subject_ids,
+            't1/2': half_life,
+            'lambda_z': lambda_z,
+            'R_squared': terminal['r_squared']
+        })
         
         parameters = {
             'mean_t1/2': results_df['t1/2'].mean(),
@@ -1472,19 +1467,42 @@ class PKPDAnalysis:
         alpha: float
     ) -> PKPDResult:
         """Calculate clearance for multiple subjects."""
-        subject_ids = df['subject_id'].unique()
-        results = []
-        
-        for subject_id in subject_ids:
-            subject_data = df[df['subject_id'] == subject_id].drop('subject_id', axis=1)
-            pkpd = PKPDAnalysis(subject_data, self.dose, self.route, self.tau, subject_id)
-            result = pkpd.calculate_clearance(bioavailability, alpha)
-            results.append({
-                'subject_id': subject_id,
-                **result.parameters
-            })
+        engine = self._grouped_nca(df)
+        subject_ids = engine.subject_ids
+        auc = engine.auc()
+        lambda_z = engine.lambda_z()['lambda_z']
+        _, tmax = engine.cmax_tmax()
+        eliminating = lambda_z > 0
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if self.route == 'IV':
+                cl = self.dose / auc
+                mrt = 1 / lambda_z
+            elif bioavailability is not None and bioavailability > 0:
+                cl = (self.dose * bioavailability) / auc
+                mrt = (1 / lambda_z) - (tmax / 2)
+            else:
+                cl = np.full(engine.n_subjects, np.nan)
+                mrt = (1 / lambda_z) - (tmax / 2)
+                self.warnings.append(
+                    "Cannot calculate CL for extravascular route without bioavailability. "
+                    "Provide bioavailability parameter."
+                )
+            vd = np.where(~np.isnan(cl) & eliminating, cl / lambda_z, np.nan)
+            vd_ss = np.where(eliminating, cl * mrt, np.nan)
         
-        results_df = pd.DataFrame(results)
+        # Normalize to body weight (assume 70 kg adult)
+        body_weight = 70  # kg
+        results_df = pd.DataFrame({
+            'subject_id': subject_ids,
+            'CL': cl,
+            'CL_norm': cl / body_weight,
+            'Vd': vd,
+            'Vd_norm': vd / body_weight,
+            'Vd_ss': vd_ss,
+            'Vd_ss_norm': vd_ss / body_weight,
+            'lambda_z': lambda_z
+        })
         
         parameters = {
             'mean_CL': results_df['CL'].mean(),
@@ -2013,32 +2031,25 @@ class PKPDAnalysis:
         lambda_z_timepoints: Optional[int]
     ) -> PKPDResult:
         """Calculate PK parameters for multiple subjects."""
-        subject_ids = df['subject_id'].unique()
-        results = []
-        
-        for subject_id in subject_ids:
-            subject_data = df[df['subject_id'] == subject_id].drop('subject_id', axis=1)
-            pkpd = PKPDAnalysis(subject_data, self.dose, self.route, self.tau, subject_id)
-            result = pkpd.pk_parameter_estimation(alpha, lambda_z_timepoints)
-            results.append({
-                'subject_id': subject_id,
-                **result.parameters
-            })
-        
-        results_df = pd.DataFrame(results)
+        engine = self._grouped_nca(df)
+        subject_ids = engine.subject_ids
+        results_df = engine.pk_parameters(self.dose, self.route, self.tau, lambda_z_timepoints)
         
-        # Calculate summary statistics
+        # Calculate summary statistics (column-wise over the subject x parameter matrix)
         numeric_cols = [col for col in results_df.columns if col != 'subject_id']
+        matrix = results_df[numeric_cols].to_numpy(dtype=float)
+        means = np.mean(matrix, axis=0)
+        medians = np.median(matrix, axis=0)
+        sds = np.std(matrix, axis=0)
         
         parameters = {}
-        for col in numeric_cols:
-            values = results_df[col].values
-            parameters[f'mean_{col}'] = np.mean(values)
-            parameters[f'median_{col}'] = np.median(values)
-            parameters[f'sd_{col}'] = np.std(values)
+        for col, mean_val, median_val, sd_val in zip(numeric_cols, means, medians, sds):
+            parameters[f'mean_{col}'] = mean_val
+            parameters[f'median_{col}'] = median_val
+            parameters[f'sd_{col}'] = sd_val
             
-            if np.mean(values) > 0:
-                parameters[f'cv_{col}'] = (np.std(values) / np.mean(values) * 100)
+            if mean_val > 0:
+                parameters[f'cv_{col}'] = (sd_val / mean_val * 100)
         
         # Confidence intervals
         confidence_intervals = {}
@@ -2055,7 +2066,9 @@ class PKPDAnalysis:
             'Tmax': 'h',
             't1/2': 'h',
             'CL': 'L/h',
-            'Vd': 'L'
+            'Vd': 'L',
+            'Vss': 'L',
+            'MRT': 'h'
         }
         
         interpretation = self._generate_pk_summary_interpretation(parameters, units, n_subjects=len(subject_ids))
@@ -2735,11 +2748,6 @@ class PKPDAnalysis:
         Includes geometric means for log-normal parameters.
         Supports both single and multiple subject data.
         """
-        # Get complete PK parameters
-        pk_result = self.pk_parameter_estimation(alpha)
-        pk_params = pk_result.parameters
-        pk_units = pk_result.units
-        
         # Define standard parameters if not specified
         if parameters is None:
             parameters = [
@@ -2751,6 +2759,11 @@ class PKPDAnalysis:
         if 'subject_id' in df.columns:
             return self._summary_multiple_subjects(df, parameters, format, alpha)
         
+        # Get complete PK parameters
+        pk_result = self.pk_parameter_estimation(alpha)
+        pk_params = pk_result.parameters
+        pk_units = pk_result.units
+        
         # Build summary table
         summary_data = []
         for param in parameters:
@@ -2802,18 +2815,10 @@ class PKPDAnalysis:
         alpha: float
     ) -> PKPDResult:
         """Generate summary statistics for multiple subjects."""
-        subject_ids = df['subject_id'].unique()
-        
         # Get individual subject parameters
-        subject_params = []
-        for subject_id in subject_ids:
-            subject_data = df[df['subject_id'] == subject_id].drop('subject_id', axis=1)
-            pkpd = PKPDAnalysis(subject_data, self.dose, self.route, self.tau, subject_id)
-            result = pkpd.pk_parameter_estimation(alpha)
-            subject_params.append(result.parameters)
-        
-        params_df = pd.DataFrame(subject_params)
-        params_df['subject_id'] = subject_ids
+        engine = self._grouped_nca(df)
+        subject_ids = engine.subject_ids
+        params_df = engine.pk_parameters(self.dose, self.route, self.tau)
         
         # Calculate summary statistics
         summary_data = []
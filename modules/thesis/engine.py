@@ -14,6 +14,7 @@ from modules.thesis.structure import (
 from modules.thesis.validator import thesis_validator
 from modules.agent.prompts import PHD_THESIS_WRITER_PROMPT
 from modules.rag.vector_store import get_vector_store
+from runtime.lazy import LazyObject
 
 logger = logging.getLogger("thesis.engine")
 
@@ -247,7 +248,8 @@ Write the section:"""
             for cid in THESIS_STRUCTURE if cid not in [ChapterId.REFERENCES, ChapterId.APPENDICES]
         ]
 
-thesis_engine = ThesisEngine()
+# Built on first use: the vector store loads the embedding model
+thesis_engine = LazyObject(ThesisEngine, "thesis_engine")
 
 def get_thesis_engine() -> ThesisEngine:
     return thesis_engine
@@ -3,7 +3,8 @@ import chromadb
 from chromadb.config import Settings
 from typing import List, Dict, Any, Optional
 import logging
-from sentence_transformers import SentenceTransformer
+
+from modules.rag.embedding_service import get_embedding_service
 
 logger = logging.getLogger(__name__)
 
@@ -11,23 +12,31 @@ class LocalEmbedder:
     """
     Local embedding using HuggingFace sentence-transformers.
     Zero-cost alternative to OpenAI/Google embeddings.
+    The model is shared process-wide and calls are micro-batched and cached.
     """
     
     def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
         logger.info(f"Initializing LocalEmbedder with model: {model_name}")
-        self.model = SentenceTransformer(model_name)
+        self.service = get_embedding_service(model_name)
+        self.model = self.service.model
         self.model_name = model_name
     
     def embed(self, text: str) -> List[float]:
         """Generate embedding for single text."""
-        # convert_to_numpy=True returns numpy array, we need list for Chroma
-        embedding = self.model.encode(text, convert_to_numpy=True)
-        return embedding.tolist()
+        # Chroma wants plain lists, not numpy arrays
+        return self.service.embed([text])[0].tolist()
     
     def embed_batch(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings for batch."""
-        embeddings = self.model.encode(texts, convert_to_numpy=True)
-        return embeddings.tolist()
+        return self.service.embed(texts).tolist()
+
+    async def aembed(self, text: str) -> List[float]:
+        """Async embed() for use on the event loop."""
+        return (await self.service.aembed([text]))[0].tolist()
+
+    async def aembed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Async embed_batch() for use on the event loop."""
+        return (await self.service.aembed(texts)).tolist()
 
 class ChromaVectorStore:
     """
@@ -113,7 +122,7 @@ class ChromaVectorStore:
             
         # Generate embeddings
         try:
-            embeddings = self.embedder.embed_batch(texts)
+            embeddings = await self.embedder.aembed_batch(texts)
             
             # Add to Chroma
             collection.add(
@@ -142,7 +151,7 @@ class ChromaVectorStore:
         collection = self.collections[collection_name]
         
         try:
-            query_embedding = self.embedder.embed(query)
+            query_embedding = await self.embedder.aembed(query)
             
             results = collection.query(
                 query_embeddings=[query_embedding],
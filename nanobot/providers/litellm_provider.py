@@ -3,10 +3,11 @@
 import os
 from typing import Any
 
-import litellm
-from litellm import acompletion
-
 from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from runtime.lazy import lazy_import
+
+# Imported on first use; LiteLLM alone takes seconds to load
+litellm = lazy_import("litellm")
 
 
 class LiteLLMProvider(LLMProvider):
@@ -145,7 +146,7 @@ class LiteLLMProvider(LLMProvider):
             kwargs["tool_choice"] = "auto"
         
         try:
-            response = await acompletion(**kwargs)
+            response = await litellm.acompletion(**kwargs)
             return self._parse_response(response)
         except Exception as e:
             # Return error as content for graceful handling
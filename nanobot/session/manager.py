@@ -1,6 +1,10 @@
 """Session management for conversation history."""
 
 import json
+import os
+import struct
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -10,21 +14,33 @@ from loguru import logger
 
 from nanobot.utils.helpers import ensure_dir, safe_filename
 
+# Index file layout (little-endian u64): size of the JSONL file the index
+# describes, offset of the latest metadata line, then one offset per live
+# message line (messages after the latest clear).
+_OFFSET = struct.Struct("<Q")
+_HEADER_SIZE = 2 * _OFFSET.size
+
 
 @dataclass
 class Session:
     """
     A conversation session.
-    
+
     Stores messages in JSONL format for easy reading and persistence.
+    Only the most recent messages are kept in memory; older ones stay on disk.
     """
-    
+
     key: str  # channel:chat_id
     messages: list[dict[str, Any]] = field(default_factory=list)
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     metadata: dict[str, Any] = field(default_factory=dict)
-    
+    # Persistence bookkeeping, maintained by SessionManager
+    _flushed: int = field(default=0, repr=False)
+    _cleared: bool = field(default=False, repr=False)
+    _saved_metadata: str | None = field(default=None, repr=False)
+    _older: int = field(default=0, repr=False)
+
     def add_message(self, role: str, content: str, **kwargs: Any) -> None:
         """Add a message to the session."""
         msg = {
@@ -35,156 +51,382 @@ class Session:
         }
         self.messages.append(msg)
         self.updated_at = datetime.now()
-    
+
     def get_history(self, max_messages: int = 50) -> list[dict[str, Any]]:
         """
         Get message history for LLM context.
-        
+
         Args:
             max_messages: Maximum messages to return.
-        
+
         Returns:
             List of messages in LLM format.
         """
         # Get recent messages
         recent = self.messages[-max_messages:] if len(self.messages) > max_messages else self.messages
-        
+
         # Convert to LLM format (just role and content)
         return [{"role": m["role"], "content": m["content"]} for m in recent]
-    
+
+    @property
+    def total_messages(self) -> int:
+        """Number of messages including those only kept on disk."""
+        return self._older + len(self.messages)
+
     def clear(self) -> None:
         """Clear all messages in the session."""
         self.messages = []
+        self._flushed = 0
+        self._older = 0
+        self._cleared = True
         self.updated_at = datetime.now()
 
 
 class SessionManager:
     """
     Manages conversation sessions.
-    
-    Sessions are stored as JSONL files in the sessions directory.
+
+    Sessions are stored as append-only JSONL files in the sessions directory,
+    each with a binary offset index (.idx) so the latest messages can be read
+    without scanning the file. Saving appends only the new messages; clearing
+    and metadata changes append marker lines, which background compaction
+    later drops. Loaded sessions live in an LRU cache of bounded size.
     """
-    
-    def __init__(self, workspace: Path):
+
+    def __init__(
+        self,
+        workspace: Path,
+        sessions_dir: Path | None = None,
+        max_cached_sessions: int = 256,
+        memory_window: int = 200,
+        compact_interval: float | None = 3600.0,
+    ):
         self.workspace = workspace
-        self.sessions_dir = ensure_dir(Path.home() / ".nanobot" / "sessions")
-        self._cache: dict[str, Session] = {}
-    
+        self.sessions_dir = ensure_dir(sessions_dir or Path.home() / ".nanobot" / "sessions")
+        self.max_cached_sessions = max_cached_sessions
+        self.memory_window = memory_window
+        self._cache: OrderedDict[str, Session] = OrderedDict()
+        self._lock = threading.RLock()
+
+        self._stop = threading.Event()
+        self._compactor: threading.Thread | None = None
+        if compact_interval:
+            self._compactor = threading.Thread(
+                target=self._compact_loop, args=(compact_interval,), name="nanobot-session-compactor", daemon=True
+            )
+            self._compactor.start()
+
     def _get_session_path(self, key: str) -> Path:
         """Get the file path for a session."""
         safe_key = safe_filename(key.replace(":", "_"))
         return self.sessions_dir / f"{safe_key}.jsonl"
-    
+
     def get_or_create(self, key: str) -> Session:
         """
         Get an existing session or create a new one.
-        
+
         Args:
             key: Session key (usually channel:chat_id).
-        
+
         Returns:
             The session.
         """
-        # Check cache
-        if key in self._cache:
-            return self._cache[key]
-        
-        # Try to load from disk
-        session = self._load(key)
-        if session is None:
-            session = Session(key=key)
-        
-        self._cache[key] = session
-        return session
-    
+        with self._lock:
+            # Check cache
+            session = self._cache.get(key)
+            if session is not None:
+                self._cache.move_to_end(key)
+                return session
+
+            # Try to load from disk
+            session = self._load(key)
+            if session is None:
+                session = Session(key=key)
+
+            self._remember(session)
+            return session
+
+    def _remember(self, session: Session) -> None:
+        self._cache[session.key] = session
+        self._cache.move_to_end(session.key)
+        while len(self._cache) > self.max_cached_sessions:
+            self._cache.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Offset index
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _index_path(path: Path) -> Path:
+        return path.with_suffix(".idx")
+
+    def _read_index(self, path: Path) -> tuple[int, list[int]]:
+        """Return (metadata offset, message offsets), rebuilding a stale index."""
+        try:
+            raw = self._index_path(path).read_bytes()
+            if len(raw) >= _HEADER_SIZE and len(raw) % _OFFSET.size == 0:
+                size, meta_offset, *offsets = (o for (o,) in _OFFSET.iter_unpack(raw))
+                # A crash between appending to the file and to the index leaves them out of step
+                if size == path.stat().st_size:
+                    return meta_offset, offsets
+        except FileNotFoundError:
+            pass
+        return self._rebuild_index(path)
+
+    def _rebuild_index(self, path: Path) -> tuple[int, list[int]]:
+        """Scan a session file once (e.g. written by an older version)."""
+        meta_offset, offsets, pos = 0, [], 0
+        with open(path, "r+b") as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(0)
+            for line in f:
+                start, pos = pos, pos + len(line)
+                stripped = line.strip()
+                if not stripped:
+                    continue
+                try:
+                    kind = json.loads(stripped).get("_type")
+                except json.JSONDecodeError:
+                    if pos >= size:
+                        # Torn final record from a crash mid-append
+                        f.truncate(start)
+                        break
+                    logger.warning(f"Skipping corrupt line at byte {start} of {path.name}")
+                    continue
+                if kind == "metadata":
+                    meta_offset = start
+                elif kind == "clear":
+                    offsets = []
+                else:
+                    offsets.append(start)
+        self._write_index(path, meta_offset, offsets)
+        return meta_offset, offsets
+
+    def _write_index(self, path: Path, meta_offset: int, offsets: list[int]) -> None:
+        tmp = self._index_path(path).with_suffix(".idx.tmp")
+        size = path.stat().st_size
+        with open(tmp, "wb") as f:
+            f.write(b"".join(_OFFSET.pack(o) for o in [size, meta_offset, *offsets]))
+        os.replace(tmp, self._index_path(path))
+
+    # ------------------------------------------------------------------
+    # Load / save
+    # ------------------------------------------------------------------
+
     def _load(self, key: str) -> Session | None:
-        """Load a session from disk."""
+        """Load a session's metadata and its most recent messages from disk."""
         path = self._get_session_path(key)
-        
+
         if not path.exists():
             return None
-        
+
         try:
-            messages = []
-            metadata = {}
-            created_at = None
-            
-            with open(path) as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    data = json.loads(line)
-                    
-                    if data.get("_type") == "metadata":
-                        metadata = data.get("metadata", {})
-                        created_at = datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None
-                    else:
-                        messages.append(data)
-            
+            meta_offset, offsets = self._read_index(path)
+            loaded = offsets[-self.memory_window:] if self.memory_window else []
+
+            with open(path, "rb") as f:
+                f.seek(meta_offset)
+                header = json.loads(f.readline())
+                messages = []
+                if loaded:
+                    f.seek(loaded[0])
+                    # Marker lines appended after the first loaded message are skipped
+                    messages = [
+                        msg for msg in (json.loads(line) for line in f.read().splitlines() if line.strip())
+                        if "_type" not in msg
+                    ]
+
+            metadata = header.get("metadata", {})
+            created_at = datetime.fromisoformat(header["created_at"]) if header.get("created_at") else None
+            updated_at = datetime.fromisoformat(header["updated_at"]) if header.get("updated_at") else None
+            if messages and messages[-1].get("timestamp"):
+                updated_at = datetime.fromisoformat(messages[-1]["timestamp"])
+
             return Session(
                 key=key,
                 messages=messages,
                 created_at=created_at or datetime.now(),
-                metadata=metadata
+                updated_at=updated_at or created_at or datetime.now(),
+                metadata=metadata,
+                _flushed=len(messages),
+                _saved_metadata=json.dumps(metadata, sort_keys=True),
+                _older=len(offsets) - len(loaded),
             )
         except Exception as e:
             logger.warning(f"Failed to load session {key}: {e}")
             return None
-    
+
+    @staticmethod
+    def _metadata_line(session: Session) -> dict[str, Any]:
+        return {
+            "_type": "metadata",
+            "created_at": session.created_at.isoformat(),
+            "updated_at": session.updated_at.isoformat(),
+            "metadata": session.metadata
+        }
+
     def save(self, session: Session) -> None:
-        """Save a session to disk."""
+        """Append the session's unsaved changes to disk."""
         path = self._get_session_path(session.key)
-        
-        with open(path, "w") as f:
-            # Write metadata first
-            metadata_line = {
-                "_type": "metadata",
-                "created_at": session.created_at.isoformat(),
-                "updated_at": session.updated_at.isoformat(),
-                "metadata": session.metadata
-            }
-            f.write(json.dumps(metadata_line) + "\n")
-            
-            # Write messages
-            for msg in session.messages:
-                f.write(json.dumps(msg) + "\n")
-        
-        self._cache[session.key] = session
-    
+        idx_path = self._index_path(path)
+
+        with self._lock:
+            if not path.exists():
+                # A fresh file: header first, then every message held in memory
+                session._cleared = False
+                session._saved_metadata = None
+                session._flushed = 0
+                session._older = 0
+                with open(path, "wb"):
+                    pass
+                self._write_index(path, 0, [])
+            else:
+                self._read_index(path)  # repairs the index after a crash mid-append
+
+            metadata = json.dumps(session.metadata, sort_keys=True)
+            lines: list[tuple[str, dict[str, Any]]] = []
+            if session._cleared:
+                lines.append(("clear", {"_type": "clear"}))
+            if metadata != session._saved_metadata:
+                lines.append(("metadata", self._metadata_line(session)))
+            lines.extend(("message", msg) for msg in session.messages[session._flushed:])
+
+            if lines:
+                with open(path, "ab") as f, open(idx_path, "r+b") as idx:
+                    pos = f.seek(0, os.SEEK_END)
+                    chunks, new_offsets = [], []
+                    for kind, data in lines:
+                        encoded = (json.dumps(data) + "\n").encode("utf-8")
+                        if kind == "clear":
+                            idx.truncate(_HEADER_SIZE)
+                            new_offsets = []
+                        elif kind == "metadata":
+                            idx.seek(_OFFSET.size)
+                            idx.write(_OFFSET.pack(pos))
+                        else:
+                            new_offsets.append(pos)
+                        chunks.append(encoded)
+                        pos += len(encoded)
+                    f.write(b"".join(chunks))
+                    f.flush()
+                    idx.seek(0, os.SEEK_END)
+                    idx.write(b"".join(_OFFSET.pack(o) for o in new_offsets))
+                    # Stamp the size last: the index is only trusted once it covers the append
+                    idx.seek(0)
+                    idx.write(_OFFSET.pack(pos))
+
+            session._cleared = False
+            session._saved_metadata = metadata
+            session._flushed = len(session.messages)
+
+            # Everything is on disk now; keep only the recent window in memory
+            excess = len(session.messages) - self.memory_window
+            if excess > 0:
+                del session.messages[:excess]
+                session._older += excess
+                session._flushed -= excess
+
+            self._remember(session)
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+
+    def compact(self, key: str, min_dead_bytes: int = 64 * 1024) -> bool:
+        """
+        Rewrite a session file without cleared messages or stale metadata.
+
+        Args:
+            key: Session key.
+            min_dead_bytes: Skip files with less reclaimable space than this.
+
+        Returns:
+            True if the file was rewritten.
+        """
+        return self._compact_path(self._get_session_path(key), min_dead_bytes)
+
+    def _compact_path(self, path: Path, min_dead_bytes: int) -> bool:
+        with self._lock:
+            if not path.exists():
+                return False
+            meta_offset, offsets = self._read_index(path)
+            with open(path, "rb") as f:
+                size = f.seek(0, os.SEEK_END)
+                f.seek(meta_offset)
+                header = f.readline()
+                live = []
+                for offset in offsets:
+                    f.seek(offset)
+                    live.append(f.readline())
+            dead = size - len(header) - sum(len(line) for line in live)
+            if dead < min_dead_bytes:
+                return False
+
+            new_offsets, pos = [], len(header)
+            for line in live:
+                new_offsets.append(pos)
+                pos += len(line)
+            tmp = path.with_suffix(".jsonl.tmp")
+            with open(tmp, "wb") as f:
+                f.write(header + b"".join(live))
+            os.replace(tmp, path)
+            self._write_index(path, 0, new_offsets)
+            logger.debug(f"Compacted session file {path.name}: {dead} bytes reclaimed")
+            return True
+
+    def compact_all(self, min_dead_bytes: int = 64 * 1024) -> int:
+        """Compact every session file with enough reclaimable space."""
+        compacted = 0
+        for path in self.sessions_dir.glob("*.jsonl"):
+            try:
+                compacted += self._compact_path(path, min_dead_bytes)
+            except Exception as e:
+                logger.warning(f"Failed to compact session file {path.name}: {e}")
+        return compacted
+
+    def _compact_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.compact_all()
+
+    def close(self) -> None:
+        """Stop background compaction."""
+        self._stop.set()
+
     def delete(self, key: str) -> bool:
         """
         Delete a session.
-        
+
         Args:
             key: Session key.
-        
+
         Returns:
             True if deleted, False if not found.
         """
-        # Remove from cache
-        self._cache.pop(key, None)
-        
-        # Remove file
-        path = self._get_session_path(key)
-        if path.exists():
-            path.unlink()
-            return True
-        return False
-    
+        with self._lock:
+            # Remove from cache
+            self._cache.pop(key, None)
+
+            # Remove file
+            path = self._get_session_path(key)
+            self._index_path(path).unlink(missing_ok=True)
+            if path.exists():
+                path.unlink()
+                return True
+            return False
+
     def list_sessions(self) -> list[dict[str, Any]]:
         """
         List all sessions.
-        
+
         Returns:
             List of session info dicts.
         """
         sessions = []
-        
+
         for path in self.sessions_dir.glob("*.jsonl"):
             try:
-                # Read just the metadata line
+                # Read just the metadata line; the file is appended on every save,
+                # so its modification time is the last update
                 with open(path) as f:
                     first_line = f.readline().strip()
                     if first_line:
@@ -193,10 +435,10 @@ class SessionManager:
                             sessions.append({
                                 "key": path.stem.replace("_", ":"),
                                 "created_at": data.get("created_at"),
-                                "updated_at": data.get("updated_at"),
+                                "updated_at": datetime.fromtimestamp(path.stat().st_mtime).isoformat(),
                                 "path": str(path)
                             })
             except Exception:
                 continue
-        
+
         return sorted(sessions, key=lambda x: x.get("updated_at", ""), reverse=True)
@@ -14,6 +14,7 @@ Components:
 - SciBERTEmbedder: Generate semantic embeddings using SciBERT
 - DrugDiscoveryThemeExtractor: Extract themes using BERTopic
 - PreclinicalGapAnalyzer: Detect research gaps and assess novelty
+- EntityIndex: Sparse paper x entity matrix for frequency and co-occurrence counts
 
 Example Usage:
     from nlp import GROBIDParser, SciBERTEmbedder, DrugDiscoveryThemeExtractor, PreclinicalGapAnalyzer
@@ -22,6 +23,10 @@ Example Usage:
     grobid = GROBIDParser()
     papers = grobid.batch_parse(['paper1.pdf', 'paper2.pdf'])
 
+    # Large libraries: stream results, TEI cached on disk
+    for result in grobid.iter_parse(pdf_paths):
+        ...
+
     # Generate embeddings
     embedder = SciBERTEmbedder()
     abstracts = [p['abstract'] for p in papers]
@@ -36,10 +41,28 @@ Example Usage:
     gaps = gap_analyzer.detect_research_gaps("Alzheimer's", papers)
 """
 
-from .grobid_parser import GROBIDParser, ParsedPaper
-from .scibert_embedder import SciBERTEmbedder
-from .bertopic_extractor import DrugDiscoveryThemeExtractor
-from .gap_analyzer import PreclinicalGapAnalyzer
+import importlib
+
+# Exports resolve on first access, so importing one submodule (e.g. in a
+# GROBID TEI worker process) does not pull in torch and BERTopic
+_EXPORTS = {
+    'GROBIDParser': '.grobid_parser',
+    'ParsedPaper': '.grobid_parser',
+    'SciBERTEmbedder': '.scibert_embedder',
+    'DrugDiscoveryThemeExtractor': '.bertopic_extractor',
+    'PreclinicalGapAnalyzer': '.gap_analyzer',
+    'EntityIndex': '.entity_index',
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __version__ = '1.0.0'
 __author__ = 'BioDockify Team'
@@ -50,4 +73,5 @@ __all__ = [
     'SciBERTEmbedder',
     'DrugDiscoveryThemeExtractor',
     'PreclinicalGapAnalyzer',
+    'EntityIndex',
 ]
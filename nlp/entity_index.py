@@ -0,0 +1,131 @@
+"""
+Entity Vocabulary Index
+
+Sparse paper x entity incidence matrix for corpus-level entity statistics:
+- Entity vocabulary built incrementally as papers are added
+- Document frequency per entity from one column sum
+- Total mention counts per entity
+- Pairwise co-occurrence counts from one sparse product (X^T X)
+
+Cost grows with the number of (paper, entity) mentions and co-occurring
+pairs, not with the square of the number of papers.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import logging
+
+import numpy as np
+from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+
+class EntityIndex:
+    """
+    Incidence matrix of papers (rows) against distinct entity texts (columns).
+
+    Example:
+        index = EntityIndex()
+        index.add_papers(entity_lists)
+        for a, b, n in index.cooccurring_pairs(min_count=2, max_count=2):
+            ...
+    """
+
+    def __init__(self):
+        self.vocabulary: Dict[str, int] = {}
+        self.entities: List[str] = []
+        self.entity_types: List[Set[str]] = []
+        self._mentions: List[int] = []
+        # CSR buffers, extended per paper
+        self._indices: List[int] = []
+        self._indptr: List[int] = [0]
+        self._matrix: Optional[sparse.csr_matrix] = None
+
+    @property
+    def n_papers(self) -> int:
+        return len(self._indptr) - 1
+
+    @property
+    def n_entities(self) -> int:
+        return len(self.entities)
+
+    def add_paper(self, entities: Iterable[Dict]) -> int:
+        """
+        Add one paper's entities (dicts with 'text' and 'entity_type').
+        Repeated mentions within a paper count once in the incidence matrix
+        (but each one counts in mention_frequency). Returns the paper's row.
+        """
+        columns = set()
+        for entity in entities:
+            text = entity.get('text', '')
+            if not text:
+                continue
+            col = self.vocabulary.get(text)
+            if col is None:
+                col = len(self.entities)
+                self.vocabulary[text] = col
+                self.entities.append(text)
+                self.entity_types.append(set())
+                self._mentions.append(0)
+            self._mentions[col] += 1
+            self.entity_types[col].add(entity.get('entity_type', 'unknown'))
+            columns.add(col)
+
+        self._indices.extend(sorted(columns))
+        self._indptr.append(len(self._indices))
+        self._matrix = None
+        return self.n_papers - 1
+
+    def add_papers(self, papers_entities: Iterable[Iterable[Dict]]):
+        for entities in papers_entities:
+            self.add_paper(entities)
+
+    def incidence(self) -> sparse.csr_matrix:
+        """Binary papers x entities matrix (cached until the next add)."""
+        if self._matrix is None:
+            data = np.ones(len(self._indices), dtype=np.int32)
+            self._matrix = sparse.csr_matrix(
+                (data, np.asarray(self._indices, dtype=np.int64), np.asarray(self._indptr, dtype=np.int64)),
+                shape=(self.n_papers, self.n_entities),
+            )
+        return self._matrix
+
+    def document_frequency(self) -> np.ndarray:
+        """Number of papers mentioning each entity, indexed like self.entities."""
+        return np.asarray(self.incidence().sum(axis=0)).ravel()
+
+    def mention_frequency(self) -> np.ndarray:
+        """Total mentions of each entity across all papers, indexed like self.entities."""
+        return np.asarray(self._mentions, dtype=np.int64)
+
+    def cooccurrence(self) -> sparse.coo_matrix:
+        """
+        Upper-triangular entity x entity matrix of shared-paper counts.
+        Entry (a, b), a < b, is the number of papers mentioning both.
+        """
+        x = self.incidence().tocsc()
+        counts = (x.T @ x).tocoo()
+        upper = counts.row < counts.col
+        return sparse.coo_matrix(
+            (counts.data[upper], (counts.row[upper], counts.col[upper])),
+            shape=counts.shape,
+        )
+
+    def cooccurring_pairs(
+        self,
+        min_count: int = 1,
+        max_count: Optional[int] = None
+    ) -> Iterator[Tuple[str, str, int]]:
+        """
+        Entity pairs with min_count <= shared papers <= max_count.
+
+        Yields:
+            (entity_a, entity_b, paper_count) with entity_a < entity_b
+        """
+        counts = self.cooccurrence()
+        keep = counts.data >= min_count
+        if max_count is not None:
+            keep &= counts.data <= max_count
+        for a, b, n in zip(counts.row[keep], counts.col[keep], counts.data[keep]):
+            first, second = sorted((self.entities[a], self.entities[b]))
+            yield first, second, int(n)
@@ -5,6 +5,7 @@ This module provides analysis tools for identifying research gaps and assessing
 novelty in pharmaceutical literature, including:
 - Entity frequency analysis
 - Under-explored research direction detection
+- Entity co-occurrence analysis on a sparse paper x entity matrix
 - Semantic gap detection using embeddings
 - Graph-based gap detection (with Neo4j)
 - Research novelty scoring
@@ -16,11 +17,14 @@ Papers + Embeddings → Entity Extraction → Frequency Analysis → Gap Detecti
 
 from typing import List, Dict, Optional, Any, Tuple
 import numpy as np
-from collections import Counter, defaultdict
+from collections import Counter, OrderedDict, defaultdict
 import logging
 from pathlib import Path
+import hashlib
 import json
 
+from .entity_index import EntityIndex
+
 
 # Set up logging
 logging.basicConfig(
@@ -80,7 +84,8 @@ class PreclinicalGapAnalyzer:
         faiss_index=None,
         neo4j_client=None,
         min_entity_count: int = 3,
-        density_threshold: float = 0.1
+        density_threshold: float = 0.1,
+        entity_cache_size: int = 10000
     ):
         """
         Initialize Preclinical Gap Analyzer
@@ -91,12 +96,16 @@ class PreclinicalGapAnalyzer:
             neo4j_client: Optional Neo4j client for graph analysis
             min_entity_count: Minimum count for entity to be considered
             density_threshold: Threshold for semantic gap detection
+            entity_cache_size: Abstracts whose extracted entities are kept (LRU)
         """
         self.embedder = embedder
         self.index = faiss_index
         self.graph = neo4j_client
         self.min_entity_count = min_entity_count
         self.density_threshold = density_threshold
+        # Extracted entities per abstract (content hash), reused across calls
+        self.entity_cache_size = entity_cache_size
+        self._entity_cache: 'OrderedDict[str, List[Dict]]' = OrderedDict()
 
         logger.info("Preclinical Gap Analyzer initialized")
 
@@ -138,6 +147,33 @@ class PreclinicalGapAnalyzer:
 
         return entities
 
+    def paper_entities(self, paper: Dict) -> List[Dict]:
+        """
+        Entities of a paper: its 'entities' field, else extracted from the
+        abstract once and cached by content hash.
+        """
+        entities = paper.get('entities', [])
+        if entities or 'abstract' not in paper:
+            return entities
+
+        key = hashlib.sha1(paper['abstract'].encode('utf-8')).hexdigest()
+        cached = self._entity_cache.get(key)
+        if cached is None:
+            cached = self.extract_entities(paper['abstract'])
+            self._entity_cache[key] = cached
+            if len(self._entity_cache) > self.entity_cache_size:
+                self._entity_cache.popitem(last=False)
+        else:
+            self._entity_cache.move_to_end(key)
+        return cached
+
+    def build_entity_index(self, papers: List[Dict]) -> EntityIndex:
+        """Sparse paper x entity incidence index for a corpus"""
+        index = EntityIndex()
+        index.add_papers(self.paper_entities(paper) for paper in papers)
+        logger.info(f"Entity index: {index.n_papers} papers x {index.n_entities} entities")
+        return index
+
     def detect_research_gaps(
         self,
         research_area: str,
@@ -163,9 +199,14 @@ class PreclinicalGapAnalyzer:
 
         gaps = []
 
+        # Entity statistics for both frequency and combination gaps come from one index
+        entity_index = None
+        if 'under_explored' in gap_types or 'combination' in gap_types:
+            entity_index = self.build_entity_index(papers)
+
         # 1. Entity frequency-based gaps
         if 'under_explored' in gap_types:
-            entity_gaps = self._detect_underexplored_entities(papers)
+            entity_gaps = self._detect_underexplored_entities(papers, entity_index)
             gaps.extend(entity_gaps)
 
         # 2. Semantic gaps using embeddings
@@ -175,7 +216,7 @@ class PreclinicalGapAnalyzer:
 
         # 3. Combination gaps (under-studied entity pairs)
         if 'combination' in gap_types:
-            combination_gaps = self._detect_combination_gaps(papers)
+            combination_gaps = self._detect_combination_gaps(papers, entity_index)
             gaps.extend(combination_gaps)
 
         # 4. Graph-based gaps (if Neo4j available)
@@ -194,92 +235,70 @@ class PreclinicalGapAnalyzer:
 
         return gaps
 
-    def _detect_underexplored_entities(self, papers: List[Dict]) -> List[Dict]:
+    def _detect_underexplored_entities(
+        self,
+        papers: List[Dict],
+        entity_index: Optional[EntityIndex] = None
+    ) -> List[Dict]:
         """Detect under-explored entities"""
         gaps = []
 
-        # Collect all entities
-        all_entities = []
-        for paper in papers:
-            paper_entities = paper.get('entities', [])
-
-            # Extract entities if not present
-            if not paper_entities and 'abstract' in paper:
-                paper_entities = self.extract_entities(paper['abstract'])
-
-            all_entities.extend(paper_entities)
+        if entity_index is None:
+            entity_index = self.build_entity_index(papers)
 
-        # Count entity occurrences
-        entity_counts = Counter()
-        entity_by_type = defaultdict(list)
-
-        for entity in all_entities:
-            entity_text = entity.get('text', '')
-            entity_counts[entity_text] += 1
-            entity_by_type[entity_text].append(entity.get('entity_type', 'unknown'))
+        # Total mentions of each entity (repeats within a paper included)
+        entity_counts = entity_index.mention_frequency()
 
         # Find under-explored entities
-        for entity, count in entity_counts.items():
-            if count < self.min_entity_count:
-                # Higher novelty for less frequently mentioned entities
-                novelty_score = 1.0 / (count + 1)
-
-                gaps.append({
-                    'entity': entity,
-                    'entity_types': list(set(entity_by_type[entity])),
-                    'paper_count': count,
-                    'gap_type': 'under_explored_entity',
-                    'novelty_score': novelty_score,
-                    'description': f"Entity '{entity}' mentioned in only {count} papers"
-                })
+        for col in np.flatnonzero(entity_counts < self.min_entity_count):
+            entity = entity_index.entities[col]
+            count = int(entity_counts[col])
+            # Higher novelty for less frequently mentioned entities
+            novelty_score = 1.0 / (count + 1)
+
+            gaps.append({
+                'entity': entity,
+                'entity_types': sorted(entity_index.entity_types[col]),
+                'paper_count': count,
+                'gap_type': 'under_explored_entity',
+                'novelty_score': novelty_score,
+                'description': f"Entity '{entity}' mentioned in only {count} papers"
+            })
 
         logger.info(f"Found {len(gaps)} under-explored entity gaps")
 
         return gaps
 
-    def _detect_combination_gaps(self, papers: List[Dict]) -> List[Dict]:
-        """Detect under-studied entity combinations"""
-        gaps = []
-
-        # Collect entities per paper
-        papers_entities = []
-        for paper in papers:
-            entities = paper.get('entities', [])
-
-            if not entities and 'abstract' in paper:
-                entities = self.extract_entities(paper['abstract'])
-
-            entity_texts = [e.get('text', '') for e in entities]
-            papers_entities.append(set(entity_texts))
+    def _detect_combination_gaps(
+        self,
+        papers: List[Dict],
+        entity_index: Optional[EntityIndex] = None
+    ) -> List[Dict]:
+        """
+        Detect under-studied entity combinations
 
-        # Count co-occurrences
-        co_occurrences = Counter()
+        A combination is a pair of entities mentioned together in at least
+        two papers but fewer than min_entity_count.
+        """
+        gaps = []
 
-        for i, entities1 in enumerate(papers_entities):
-            for entities2 in papers_entities[i+1:]:
-                # Find intersection
-                common = entities1 & entities2
+        if entity_index is None:
+            entity_index = self.build_entity_index(papers)
 
-                if len(common) >= 2:
-                    # Create sorted pairs
-                    common_list = sorted(common)
-                    for j in range(len(common_list)):
-                        for k in range(j+1, len(common_list)):
-                            pair = f"{common_list[j]} + {common_list[k]}"
-                            co_occurrences[pair] += 1
+        # Shared-paper counts for every entity pair, from one sparse product
+        pairs = entity_index.cooccurring_pairs(min_count=2, max_count=self.min_entity_count - 1)
 
-        # Find under-explored combinations
-        for combo, count in co_occurrences.items():
-            if count < self.min_entity_count:
-                novelty_score = 1.0 / (count + 1)
+        for first, second, count in sorted(pairs):
+            combo = f"{first} + {second}"
+            novelty_score = 1.0 / (count + 1)
 
-                gaps.append({
-                    'combination': combo,
-                    'paper_count': count,
-                    'gap_type': 'under_explored_combination',
-                    'novelty_score': novelty_score,
-                    'description': f"Combination '{combo}' studied in only {count} papers"
-                })
+            gaps.append({
+                'combination': combo,
+                'paper_count': count,
+                'gap_type': 'under_explored_combination',
+                'novelty_score': novelty_score,
+                'description': f"Combination '{combo}' studied in only {count} papers"
+            })
 
         logger.info(f"Found {len(gaps)} under-explored combination gaps")
 
@@ -375,10 +394,7 @@ class PreclinicalGapAnalyzer:
             # Collect all entities from papers
             all_paper_entities = set()
             for paper in papers:
-                paper_entities = paper.get('entities', [])
-                if not paper_entities and 'abstract' in paper:
-                    paper_entities = self.extract_entities(paper['abstract'])
-                all_paper_entities.update(e['text'] for e in paper_entities)
+                all_paper_entities.update(e['text'] for e in self.paper_entities(paper))
 
             if not all_paper_entities:
                 return 1.0  # No entities in papers, maximum novelty
@@ -412,12 +428,13 @@ class PreclinicalGapAnalyzer:
             return gaps
 
         try:
-            # Get abstracts
-            abstracts = [p.get('abstract', '') for p in papers if p.get('abstract')]
+            # Get abstracts, remembering which paper each came from
+            paper_indices = [i for i, p in enumerate(papers) if p.get('abstract')]
+            abstracts = [papers[i]['abstract'] for i in paper_indices]
             if not abstracts:
                 return gaps
 
-            # Generate embeddings
+            # Generate embeddings (cached by content, so only new papers hit the model)
             embeddings = self.embedder.embed_batch(
                 abstracts,
                 batch_size=32,
@@ -425,38 +442,33 @@ class PreclinicalGapAnalyzer:
                 show_progress=False
             )
 
-            # Calculate local density for each point
-            # Simplified: use k-nearest neighbors distance
+            # Local density from k-nearest-neighbour distances,
+            # all papers in one batched search
             n_neighbors = min(5, len(embeddings))
-            densities = []
-
-            for i, embedding in enumerate(embeddings):
-                # Find k nearest neighbors (excluding self)
-                embedding_reshaped = embedding.reshape(1, -1).astype('float32')
-                distances, indices = self.index.search(embedding_reshaped, n_neighbors + 1)
-
-                # Average distance to neighbors (excluding self at index 0)
-                if len(distances[0]) > 1:
-                    avg_distance = np.mean(distances[0][1:])  # Skip self
-                else:
-                    avg_distance = 0
-
-                densities.append(avg_distance)
+            queries = np.ascontiguousarray(embeddings, dtype='float32')
+            distances, indices = self.index.search(queries, n_neighbors + 1)
 
-            densities = np.array(densities)
+            # Average distance to neighbors (excluding self in column 0;
+            # -1 marks slots the index could not fill)
+            found = indices[:, 1:] != -1
+            totals = np.where(found, distances[:, 1:], 0.0).sum(axis=1)
+            counts = found.sum(axis=1)
+            densities = np.divide(totals, counts, out=np.zeros(len(queries)), where=counts > 0)
 
             # Identify low-density regions (potential gaps)
             density_threshold = np.percentile(densities, 90)  # Top 10% most isolated
+            max_density = float(np.max(densities)) or 1.0
 
             low_density_indices = np.where(densities > density_threshold)[0]
 
             for idx in low_density_indices:
+                paper_idx = paper_indices[idx]
                 gaps.append({
-                    'paper_index': int(idx),
-                    'paper_title': papers[idx].get('title', 'Unknown'),
+                    'paper_index': int(paper_idx),
+                    'paper_title': papers[paper_idx].get('title', 'Unknown'),
                     'density_score': float(densities[idx]),
                     'gap_type': 'semantic_gap',
-                    'novelty_score': float(densities[idx]) / np.max(densities),
+                    'novelty_score': float(densities[idx]) / max_density,
                     'description': 'Paper in low-density region of semantic space'
                 })
 
@@ -6,14 +6,29 @@ for parsing scientific PDFs into structured TEI XML format.
 
 Pipeline Flow:
 PDF → GROBID → TEI XML → Structured Sections (title, abstract, sections, references)
+
+Large libraries:
+- TEI output is cached on disk by PDF content hash, so a PDF is only sent
+  to GROBID once; an interrupted batch resumes where it stopped
+- iter_parse() streams results as they complete, with a bounded number of
+  PDFs in flight, so memory does not grow with the library
+- GROBID requests are capped by an adaptive limit that backs off when
+  GROBID reports it is at capacity (HTTP 503)
+- TEI-to-structure parsing runs in worker processes
 """
 
+import os
+import gzip
+import asyncio
+import hashlib
+import threading
+import multiprocessing
 import requests
 import xml.etree.ElementTree as ET
-from typing import Dict, List, Optional, Any
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
 from pathlib import Path
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from dataclasses import dataclass, asdict
 import time
 
@@ -58,6 +73,116 @@ class ParsedPaper:
     metadata: Dict
 
 
+def pdf_content_hash(pdf_path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a PDF's bytes, read in chunks"""
+    digest = hashlib.sha256()
+    with open(pdf_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TEICache:
+    """
+    On-disk GROBID output keyed by PDF content hash and endpoint.
+
+    One gzipped file per entry under <data dir>/cache/grobid, written
+    atomically, so concurrent batches and interrupted runs never see a
+    partial entry.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        if cache_dir is None:
+            data_dir = os.getenv("BIODOCKIFY_DATA_DIR")
+            base = Path(data_dir) if data_dir else Path.home() / ".biodockify" / "data"
+            cache_dir = str(base / "cache" / "grobid")
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def path_for(self, digest: str, endpoint: str) -> Path:
+        return self.cache_dir / digest[:2] / f"{digest}.{endpoint}.tei.xml.gz"
+
+    def get(self, digest: str, endpoint: str) -> Optional[str]:
+        path = self.path_for(digest, endpoint)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                xml_text = f.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, EOFError) as e:
+            logger.warning(f"Discarding unreadable TEI cache entry {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return xml_text
+
+    def put(self, digest: str, endpoint: str, xml_text: str):
+        path = self.path_for(digest, endpoint)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with gzip.open(tmp, 'wt', encoding='utf-8') as f:
+            f.write(xml_text)
+        os.replace(tmp, path)
+
+    def stats(self) -> Dict[str, Any]:
+        return {'cache_dir': str(self.cache_dir), 'hits': self.hits, 'misses': self.misses}
+
+
+class GrobidCapacity:
+    """
+    Adaptive cap on concurrent GROBID requests.
+
+    Starts at max_concurrency; a 503 (GROBID's request pool is full)
+    halves the cap, and each success raises it by one again.
+    """
+
+    def __init__(self, max_concurrency: int = 4):
+        self.max_concurrency = max(1, max_concurrency)
+        self.limit = self.max_concurrency
+        self.active = 0
+        self.overloads = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self.active >= self.limit:
+                self._cond.wait()
+            self.active += 1
+
+    def release(self, overloaded: bool = False):
+        with self._cond:
+            self.active -= 1
+            if overloaded:
+                self.overloads += 1
+                self.limit = max(1, self.limit // 2)
+            elif self.limit < self.max_concurrency:
+                self.limit += 1
+            self._cond.notify_all()
+
+
+def _init_tei_worker():
+    """Keep TEI worker processes quiet"""
+    logging.getLogger().setLevel(logging.WARNING)
+
+
+def _parse_tei_worker(
+    xml_text: str,
+    extract_sections: bool,
+    extract_references: bool
+) -> Dict[str, Any]:
+    """TEI-to-structure parsing in a worker process (no GROBID connection needed)"""
+    reader = GROBIDParser.__new__(GROBIDParser)
+    return reader._parse_tei_xml(
+        xml_text,
+        extract_sections=extract_sections,
+        extract_references=extract_references
+    )
+
+
 class GROBIDParser:
     """
     GROBID Integration for parsing scientific PDFs
@@ -65,6 +190,7 @@ class GROBIDParser:
     This class provides methods to:
     - Parse individual PDFs
     - Batch parse multiple PDFs
+    - Stream large batches with cached TEI output
     - Extract structured sections from TEI XML
     - Handle errors gracefully
     """
@@ -84,7 +210,10 @@ class GROBIDParser:
         self,
         grobid_url: str = "http://localhost:8070",
         timeout: int = 120,
-        max_retries: int = 3
+        max_retries: int = 3,
+        max_concurrency: int = 4,
+        cache_dir: Optional[str] = None,
+        use_cache: bool = True
     ):
         """
         Initialize GROBID parser
@@ -93,10 +222,16 @@ class GROBIDParser:
             grobid_url: Base URL of GROBID server
             timeout: Request timeout in seconds
             max_retries: Maximum number of retry attempts
+            max_concurrency: Maximum concurrent GROBID requests
+                (keep at or below GROBID's own `concurrency` setting)
+            cache_dir: TEI cache directory (default: <data dir>/cache/grobid)
+            use_cache: Set False to always send PDFs to GROBID
         """
         self.base_url = grobid_url.rstrip('/')
         self.timeout = timeout
         self.max_retries = max_retries
+        self.capacity = GrobidCapacity(max_concurrency)
+        self.cache = TEICache(cache_dir) if use_cache else None
 
         # Validate GROBID is accessible
         self._check_grobid_connection()
@@ -166,7 +301,7 @@ class GROBIDParser:
         endpoint: str = 'processFulltextDocument'
     ) -> str:
         """
-        Send PDF to GROBID for processing
+        Send PDF to GROBID for processing, unless its TEI is cached
 
         Args:
             pdf_path: Path to PDF file
@@ -178,26 +313,52 @@ class GROBIDParser:
         Raises:
             Exception: If request fails after retries
         """
+        return self._fetch_tei(pdf_path, endpoint)[0]
+
+    def _fetch_tei(self, pdf_path: str, endpoint: str) -> Tuple[str, bool]:
+        """TEI XML for a PDF and whether it came from the cache"""
+        if self.cache is None:
+            return self._post_to_grobid(pdf_path, endpoint), False
+
+        digest = pdf_content_hash(pdf_path)
+        xml_text = self.cache.get(digest, endpoint)
+        if xml_text is not None:
+            return xml_text, True
+
+        xml_text = self._post_to_grobid(pdf_path, endpoint)
+        self.cache.put(digest, endpoint, xml_text)
+        return xml_text, False
+
+    def _post_to_grobid(self, pdf_path: str, endpoint: str) -> str:
+        """POST a PDF to GROBID with retries, within the concurrency cap"""
         url = f"{self.base_url}{self.ENDPOINTS[endpoint]}"
 
         for attempt in range(self.max_retries):
             try:
-                with open(pdf_path, 'rb') as f:
-                    files = {'input': f}
-                    headers = {'Accept': 'application/xml'}
-
-                    response = requests.post(
-                        url,
-                        files=files,
-                        headers=headers,
-                        timeout=self.timeout
-                    )
+                status_code = None
+                self.capacity.acquire()
+                try:
+                    with open(pdf_path, 'rb') as f:
+                        files = {'input': f}
+                        headers = {'Accept': 'application/xml'}
+
+                        response = requests.post(
+                            url,
+                            files=files,
+                            headers=headers,
+                            timeout=self.timeout
+                        )
+                    status_code = response.status_code
+                finally:
+                    self.capacity.release(overloaded=status_code == 503)
 
                 if response.status_code == 200:
                     return response.text
-                elif response.status_code == 500:
-                    # GROBID internal error, might work on retry
-                    logger.warning(f"GROBID returned 500, attempt {attempt + 1}/{self.max_retries}")
+                elif response.status_code in (500, 503):
+                    # GROBID internal error or busy (503), might work on retry
+                    logger.warning(
+                        f"GROBID returned {response.status_code}, attempt {attempt + 1}/{self.max_retries}"
+                    )
                     if attempt < self.max_retries - 1:
                         time.sleep(2 ** attempt)  # Exponential backoff
                         continue
@@ -469,6 +630,9 @@ class GROBIDParser:
         """
         Parse multiple PDFs in parallel
 
+        Collects iter_parse() into a list; prefer iter_parse() for large
+        libraries, which does not hold every result in memory.
+
         Args:
             pdf_paths: List of paths to PDF files
             max_workers: Number of parallel workers
@@ -478,59 +642,178 @@ class GROBIDParser:
         Returns:
             List of dictionaries with parsed data or errors
         """
-        results = []
-
         logger.info(f"Batch parsing {len(pdf_paths)} PDFs with {max_workers} workers")
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all tasks
-            future_to_path = {
-                executor.submit(
-                    self._parse_single_pdf,
-                    path,
-                    extract_sections,
-                    extract_references
-                ): path
-                for path in pdf_paths
-            }
-
-            # Collect results as they complete
-            for future in as_completed(future_to_path):
-                path = future_to_path[future]
-
-                try:
-                    parsed = future.result()
-                    results.append({
-                        'success': True,
-                        'file_path': path,
-                        'data': asdict(parsed)
-                    })
-                    logger.info(f"Successfully parsed: {path}")
-                except Exception as e:
-                    logger.error(f"Error parsing {path}: {e}")
-                    results.append({
-                        'success': False,
-                        'file_path': path,
-                        'error': str(e)
-                    })
+        results = list(self.iter_parse(
+            pdf_paths,
+            extract_sections=extract_sections,
+            extract_references=extract_references,
+            parse_workers=0,
+            fetch_workers=max_workers
+        ))
 
         successful = sum(1 for r in results if r['success'])
         logger.info(f"Batch parsing complete: {successful}/{len(pdf_paths)} successful")
 
         return results
 
-    def _parse_single_pdf(
+    def iter_parse(
         self,
-        pdf_path: str,
-        extract_sections: bool,
-        extract_references: bool
-    ) -> ParsedPaper:
-        """Wrapper for single PDF parsing with error handling"""
+        pdf_paths: Iterable[str],
+        extract_sections: bool = True,
+        extract_references: bool = True,
+        parse_workers: Optional[int] = None,
+        fetch_workers: Optional[int] = None,
+        max_in_flight: Optional[int] = None
+    ) -> Iterator[Dict]:
+        """
+        Parse PDFs, yielding each result as soon as it is ready
+
+        PDFs are read from pdf_paths lazily and at most max_in_flight are
+        being fetched or parsed at a time, so memory stays flat however
+        long the input is. Results come in completion order, shaped like
+        batch_parse() items plus a 'cached' flag. Re-running an
+        interrupted batch serves finished PDFs from the TEI cache.
+
+        Args:
+            pdf_paths: Paths to PDF files (any iterable, e.g. a generator)
+            extract_sections: Whether to extract sections
+            extract_references: Whether to extract references
+            parse_workers: TEI parsing processes (default: CPUs - 1, max 4;
+                0 parses in the calling thread)
+            fetch_workers: Threads fetching TEI (default: max_concurrency);
+                GROBID requests stay within the adaptive capacity limit
+            max_in_flight: PDFs fetched or parsed at once (default: 4 x fetch_workers)
+
+        Yields:
+            {'success': True, 'file_path', 'cached', 'data'} or
+            {'success': False, 'file_path', 'error'}
+        """
+        if parse_workers is None:
+            parse_workers = max(1, min(4, (os.cpu_count() or 2) - 1))
+        fetch_workers = fetch_workers or self.capacity.max_concurrency
+        max_in_flight = max(fetch_workers, max_in_flight or 4 * fetch_workers)
+
+        # spawn: forking a process that runs fetch threads is not safe
+        parse_pool = ProcessPoolExecutor(
+            max_workers=parse_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_tei_worker,
+        ) if parse_workers > 0 else None
+        fetch_pool = ThreadPoolExecutor(max_workers=fetch_workers, thread_name_prefix='grobid-fetch')
+
+        paths = iter(pdf_paths)
+        fetching: Dict[Future, str] = {}
+        parsing: Dict[Future, Tuple[str, bool]] = {}
+        exhausted = False
+
         try:
-            return self.parse_pdf(pdf_path, extract_sections, extract_references)
-        except Exception as e:
-            logger.error(f"Failed to parse {pdf_path}: {e}")
-            raise
+            while True:
+                # Top up; fetches beyond GROBID's capacity wait in GrobidCapacity
+                while not exhausted and len(fetching) + len(parsing) < max_in_flight:
+                    path = next(paths, None)
+                    if path is None:
+                        exhausted = True
+                        break
+                    fetching[fetch_pool.submit(self._fetch_tei, str(path), 'processFulltextDocument')] = str(path)
+
+                if not fetching and not parsing:
+                    break
+
+                done, _ = wait(list(fetching) + list(parsing), return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in fetching:
+                        path = fetching.pop(future)
+                        try:
+                            xml_text, cached = future.result()
+                        except Exception as e:
+                            yield self._failed(path, e)
+                            continue
+                        if parse_pool is None:
+                            try:
+                                data = self._parse_tei_xml(xml_text, extract_sections, extract_references)
+                            except Exception as e:
+                                yield self._failed(path, e)
+                                continue
+                            yield self._parsed(path, cached, data)
+                        else:
+                            job = parse_pool.submit(
+                                _parse_tei_worker, xml_text, extract_sections, extract_references
+                            )
+                            parsing[job] = (path, cached)
+                    else:
+                        path, cached = parsing.pop(future)
+                        try:
+                            data = future.result()
+                        except Exception as e:
+                            yield self._failed(path, e)
+                            continue
+                        yield self._parsed(path, cached, data)
+        finally:
+            # Also runs when the caller stops iterating early
+            fetch_pool.shutdown(wait=False, cancel_futures=True)
+            if parse_pool is not None:
+                parse_pool.shutdown(wait=False, cancel_futures=True)
+
+    async def aiter_parse(
+        self,
+        pdf_paths: Iterable[str],
+        buffer_size: int = 16,
+        **kwargs
+    ) -> AsyncIterator[Dict]:
+        """
+        Async version of iter_parse() for use on an event loop
+
+        The pipeline runs on a background thread and hands results over
+        through a queue of buffer_size items; a slow consumer stalls the
+        pipeline instead of letting results pile up.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        slots = threading.Semaphore(buffer_size)
+        stop = threading.Event()
+        done = object()
+
+        def produce():
+            results = self.iter_parse(pdf_paths, **kwargs)
+            outcome: Any = done
+            try:
+                for result in results:
+                    # Wait for the consumer to make room, or for it to go away
+                    while not slots.acquire(timeout=0.5):
+                        if stop.is_set():
+                            return
+                    loop.call_soon_threadsafe(queue.put_nowait, result)
+            except Exception as e:
+                outcome = e
+            finally:
+                results.close()
+                if not stop.is_set():
+                    loop.call_soon_threadsafe(queue.put_nowait, outcome)
+
+        producer = loop.run_in_executor(None, produce)
+        try:
+            while True:
+                result = await queue.get()
+                if result is done:
+                    break
+                if isinstance(result, Exception):
+                    raise result
+                slots.release()
+                yield result
+        finally:
+            stop.set()
+            await producer
+
+    @staticmethod
+    def _parsed(path: str, cached: bool, data: Dict[str, Any]) -> Dict:
+        logger.info(f"Successfully parsed: {path}")
+        return {'success': True, 'file_path': path, 'cached': cached, 'data': data}
+
+    @staticmethod
+    def _failed(path: str, error: Exception) -> Dict:
+        logger.error(f"Error parsing {path}: {error}")
+        return {'success': False, 'file_path': path, 'error': str(error)}
 
     def parse_header_only(self, pdf_path: str) -> Dict:
         """
@@ -23,6 +23,8 @@ from pathlib import Path
 import pickle
 from tqdm import tqdm
 
+from modules.rag.embedding_service import EmbeddingService
+
 
 # Set up logging
 logging.basicConfig(
@@ -85,8 +87,30 @@ class SciBERTEmbedder:
         # Get embedding dimension
         self.embedding_dim = self.model.config.hidden_size
 
+        # Single-text calls are micro-batched and cached by content hash
+        self.embedding_service = EmbeddingService(
+            self._encode_cls, model_id=f"{model_name}:cls:{max_length}", model=self.model
+        )
+
         logger.info(f"SciBERT loaded successfully. Embedding dimension: {self.embedding_dim}")
 
+    def _encode_cls(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """Raw (unnormalized) [CLS] embeddings, one row per text"""
+        embeddings = []
+        for i in range(0, len(texts), batch_size):
+            inputs = self.tokenizer(
+                texts[i:i + batch_size],
+                return_tensors='pt',
+                max_length=self.max_length,
+                truncation=True,
+                padding=True
+            )
+            inputs = {k: v.to(self.device) for k, v in inputs.items()}
+            with torch.no_grad():
+                outputs = self.model(**inputs)
+            embeddings.append(outputs.last_hidden_state[:, 0, :].cpu().numpy())
+        return np.vstack(embeddings)
+
     def embed_text(self, text: str, normalize: bool = True) -> np.ndarray:
         """
         Generate embedding for single text
@@ -104,25 +128,8 @@ class SciBERTEmbedder:
         if not text or not text.strip():
             raise ValueError("Cannot embed empty text")
 
-        # Tokenize
-        inputs = self.tokenizer(
-            text,
-            return_tensors='pt',
-            max_length=self.max_length,
-            truncation=True,
-            padding=True
-        )
-
-        # Move to device
-        inputs = {k: v.to(self.device) for k, v in inputs.items()}
-
-        # Generate embedding
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-
-        # Use [CLS] token embedding (first token)
-        cls_embedding = outputs.last_hidden_state[:, 0, :].cpu().numpy()
-        embedding = cls_embedding.flatten()
+        # Concurrent callers share one forward pass; repeated texts hit the cache
+        embedding = self.embedding_service.embed([text])[0]
 
         # Normalize if requested
         if normalize:
@@ -164,38 +171,15 @@ class SciBERTEmbedder:
 
         logger.info(f"Embedding {len(valid_texts)} texts with batch size {batch_size}")
 
-        embeddings = []
-
-        # Process in batches
-        iterator = range(0, len(valid_texts), batch_size)
-        if show_progress:
-            iterator = tqdm(iterator, desc="Generating embeddings")
-
-        for i in iterator:
-            batch = valid_texts[i:i + batch_size]
-
-            # Tokenize batch
-            inputs = self.tokenizer(
-                batch,
-                return_tensors='pt',
-                max_length=self.max_length,
-                truncation=True,
-                padding=True
-            )
-
-            # Move to device
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
-
-            # Generate embeddings
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-
-            # Extract [CLS] token embeddings
-            batch_embeddings = outputs.last_hidden_state[:, 0, :].cpu().numpy()
-            embeddings.append(batch_embeddings)
-
-        # Concatenate all batches
-        embeddings = np.vstack(embeddings)
+        # Texts embedded before (by any caller, or in an earlier run) come from the
+        # content-hash cache; only new texts go through the model
+        if show_progress and len(valid_texts) > batch_size:
+            embeddings = np.vstack([
+                self.embedding_service.embed(valid_texts[i:i + batch_size])
+                for i in tqdm(range(0, len(valid_texts), batch_size), desc="Generating embeddings")
+            ])
+        else:
+            embeddings = self.embedding_service.embed(valid_texts)
 
         # Normalize if requested
         if normalize:
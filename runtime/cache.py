@@ -1,14 +1,28 @@
 """
 Simple TTL Caching Module
-Provides in-memory caching for LLM and vector search results.
+Provides caching for LLM and vector search results.
+
+LLM responses use LLMResponseCache: a size-bounded LRU memory tier in front
+of a persistent SQLite tier shared by all worker processes, with single-flight
+coalescing of identical in-flight requests.
 """
 
+import os
 import time
+import zlib
+import asyncio
+import sqlite3
 import logging
 import functools
+import threading
 import json
 import hashlib
-from typing import Any, Dict, Optional, Callable
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from runtime.instrumentation import record_cache
 
 logger = logging.getLogger("simple_cache")
 
@@ -28,7 +42,7 @@ class TTLDict(dict):
         self._expiries[key] = expiry
 
     def __getitem__(self, key):
-        if key not in self:
+        if not super().__contains__(key):
             raise KeyError(key)
         if time.time() > self._expiries[key]:
             self.__delitem__(key)
@@ -60,49 +74,393 @@ class TTLDict(dict):
         for k in expired:
             self.__delitem__(k)
 
-# Global caches
-_llm_cache = TTLDict(default_ttl=7200)  # 2 hours for LLM calls
 _vector_cache = TTLDict(default_ttl=3600)  # 1 hour for vector search
 
+# Adapter results that describe a failure rather than a completion
+UNCACHEABLE_PREFIXES = ("[AI Unavailable]", "[Model Not Found]", "[Ollama Unavailable]", "[Ollama Timeout]", "[Ollama Error]")
+
+
+class LLMResponseCache:
+    """
+    Two-tier LLM response cache.
+
+    - Memory: LRU bounded by entry count; expired entries are dropped when
+      read and when they reach the LRU end
+    - Disk: SQLite (WAL) bounded by stored bytes with LRU eviction, so
+      responses survive restarts and are shared between workers
+    - Single-flight: concurrent calls for the same key wait for the first
+      one instead of issuing duplicate completions
+
+    The memory tier has its own lock and never waits on SQLite. Disk hits
+    record last_access in memory and write it back in batches. The async
+    path checks memory inline and runs disk reads and writes in a thread.
+
+    Usage:
+        cache = get_llm_cache()
+        text = cache.get_or_compute(key, lambda: adapter_call())
+        text = await cache.async_get_or_compute(key, lambda: adapter_acall())
+    """
+
+    # Pending last_access updates are written once this many accumulate, or
+    # after TOUCH_FLUSH_SECONDS, or before the next disk write
+    TOUCH_BATCH = 128
+    TOUCH_FLUSH_SECONDS = 5.0
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        max_disk_bytes: Optional[int] = None,
+        default_ttl: int = 7200,
+        persistent: bool = True,
+    ):
+        self.max_entries = max_entries or int(os.getenv("BIODOCKIFY_LLM_CACHE_ENTRIES", 2048))
+        if max_disk_bytes is None:
+            max_disk_bytes = int(float(os.getenv("BIODOCKIFY_LLM_CACHE_MB", 256)) * 1024 * 1024)
+        self.max_disk_bytes = max_disk_bytes
+        self.default_ttl = default_ttl
+
+        self._memory: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Serializes use of the SQLite connection; taken before _lock, never inside it
+        self._disk_lock = threading.Lock()
+        self._touched: Dict[str, float] = {}
+        self._touch_flushed = time.monotonic()
+        self._inflight: Dict[str, Future] = {}
+        self._async_inflight: Dict[Tuple[asyncio.AbstractEventLoop, str], asyncio.Future] = {}
+        self._metrics = {
+            "memory_hits": 0, "disk_hits": 0, "misses": 0, "coalesced": 0,
+            "memory_evictions": 0, "disk_evictions": 0, "expired": 0, "disk_errors": 0,
+        }
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disk_bytes = 0
+        self._writes = 0
+        if persistent:
+            if db_path is None:
+                data_dir = os.getenv("BIODOCKIFY_DATA_DIR")
+                base = Path(data_dir) if data_dir else Path.home() / ".biodockify" / "data"
+                db_path = str(base / "cache" / "llm_responses.db")
+            try:
+                Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=5)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+                with self._conn:
+                    self._conn.execute("""
+                        CREATE TABLE IF NOT EXISTS llm_responses (
+                            key TEXT PRIMARY KEY,
+                            body BLOB NOT NULL,
+                            size INTEGER NOT NULL,
+                            expires_at REAL NOT NULL,
+                            last_access REAL NOT NULL
+                        )
+                    """)
+                    self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_responses_access ON llm_responses(last_access)")
+                self._disk_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_responses").fetchone()[0]
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache disk tier unavailable ({e}); using memory only")
+                self._conn = None
+        self.db_path = db_path
+
+    @staticmethod
+    def make_key(model: str, prompt: str, params: Dict[str, Any]) -> str:
+        key_data = {
+            "prompt": prompt,
+            "model": model,
+            "params": {k: v for k, v in params.items() if k != "timeout"}
+        }
+        return hashlib.sha256(json.dumps(key_data, sort_keys=True, default=str).encode()).hexdigest()
+
+    @staticmethod
+    def cacheable(value: Any) -> bool:
+        return bool(value) and not str(value).startswith(UNCACHEABLE_PREFIXES)
+
+    # ------------------------------------------------------------------
+    # Tiers
+    # ------------------------------------------------------------------
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Look a key up in memory, then on disk (promoting disk hits)."""
+        now = time.time()
+        found, value = self._memory_get(key, now)
+        if found:
+            return value
+        return self._disk_lookup(key, now, default)
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        expires_at = time.time() + (ttl if ttl is not None else self.default_ttl)
+        with self._lock:
+            self._remember(key, value, expires_at)
+        self._disk_set(key, value, expires_at)
+
+    def _memory_get(self, key: str, now: float) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._memory.move_to_end(key)
+                    self._metrics["memory_hits"] += 1
+                    record_cache("llm", hits=1)
+                    return True, entry[0]
+                del self._memory[key]
+                self._metrics["expired"] += 1
+        return False, None
+
+    def _disk_lookup(self, key: str, now: float, default: Any = None) -> Any:
+        """Disk tier lookup; promotes hits to memory and counts misses."""
+        row = self._disk_get(key, now)
+        with self._lock:
+            if row is not None:
+                value, expires_at = row
+                self._remember(key, value, expires_at)
+                self._metrics["disk_hits"] += 1
+                record_cache("llm", hits=1)
+                return value
+            self._metrics["misses"] += 1
+            record_cache("llm", misses=1)
+            return default
+
+    def _remember(self, key: str, value: Any, expires_at: float):
+        """Insert into the memory tier and evict LRU entries. Caller holds the lock."""
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._metrics["memory_evictions"] += 1
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[Any, float]]:
+        if self._conn is None:
+            return None
+        try:
+            with self._disk_lock:
+                row = self._conn.execute(
+                    "SELECT body, expires_at FROM llm_responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[1] > now:
+                    self._touch(key, now)
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._count("expired")
+                return None
+            return json.loads(zlib.decompress(row[0])), row[1]
+        except (sqlite3.Error, zlib.error, ValueError) as e:
+            self._count("disk_errors")
+            logger.debug(f"LLM cache disk read failed: {e}")
+            return None
+
+    def _touch(self, key: str, now: float):
+        """Queue a last_access update. Caller holds _disk_lock."""
+        self._touched[key] = now
+        if (len(self._touched) >= self.TOUCH_BATCH
+                or time.monotonic() - self._touch_flushed >= self.TOUCH_FLUSH_SECONDS):
+            self._flush_touches()
+
+    def _flush_touches(self):
+        """Write queued last_access updates in one transaction. Caller holds _disk_lock."""
+        self._touch_flushed = time.monotonic()
+        if not self._touched:
+            return
+        touched = [(at, key) for key, at in self._touched.items()]
+        self._touched.clear()
+        with self._conn:
+            self._conn.executemany("UPDATE llm_responses SET last_access = ? WHERE key = ?", touched)
+
+    def _disk_set(self, key: str, value: Any, expires_at: float):
+        if self._conn is None:
+            return
+        try:
+            body = zlib.compress(json.dumps(value, default=str).encode("utf-8"))
+            with self._disk_lock:
+                self._touched.pop(key, None)
+                self._flush_touches()
+                old = self._conn.execute("SELECT size FROM llm_responses WHERE key = ?", (key,)).fetchone()
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO llm_responses (key, body, size, expires_at, last_access) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (key, body, len(body), expires_at, time.time())
+                    )
+                self._disk_bytes += len(body) - (old[0] if old else 0)
+                self._writes += 1
+                if self._writes % 256 == 0:
+                    self._purge_expired()
+                if self._disk_bytes > self.max_disk_bytes:
+                    self._evict_disk()
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            self._count("disk_errors")
+            logger.debug(f"LLM cache disk write failed: {e}")
+
+    def _count(self, metric: str, n: int = 1):
+        with self._lock:
+            self._metrics[metric] += n
+
+    def _purge_expired(self):
+        with self._conn:
+            self._conn.execute("DELETE FROM llm_responses WHERE expires_at <= ?", (time.time(),))
+        self._disk_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_responses").fetchone()[0]
+
+    def _evict_disk(self):
+        """Drop least recently used rows until 90% of max_disk_bytes. Caller holds _disk_lock."""
+        target = int(self.max_disk_bytes * 0.9)
+        doomed = []
+        for key, size in self._conn.execute("SELECT key, size FROM llm_responses ORDER BY last_access ASC"):
+            if self._disk_bytes <= target:
+                break
+            doomed.append((key,))
+            self._disk_bytes -= size
+        with self._conn:
+            self._conn.executemany("DELETE FROM llm_responses WHERE key = ?", doomed)
+        self._count("disk_evictions", len(doomed))
+
+    # ------------------------------------------------------------------
+    # Single-flight
+    # ------------------------------------------------------------------
+
+    def get_or_compute(self, key: str, producer: Callable[[], Any]) -> Any:
+        """Return the cached value or compute it once, even under concurrent calls."""
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            pending = self._inflight.get(key)
+            if pending is None:
+                pending = self._inflight[key] = Future()
+                leader = True
+            else:
+                leader = False
+                self._metrics["coalesced"] += 1
+        if not leader:
+            return pending.result()
+
+        try:
+            value = producer()
+            if self.cacheable(value):
+                self.set(key, value)
+            pending.set_result(value)
+            return value
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    async def async_get_or_compute(self, key: str, producer: Callable[[], Awaitable[Any]]) -> Any:
+        """Async counterpart of get_or_compute, coalescing per event loop.
+        Only the memory tier is checked on the loop; disk I/O runs in a thread."""
+        now = time.time()
+        found, value = self._memory_get(key, now)
+        if found:
+            return value
+        if self._conn is None:
+            value = self._disk_lookup(key, now)
+        else:
+            value = await asyncio.to_thread(self._disk_lookup, key, now)
+        if value is not None:
+            return value
+
+        loop = asyncio.get_running_loop()
+        slot = (loop, key)
+        pending = self._async_inflight.get(slot)
+        if pending is not None:
+            self._metrics["coalesced"] += 1
+            # shield: a cancelled follower must not cancel the shared call
+            return await asyncio.shield(pending)
+
+        pending = self._async_inflight[slot] = loop.create_future()
+        try:
+            value = await producer()
+            if self.cacheable(value):
+                expires_at = time.time() + self.default_ttl
+                with self._lock:
+                    self._remember(key, value, expires_at)
+                pending.set_result(value)
+                if self._conn is not None:
+                    await asyncio.to_thread(self._disk_set, key, value, expires_at)
+            else:
+                pending.set_result(value)
+            return value
+        except BaseException as e:
+            if not pending.done():
+                pending.set_exception(e)
+                # Mark retrieved so an unobserved failure is not logged by asyncio
+                pending.exception()
+            raise
+        finally:
+            self._async_inflight.pop(slot, None)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def cleanup(self):
+        """Remove expired entries from both tiers."""
+        now = time.time()
+        with self._lock:
+            expired = [k for k, (_, exp) in self._memory.items() if exp <= now]
+            for k in expired:
+                del self._memory[k]
+        if self._conn is not None:
+            with self._disk_lock:
+                self._flush_touches()
+                self._purge_expired()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        if self._conn is not None:
+            with self._disk_lock:
+                self._touched.clear()
+                with self._conn:
+                    self._conn.execute("DELETE FROM llm_responses")
+                self._disk_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._metrics["memory_hits"] + self._metrics["disk_hits"] + self._metrics["misses"]
+            return {
+                **self._metrics,
+                "hit_rate": (lookups - self._metrics["misses"]) / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "disk_bytes": self._disk_bytes,
+                "max_disk_bytes": self.max_disk_bytes,
+                "persistent": self._conn is not None,
+                "inflight": len(self._inflight) + len(self._async_inflight),
+            }
+
+
+_llm_cache: Optional[LLMResponseCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Process-wide LLM response cache (created on first use)."""
+    global _llm_cache
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                _llm_cache = LLMResponseCache()
+    return _llm_cache
+
+
 def cache_llm_call(func: Callable):
     """Decorator to cache LLM calls based on prompt and parameters."""
     @functools.wraps(func)
     def wrapper(self, prompt: str, **kwargs):
-        # Create a stable key
-        key_data = {
-            "prompt": prompt,
-            "model": getattr(self, "model", "default"),
-            "params": {k: v for k, v in kwargs.items() if k != "timeout"}
-        }
-        key = hashlib.sha256(json.dumps(key_data, sort_keys=True).encode()).hexdigest()
-        
-        if key in _llm_cache:
-            logger.debug(f"LLM Cache Hit for {key}")
-            return _llm_cache[key]
-        
-        result = func(self, prompt, **kwargs)
-        if result and not str(result).startswith("[AI Unavailable]"):
-            _llm_cache[key] = result
-        return result
+        key = LLMResponseCache.make_key(getattr(self, "model", "default"), prompt, kwargs)
+
+        return get_llm_cache().get_or_compute(key, lambda: func(self, prompt, **kwargs))
     return wrapper
 
 def async_cache_llm_call(func: Callable):
     """Async version of LLM cache decorator."""
     @functools.wraps(func)
     async def wrapper(self, prompt: str, **kwargs):
-        key_data = {
-            "prompt": prompt,
-            "model": getattr(self, "model", "default"),
-            "params": {k: v for k, v in kwargs.items() if k != "timeout"}
-        }
-        key = hashlib.sha256(json.dumps(key_data, sort_keys=True).encode()).hexdigest()
-        
-        if key in _llm_cache:
-            logger.debug(f"LLM Cache Hit for {key}")
-            return _llm_cache[key]
-        
-        result = await func(self, prompt, **kwargs)
-        if result and not str(result).startswith("[AI Unavailable]"):
-            _llm_cache[key] = result
-        return result
+        key = LLMResponseCache.make_key(getattr(self, "model", "default"), prompt, kwargs)
+
+        return await get_llm_cache().async_get_or_compute(key, lambda: func(self, prompt, **kwargs))
     return wrapper
@@ -0,0 +1,349 @@
+"""
+BioDockify Hot-Path Instrumentation.
+
+Prometheus metrics for the code paths that dominate request latency:
+- LLM adapter latency and token usage per provider
+- Embedding batch size and encode time
+- Vector (FAISS) search latency
+- Cache hit/miss counters (LLM responses, embeddings)
+- Statistics analysis runtime per method
+- Event-loop lag
+
+Plus an on-demand sampling profiler that aggregates the stacks of all
+threads, so a slowdown can be attributed to a function without attaching
+a debugger. Everything degrades to no-ops when prometheus_client is not
+installed.
+"""
+
+import sys
+import time
+import asyncio
+import logging
+import threading
+from collections import Counter as StackCounter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+try:
+    from prometheus_client import Counter, Histogram, Gauge, REGISTRY
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class _NoopMetric:
+    """Stand-in for a metric when prometheus_client is missing."""
+
+    def labels(self, *args, **kwargs):
+        return self
+
+    def observe(self, value):
+        pass
+
+    def inc(self, amount=1):
+        pass
+
+    def set(self, value):
+        pass
+
+
+def _metric(kind: str, name: str, documentation: str, labelnames=(), **kwargs):
+    """Create a metric, or return the one already registered (module reloads, tests)."""
+    if not PROMETHEUS_AVAILABLE:
+        return _NoopMetric()
+    cls = {'counter': Counter, 'histogram': Histogram, 'gauge': Gauge}[kind]
+    try:
+        return cls(name, documentation, labelnames, **kwargs)
+    except ValueError:
+        return REGISTRY._names_to_collectors.get(name)
+
+
+_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 80.0, 160.0)
+_FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+_BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+LLM_REQUEST_SECONDS = _metric(
+    'histogram',
+    'biodockify_llm_request_duration_seconds',
+    'LLM provider request latency, one observation per attempt (cache misses only)',
+    ['provider', 'operation', 'status'],
+    buckets=_LATENCY_BUCKETS,
+)
+LLM_TOKENS = _metric(
+    'counter',
+    'biodockify_llm_tokens_total',
+    'Tokens reported by LLM providers',
+    ['provider', 'kind'],
+)
+EMBEDDING_BATCH_SIZE = _metric(
+    'histogram',
+    'biodockify_embedding_batch_size',
+    'Texts per embedding model forward pass',
+    ['model'],
+    buckets=_BATCH_BUCKETS,
+)
+EMBEDDING_BATCH_SECONDS = _metric(
+    'histogram',
+    'biodockify_embedding_batch_duration_seconds',
+    'Embedding model encode time per batch',
+    ['model'],
+    buckets=_FAST_BUCKETS + (5.0, 10.0),
+)
+VECTOR_SEARCH_SECONDS = _metric(
+    'histogram',
+    'biodockify_vector_search_duration_seconds',
+    'ANN index search latency per call',
+    ['backend'],
+    buckets=_FAST_BUCKETS,
+)
+CACHE_LOOKUPS = _metric(
+    'counter',
+    'biodockify_cache_lookups_total',
+    'Cache lookups by cache and result (hit/miss)',
+    ['cache', 'result'],
+)
+ANALYSIS_SECONDS = _metric(
+    'histogram',
+    'biodockify_statistics_analysis_duration_seconds',
+    'Statistics analysis runtime in the executor',
+    ['method', 'lane', 'status'],
+    buckets=_LATENCY_BUCKETS,
+)
+EVENT_LOOP_LAG_SECONDS = _metric(
+    'histogram',
+    'biodockify_event_loop_lag_seconds',
+    'Delay of a scheduled event-loop wakeup beyond its interval',
+    buckets=_FAST_BUCKETS,
+)
+EVENT_LOOP_LAG_MAX = _metric(
+    'gauge',
+    'biodockify_event_loop_lag_max_seconds',
+    'Largest event-loop lag seen in the last reporting window',
+)
+
+
+# ---------------------------------------------------------------------------
+# Recording helpers
+# ---------------------------------------------------------------------------
+
+def provider_name(adapter: Any) -> str:
+    """Metric label for an LLM adapter instance, e.g. OllamaAdapter -> 'ollama'."""
+    name = type(adapter).__name__
+    if name.endswith("Adapter"):
+        name = name[:-len("Adapter")]
+    return name.lower() or "unknown"
+
+
+@contextmanager
+def track_llm(provider: str, operation: str) -> Iterator[None]:
+    """
+    Time one request to an LLM provider, labelled ok/error/cancelled.
+
+    Wrap the HTTP or LiteLLM call itself, inside any retry loop, so each
+    attempt is observed on its own and backoff sleeps are not counted. For
+    streams, wrap the whole iteration; a consumer that stops early is
+    labelled 'cancelled'.
+    """
+    start = time.perf_counter()
+    status = "error"
+    try:
+        yield
+        status = "ok"
+    except (GeneratorExit, asyncio.CancelledError):
+        status = "cancelled"
+        raise
+    finally:
+        LLM_REQUEST_SECONDS.labels(provider, operation, status).observe(time.perf_counter() - start)
+
+
+def token_usage(response: Any) -> Tuple[int, int]:
+    """
+    (prompt_tokens, completion_tokens) from a provider response.
+
+    Understands OpenAI-style and Anthropic 'usage', Gemini 'usageMetadata',
+    Ollama eval counts and LiteLLM response objects. Returns (0, 0) if the
+    response carries no usage.
+    """
+    def read(obj, *names):
+        for name in names:
+            value = obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+            if isinstance(value, (int, float)):
+                return int(value)
+        return 0
+
+    if response is None:
+        return 0, 0
+    if isinstance(response, dict):
+        if "prompt_eval_count" in response or "eval_count" in response:
+            return read(response, "prompt_eval_count"), read(response, "eval_count")
+        usage = response.get("usage") or response.get("usageMetadata")
+    else:
+        usage = getattr(response, "usage", None)
+    if not usage:
+        return 0, 0
+    return (
+        read(usage, "prompt_tokens", "input_tokens", "promptTokenCount"),
+        read(usage, "completion_tokens", "output_tokens", "candidatesTokenCount"),
+    )
+
+
+def record_llm_tokens(provider: str, response: Any):
+    """Count the tokens reported in a provider response. Never raises."""
+    try:
+        prompt, completion = token_usage(response)
+    except Exception:
+        return
+    if prompt:
+        LLM_TOKENS.labels(provider, "prompt").inc(prompt)
+    if completion:
+        LLM_TOKENS.labels(provider, "completion").inc(completion)
+
+
+def record_cache(cache: str, hits: int = 0, misses: int = 0):
+    """Count cache lookups for hit-rate dashboards."""
+    if hits:
+        CACHE_LOOKUPS.labels(cache, "hit").inc(hits)
+    if misses:
+        CACHE_LOOKUPS.labels(cache, "miss").inc(misses)
+
+
+@contextmanager
+def track(histogram, *labels: str) -> Iterator[None]:
+    """Observe the wall time of a block on a (labelled) histogram."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        (histogram.labels(*labels) if labels else histogram).observe(time.perf_counter() - start)
+
+
+# ---------------------------------------------------------------------------
+# Event-loop lag
+# ---------------------------------------------------------------------------
+
+async def monitor_event_loop_lag(interval: float = 0.5, report_every: float = 60.0, warn_above: float = 0.5):
+    """
+    Measure how late the event loop wakes a sleeping task.
+
+    Lag is the time past the requested sleep; sustained lag means something
+    is blocking the loop (sync I/O, CPU work in a handler). Runs until cancelled.
+    """
+    loop = asyncio.get_running_loop()
+    window_max = 0.0
+    window_start = loop.time()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - expected)
+        EVENT_LOOP_LAG_SECONDS.observe(lag)
+        window_max = max(window_max, lag)
+        if lag > warn_above:
+            logger.warning(f"Event loop blocked for {lag:.3f}s")
+        if loop.time() - window_start >= report_every:
+            EVENT_LOOP_LAG_MAX.set(window_max)
+            window_max = 0.0
+            window_start = loop.time()
+
+
+def start_event_loop_monitor(interval: float = 0.5) -> asyncio.Task:
+    """Start the lag monitor on the running loop."""
+    return asyncio.get_running_loop().create_task(monitor_event_loop_lag(interval))
+
+
+# ---------------------------------------------------------------------------
+# Sampling profiler
+# ---------------------------------------------------------------------------
+
+class SamplingProfiler:
+    """
+    Statistical profiler over all Python threads.
+
+    A background thread snapshots every thread's stack at a fixed interval
+    and counts identical stacks. Output is "collapsed stack" text (one
+    `frame;frame;frame count` line per stack), readable by flamegraph.pl and
+    speedscope, or a JSON summary of the hottest stacks and functions.
+    Overhead is one stack walk per thread per interval; nothing is traced.
+    """
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 64):
+        self.interval = interval
+        self.max_depth = max_depth
+        self._running = threading.Lock()
+
+    @staticmethod
+    def _frame_label(frame) -> str:
+        code = frame.f_code
+        module = frame.f_globals.get("__name__", code.co_filename)
+        return f"{module}:{code.co_name}:{frame.f_lineno}"
+
+    def _walk(self, frame) -> str:
+        frames = []
+        while frame is not None and len(frames) < self.max_depth:
+            frames.append(self._frame_label(frame))
+            frame = frame.f_back
+        return ";".join(reversed(frames))
+
+    def sample(self, duration: float) -> Dict[str, Any]:
+        """
+        Sample for `duration` seconds (blocking the calling thread).
+
+        Returns:
+            Dict with 'stacks' (collapsed stack -> count), 'samples' and
+            'duration'. Raises RuntimeError if a profile is already running.
+        """
+        if not self._running.acquire(blocking=False):
+            raise RuntimeError("A profile is already running")
+        try:
+            me = threading.get_ident()
+            names = {t.ident: t.name for t in threading.enumerate()}
+            stacks: StackCounter = StackCounter()
+            samples = 0
+            start = time.perf_counter()
+            deadline = start + duration
+            while time.perf_counter() < deadline:
+                for ident, frame in sys._current_frames().items():
+                    if ident == me:
+                        continue
+                    thread = names.get(ident) or f"thread-{ident}"
+                    stacks[f"{thread};{self._walk(frame)}"] += 1
+                samples += 1
+                time.sleep(self.interval)
+            return {"stacks": stacks, "samples": samples, "duration": time.perf_counter() - start}
+        finally:
+            self._running.release()
+
+    @staticmethod
+    def collapsed(profile: Dict[str, Any]) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in profile["stacks"].most_common())
+
+    @staticmethod
+    def summary(profile: Dict[str, Any], top: int = 25) -> Dict[str, Any]:
+        """Hottest stacks plus self/inclusive sample counts per function."""
+        self_counts: StackCounter = StackCounter()
+        inclusive: StackCounter = StackCounter()
+        for stack, count in profile["stacks"].items():
+            frames = stack.split(";")[1:]
+            if not frames:
+                continue
+            self_counts[frames[-1]] += count
+            for frame in set(frames):
+                inclusive[frame] += count
+        return {
+            "samples": profile["samples"],
+            "duration": round(profile["duration"], 3),
+            "top_self": self_counts.most_common(top),
+            "top_inclusive": inclusive.most_common(top),
+            "top_stacks": profile["stacks"].most_common(top),
+        }
+
+
+_profiler: Optional[SamplingProfiler] = None
+
+
+def get_profiler() -> SamplingProfiler:
+    global _profiler
+    if _profiler is None:
+        _profiler = SamplingProfiler()
+    return _profiler
@@ -0,0 +1,254 @@
+"""
+BioDockify Lazy Loading & Startup Budget.
+
+Heavy subsystems (torch, sentence-transformers, statsmodels, lifelines,
+playwright, LiteLLM, the agent stack) cost seconds to import. Importing
+them at module level makes every cold API worker pay for all of them
+before the first request. This module defers them:
+
+- lazy_import("pkg.module")          module proxy, imported on first attribute access
+- lazy_attr("pkg.module", "Name")    proxy for one attribute (class, function, singleton)
+- LazyObject(factory)                singleton proxy, built on first attribute access
+- register_warmup(name, fn)          work for the background warm-up thread
+- startup_phase(name)                time one startup step
+- startup_report()                   phases, first-use loads and warm-ups with durations
+
+Loads are thread-safe and happen once; a proxy that failed to load
+re-raises the original error on every access.
+"""
+
+import os
+import time
+import logging
+import importlib
+import importlib.util
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Reference point for "time to ready"; runtime.lazy is imported first by api.main
+PROCESS_START = time.perf_counter()
+
+_lock = threading.Lock()
+_phases: List[Dict[str, Any]] = []
+_loads: Dict[str, Dict[str, Any]] = {}
+_warmups: List[Tuple[str, Callable[[], Any]]] = []
+_warmup_results: Dict[str, Dict[str, Any]] = {}
+_warmup_thread: Optional[threading.Thread] = None
+_ready_at: Optional[float] = None
+
+
+def record_load(name: str, seconds: float, error: Optional[Any] = None):
+    """Add a deferred load to the startup report (LazyObject does this itself)."""
+    with _lock:
+        _loads[name] = {
+            "seconds": round(seconds, 4),
+            "status": "error" if error else "ok",
+            "error": str(error) if error else None,
+            "during_startup": _ready_at is None,
+        }
+    if error:
+        logger.warning(f"Lazy load of {name} failed after {seconds:.2f}s: {error}")
+    else:
+        logger.info(f"Lazy loaded {name} in {seconds:.2f}s")
+
+
+class LazyObject:
+    """
+    Proxy that builds its target with `factory()` on first use.
+
+    Attribute access, calls, item access, iteration and truth tests are
+    forwarded, so a module-level singleton can be swapped for a LazyObject
+    without touching call sites.
+    """
+
+    __slots__ = ("_lazy_factory", "_lazy_name", "_lazy_target", "_lazy_error", "_lazy_lock")
+
+    def __init__(self, factory: Callable[[], Any], name: Optional[str] = None):
+        object.__setattr__(self, "_lazy_factory", factory)
+        object.__setattr__(self, "_lazy_name", name or getattr(factory, "__qualname__", repr(factory)))
+        object.__setattr__(self, "_lazy_target", None)
+        object.__setattr__(self, "_lazy_error", None)
+        object.__setattr__(self, "_lazy_lock", threading.Lock())
+
+    def _lazy_resolve(self) -> Any:
+        target = object.__getattribute__(self, "_lazy_target")
+        if target is not None:
+            return target
+        with object.__getattribute__(self, "_lazy_lock"):
+            target = object.__getattribute__(self, "_lazy_target")
+            if target is not None:
+                return target
+            error = object.__getattribute__(self, "_lazy_error")
+            if error is not None:
+                raise error
+            name = object.__getattribute__(self, "_lazy_name")
+            start = time.perf_counter()
+            try:
+                target = object.__getattribute__(self, "_lazy_factory")()
+            except Exception as e:
+                object.__setattr__(self, "_lazy_error", e)
+                record_load(name, time.perf_counter() - start, e)
+                raise
+            record_load(name, time.perf_counter() - start)
+            object.__setattr__(self, "_lazy_target", target)
+            return target
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self._lazy_resolve(), item)
+
+    def __setattr__(self, item: str, value: Any):
+        setattr(self._lazy_resolve(), item, value)
+
+    def __delattr__(self, item: str):
+        delattr(self._lazy_resolve(), item)
+
+    def __call__(self, *args, **kwargs):
+        return self._lazy_resolve()(*args, **kwargs)
+
+    def __getitem__(self, key):
+        return self._lazy_resolve()[key]
+
+    def __iter__(self):
+        return iter(self._lazy_resolve())
+
+    def __len__(self) -> int:
+        return len(self._lazy_resolve())
+
+    def __bool__(self) -> bool:
+        return bool(self._lazy_resolve())
+
+    def __repr__(self) -> str:
+        name = object.__getattribute__(self, "_lazy_name")
+        state = "loaded" if object.__getattribute__(self, "_lazy_target") is not None else "pending"
+        return f"<LazyObject {name} ({state})>"
+
+
+def lazy_import(module_name: str) -> LazyObject:
+    """Module proxy; the import runs on first attribute access."""
+    return LazyObject(lambda: importlib.import_module(module_name), module_name)
+
+
+def lazy_attr(module_name: str, attr: str) -> LazyObject:
+    """Proxy for `module_name.attr`, e.g. a class that is only instantiated in handlers."""
+    return LazyObject(lambda: getattr(importlib.import_module(module_name), attr), f"{module_name}.{attr}")
+
+
+def is_loaded(obj: Any) -> bool:
+    """True if obj is not a LazyObject, or is one whose target has been built."""
+    if isinstance(obj, LazyObject):
+        return object.__getattribute__(obj, "_lazy_target") is not None
+    return True
+
+
+def resolve(obj: Any) -> Any:
+    """The real object behind a LazyObject (building it if needed); other values pass through."""
+    if isinstance(obj, LazyObject):
+        return obj._lazy_resolve()
+    return obj
+
+
+def is_available(module_name: str) -> bool:
+    """Whether a package is installed, without importing it."""
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+# ---------------------------------------------------------------------------
+# Startup budget
+# ---------------------------------------------------------------------------
+
+def record_phase(name: str, seconds: float, status: str = "ok"):
+    """Add a timed startup step to the report; steps over 0.5s are logged as warnings."""
+    with _lock:
+        _phases.append({"name": name, "seconds": round(seconds, 4), "status": status})
+    if seconds > 0.5:
+        logger.warning(f"Startup phase '{name}' took {seconds:.2f}s")
+
+
+@contextmanager
+def startup_phase(name: str) -> Iterator[None]:
+    """Time one startup step."""
+    start = time.perf_counter()
+    status = "error"
+    try:
+        yield
+        status = "ok"
+    finally:
+        record_phase(name, time.perf_counter() - start, status)
+
+
+def mark_ready() -> float:
+    """Record that the server can take requests. Returns seconds since process start."""
+    global _ready_at
+    with _lock:
+        if _ready_at is None:
+            _ready_at = time.perf_counter()
+        ready = _ready_at - PROCESS_START
+    logger.info(f"API ready {ready:.2f}s after process start")
+    return ready
+
+
+# ---------------------------------------------------------------------------
+# Background warm-up
+# ---------------------------------------------------------------------------
+
+def register_warmup(name: str, fn: Callable[[], Any]):
+    """Queue `fn` for the warm-up thread (runs in registration order)."""
+    with _lock:
+        _warmups.append((name, fn))
+
+
+def run_warmups() -> Dict[str, Dict[str, Any]]:
+    """Run every pending warm-up in the calling thread; failures are logged, not raised."""
+    while True:
+        with _lock:
+            if not _warmups:
+                break
+            name, fn = _warmups.pop(0)
+            _warmup_results[name] = {"status": "running", "seconds": None}
+        start = time.perf_counter()
+        try:
+            fn()
+            result = {"status": "ok", "seconds": round(time.perf_counter() - start, 4)}
+        except Exception as e:
+            logger.warning(f"Warm-up '{name}' failed: {e}")
+            result = {"status": "error", "seconds": round(time.perf_counter() - start, 4), "error": str(e)}
+        with _lock:
+            _warmup_results[name] = result
+    return dict(_warmup_results)
+
+
+def start_warmup() -> Optional[threading.Thread]:
+    """
+    Run the registered warm-ups on a daemon thread, once.
+    Disabled with BIODOCKIFY_WARMUP=0 (everything then loads on first use).
+    """
+    global _warmup_thread
+    if os.getenv("BIODOCKIFY_WARMUP", "1") == "0":
+        logger.info("Background warm-up disabled (BIODOCKIFY_WARMUP=0)")
+        return None
+    with _lock:
+        if _warmup_thread is not None and _warmup_thread.is_alive():
+            return _warmup_thread
+        _warmup_thread = threading.Thread(target=run_warmups, name="biodockify-warmup", daemon=True)
+        _warmup_thread.start()
+        return _warmup_thread
+
+
+def startup_report() -> Dict[str, Any]:
+    """Startup phases, time to ready, lazy loads and warm-up progress."""
+    with _lock:
+        ready = round(_ready_at - PROCESS_START, 4) if _ready_at is not None else None
+        return {
+            "ready_seconds": ready,
+            "uptime_seconds": round(time.perf_counter() - PROCESS_START, 4),
+            "phases": list(_phases),
+            "lazy_loads": dict(_loads),
+            "warmups": dict(_warmup_results),
+            "pending_warmups": [name for name, _ in _warmups],
+        }
@@ -178,6 +178,7 @@ def async_with_retry(
         async def wrapper(*args, **kwargs) -> Any:
             import asyncio
             import aiohttp
+            import httpx
             
             circuit = get_circuit_breaker(circuit_name or func.__name__) if circuit_name else None
             
@@ -195,7 +196,7 @@ def async_with_retry(
                         circuit.record_success()
                     return result
                     
-                except (aiohttp.ClientError, asyncio.TimeoutError, ConnectionError) as e:
+                except (aiohttp.ClientError, httpx.TransportError, asyncio.TimeoutError, ConnectionError) as e:
                     last_exception = e
                     
                     if circuit:
@@ -14,14 +14,21 @@ import logging
 import asyncio
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any
 
 logger = logging.getLogger("task_store")
 
+TERMINAL_STATUSES = {"completed", "failed", "cancelled"}
+
+
 class TaskStore:
     """
     Persistent task storage using aiosqlite.
     Async-native for non-blocking I/O.
+
+    Uses one long-lived WAL-mode connection per event loop. Log lines live in
+    an append-only ``task_logs`` table, so appending costs the same however
+    long a task's log already is.
     """
     
     def __init__(self, db_path: str = None):
@@ -36,27 +43,88 @@ class TaskStore:
         
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        # We don't init DB in __init__ because it's sync. 
-        # Application startup should call await store.init()
+        # The connection is opened lazily on first use (or by await store.init())
+        self._db: Optional[aiosqlite.Connection] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._write_lock: Optional[asyncio.Lock] = None
     
     async def init(self):
         """Initialize the database schema."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS tasks (
-                    task_id TEXT PRIMARY KEY,
-                    status TEXT NOT NULL DEFAULT 'pending',
-                    progress INTEGER DEFAULT 0,
-                    title TEXT,
-                    mode TEXT,
-                    logs TEXT DEFAULT '[]',
-                    result TEXT,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL
-                )
-            """)
-            await db.commit()
+        await self._connection()
         logger.info(f"TaskStore initialized at {self.db_path}")
+
+    async def close(self):
+        """Close the pooled connection."""
+        if self._db is not None:
+            db, self._db = self._db, None
+            try:
+                await db.close()
+            except Exception as e:
+                logger.debug(f"Error closing task store connection: {e}")
+
+    async def _connection(self) -> aiosqlite.Connection:
+        """Return the pooled connection, opening it for the running loop if needed."""
+        loop = asyncio.get_running_loop()
+        if self._db is not None and self._loop is loop:
+            return self._db
+
+        # A connection opened on another (possibly closed) loop cannot be reused
+        self._db = None
+        db = await aiosqlite.connect(self.db_path)
+        db.row_factory = aiosqlite.Row
+        await db.execute("PRAGMA journal_mode=WAL")
+        await db.execute("PRAGMA synchronous=NORMAL")
+        await self._create_schema(db)
+        if self._db is not None and self._loop is loop:
+            # Another coroutine finished opening first
+            await db.close()
+            return self._db
+
+        self._db, self._loop, self._write_lock = db, loop, asyncio.Lock()
+        return db
+
+    async def _create_schema(self, db: aiosqlite.Connection):
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                task_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL DEFAULT 'pending',
+                progress INTEGER DEFAULT 0,
+                title TEXT,
+                mode TEXT,
+                logs TEXT DEFAULT '[]',
+                result TEXT,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS task_logs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                task_id TEXT NOT NULL,
+                message TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+        """)
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_task_logs_task ON task_logs(task_id, id)")
+
+        # Move logs stored by older versions in the tasks.logs JSON column
+        async with db.execute(
+            "SELECT task_id, logs, updated_at FROM tasks WHERE logs IS NOT NULL AND logs != '[]'"
+        ) as cursor:
+            legacy = await cursor.fetchall()
+        for row in legacy:
+            try:
+                lines = json.loads(row["logs"])
+            except Exception:
+                lines = []
+            await db.executemany(
+                "INSERT INTO task_logs (task_id, message, created_at) VALUES (?, ?, ?)",
+                [(row["task_id"], str(line), row["updated_at"]) for line in lines]
+            )
+            await db.execute("UPDATE tasks SET logs = '[]' WHERE task_id = ?", (row["task_id"],))
+        if legacy:
+            logger.info(f"Migrated logs of {len(legacy)} tasks to the task_logs table")
+        await db.commit()
     
     async def create_task(self, task_id: str, title: str = "", mode: str = "local") -> Dict[str, Any]:
         """Create a new task."""
@@ -73,7 +141,8 @@ class TaskStore:
             "updated_at": now
         }
         
-        async with aiosqlite.connect(self.db_path) as db:
+        db = await self._connection()
+        async with self._write_lock:
             try:
                 await db.execute("""
                     INSERT INTO tasks (task_id, status, progress, title, mode, logs, result, created_at, updated_at)
@@ -84,20 +153,30 @@ class TaskStore:
                 ))
                 await db.commit()
             except Exception as e:
+                await db.rollback()
                 logger.error(f"Failed to create task: {e}")
                 raise
         
         return task
     
-    async def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
-        """Get a task by ID."""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute("SELECT * FROM tasks WHERE task_id = ?", (task_id,)) as cursor:
-                row = await cursor.fetchone()
-                if row:
-                    return self._row_to_dict(row)
-        return None
+    async def get_task(self, task_id: str, log_limit: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Get a task by ID.
+
+        Args:
+            task_id: Task to fetch
+            log_limit: Only include the last N log lines (all when None)
+        """
+        db = await self._connection()
+        async with db.execute("SELECT * FROM tasks WHERE task_id = ?", (task_id,)) as cursor:
+            row = await cursor.fetchone()
+        if not row:
+            return None
+        task = self._row_to_dict(row)
+        if log_limit is None:
+            task["logs"] = await self.get_logs(task_id)
+        else:
+            task["logs"] = await self.tail_logs(task_id, log_limit)
+        return task
     
     async def update_task(self, task_id: str, **updates) -> bool:
         """Update a task's fields."""
@@ -116,9 +195,8 @@ class TaskStore:
         if not filtered_updates:
             return False
 
-        # Handle logs specially
-        if "logs" in filtered_updates and isinstance(filtered_updates["logs"], list):
-            filtered_updates["logs"] = json.dumps(filtered_updates["logs"])
+        # Logs live in task_logs; passing a list replaces them
+        replacement_logs = filtered_updates.pop("logs", None)
         
         if "result" in filtered_updates and isinstance(filtered_updates["result"], dict):
             filtered_updates["result"] = json.dumps(filtered_updates["result"])
@@ -128,52 +206,141 @@ class TaskStore:
         set_clause = ", ".join([f"{k} = ?" for k in filtered_updates.keys()])
         values = list(filtered_updates.values()) + [task_id]
         
-        async with aiosqlite.connect(self.db_path) as db:
+        db = await self._connection()
+        async with self._write_lock:
             try:
                 cursor = await db.execute(f"UPDATE tasks SET {set_clause} WHERE task_id = ?", values)  # nosec B608
+                updated = cursor.rowcount > 0
+                if updated and isinstance(replacement_logs, list):
+                    await db.execute("DELETE FROM task_logs WHERE task_id = ?", (task_id,))
+                    await db.executemany(
+                        "INSERT INTO task_logs (task_id, message, created_at) VALUES (?, ?, ?)",
+                        [(task_id, str(line), filtered_updates["updated_at"]) for line in replacement_logs]
+                    )
                 await db.commit()
-                return cursor.rowcount > 0
+                return updated
             except Exception as e:
+                await db.rollback()
                 logger.error(f"Failed to update task: {e}")
                 return False
     
     async def append_log(self, task_id: str, log: str) -> bool:
         """Append a log entry to a task efficiently."""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            
-            # Get existing logs
-            async with db.execute("SELECT logs FROM tasks WHERE task_id = ?", (task_id,)) as cursor:
-                row = await cursor.fetchone()
-                if not row:
-                    return False
-                
-                try:
-                    logs = json.loads(row["logs"]) if row["logs"] else []
-                except:
-                    logs = []
-                
-                logs.append(log)
-                
+        return await self.append_logs(task_id, [log]) > 0
+
+    async def append_logs(self, task_id: str, logs: List[str]) -> int:
+        """Append several log entries in one transaction. Returns the number written."""
+        if not logs:
+            return 0
+        now = datetime.now().isoformat()
+        db = await self._connection()
+        async with self._write_lock:
+            try:
                 cursor = await db.execute(
-                    "UPDATE tasks SET logs = ?, updated_at = ? WHERE task_id = ?",
-                    (json.dumps(logs), datetime.now().isoformat(), task_id)
+                    "UPDATE tasks SET updated_at = ? WHERE task_id = ?", (now, task_id)
+                )
+                if cursor.rowcount == 0:
+                    await db.rollback()
+                    return 0
+                await db.executemany(
+                    "INSERT INTO task_logs (task_id, message, created_at) VALUES (?, ?, ?)",
+                    [(task_id, str(log), now) for log in logs]
                 )
                 await db.commit()
-                return cursor.rowcount > 0
+                return len(logs)
+            except Exception as e:
+                await db.rollback()
+                logger.error(f"Failed to append log: {e}")
+                return 0
+
+    async def get_logs(self, task_id: str, offset: int = 0, limit: Optional[int] = None) -> List[str]:
+        """Get a page of a task's log lines, oldest first."""
+        db = await self._connection()
+        async with db.execute(
+            "SELECT message FROM task_logs WHERE task_id = ? ORDER BY id LIMIT ? OFFSET ?",
+            (task_id, -1 if limit is None else limit, offset)
+        ) as cursor:
+            return [row["message"] for row in await cursor.fetchall()]
+
+    async def tail_logs(self, task_id: str, n: int = 50) -> List[str]:
+        """Get the last n log lines of a task, oldest first."""
+        db = await self._connection()
+        async with db.execute(
+            "SELECT message FROM task_logs WHERE task_id = ? ORDER BY id DESC LIMIT ?",
+            (task_id, n)
+        ) as cursor:
+            rows = await cursor.fetchall()
+        return [row["message"] for row in reversed(rows)]
+
+    async def get_logs_since(self, task_id: str, after_id: int = 0, limit: int = 500) -> List[Dict[str, Any]]:
+        """Get log entries newer than a cursor.
+
+        Each entry carries its ``id``; pass the last one back as ``after_id``
+        to continue from where the previous call stopped.
+        """
+        db = await self._connection()
+        async with db.execute(
+            "SELECT id, message, created_at FROM task_logs WHERE task_id = ? AND id > ? ORDER BY id LIMIT ?",
+            (task_id, after_id, limit)
+        ) as cursor:
+            return [dict(row) for row in await cursor.fetchall()]
+
+    async def count_logs(self, task_id: str) -> int:
+        """Number of log lines stored for a task."""
+        db = await self._connection()
+        async with db.execute("SELECT COUNT(*) FROM task_logs WHERE task_id = ?", (task_id,)) as cursor:
+            row = await cursor.fetchone()
+        return row[0]
+
+    async def stream_logs(
+        self,
+        task_id: str,
+        after_id: int = 0,
+        poll_interval: float = 0.5
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield log entries as they are written until the task finishes."""
+        while True:
+            entries = await self.get_logs_since(task_id, after_id)
+            for entry in entries:
+                after_id = entry["id"]
+                yield entry
+            if entries:
+                continue
+
+            db = await self._connection()
+            async with db.execute("SELECT status FROM tasks WHERE task_id = ?", (task_id,)) as cursor:
+                row = await cursor.fetchone()
+            if row is None or row["status"] in TERMINAL_STATUSES:
+                # Pick up lines written just before the final status change
+                for entry in await self.get_logs_since(task_id, after_id):
+                    yield entry
+                return
+            await asyncio.sleep(poll_interval)
 
     async def list_tasks(self, limit: int = 100) -> List[Dict[str, Any]]:
         """List all tasks, most recent first."""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute("SELECT * FROM tasks ORDER BY created_at DESC LIMIT ?", (limit,)) as cursor:
-                rows = await cursor.fetchall()
-                return [self._row_to_dict(row) for row in rows]
+        db = await self._connection()
+        async with db.execute("SELECT * FROM tasks ORDER BY created_at DESC LIMIT ?", (limit,)) as cursor:
+            tasks = [self._row_to_dict(row) for row in await cursor.fetchall()]
+        if not tasks:
+            return tasks
+
+        by_id = {task["task_id"]: task for task in tasks}
+        placeholders = ", ".join("?" for _ in by_id)
+        async with db.execute(
+            f"SELECT task_id, message FROM task_logs WHERE task_id IN ({placeholders}) ORDER BY id",  # nosec B608
+            list(by_id)
+        ) as cursor:
+            async for row in cursor:
+                by_id[row["task_id"]]["logs"].append(row["message"])
+        return tasks
     
     async def delete_task(self, task_id: str) -> bool:
         """Delete a task."""
-        async with aiosqlite.connect(self.db_path) as db:
+        db = await self._connection()
+        async with self._write_lock:
             cursor = await db.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
+            await db.execute("DELETE FROM task_logs WHERE task_id = ?", (task_id,))
             await db.commit()
             return cursor.rowcount > 0
     
@@ -182,7 +349,12 @@ class TaskStore:
         from datetime import timedelta
         cutoff = (datetime.now() - timedelta(days=days)).isoformat()
         
-        async with aiosqlite.connect(self.db_path) as db:
+        db = await self._connection()
+        async with self._write_lock:
+            await db.execute(
+                "DELETE FROM task_logs WHERE task_id IN (SELECT task_id FROM tasks WHERE created_at < ?)",
+                (cutoff,)
+            )
             cursor = await db.execute("DELETE FROM tasks WHERE created_at < ?", (cutoff,))
             await db.commit()
             deleted = cursor.rowcount
@@ -190,17 +362,9 @@ class TaskStore:
             return deleted
     
     def _row_to_dict(self, row: aiosqlite.Row) -> Dict[str, Any]:
-        """Convert a database row to a dictionary."""
+        """Convert a database row to a dictionary (logs are filled in by the caller)."""
         d = dict(row)
-        
-        # Parse JSON fields
-        if d.get("logs"):
-            try:
-                d["logs"] = json.loads(d["logs"])
-            except:
-                d["logs"] = []
-        else:
-            d["logs"] = []
+        d["logs"] = []
         
         if d.get("result"):
             try:
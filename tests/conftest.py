@@ -70,3 +70,4 @@ async def task_store():
         store = TaskStore(str(db_path))
         await store.init()
         yield store
+        await store.close()
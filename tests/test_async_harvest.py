@@ -0,0 +1,76 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from modules.literature.async_harvest import AsyncHarvestClient, AsyncRateLimiter, SourceBudget
+from modules.literature.scraper import LiteratureAggregator, LiteratureConfig
+
+LATENCY = 0.3
+
+
+async def _handler(request: httpx.Request) -> httpx.Response:
+    await asyncio.sleep(LATENCY)
+    host = request.url.host
+    if host == "www.ebi.ac.uk":
+        return httpx.Response(200, json={"resultList": {"result": [
+            {"title": "Shared Paper", "doi": "10.1/shared", "pubYear": "2024", "isOpenAccess": "N"},
+        ]}})
+    if host == "api.openalex.org":
+        return httpx.Response(200, json={"results": [
+            {"display_name": "Shared paper", "doi": "https://doi.org/10.1/shared", "publication_year": 2024},
+            {"display_name": "OpenAlex Only", "doi": "https://doi.org/10.1/oa", "publication_year": 2023},
+        ]})
+    if host == "api.crossref.org":
+        return httpx.Response(200, json={"message": {"items": [{"title": ["CrossRef Only"], "DOI": "10.1/cr"}]}})
+    if host == "api.unpaywall.org":
+        if request.url.path.endswith("10.1/oa"):
+            return httpx.Response(200, json={"is_oa": True, "best_oa_location": {"url_for_pdf": "https://x/oa.pdf", "license": "cc-by"}})
+        return httpx.Response(404)
+    return httpx.Response(500)
+
+
+@pytest.mark.asyncio
+async def test_sources_queried_concurrently():
+    aggregator = LiteratureAggregator(LiteratureConfig(sources=["europe_pmc", "openalex", "crossref"]))
+
+    start = time.monotonic()
+    async with AsyncHarvestClient(transport=httpx.MockTransport(_handler)) as client:
+        raw = await aggregator._layer_1_discovery_async("metformin", client)
+        papers = await aggregator._layer_2_oa_detection_async(raw, client)
+    elapsed = time.monotonic() - start
+
+    # Three sources + three Unpaywall lookups, each LATENCY long, in two parallel waves
+    assert elapsed < LATENCY * 4
+    assert [p.title for p in papers] == ["Shared Paper", "OpenAlex Only", "CrossRef Only"]
+    oa = {p.title: p for p in papers}["OpenAlex Only"]
+    assert oa.is_open_access and oa.open_access_source == "Unpaywall"
+    assert oa.full_text_url == "https://x/oa.pdf"
+
+
+@pytest.mark.asyncio
+async def test_failed_source_does_not_abort_harvest():
+    async def handler(request):
+        if request.url.host == "api.crossref.org":
+            return httpx.Response(400)
+        return await _handler(request)
+
+    aggregator = LiteratureAggregator(LiteratureConfig(sources=["europe_pmc", "crossref"]))
+    async with AsyncHarvestClient(transport=httpx.MockTransport(handler)) as client:
+        raw = await aggregator._layer_1_discovery_async("metformin", client)
+    assert [r["title"] for r in raw] == ["Shared Paper"]
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spaces_requests():
+    limiter = AsyncRateLimiter(SourceBudget(concurrency=4, requests_per_second=20))
+    starts = []
+
+    async def hit():
+        async with limiter:
+            starts.append(time.monotonic())
+
+    await asyncio.gather(*(hit() for _ in range(5)))
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert min(gaps) >= 0.04
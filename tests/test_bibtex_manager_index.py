@@ -0,0 +1,140 @@
+import random
+import time
+
+import pytest
+
+pytest.importorskip("bibtexparser")
+
+from export.bibtex_manager import BibTeXManager, _TokenIndex
+from modules.literature.response_cache import ResponseCache
+
+
+def _entry(i, **extra):
+    entry = {
+        'ID': f'ref{i}',
+        'ENTRYTYPE': 'article',
+        'title': f'Kinase inhibitor study number {i}',
+        'author': f'Author{i}, A. and Shared, B.',
+        'journal': 'Journal of Pharmacology' if i % 2 else 'Drug Discovery Today',
+        'year': str(2000 + i % 20),
+    }
+    entry.update(extra)
+    return entry
+
+
+def _pubmed_xml(pmids):
+    records = "".join(f"""
+        <PubmedArticle>
+          <MedlineCitation>
+            <PMID>{pmid}</PMID>
+            <Article>
+              <Journal><Title>Test Journal</Title></Journal>
+              <ArticleTitle>Paper {pmid}</ArticleTitle>
+              <AuthorList><Author><LastName>Doe</LastName><ForeName>Jane</ForeName></Author></AuthorList>
+              <Journal><JournalIssue><PubDate><Year>2021</Year></PubDate></JournalIssue></Journal>
+            </Article>
+          </MedlineCitation>
+          <PubmedData><ArticleIdList>
+            <ArticleId IdType="doi">10.1000/{pmid}</ArticleId>
+          </ArticleIdList></PubmedData>
+        </PubmedArticle>""" for pmid in pmids)
+    return f"<PubmedArticleSet>{records}</PubmedArticleSet>"
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeSession:
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.calls.append(params)
+        return FakeResponse(_pubmed_xml(params['id'].split(',')))
+
+
+def test_duplicates_are_detected_by_title_doi_and_pmid():
+    manager = BibTeXManager()
+    manager.add_manual(_entry(1, doi='10.1000/ABC', pmid='111'))
+
+    manager.add_manual(_entry(2, title='KINASE inhibitor study, number 1!'))
+    manager.add_manual(_entry(3, doi='10.1000/abc'))
+    manager.add_manual(_entry(4, pmid='111'))
+    manager.add_manual(_entry(5))
+
+    assert [e['ID'] for e in manager.entries] == ['ref1', 'ref5']
+    assert manager.format_citation('ref5', style='apa').startswith('Author5')
+
+
+def test_indexes_follow_direct_list_edits_and_merges():
+    manager = BibTeXManager()
+    manager.add_manual(_entry(1))
+    manager.entries.append(_entry(2))
+    assert manager._get_entry_by_id('ref2')['title'].endswith('2')
+    assert manager._is_duplicate(_entry(9, title='Kinase inhibitor study number 2'))
+
+    manager.entries.append(_entry(3, title='Kinase inhibitor study number 1'))
+    assert manager.merge_duplicates(keep_newest=False) == 1
+    assert [e['ID'] for e in manager.entries] == ['ref1', 'ref2']
+    assert manager.search('study number 1') == [manager.entries[0]]
+
+
+def test_bulk_import_and_search_match_linear_scan():
+    entries = [_entry(i) for i in range(3000)]
+    manager = BibTeXManager()
+
+    start = time.perf_counter()
+    for entry in entries:
+        manager.add_manual(entry)
+    manager.add_manual(_entry(4000, title='Kinase inhibitor study number 17'))
+    assert time.perf_counter() - start < 5
+    assert len(manager.entries) == 3000
+
+    for query in ('number 17', 'drug disc', 'shared, b', 'OR2999', 'nib', '', '..', 'no such thing'):
+        expected = [
+            e for e in manager.entries
+            if any(e.get(f) and query.lower() in e[f].lower() for f in ('title', 'author', 'journal', 'abstract'))
+        ]
+        assert manager.search(query) == expected, query
+    assert manager.search('journal of', fields=['title']) == []
+
+
+def test_token_index_substring_lookup_matches_vocabulary_scan():
+    rng = random.Random(7)
+    index = _TokenIndex()
+    for position in range(500):
+        words = (''.join(rng.choices('abcdeé_1', k=rng.randint(1, 9))) for _ in range(4))
+        index.add(' '.join(words), position)
+
+    queries = {''.join(rng.choices('abcdeé_1', k=n)) for n in range(1, 7) for _ in range(30)}
+    for query in queries:
+        expected = set()
+        for token, postings in index.postings.items():
+            if query in token:
+                expected |= postings
+        assert index.containing(query) == expected, query
+
+
+def test_batch_pubmed_uses_one_efetch_per_chunk_and_the_cache(tmp_path):
+    cache = ResponseCache(db_path=str(tmp_path / "cache.db"))
+    manager = BibTeXManager(cache=cache)
+    manager.PUBMED_BATCH_SIZE = 2
+    manager._session = session = FakeSession()
+
+    pmids = ['11', '12', '13', '14', '15', '12']
+    added = manager.add_batch_from_pubmed(pmids)
+
+    assert [e['pmid'] for e in added] == ['11', '12', '13', '14', '15']
+    assert len(session.calls) == 3
+    assert added[2]['doi'] == '10.1000/13'
+    assert added[2]['author'] == 'Doe, Jane'
+
+    again = BibTeXManager(cache=cache)
+    again._session = FakeSession()
+    again.PUBMED_BATCH_SIZE = 2
+    assert len(again.add_batch_from_pubmed(pmids[:5])) == 5
+    assert again._session.calls == []
@@ -0,0 +1,95 @@
+from modules.bio_ner import BioNER, LexiconMatcher, RegexMatcher
+
+
+def make_lexicon():
+    lexicon = LexiconMatcher()
+    lexicon.add("lung cancer", "diseases")
+    lexicon.add("non-small cell lung cancer", "diseases")
+    lexicon.add("cancer", "diseases")
+    lexicon.add("Rituxan", "drugs", canonical="rituximab")
+    lexicon.add("rituximab", "drugs")
+    lexicon.add("crohn's disease", "diseases", canonical="crohn disease")
+    lexicon.add("CAT", "genes")
+    return lexicon
+
+
+def test_longest_multiword_match_wins():
+    spans = make_lexicon().find("Patients with non-small cell lung cancer and lung cancer.")
+    names = [name for _, _, _, name in spans]
+    assert names == ["non-small cell lung cancer", "lung cancer"]
+
+
+def test_synonyms_map_to_canonical_and_case_folds():
+    spans = make_lexicon().find("RITUXAN (Rituximab) for Crohn's disease")
+    assert [(cat, name) for _, _, cat, name in spans] == [
+        ("drugs", "rituximab"), ("drugs", "rituximab"), ("diseases", "crohn disease")
+    ]
+
+
+def test_gene_symbols_are_case_sensitive():
+    spans = make_lexicon().find("The cat had high CAT activity")
+    assert [(s, e) for s, e, _, _ in spans] == [(17, 20)]
+
+
+def test_terms_do_not_span_sentences():
+    spans = make_lexicon().find("Smoking damages the lung. Cancer risk rises.")
+    assert [name for _, _, _, name in spans] == ["cancer"]
+
+
+def test_automaton_recompiles_after_add():
+    lexicon = make_lexicon()
+    assert lexicon.find("metformin") == []
+    lexicon.add("metformin", "drugs")
+    assert lexicon.find("metformin") == [(0, 9, "drugs", "metformin")]
+
+
+def test_regex_matcher_dedupes_in_first_seen_order():
+    text = "imatinib then rituximab then imatinib; hepatitis, HEPATITIS"
+    result = RegexMatcher().extract(text)
+    assert result["drugs"] == ["imatinib", "rituximab"]
+    assert result["diseases"] == ["hepatitis", "HEPATITIS"]
+
+
+def test_bioner_prefers_lexicon_over_patterns():
+    ner = BioNER(lexicon=make_lexicon())
+    result = ner.extract_entities("Crohn's disease patients given Rituxan; TP53 status and nephropathy.")
+    assert result["diseases"] == ["crohn disease", "nephropathy"]
+    assert result["drugs"] == ["rituximab"]
+    assert result["genes"] == ["TP53"]
+
+
+def test_extract_many_streams_in_order():
+    ner = BioNER(lexicon=make_lexicon())
+
+    def corpus():
+        for i in range(1000):
+            yield "rituximab for lung cancer" if i % 2 else "no entities here"
+
+    results = ner.extract_many(corpus())
+    first, second = next(results), next(results)
+    assert first == {"drugs": [], "diseases": [], "genes": []}
+    assert second["drugs"] == ["rituximab"] and second["diseases"] == ["lung cancer"]
+    assert sum(1 for _ in results) == 998
+
+
+def test_bundled_lexicons_load():
+    ner = BioNER()
+    result = ner.extract_entities("Keytruda in non-small cell lung cancer with EGFR mutations")
+    assert "pembrolizumab" in result["drugs"]
+    assert "non-small cell lung cancer" in result["diseases"]
+    assert "EGFR" in result["genes"]
+
+
+def test_transformer_labels_are_mapped():
+    ner = BioNER(use_lexicon=False)
+    ner.use_transformers = True
+    ner.nlp = lambda texts, **kwargs: (
+        [[{"entity_group": "Chemical", "word": "aspirin"}, {"entity_group": "Disease", "word": "stroke"}]
+         for _ in texts]
+        if isinstance(texts, list)
+        else [{"entity_group": "GENE_OR_GENE_PRODUCT", "word": "BRCA1"}]
+    )
+
+    assert ner.extract_entities("x") == {"drugs": [], "diseases": [], "genes": ["BRCA1"]}
+    batched = list(ner.extract_many(["a", "b", "c"], batch_size=2))
+    assert batched == [{"drugs": ["aspirin"], "diseases": ["stroke"], "genes": []}] * 3
@@ -0,0 +1,82 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from agent_zero.web_research.curator import Curator, CuratorConfig
+from agent_zero.web_research.executor import PageResult
+from agent_zero.web_research.result_index import ResultIndex
+
+
+def _page(url, title, content, domain="example.org", success=True):
+    return PageResult(url=url, title=title, content=content, metadata={"domain": domain},
+                      timestamp=datetime.now(), success=success)
+
+
+@pytest.fixture
+def curator(tmp_path, monkeypatch):
+    import modules.rag.vector_store as vector_store
+
+    # Force the keyword path
+    monkeypatch.setattr(vector_store, "get_vector_store", lambda: (_ for _ in ()).throw(RuntimeError("no store")))
+    return Curator(CuratorConfig(base_path=str(tmp_path / "web_research")))
+
+
+@pytest.mark.asyncio
+async def test_bm25_keyword_search_ranks_by_relevance(curator):
+    pages = [
+        _page("https://a.org/1", "Aspirin pharmacokinetics", "aspirin absorption aspirin clearance " * 20),
+        _page("https://b.org/2", "Statin review", "statins and a brief aspirin mention"),
+        _page("https://c.org/3", "Failed", "aspirin", success=False),
+        _page("https://d.org/4", "Metformin", "glucose lowering"),
+    ]
+    paths = await curator.save_results(pages, "aspirin pharmacology")
+
+    hits = await curator.search_index("aspirin", limit=5)
+    assert [h["url"] for h in hits] == ["https://a.org/1", "https://b.org/2"]
+    assert 0 < hits[1]["score"] < hits[0]["score"] < 1
+    # Index paths match the files actually written (failed pages are skipped)
+    assert [h["file_path"] for h in hits] == paths[:2]
+    assert await curator.search_index("glucose") and not await curator.search_index("zzz")
+
+
+@pytest.mark.asyncio
+async def test_updates_are_incremental_and_persistent(curator, tmp_path):
+    await curator.save_results([_page("https://a.org/1", "One", "alpha")], "first query")
+    db = curator.base_path / "index" / "search_index.db"
+    assert db.exists() and not (curator.base_path / "index" / "search_index.json").exists()
+
+    await curator.save_results([_page("https://b.org/2", "Two", "beta")], "second query")
+    reopened = Curator(CuratorConfig(base_path=str(curator.base_path)))
+    assert reopened.index.count() == 2
+    assert [h["url"] for h in await reopened.search_index("beta")] == ["https://b.org/2"]
+
+
+@pytest.mark.asyncio
+async def test_legacy_json_index_is_migrated_and_cleanup_works(tmp_path, curator):
+    base = tmp_path / "legacy"
+    (base / "index").mkdir(parents=True)
+    old = (datetime.now() - timedelta(days=60)).isoformat()
+    legacy = {
+        "queries": {"q1": {"query_id": "q1", "query": "old", "timestamp": old, "total_results": 1,
+                           "successful_results": 1, "sources": [], "keywords": []}},
+        "results": {"q1": [{"url": "https://old.org", "title": "Old kinase paper", "content_length": 3,
+                            "domain": "old.org", "timestamp": old, "query_id": "q1",
+                            "file_path": "x.txt", "hash": "h1"}]},
+        "last_updated": old,
+    }
+    (base / "index" / "search_index.json").write_text(json.dumps(legacy))
+
+    migrated = Curator(CuratorConfig(base_path=str(base)))
+    assert [h["url"] for h in await migrated.search_index("kinase")] == ["https://old.org"]
+    assert (base / "index" / "search_index.json.legacy").exists()
+
+    assert await migrated.cleanup_old_results(days_old=30) == 1
+    assert migrated.index.count() == 0
+
+
+def test_index_deduplicates_within_query(tmp_path):
+    index = ResultIndex(str(tmp_path / "idx.db"))
+    row = {"query_id": "q", "url": "u", "hash": "h", "content": "text"}
+    assert index.add_results([row, row]) == 1
+    assert index.add_results([{**row, "query_id": "other"}]) == 1
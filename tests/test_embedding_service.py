@@ -0,0 +1,115 @@
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from modules.rag.embedding_service import EmbeddingService
+
+
+class _RecordingEncoder:
+    """Deterministic encoder that records every batch it receives."""
+
+    def __init__(self, dim=8, delay=0.0):
+        self.dim = dim
+        self.delay = delay
+        self.batches = []
+
+    def __call__(self, texts):
+        self.batches.append(list(texts))
+        time.sleep(self.delay)
+        return np.stack([
+            np.random.default_rng(sum(t.encode())).random(self.dim, dtype="float32") for t in texts
+        ])
+
+
+def _service(tmp_path, encoder, **kwargs):
+    return EmbeddingService(encoder, "stub", db_path=str(tmp_path / "emb.db"), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_batches(tmp_path):
+    encoder = _RecordingEncoder()
+    service = _service(tmp_path, encoder, max_wait_ms=20)
+
+    texts = [f"query {i % 10}" for i in range(40)]
+    results = await asyncio.gather(*(service.aembed([t]) for t in texts))
+
+    # 40 callers, 10 distinct texts, each encoded exactly once
+    assert sum(len(b) for b in encoder.batches) == 10
+    assert len(encoder.batches) < 10
+    for text, vec in zip(texts, results):
+        np.testing.assert_array_equal(vec[0], encoder([text])[0])
+
+
+def test_threads_are_batched_and_results_cached(tmp_path):
+    encoder = _RecordingEncoder(delay=0.05)
+    service = _service(tmp_path, encoder, max_wait_ms=20)
+
+    out = {}
+    threads = [
+        threading.Thread(target=lambda i=i: out.__setitem__(i, service.embed([f"t{i}", "shared"])))
+        for i in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    encoded = [t for b in encoder.batches for t in b]
+    assert encoded.count("shared") == 1
+    assert len(encoded) == 9
+    assert all(out[i].shape == (2, 8) for i in range(8))
+
+    calls = len(encoder.batches)
+    service.embed(["t3", "shared"])
+    assert len(encoder.batches) == calls
+    assert service.stats()["memory_hits"] >= 2
+
+
+def test_disk_cache_survives_restart(tmp_path):
+    first = _RecordingEncoder()
+    vectors = _service(tmp_path, first).embed(["alpha", "beta"])
+
+    second = _RecordingEncoder()
+    service = _service(tmp_path, second)
+    np.testing.assert_array_equal(service.embed(["beta", "alpha"]), vectors[::-1])
+    assert second.batches == []
+    assert service.stats()["disk_hits"] == 2
+
+
+def test_encoder_errors_reach_callers(tmp_path):
+    def broken(texts):
+        raise RuntimeError("model crashed")
+
+    service = _service(tmp_path, broken, persistent=False)
+    with pytest.raises(RuntimeError, match="model crashed"):
+        service.embed(["x"])
+
+
+@pytest.mark.asyncio
+async def test_aembed_resolves_disk_hits_on_the_worker(tmp_path):
+    encoder = _RecordingEncoder()
+    _service(tmp_path, encoder).embed(["cached"])
+    service = _service(tmp_path, encoder)  # fresh memory tier, same disk
+
+    disk_threads = []
+    disk_lookup = service._disk_lookup
+
+    def tracking(keys):
+        disk_threads.append(threading.get_ident())
+        return disk_lookup(keys)
+
+    service._disk_lookup = tracking
+    vec = await service.aembed(["cached"])
+
+    assert len(encoder.batches) == 1
+    np.testing.assert_array_equal(vec[0], encoder(["cached"])[0])
+    assert disk_threads and threading.get_ident() not in disk_threads
+    assert service.stats()["disk_hits"] == 1
+
+    # The last_access touch is queued, then written in one batch
+    assert list(service._touched) == [service.key("cached")]
+    service.flush()
+    assert not service._touched
@@ -0,0 +1,125 @@
+import itertools
+import random
+import time
+
+from nlp.entity_index import EntityIndex
+from nlp.gap_analyzer import PreclinicalGapAnalyzer
+
+
+def ents(*names):
+    return [{'text': n, 'entity_type': 'drug'} for n in names]
+
+
+def test_cooccurrence_matches_brute_force():
+    random.seed(3)
+    vocab = [f"e{i}" for i in range(30)]
+    papers = [set(random.sample(vocab, random.randint(0, 6))) for _ in range(200)]
+
+    index = EntityIndex()
+    index.add_papers(ents(*p) for p in papers)
+
+    expected = {}
+    for p in papers:
+        for a, b in itertools.combinations(sorted(p), 2):
+            expected[(a, b)] = expected.get((a, b), 0) + 1
+
+    got = {(a, b): n for a, b, n in index.cooccurring_pairs()}
+    assert got == expected
+
+    df = index.document_frequency()
+    for entity, col in index.vocabulary.items():
+        assert df[col] == sum(entity in p for p in papers)
+
+
+def test_repeated_mentions_count_once_and_types_merge():
+    index = EntityIndex()
+    index.add_paper([{'text': 'kinase', 'entity_type': 'protein'},
+                     {'text': 'kinase', 'entity_type': 'target'},
+                     {'text': 'kinase', 'entity_type': 'protein'}])
+    assert index.document_frequency().tolist() == [1]
+    assert index.entity_types[0] == {'protein', 'target'}
+    assert index.mention_frequency().tolist() == [3]
+
+
+def test_underexplored_entities_count_total_mentions():
+    analyzer = PreclinicalGapAnalyzer(embedder=None, min_entity_count=3)
+    papers = [
+        {'entities': ents('a', 'a', 'b')},
+        {'entities': ents('a', 'c')},
+        {'entities': ents('b')},
+    ]
+
+    gaps = analyzer._detect_underexplored_entities(papers)
+
+    # 'a' appears in two papers but is mentioned three times, as before the index
+    assert {g['entity']: g['paper_count'] for g in gaps} == {'b': 2, 'c': 1}
+
+
+def test_combination_gaps_use_shared_paper_counts():
+    analyzer = PreclinicalGapAnalyzer(embedder=None, min_entity_count=3)
+    papers = (
+        [{'entities': ents('a', 'b', 'c')}] * 2
+        + [{'entities': ents('a', 'c')}] * 3
+        + [{'entities': ents('d')}]
+    )
+
+    gaps = analyzer._detect_combination_gaps(papers)
+
+    combos = {g['combination']: g['paper_count'] for g in gaps}
+    # a+c shares 5 papers (well studied); a+b and b+c share 2
+    assert combos == {'a + b': 2, 'b + c': 2}
+    assert all(g['novelty_score'] == 1 / 3 for g in gaps)
+
+
+def test_entities_extracted_once_per_abstract(monkeypatch):
+    analyzer = PreclinicalGapAnalyzer(embedder=None)
+    calls = []
+    original = analyzer.extract_entities
+
+    def counting(text):
+        calls.append(text)
+        return original(text)
+
+    monkeypatch.setattr(analyzer, 'extract_entities', counting)
+    papers = [
+        {'abstract': 'A kinase inhibitor for alzheimer disease'},
+        {'abstract': 'Receptor agonist in cancer pathway'},
+        {'abstract': 'A kinase inhibitor for alzheimer disease'},
+    ]
+
+    gaps = analyzer.detect_research_gaps("test", papers, gap_types=['under_explored', 'combination'])
+    analyzer.assess_novelty("kinase inhibitor", papers, method='entity')
+
+    assert len(calls) == 3  # two distinct abstracts + the hypothesis
+    assert {g['gap_type'] for g in gaps} == {'under_explored_entity', 'under_explored_combination'}
+
+
+def test_entity_cache_is_bounded_lru():
+    analyzer = PreclinicalGapAnalyzer(embedder=None, entity_cache_size=2)
+    first, second, third = ({'abstract': f'kinase study {i}'} for i in range(3))
+
+    analyzer.paper_entities(first)
+    analyzer.paper_entities(second)
+    analyzer.paper_entities(first)  # refresh: second is now least recent
+    analyzer.paper_entities(third)
+
+    assert len(analyzer._entity_cache) == 2
+    calls = []
+    analyzer.extract_entities = lambda text: calls.append(text) or []
+    analyzer.paper_entities(first)
+    analyzer.paper_entities(second)
+    assert calls == ['kinase study 1']
+
+
+def test_combination_gaps_scale_to_large_corpora():
+    random.seed(7)
+    vocab = [f"entity{i}" for i in range(2000)]
+    papers = [{'entities': ents(*random.sample(vocab, 8))} for _ in range(20000)]
+    analyzer = PreclinicalGapAnalyzer(embedder=None)
+
+    start = time.perf_counter()
+    gaps = analyzer.detect_research_gaps("scale", papers, gap_types=['under_explored', 'combination'])
+    elapsed = time.perf_counter() - start
+
+    assert gaps
+    assert elapsed < 20
@@ -0,0 +1,95 @@
+import faiss
+import numpy as np
+
+from modules.rag.embedding_service import EmbeddingService
+from nlp.gap_analyzer import PreclinicalGapAnalyzer
+from nlp.scibert_embedder import SciBERTEmbedder
+
+DIM = 8
+
+
+def fake_encoder(calls):
+    def encode(texts):
+        calls.extend(texts)
+        vectors = []
+        for text in texts:
+            rng = np.random.default_rng(abs(hash(text)) % (2 ** 32))
+            vectors.append(rng.normal(size=DIM))
+        return np.array(vectors, dtype=np.float32)
+    return encode
+
+
+def make_embedder(db_path, calls):
+    # Skip model loading; embed_batch only needs the shared embedding service
+    embedder = SciBERTEmbedder.__new__(SciBERTEmbedder)
+    embedder.embedding_dim = DIM
+    embedder.embedding_service = EmbeddingService(fake_encoder(calls), model_id="fake:cls", db_path=str(db_path))
+    return embedder
+
+
+class CountingIndex:
+    def __init__(self, index):
+        self.index = index
+        self.calls = 0
+
+    def search(self, queries, k):
+        self.calls += 1
+        return self.index.search(queries, k)
+
+
+def test_embed_batch_only_encodes_new_texts_across_restarts(tmp_path):
+    calls = []
+    embedder = make_embedder(tmp_path / "emb.db", calls)
+    first = embedder.embed_batch([f"abstract {i}" for i in range(50)], show_progress=False)
+    assert len(calls) == 50
+
+    calls.clear()
+    grown = embedder.embed_batch([f"abstract {i}" for i in range(60)], show_progress=False)
+    assert sorted(calls) == sorted(f"abstract {i}" for i in range(50, 60))
+    np.testing.assert_allclose(grown[:50], first)
+
+    # A fresh process reads the same on-disk cache
+    restarted_calls = []
+    restarted = make_embedder(tmp_path / "emb.db", restarted_calls)
+    again = restarted.embed_batch([f"abstract {i}" for i in range(60)], show_progress=True)
+    assert restarted_calls == []
+    np.testing.assert_allclose(again, grown, rtol=1e-6)
+
+
+def test_semantic_gaps_use_one_batched_search(tmp_path):
+    calls = []
+    embedder = make_embedder(tmp_path / "emb.db", calls)
+    papers = [{'title': f"paper {i}", 'abstract': f"abstract {i}"} for i in range(40)]
+    # Papers without abstracts must not shift the reported indices
+    papers.insert(3, {'title': 'no abstract'})
+    papers.insert(10, {'title': 'empty', 'abstract': ''})
+
+    abstracts = [p['abstract'] for p in papers if p.get('abstract')]
+    flat = faiss.IndexFlatL2(DIM)
+    flat.add(embedder.embed_batch(abstracts, show_progress=False))
+    index = CountingIndex(flat)
+
+    analyzer = PreclinicalGapAnalyzer(embedder, faiss_index=index)
+    gaps = analyzer._find_semantic_gaps(papers)
+
+    assert index.calls == 1
+    assert gaps
+    for gap in gaps:
+        assert papers[gap['paper_index']]['title'] == gap['paper_title']
+        assert papers[gap['paper_index']].get('abstract')
+        assert 0 < gap['novelty_score'] <= 1.0
+
+
+def test_density_ignores_unfilled_neighbour_slots(tmp_path):
+    calls = []
+    embedder = make_embedder(tmp_path / "emb.db", calls)
+    papers = [{'title': f"p{i}", 'abstract': f"text {i}"} for i in range(3)]
+
+    flat = faiss.IndexFlatL2(DIM)
+    flat.add(embedder.embed_batch([p['abstract'] for p in papers], show_progress=False))
+
+    analyzer = PreclinicalGapAnalyzer(embedder, faiss_index=flat)
+    gaps = analyzer._find_semantic_gaps(papers)
+
+    # k + 1 = 4 > 3 vectors: the empty slot (-1) must not inflate distances
+    assert all(gap['density_score'] < 1e6 for gap in gaps)
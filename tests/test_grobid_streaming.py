@@ -0,0 +1,126 @@
+import itertools
+
+import pytest
+
+from nlp import grobid_parser
+from nlp.grobid_parser import GROBIDParser, GrobidCapacity
+
+TEI = """<TEI xmlns="http://www.tei-c.org/ns/1.0">
+  <teiHeader>
+    <fileDesc>
+      <titleStmt><title>{title}</title></titleStmt>
+      <sourceDesc><biblStruct><analytic>
+        <author><persName><forename>Ada</forename><surname>Lovelace</surname></persName></author>
+      </analytic></biblStruct></sourceDesc>
+    </fileDesc>
+    <profileDesc><abstract><p>Abstract of {title}.</p></abstract></profileDesc>
+  </teiHeader>
+  <text><body></body></text>
+</TEI>"""
+
+
+class FakeResponse:
+    def __init__(self, status_code, text=""):
+        self.status_code = status_code
+        self.text = text
+
+
+@pytest.fixture
+def grobid(monkeypatch, tmp_path):
+    posts = []
+
+    def fake_get(url, timeout=None):
+        return FakeResponse(200)
+
+    def fake_post(url, files=None, headers=None, timeout=None):
+        content = files['input'].read().decode()
+        posts.append(content)
+        return FakeResponse(200, TEI.format(title=content))
+
+    monkeypatch.setattr(grobid_parser.requests, "get", fake_get)
+    monkeypatch.setattr(grobid_parser.requests, "post", fake_post)
+    parser = GROBIDParser(cache_dir=str(tmp_path / "tei"), max_concurrency=2)
+    return parser, posts
+
+
+def make_pdfs(tmp_path, n):
+    paths = []
+    for i in range(n):
+        path = tmp_path / f"paper{i}.pdf"
+        path.write_bytes(f"paper {i}".encode())
+        paths.append(str(path))
+    return paths
+
+
+def test_iter_parse_streams_and_caches_tei_by_content(grobid, tmp_path):
+    parser, posts = grobid
+    paths = make_pdfs(tmp_path, 5)
+
+    first = {r['file_path']: r for r in parser.iter_parse(paths, parse_workers=0)}
+    assert len(posts) == 5
+    assert all(r['success'] and not r['cached'] for r in first.values())
+    assert first[paths[3]]['data']['title'] == "paper 3"
+    assert first[paths[3]]['data']['authors'] == ["Ada Lovelace"]
+
+    # A rerun (or resumed run) is served from the cache, even under a new name
+    renamed = tmp_path / "renamed.pdf"
+    renamed.write_bytes(b"paper 1")
+    second = list(parser.iter_parse(paths + [str(renamed)], parse_workers=0))
+    assert len(posts) == 5
+    assert all(r['cached'] for r in second)
+    assert parser.parse_pdf(paths[0]).title == "paper 0"
+    assert len(posts) == 5
+
+
+def test_iter_parse_reads_input_lazily(grobid, tmp_path):
+    parser, _ = grobid
+    paths = make_pdfs(tmp_path, 3)
+    consumed = []
+
+    def endless():
+        for i in itertools.count():
+            consumed.append(i)
+            yield paths[i % 3]
+
+    results = parser.iter_parse(endless(), parse_workers=0, fetch_workers=2, max_in_flight=4)
+    for _ in range(10):
+        assert next(results)['success']
+    results.close()
+    assert len(consumed) <= 10 + 4 + 1
+
+
+def test_tei_parsing_in_worker_processes_matches_inline(grobid, tmp_path):
+    parser, _ = grobid
+    paths = make_pdfs(tmp_path, 4) + [str(tmp_path / "missing.pdf")]
+
+    inline = {r['file_path']: r.get('data') for r in parser.iter_parse(paths, parse_workers=0)}
+    pooled = {r['file_path']: r.get('data') for r in parser.iter_parse(paths, parse_workers=2)}
+
+    assert pooled == inline
+    assert pooled[paths[-1]] is None
+    assert [r['success'] for r in parser.batch_parse(paths[:2])] == [True, True]
+
+
+async def test_aiter_parse_yields_every_result(grobid, tmp_path):
+    parser, _ = grobid
+    paths = make_pdfs(tmp_path, 6)
+
+    titles = [r['data']['title'] async for r in parser.aiter_parse(paths, buffer_size=2, parse_workers=0)]
+
+    assert sorted(titles) == [f"paper {i}" for i in range(6)]
+
+
+def test_capacity_backs_off_on_overload_and_recovers():
+    capacity = GrobidCapacity(max_concurrency=8)
+
+    capacity.acquire()
+    capacity.release(overloaded=True)
+    capacity.acquire()
+    capacity.release(overloaded=True)
+    assert capacity.limit == 2
+
+    for _ in range(10):
+        capacity.acquire()
+        capacity.release()
+    assert capacity.limit == 8
+    assert capacity.overloads == 2
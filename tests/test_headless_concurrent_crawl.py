@@ -0,0 +1,160 @@
+import asyncio
+import time
+
+from modules.headless_research import engine
+from modules.headless_research.engine import HeadlessResearcher
+
+LATENCY = 0.05
+
+
+class FakeResponse:
+    status = 200
+
+
+class FakePage:
+    def __init__(self, tracker):
+        self.tracker = tracker
+        self.url = "about:blank"
+        self.closed = False
+
+    async def goto(self, url, **kwargs):
+        self.url = url
+        if url == "about:blank":
+            return FakeResponse()
+        domain = url.split("/")[2]
+        self.tracker["active"][domain] = self.tracker["active"].get(domain, 0) + 1
+        self.tracker["peak"][domain] = max(self.tracker["peak"].get(domain, 0), self.tracker["active"][domain])
+        await asyncio.sleep(LATENCY)
+        self.tracker["active"][domain] -= 1
+        return FakeResponse()
+
+    async def content(self):
+        return f"<html><body><p>{self.url}</p></body></html>"
+
+    async def add_init_script(self, script):
+        pass
+
+    async def set_extra_http_headers(self, headers):
+        pass
+
+    async def screenshot(self, **kwargs):
+        pass
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self):
+        self.tracker = {"active": {}, "peak": {}}
+        self.pages = []
+
+    async def new_page(self):
+        page = FakePage(self.tracker)
+        self.pages.append(page)
+        return page
+
+
+def make_researcher(monkeypatch, concurrency, **kwargs):
+    researcher = HeadlessResearcher(concurrency=concurrency, domain_interval=0.0, **kwargs)
+    researcher.context = FakeContext()
+
+    async def no_reading(page):
+        pass
+
+    async def extract_markdown(html):
+        return html * 2
+
+    async def get_metadata(page):
+        return {"title": page.url}
+
+    synced = []
+
+    async def fake_sync(result):
+        await asyncio.sleep(LATENCY)
+        synced.append(result["url"])
+        return {"surfsense": "success", "internal": "success"}
+
+    monkeypatch.setattr(researcher.behavior, "simulate_reading", no_reading)
+    monkeypatch.setattr(researcher.scraper, "extract_markdown", extract_markdown)
+    monkeypatch.setattr(researcher.scraper, "get_metadata", get_metadata)
+    monkeypatch.setattr(researcher, "_sync_to_surfsense", fake_sync)
+    return researcher, synced
+
+
+async def test_research_many_crawls_concurrently_in_input_order(monkeypatch):
+    researcher, synced = make_researcher(monkeypatch, concurrency=8, per_domain_limit=4)
+    urls = [f"https://site{i % 5}.org/paper/{i}" for i in range(20)]
+
+    start = time.perf_counter()
+    results = await researcher.research_many(urls)
+    elapsed = time.perf_counter() - start
+
+    assert [r["url"] for r in results] == urls
+    assert all(r["status"] == "success" for r in results)
+    assert all(r["sync"]["surfsense"] == "success" for r in results)
+    assert sorted(synced) == sorted(urls)
+    # Sequential crawl + upload would take 20 * 2 * LATENCY
+    assert elapsed < 20 * 2 * LATENCY / 3
+    # Pages are reused, not opened per URL
+    assert len(researcher.context.pages) == 8
+
+
+async def test_research_many_respects_per_domain_limit(monkeypatch):
+    researcher, _ = make_researcher(monkeypatch, concurrency=6, per_domain_limit=2)
+    urls = [f"https://slow.example.org/paper/{i}" for i in range(8)]
+
+    results = await researcher.research_many(urls)
+
+    assert all(r["status"] == "success" for r in results)
+    assert researcher.context.tracker["peak"]["slow.example.org"] == 2
+
+
+async def test_domain_limiter_spaces_requests():
+    limiter = engine.DomainLimiter(max_concurrent=4, min_interval=0.05)
+    starts = []
+
+    async def hit():
+        async with limiter.slot("https://example.org/x"):
+            starts.append(time.monotonic())
+
+    await asyncio.gather(*(hit() for _ in range(3)))
+
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert all(gap >= 0.04 for gap in gaps)
+
+
+async def test_pool_replaces_closed_pages(monkeypatch):
+    researcher, _ = make_researcher(monkeypatch, concurrency=2)
+    await researcher._ensure_pool()
+
+    page = await researcher.pool.acquire()
+    await page.close()
+    await researcher.pool.release(page)
+
+    results = await researcher.research_many(["https://a.org/1", "https://b.org/2"])
+
+    assert all(r["status"] == "success" for r in results)
+    assert len(researcher.context.pages) == 3
+
+
+async def test_page_acquire_failure_is_recorded_per_url(monkeypatch):
+    researcher, _ = make_researcher(monkeypatch, concurrency=2)
+    await researcher._ensure_pool()
+    for page in researcher.context.pages:
+        await page.close()
+
+    async def browser_gone():
+        raise RuntimeError("Target closed")
+
+    monkeypatch.setattr(researcher.context, "new_page", browser_gone)
+    urls = [f"https://a.org/{i}" for i in range(3)]
+
+    results = await asyncio.wait_for(researcher.research_many(urls), timeout=5)
+
+    assert [r["url"] for r in results] == urls
+    assert all(r["status"] == "error" and "Target closed" in r["error"] for r in results)
+    assert len(researcher.pool._pages) == 2
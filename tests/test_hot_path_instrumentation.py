@@ -0,0 +1,179 @@
+import asyncio
+import json
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+from prometheus_client import REGISTRY
+
+from runtime import instrumentation
+from runtime.instrumentation import SamplingProfiler, provider_name, token_usage
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_token_usage_understands_provider_formats():
+    assert token_usage({"usage": {"prompt_tokens": 12, "completion_tokens": 30}}) == (12, 30)
+    assert token_usage({"usage": {"input_tokens": 5, "output_tokens": 7}}) == (5, 7)
+    assert token_usage({"usageMetadata": {"promptTokenCount": 3, "candidatesTokenCount": 4}}) == (3, 4)
+    assert token_usage({"response": "hi", "prompt_eval_count": 9, "eval_count": 2}) == (9, 2)
+    litellm_like = SimpleNamespace(usage=SimpleNamespace(prompt_tokens=8, completion_tokens=1))
+    assert token_usage(litellm_like) == (8, 1)
+    assert token_usage({"choices": []}) == (0, 0)
+    assert token_usage(None) == (0, 0)
+
+
+def test_llm_latency_is_recorded_per_attempt(tmp_path, monkeypatch):
+    import requests
+    from runtime import cache as cache_module
+    from runtime import robust_connection
+    import modules.llm.adapters as adapters
+
+    monkeypatch.setattr(cache_module, "_llm_cache", cache_module.LLMResponseCache(db_path=str(tmp_path / "llm.db")))
+    monkeypatch.setattr(robust_connection.time, "sleep", lambda seconds: None)
+    ok_response = MagicMock(status_code=200)
+    ok_response.json.return_value = {
+        "choices": [{"message": {"content": "answer"}}],
+        "usage": {"prompt_tokens": 4, "completion_tokens": 6},
+    }
+    session = MagicMock()
+    session.post.side_effect = [requests.exceptions.ConnectionError("reset"), ok_response]
+    monkeypatch.setattr(adapters, "get_http_session", lambda: session)
+
+    ok = dict(provider="custom", operation="generate", status="ok")
+    error = dict(provider="custom", operation="generate", status="error")
+    ok_before = sample("biodockify_llm_request_duration_seconds_count", **ok)
+    error_before = sample("biodockify_llm_request_duration_seconds_count", **error)
+    tokens_before = sample("biodockify_llm_tokens_total", provider="custom", kind="completion")
+
+    adapter = adapters.CustomAdapter("key", "http://llm.local/v1", "probe")
+    assert adapter.generate("q") == "answer"
+    assert adapter.generate("q") == "answer"
+
+    # One observation per attempt; the retry backoff and the cache hit are not timed
+    assert session.post.call_count == 2
+    assert sample("biodockify_llm_request_duration_seconds_count", **ok) == ok_before + 1
+    assert sample("biodockify_llm_request_duration_seconds_count", **error) == error_before + 1
+    assert sample("biodockify_llm_tokens_total", provider="custom", kind="completion") == tokens_before + 6
+
+
+async def test_llm_streams_record_latency_and_tokens(monkeypatch):
+    import httpx
+    import modules.llm.adapters as adapters
+
+    events = [
+        {"type": "message_start", "message": {"usage": {"input_tokens": 11, "output_tokens": 1}}},
+        {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "A"}},
+        {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "B"}},
+        {"type": "message_delta", "usage": {"output_tokens": 5}},
+        {"type": "message_stop"},
+    ]
+    body = "".join(f"event: x\ndata: {json.dumps(e)}\n\n" for e in events)
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, text=body)))
+    monkeypatch.setattr(adapters, "get_async_client", lambda: client)
+
+    def streams(status):
+        return sample("biodockify_llm_request_duration_seconds_count", provider="anthropic", operation="stream", status=status)
+
+    ok_before, cancelled_before = streams("ok"), streams("cancelled")
+    prompt_before = sample("biodockify_llm_tokens_total", provider="anthropic", kind="prompt")
+    completion_before = sample("biodockify_llm_tokens_total", provider="anthropic", kind="completion")
+
+    adapter = adapters.AnthropicAdapter("key")
+    assert [t async for t in adapter.stream("hi")] == ["A", "B"]
+    assert streams("ok") == ok_before + 1
+    assert sample("biodockify_llm_tokens_total", provider="anthropic", kind="prompt") == prompt_before + 11
+    assert sample("biodockify_llm_tokens_total", provider="anthropic", kind="completion") == completion_before + 5
+
+    # A consumer that stops reading is labelled separately from failures
+    stream = adapter.stream("hi")
+    assert await stream.__anext__() == "A"
+    await stream.aclose()
+    assert streams("cancelled") == cancelled_before + 1
+
+
+def test_embedding_batches_and_cache_are_recorded(tmp_path):
+    from modules.rag.embedding_service import EmbeddingService
+
+    service = EmbeddingService(
+        lambda texts: np.ones((len(texts), 4), dtype=np.float32),
+        model_id="probe-model",
+        db_path=str(tmp_path / "emb.db"),
+    )
+    sizes_before = sample("biodockify_embedding_batch_size_sum", model="probe-model")
+    misses_before = sample("biodockify_cache_lookups_total", cache="embedding", result="miss")
+    hits_before = sample("biodockify_cache_lookups_total", cache="embedding", result="hit")
+
+    service.embed(["a", "b", "c"])
+    service.embed(["a", "d"])
+
+    assert sample("biodockify_embedding_batch_size_sum", model="probe-model") == sizes_before + 4
+    assert sample("biodockify_cache_lookups_total", cache="embedding", result="miss") == misses_before + 4
+    assert sample("biodockify_cache_lookups_total", cache="embedding", result="hit") == hits_before + 1
+
+
+async def test_analysis_runtime_labelled_by_method():
+    from modules.statistics.executor import AnalysisExecutor
+
+    executor = AnalysisExecutor(max_workers=1)
+    try:
+        before = sample("biodockify_statistics_analysis_duration_seconds_count", method="sum", lane="session", status="ok")
+        assert await executor.run_session(sum, [1, 2, 3]) == 6
+        await asyncio.sleep(0.01)  # completion is recorded by a loop callback
+        after = sample("biodockify_statistics_analysis_duration_seconds_count", method="sum", lane="session", status="ok")
+        assert after == before + 1
+    finally:
+        executor.shutdown()
+
+
+async def test_event_loop_lag_monitor_sees_blocking_call():
+    before = sample("biodockify_event_loop_lag_seconds_sum")
+    task = instrumentation.start_event_loop_monitor(interval=0.01)
+    await asyncio.sleep(0.02)
+    time.sleep(0.2)  # block the loop
+    await asyncio.sleep(0.03)
+    task.cancel()
+
+    assert sample("biodockify_event_loop_lag_seconds_sum") - before >= 0.15
+
+
+def test_sampling_profiler_attributes_busy_thread():
+    stop = threading.Event()
+
+    def hot_loop():
+        while not stop.is_set():
+            sum(i * i for i in range(1000))
+
+    worker = threading.Thread(target=hot_loop, name="hot-worker")
+    worker.start()
+    try:
+        profile = SamplingProfiler(interval=0.002).sample(0.3)
+    finally:
+        stop.set()
+        worker.join()
+
+    summary = SamplingProfiler.summary(profile)
+    assert profile["samples"] > 10
+    assert any("hot_loop" in frame for frame, _ in summary["top_inclusive"])
+    assert "hot-worker;" in SamplingProfiler.collapsed(profile)
+
+
+def test_profiler_rejects_overlapping_runs():
+    profiler = SamplingProfiler(interval=0.01)
+    results = []
+    runner = threading.Thread(target=lambda: results.append(profiler.sample(0.3)))
+    runner.start()
+    time.sleep(0.05)
+    try:
+        profiler.sample(0.01)
+        overlapped = True
+    except RuntimeError:
+        overlapped = False
+    runner.join()
+
+    assert not overlapped
+    assert results
@@ -0,0 +1,113 @@
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.deferred_routes import DeferredRouteGate, DeferredRouters
+from runtime import lazy
+from runtime.lazy import LazyObject, is_loaded, lazy_attr
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_lazy_object_builds_once_on_first_use():
+    calls = []
+
+    class Service:
+        greeting = "hi"
+
+        def echo(self, value):
+            return value
+
+    def build():
+        calls.append(1)
+        return Service()
+
+    service = LazyObject(build, "test.service")
+    assert not is_loaded(service)
+    assert calls == []
+
+    assert service.echo(3) == 3
+    assert service.greeting == "hi"
+    assert is_loaded(service)
+    assert calls == [1]
+    assert lazy.startup_report()["lazy_loads"]["test.service"]["status"] == "ok"
+
+
+def test_lazy_object_remembers_failed_load():
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise ImportError("missing optional dependency")
+
+    service = LazyObject(broken, "test.broken")
+    for _ in range(2):
+        with pytest.raises(ImportError):
+            service.run()
+    assert calls == [1]
+    assert lazy.startup_report()["lazy_loads"]["test.broken"]["status"] == "error"
+
+
+def test_lazy_attr_is_callable():
+    ordered_dict = lazy_attr("collections", "OrderedDict")
+    assert ordered_dict(a=1) == {"a": 1}
+
+
+def test_warmups_report_each_step():
+    lazy.register_warmup("test.ok", lambda: None)
+    lazy.register_warmup("test.fails", lambda: 1 / 0)
+
+    results = lazy.run_warmups()
+
+    assert results["test.ok"]["status"] == "ok"
+    assert results["test.fails"]["status"] == "error"
+    assert lazy.startup_report()["pending_warmups"] == []
+
+
+def test_deferred_router_mounts_on_first_request_and_keeps_precedence(tmp_path, monkeypatch):
+    (tmp_path / "deferred_demo_routes.py").write_text(textwrap.dedent("""
+        from fastapi import APIRouter
+
+        router = APIRouter(prefix="/api/demo")
+
+        @router.get("/analyze")
+        def analyze():
+            return {"source": "router"}
+    """))
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    app = FastAPI()
+    deferred = DeferredRouters(app)
+    deferred.add("deferred_demo_routes", prefixes=("/api/demo",))
+    app.add_middleware(DeferredRouteGate, deferred=deferred)
+
+    # Registered later, so an eager include_router would have shadowed it
+    @app.get("/api/demo/analyze")
+    def legacy_analyze():
+        return {"source": "legacy"}
+
+    client = TestClient(app)
+    assert deferred.status()["deferred_demo_routes"]["mounted"] is False
+
+    assert client.get("/api/demo/analyze").json() == {"source": "router"}
+    assert deferred.status()["deferred_demo_routes"] == {"mounted": True, "routes": 1, "error": None}
+    assert "/api/demo/analyze" in client.get("/openapi.json").json()["paths"]
+
+
+def test_heavy_subsystems_are_not_imported_with_their_callers():
+    code = textwrap.dedent("""
+        import sys
+        import modules.compliance, modules.rag.vector_store, modules.llm.adapters, modules.thesis
+        heavy = ("torch", "sentence_transformers", "litellm", "sklearn")
+        print("loaded:" + ",".join(m for m in heavy if m in sys.modules))
+    """)
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, timeout=300,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == "loaded:"
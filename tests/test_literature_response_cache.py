@@ -0,0 +1,104 @@
+import os
+import time
+
+import httpx
+import pytest
+
+from modules.literature.async_harvest import AsyncHarvestClient
+from modules.literature.response_cache import ResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(db_path=str(tmp_path / "http.db"))
+
+
+def test_keys_are_content_addressed():
+    a = ResponseCache.make_key("openalex", "https://x", {"search": "aspirin", "per-page": 10})
+    b = ResponseCache.make_key("openalex", "https://x", {"per-page": 10, "search": "aspirin"})
+    c = ResponseCache.make_key("crossref", "https://x", {"search": "aspirin", "per-page": 10})
+    assert a == b
+    assert a != c
+
+
+def test_store_lookup_and_ttl(cache):
+    key = cache.make_key("crossref", "https://api.crossref.org/works", {"query": "q"})
+    cache.store(key, "crossref", {"items": [1, 2]}, etag='"v1"')
+
+    entry = cache.lookup(key)
+    assert entry.value == {"items": [1, 2]}
+    assert entry.fresh
+    assert cache.conditional_headers(entry) == {"If-None-Match": '"v1"'}
+
+    cache.store(key, "crossref", {"items": []}, ttl=-1)
+    assert not cache.lookup(key).fresh
+
+    cache.touch(key, "crossref")
+    assert cache.lookup(key).fresh
+
+
+def test_persists_across_instances(tmp_path):
+    path = str(tmp_path / "http.db")
+    key = ResponseCache.make_key("unpaywall", "https://api.unpaywall.org/v2/10.1/x")
+    ResponseCache(db_path=path).store(key, "unpaywall", {"is_oa": True})
+
+    reopened = ResponseCache(db_path=path)
+    assert reopened.lookup(key).value == {"is_oa": True}
+    assert reopened.stats()["entries"] == 1
+
+
+def test_lru_eviction_respects_size_bound(tmp_path):
+    cache = ResponseCache(db_path=str(tmp_path / "http.db"), max_bytes=2000)
+    payload = {"blob": os.urandom(300).hex()}  # incompressible, ~600 bytes stored
+    keys = [cache.make_key("openalex", "u", {"page": i}) for i in range(6)]
+
+    for key in keys[:3]:
+        cache.store(key, "openalex", payload)
+        time.sleep(0.01)
+    cache.lookup(keys[0])  # keys[1] is now least recently used
+    for key in keys[3:]:
+        cache.store(key, "openalex", payload)
+        time.sleep(0.01)
+
+    assert cache.stats()["bytes"] <= cache.max_bytes
+    assert cache.lookup(keys[1]) is None
+    assert cache.lookup(keys[-1]) is not None
+
+
+def test_memoize_calls_producer_once(cache):
+    calls = []
+
+    def producer():
+        calls.append(1)
+        return [{"pmid": "1"}]
+
+    for _ in range(3):
+        assert cache.memoize("pubmed", {"query": "q", "limit": 5}, producer) == [{"pmid": "1"}]
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_async_client_serves_cache_and_revalidates(cache):
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"results": ["a"]}, headers={"ETag": '"v1"'})
+
+    url = "https://api.openalex.org/works"
+    async with AsyncHarvestClient(transport=httpx.MockTransport(handler), cache=cache) as client:
+        assert await client.get_json("openalex", url, params={"search": "q"}) == {"results": ["a"]}
+        assert await client.get_json("openalex", url, params={"search": "q"}) == {"results": ["a"]}
+        assert seen == [None]
+
+        key = cache.make_key("openalex", url, {"search": "q"})
+        cache.store(key, "openalex", {"results": ["a"]}, etag='"v1"', ttl=-1)
+        assert await client.get_json("openalex", url, params={"search": "q"}) == {"results": ["a"]}
+
+    assert seen == [None, '"v1"']
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["revalidated"] == 1
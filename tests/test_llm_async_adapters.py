@@ -0,0 +1,96 @@
+import asyncio
+import json
+import time
+import uuid
+
+import httpx
+import pytest
+
+import modules.llm.adapters as adapters
+from modules.llm.adapters import AnthropicAdapter, CustomAdapter, OllamaAdapter
+from modules.llm.http_client import get_async_client
+
+
+def _pooled_client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.fixture
+def mock_client(monkeypatch):
+    """Route the adapters' pooled async client through a mock transport."""
+    def install(handler):
+        client = _pooled_client(handler)
+        monkeypatch.setattr(adapters, "get_async_client", lambda: client)
+        return client
+    return install
+
+
+@pytest.mark.asyncio
+async def test_async_generate_is_native_and_concurrent(mock_client):
+    seen = []
+
+    async def handler(request):
+        seen.append(json.loads(request.content))
+        await asyncio.sleep(0.2)
+        return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+
+    mock_client(handler)
+    adapter = CustomAdapter("Bearer key", "http://llm.local/v1/models", "m")
+
+    start = time.monotonic()
+    prompts = [f"q{i}-{uuid.uuid4()}" for i in range(20)]
+    results = await asyncio.gather(*(adapter.async_generate(p) for p in prompts))
+    # Twenty 0.2s calls overlapped instead of queueing on a thread pool
+    assert time.monotonic() - start < 1.5
+    assert results == ["ok"] * 20
+    assert {s["messages"][0]["content"] for s in seen} == set(prompts)
+
+    # Responses are cached like the sync path
+    await adapter.async_generate(prompts[0])
+    assert len(seen) == 20
+
+
+@pytest.mark.asyncio
+async def test_status_errors_are_reported(mock_client):
+    mock_client(lambda request: httpx.Response(401))
+    adapter = CustomAdapter("key", "http://llm.local/v1", "m")
+    with pytest.raises(ValueError, match="401"):
+        await adapter.async_generate(f"x-{uuid.uuid4()}")
+
+
+@pytest.mark.asyncio
+async def test_openai_compatible_streaming(mock_client):
+    def handler(request):
+        assert json.loads(request.content)["stream"] is True
+        body = "".join(
+            f"data: {json.dumps({'choices': [{'delta': {'content': t}}]})}\n\n" for t in ["Hel", "lo"]
+        ) + "data: [DONE]\n\n"
+        return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+
+    mock_client(handler)
+    adapter = CustomAdapter("key", "http://llm.local/v1", "m")
+    assert [t async for t in adapter.stream("hi")] == ["Hel", "lo"]
+
+
+@pytest.mark.asyncio
+async def test_anthropic_and_ollama_streaming(mock_client):
+    def handler(request):
+        if request.url.host == "api.anthropic.com":
+            events = [
+                {"type": "message_start"},
+                {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "A"}},
+                {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "B"}},
+                {"type": "message_stop"},
+            ]
+            return httpx.Response(200, text="".join(f"event: x\ndata: {json.dumps(e)}\n\n" for e in events))
+        lines = [{"response": "x", "done": False}, {"response": "y", "done": False}, {"response": "", "done": True}]
+        return httpx.Response(200, text="\n".join(json.dumps(l) for l in lines))
+
+    mock_client(handler)
+    assert [t async for t in AnthropicAdapter("key").stream("hi")] == ["A", "B"]
+    assert [t async for t in OllamaAdapter("http://ollama.local").stream("hi")] == ["x", "y"]
+
+
+@pytest.mark.asyncio
+async def test_pooled_client_is_shared_per_loop():
+    assert get_async_client() is get_async_client()
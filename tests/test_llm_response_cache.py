@@ -0,0 +1,133 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from runtime.cache import LLMResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMResponseCache(db_path=str(tmp_path / "llm.db"), max_entries=2)
+
+
+def test_memory_lru_and_disk_tier(tmp_path, cache):
+    for key in ("a", "b", "c"):
+        cache.set(key, f"answer {key}")
+
+    # "a" fell out of memory but is still served (and promoted) from disk
+    assert cache.get("a") == "answer a"
+    stats = cache.stats()
+    assert stats["memory_evictions"] >= 1
+    assert stats["disk_hits"] == 1
+    assert stats["memory_entries"] == 2
+
+    # A new process sees the persisted responses
+    reopened = LLMResponseCache(db_path=str(tmp_path / "llm.db"))
+    assert reopened.get("c") == "answer c"
+    assert reopened.get("missing") is None
+    assert reopened.stats()["misses"] == 1
+
+
+def test_expired_entries_are_not_served(cache):
+    cache.set("k", "v", ttl=-1)
+    assert cache.get("k") is None
+    assert cache.stats()["expired"] >= 1
+
+
+def test_disk_tier_is_size_bounded(tmp_path):
+    cache = LLMResponseCache(db_path=str(tmp_path / "llm.db"), max_entries=1, max_disk_bytes=4000)
+    for i in range(50):
+        cache.set(f"k{i}", os.urandom(300).hex())
+    stats = cache.stats()
+    assert stats["disk_evictions"] > 0
+    assert stats["disk_bytes"] <= 4000
+    assert cache.get("k49") is not None
+
+
+def test_concurrent_identical_calls_are_coalesced(cache):
+    calls = []
+
+    def producer():
+        calls.append(1)
+        time.sleep(0.2)
+        return "done"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute("q", producer))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == ["done"] * 8
+    assert len(calls) == 1
+    assert cache.stats()["coalesced"] == 7
+
+
+@pytest.mark.asyncio
+async def test_async_coalescing_and_error_results(cache):
+    calls = []
+
+    async def producer():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return "[AI Unavailable] offline"
+
+    results = await asyncio.gather(*(cache.async_get_or_compute("q", producer) for _ in range(5)))
+    assert len(calls) == 1
+    assert set(results) == {"[AI Unavailable] offline"}
+
+    # Failure placeholders are shared but never cached
+    await cache.async_get_or_compute("q", producer)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_async_path_keeps_disk_io_off_the_loop(tmp_path):
+    cache = LLMResponseCache(db_path=str(tmp_path / "llm.db"), max_entries=1)
+    cache.set("old", "cached answer")
+    cache.set("new", "other")  # pushes "old" out of memory
+    disk_threads = []
+    disk_get, disk_set = cache._disk_get, cache._disk_set
+
+    def tracking_get(*args):
+        disk_threads.append(threading.get_ident())
+        return disk_get(*args)
+
+    def tracking_set(*args):
+        disk_threads.append(threading.get_ident())
+        return disk_set(*args)
+
+    cache._disk_get, cache._disk_set = tracking_get, tracking_set
+
+    async def producer():
+        return "fresh"
+
+    assert await cache.async_get_or_compute("old", producer) == "cached answer"
+    assert await cache.async_get_or_compute("q", producer) == "fresh"
+    # Memory hit: answered on the loop without touching disk
+    calls = len(disk_threads)
+    assert await cache.async_get_or_compute("q", producer) == "fresh"
+    assert len(disk_threads) == calls
+    assert calls == 3 and threading.get_ident() not in disk_threads
+
+
+def test_disk_hits_batch_last_access_updates(tmp_path):
+    cache = LLMResponseCache(db_path=str(tmp_path / "llm.db"), max_entries=1)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    before = cache._conn.execute("SELECT last_access FROM llm_responses WHERE key = 'a'").fetchone()[0]
+
+    time.sleep(0.01)
+    assert cache.get("a") == "1"
+    assert "a" in cache._touched
+    stored = cache._conn.execute("SELECT last_access FROM llm_responses WHERE key = 'a'").fetchone()[0]
+    assert stored == before
+
+    cache.cleanup()
+    assert not cache._touched
+    stored = cache._conn.execute("SELECT last_access FROM llm_responses WHERE key = 'a'").fetchone()[0]
+    assert stored > before
@@ -10,8 +10,8 @@ from modules.llm.adapters import LMStudioAdapter
 
 class TestLMStudioDetection(unittest.TestCase):
     
-    @patch('modules.llm.adapters.requests.get')
-    def test_auto_detection_success(self, mock_get):
+    @patch('modules.llm.adapters.get_http_session')
+    def test_auto_detection_success(self, mock_session):
         """Test successful auto-detection of a preferred model."""
         # Mock API response from /v1/models
         mock_response = MagicMock()
@@ -23,7 +23,7 @@ class TestLMStudioDetection(unittest.TestCase):
                 {"id": "mistral-instruct"}
             ]
         }
-        mock_get.return_value = mock_response
+        mock_session.return_value.get.return_value = mock_response
         
         adapter = LMStudioAdapter(model="auto")
         detected = adapter._auto_select_model()
@@ -31,8 +31,8 @@ class TestLMStudioDetection(unittest.TestCase):
         print(f"Detected: {detected}")
         self.assertEqual(detected, "TheBloke/OpenBioLLM-Llama3-8B-GGUF")
         
-    @patch('modules.llm.adapters.requests.get')
-    def test_auto_detection_fallback(self, mock_get):
+    @patch('modules.llm.adapters.get_http_session')
+    def test_auto_detection_fallback(self, mock_session):
         """Test fallback to first available if no preferred model found."""
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -42,7 +42,7 @@ class TestLMStudioDetection(unittest.TestCase):
                 {"id": "another-model"}
             ]
         }
-        mock_get.return_value = mock_response
+        mock_session.return_value.get.return_value = mock_response
         
         adapter = LMStudioAdapter(model="auto")
         detected = adapter._auto_select_model()
@@ -50,10 +50,10 @@ class TestLMStudioDetection(unittest.TestCase):
         print(f"Fallbacked to: {detected}")
         self.assertEqual(detected, "random-model-v1")
 
-    @patch('modules.llm.adapters.requests.get')
-    def test_detection_failure(self, mock_get):
+    @patch('modules.llm.adapters.get_http_session')
+    def test_detection_failure(self, mock_session):
         """Test graceful failure when API is down."""
-        mock_get.side_effect = Exception("Connection Refused")
+        mock_session.return_value.get.side_effect = Exception("Connection Refused")
         
         adapter = LMStudioAdapter(model="auto")
         detected = adapter._auto_select_model()
@@ -0,0 +1,139 @@
+import asyncio
+import json
+
+import pytest
+
+from modules.multi_task.multi_task_scheduler import MultiTaskScheduler, TaskStatus
+
+
+class _Gate:
+    """Task logic that blocks until released, recording start order."""
+
+    def __init__(self):
+        self.started = []
+        self.events = {}
+
+    async def __call__(self, task):
+        self.started.append(task.id)
+        event = self.events.setdefault(task.id, asyncio.Event())
+        await event.wait()
+        return {"done": task.id}
+
+    def release(self, task_id):
+        self.events.setdefault(task_id, asyncio.Event()).set()
+
+
+def _scheduler(tmp_path, gate=None, **kwargs):
+    scheduler = MultiTaskScheduler(persistence_path=str(tmp_path / "state.json"), **kwargs)
+    if gate is not None:
+        scheduler._execute_task_logic = gate
+    return scheduler
+
+
+@pytest.mark.asyncio
+async def test_priority_and_dependency_dispatch(tmp_path):
+    gate = _Gate()
+    scheduler = _scheduler(tmp_path, gate, max_parallel_tasks=2)
+    await scheduler.add_task("load", "Load", "", priority=5)
+    await scheduler.add_task("fit", "Fit", "", priority=0, dependencies=["load"])
+    await scheduler.add_task("report", "Report", "", priority=9, dependencies=["fit", "load"])
+    await scheduler.add_task("side", "Side", "", priority=1)
+
+    await scheduler.start_next_tasks()
+    await asyncio.sleep(0)
+    assert gate.started == ["side", "load"]
+
+    gate.release("load")
+    await asyncio.sleep(0.01)
+    assert gate.started[-1] == "fit"
+    assert "report" in scheduler.queued_tasks
+
+    gate.release("fit")
+    await asyncio.sleep(0.01)
+    assert gate.started[-1] == "report"
+    assert scheduler.completed_tasks["fit"].status == TaskStatus.COMPLETED
+    gate.release("side")
+    gate.release("report")
+    await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_journal_replay_restores_state(tmp_path):
+    gate = _Gate()
+    scheduler = _scheduler(tmp_path, gate, max_parallel_tasks=1)
+    for i in range(3):
+        await scheduler.add_task(f"t{i}", f"Task {i}", "", priority=i)
+    await scheduler.start_next_tasks()
+    for p in range(10):
+        await scheduler.update_task_progress("t0", p * 10.0)
+    await scheduler.cancel_task("t2")
+
+    # Nothing rewrote the snapshot; every change went to the journal
+    assert not scheduler.persistence_path.exists()
+    records = [json.loads(l) for l in scheduler.journal_path.read_text().splitlines()]
+    assert len(records) == 3 + 1 + 10 + 1
+
+    restored = _scheduler(tmp_path)
+    await restored.load_state()
+    # The running task is re-queued ahead of t1; the cancelled one is history
+    assert [t.id for t in restored.task_queue] == ["t0", "t1"]
+    assert restored.queued_tasks["t0"].progress == 90.0
+    assert restored.completed_tasks["t2"].status == TaskStatus.CANCELLED
+    assert restored.journal_path.read_text() == ""
+    gate.release("t0")
+    await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_retention_and_compaction(tmp_path):
+    scheduler = _scheduler(tmp_path, completed_retention=3, journal_compact_every=20)
+
+    async def instant(task):
+        return {}
+
+    scheduler._execute_task_logic = instant
+    await scheduler.add_task("base", "Base", "")
+    for i in range(10):
+        await scheduler.add_task(f"t{i}", "", "")
+    await scheduler.start_next_tasks()
+    while scheduler.queued_tasks or scheduler.running_tasks:
+        await asyncio.sleep(0.01)
+
+    assert len(scheduler.completed_tasks) == 3
+    assert (await scheduler.get_queue_status())["completed"] == 11
+
+    # Retained history satisfies dependencies; nothing else is kept per finished task
+    await scheduler.add_task("late", "", "", dependencies=["t9"])
+    assert scheduler._indegree["late"] == 0
+    assert scheduler.persistence_path.exists()
+    assert len(scheduler.journal_path.read_text().splitlines()) < 20
+
+    await scheduler.save_state()
+    state = json.loads(scheduler.persistence_path.read_text())
+    assert "finished_ids" not in state and state["finished_count"] == 11
+    restored = _scheduler(tmp_path, completed_retention=3)
+    await restored.load_state()
+    assert (await restored.get_queue_status())["completed"] == 11
+    assert restored._indegree["late"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancel_cascades_to_dependents(tmp_path):
+    gate = _Gate()
+    scheduler = _scheduler(tmp_path, gate, max_parallel_tasks=1)
+    await scheduler.add_task("load", "Load", "")
+    await scheduler.add_task("fit", "Fit", "", dependencies=["load"])
+    await scheduler.add_task("report", "Report", "", dependencies=["fit"])
+    await scheduler.add_task("other", "Other", "")
+
+    assert await scheduler.cancel_task("load")
+
+    assert list(scheduler.queued_tasks) == ["other"]
+    assert scheduler.completed_tasks["report"].status == TaskStatus.CANCELLED
+    assert "fit" in scheduler.completed_tasks["report"].error
+    status = await scheduler.get_queue_status()
+    assert status["queued"] == 1 and status["ready"] == 1
+
+    restored = _scheduler(tmp_path)
+    await restored.load_state()
+    assert list(restored.queued_tasks) == ["other"]
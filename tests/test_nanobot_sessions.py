@@ -0,0 +1,80 @@
+import json
+
+from nanobot.session.manager import SessionManager
+
+
+def _manager(tmp_path, **kwargs):
+    kwargs.setdefault("compact_interval", None)
+    return SessionManager(tmp_path, sessions_dir=tmp_path / "sessions", **kwargs)
+
+
+def test_saves_append_and_reload_tail(tmp_path):
+    manager = _manager(tmp_path, memory_window=10)
+    session = manager.get_or_create("telegram:42")
+    path = manager._get_session_path("telegram:42")
+
+    for i in range(25):
+        session.add_message("user", f"m{i}")
+        manager.save(session)
+        if i == 0:
+            first_save = path.read_bytes()
+
+    # Earlier bytes are never rewritten
+    assert path.read_bytes().startswith(first_save)
+    assert len(session.messages) == 10
+    assert session.total_messages == 25
+
+    reloaded = _manager(tmp_path, memory_window=10).get_or_create("telegram:42")
+    assert [m["content"] for m in reloaded.messages] == [f"m{i}" for i in range(15, 25)]
+    assert reloaded.total_messages == 25
+    assert reloaded.get_history(3) == [{"role": "user", "content": f"m{i}"} for i in (22, 23, 24)]
+
+
+def test_clear_metadata_and_compaction(tmp_path):
+    manager = _manager(tmp_path)
+    session = manager.get_or_create("discord:7")
+    for i in range(50):
+        session.add_message("user", "x" * 100)
+    manager.save(session)
+
+    session.clear()
+    session.metadata["topic"] = "aspirin"
+    session.add_message("user", "fresh start")
+    manager.save(session)
+
+    path = manager._get_session_path("discord:7")
+    size_before = path.stat().st_size
+    assert manager.compact("discord:7", min_dead_bytes=0)
+    assert path.stat().st_size < size_before
+
+    lines = [json.loads(l) for l in path.read_text().splitlines()]
+    assert lines[0]["_type"] == "metadata" and lines[0]["metadata"] == {"topic": "aspirin"}
+    assert [l["content"] for l in lines[1:]] == ["fresh start"]
+
+    reloaded = _manager(tmp_path).get_or_create("discord:7")
+    assert reloaded.metadata == {"topic": "aspirin"}
+    assert [m["content"] for m in reloaded.messages] == ["fresh start"]
+
+
+def test_legacy_files_and_torn_writes(tmp_path):
+    manager = _manager(tmp_path)
+    path = manager._get_session_path("cli:old")
+    legacy = [{"_type": "metadata", "created_at": "2025-01-01T00:00:00", "metadata": {}}]
+    legacy += [{"role": "user", "content": f"old {i}", "timestamp": "2025-01-01T00:00:00"} for i in range(3)]
+    path.write_text("".join(json.dumps(l) + "\n" for l in legacy) + '{"role": "us')
+
+    session = manager.get_or_create("cli:old")
+    assert [m["content"] for m in session.messages] == ["old 0", "old 1", "old 2"]
+
+    session.add_message("assistant", "new")
+    manager.save(session)
+    reloaded = _manager(tmp_path).get_or_create("cli:old")
+    assert [m["content"] for m in reloaded.messages][-2:] == ["old 2", "new"]
+
+
+def test_cache_is_lru_bounded(tmp_path):
+    manager = _manager(tmp_path, max_cached_sessions=3)
+    for i in range(10):
+        manager.save(manager.get_or_create(f"chat:{i}"))
+    assert list(manager._cache) == ["chat:7", "chat:8", "chat:9"]
+    assert len(manager.list_sessions()) == 10
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.statistics.grouped_nca import GroupedNCA
+from modules.statistics.pkpd_analysis import PKPDAnalysis
+
+TIMES = np.array([0, 0.5, 1, 2, 4, 8, 12, 24])
+
+
+def _study(n_subjects, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for s in range(n_subjects):
+        ka, ke = rng.uniform(0.5, 2), rng.uniform(0.05, 0.3)
+        conc = 100 * (np.exp(-ke * TIMES) - np.exp(-ka * TIMES)) * rng.lognormal(0, 0.1, len(TIMES))
+        # Rows arrive shuffled; the engine sorts them itself
+        for i in rng.permutation(len(TIMES)):
+            rows.append((f"S{s}", TIMES[i], max(conc[i], 0.0)))
+    return pd.DataFrame(rows, columns=["subject_id", "time", "concentration"])
+
+
+def _per_subject(df, analysis, **kwargs):
+    results = []
+    for subject_id in df["subject_id"].unique():
+        subject = df[df["subject_id"] == subject_id].drop(columns="subject_id")
+        pkpd = PKPDAnalysis(subject, dose=100, route="IV", tau=12)
+        results.append(getattr(pkpd, analysis)(**kwargs).parameters)
+    return pd.DataFrame(results)
+
+
+def test_pk_parameters_match_single_subject_analysis():
+    df = _study(30)
+    grouped = GroupedNCA(df).pk_parameters(dose=100, route="IV", tau=12)
+    expected = _per_subject(df, "pk_parameter_estimation")
+
+    assert list(grouped["subject_id"]) == list(df["subject_id"].unique())
+    for col in expected.columns:
+        np.testing.assert_allclose(grouped[col], expected[col], rtol=1e-9, err_msg=col)
+
+
+def test_interpolated_peak_log_auc_and_terminal_fit():
+    df = _study(30, seed=1)
+    engine = GroupedNCA(df)
+
+    cmax, tmax = engine.cmax_tmax(interpolation=True)
+    expected = _per_subject(df, "calculate_cmax_tmax")
+    np.testing.assert_allclose(cmax, expected["Cmax"], rtol=1e-9)
+    np.testing.assert_allclose(tmax, expected["Tmax"], rtol=1e-9)
+
+    expected = _per_subject(df, "calculate_auc", method="log")
+    np.testing.assert_allclose(engine.auc("log"), expected["AUC0-t"], rtol=1e-9)
+
+    terminal = engine.lambda_z(timepoints=3)
+    expected = _per_subject(df, "estimate_half_life", lambda_z_timepoints=3)
+    np.testing.assert_allclose(terminal["lambda_z"], expected["lambda_z"], rtol=1e-9)
+    np.testing.assert_allclose(terminal["r_squared"], expected["R_squared"], rtol=1e-9)
+
+
+def test_multiple_subject_methods_skip_short_profiles():
+    df = pd.concat([
+        _study(5),
+        pd.DataFrame({"subject_id": ["short", "short"], "time": [0, 1], "concentration": [0, 3.0]}),
+    ])
+    pkpd = PKPDAnalysis(df, dose=100, route="EV")
+
+    result = pkpd.non_compartmental_analysis()
+    assert "Multiple Subjects" in result.method
+    assert any("short" in w for w in result.warnings)
+    assert pkpd.calculate_auc().parameters["mean_AUC0-t"] > 0
+    assert pkpd.pk_summary_statistics().parameters["N_subjects"] == 5
+
+
+def test_no_valid_subjects_raises():
+    df = pd.DataFrame({
+        "subject_id": ["a", "a", "b", "b"],
+        "time": [0, 1, 0, 1],
+        "concentration": [0, 1.0, 0, 2.0],
+    })
+    with pytest.raises(ValueError):
+        PKPDAnalysis(df, dose=100).non_compartmental_analysis()
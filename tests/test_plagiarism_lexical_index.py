@@ -0,0 +1,126 @@
+from modules.compliance.lexical_index import LexicalIndex
+from modules.rag.metadata_store import ChunkMetadataStore
+
+KB = [
+    "Metformin activates AMPK and reduces hepatic gluconeogenesis in type 2 diabetes.",
+    "Donepezil inhibits acetylcholinesterase and is used in Alzheimer disease.",
+    "Paclitaxel stabilises microtubules and arrests mitosis in breast cancer cells.",
+]
+
+
+def _store(tmp_path, texts):
+    store = ChunkMetadataStore(str(tmp_path / "metadata.db"))
+    store.add(range(len(texts)), [{"text": t, "source": f"paper-{i}"} for i, t in enumerate(texts)])
+    return store
+
+
+def test_best_matches_finds_copied_chunk(tmp_path):
+    index = LexicalIndex(_store(tmp_path, KB), str(tmp_path / "lexical"))
+
+    matches = index.best_matches([KB[1], "Completely unrelated sentence about weather patterns."])
+    assert matches[0][1] == 1
+    assert matches[0][0] > 0.99
+    assert matches[1] == (0.0, -1)
+
+
+def test_appends_without_refit_and_reloads(tmp_path):
+    store = _store(tmp_path, KB)
+    index = LexicalIndex(store, str(tmp_path / "lexical"), refit_growth=2.0)
+    index.refresh()
+    vocabulary = dict(index.vectorizer.vocabulary_)
+
+    store.add([3], [{"text": "Donepezil improves cognition in Alzheimer disease patients."}])
+    index.refresh()
+    assert index.size == 4
+    assert index.vectorizer.vocabulary_ == vocabulary
+
+    reloaded = LexicalIndex(store, str(tmp_path / "lexical"))
+    assert reloaded.size == 4
+    assert reloaded.best_matches([KB[2]])[0][1] == 2
+
+
+def test_refits_after_delete(tmp_path):
+    store = _store(tmp_path, KB)
+    index = LexicalIndex(store, str(tmp_path / "lexical"))
+    index.refresh()
+
+    store.delete([2])
+    score, vector_id = index.best_matches([KB[2]])[0]
+    assert index.size == 2
+    assert vector_id != 2
+
+
+def test_deletes_drop_rows_without_refit_until_threshold(tmp_path):
+    texts = KB + [f"Filler chunk number {i} about assay reproducibility." for i in range(5)]
+    store = _store(tmp_path, texts)
+    index = LexicalIndex(store, str(tmp_path / "lexical"), refit_removed=0.25)
+    index.refresh()
+    vectorizer = index.vectorizer
+
+    store.delete([3])
+    store.delete([4])
+    assert index.best_matches([KB[0]])[0][1] == 0
+    assert index.vectorizer is vectorizer
+    assert 3 not in index.ids.tolist() and index.size == 6
+
+    store.delete([5])
+    index.refresh()
+    assert index.vectorizer is not vectorizer
+    assert index.removed_since_fit == 0 and index.size == 5
+
+
+def test_incremental_updates_append_segments_until_compaction(tmp_path):
+    texts = KB + [f"Filler chunk number {i} about assay reproducibility." for i in range(5)]
+    store = _store(tmp_path, texts)
+    storage = tmp_path / "lexical"
+    index = LexicalIndex(store, str(storage), refit_growth=10.0, compact_segments=3)
+    index.refresh()
+    base = (storage / "matrix.npz").stat().st_mtime_ns
+
+    store.add([8], [{"text": "Donepezil improves cognition in Alzheimer disease patients."}])
+    index.refresh()
+    store.delete([4])
+    index.refresh()
+    assert (storage / "matrix.npz").stat().st_mtime_ns == base
+    assert len(list(storage.glob("delta-*.npz"))) == 2
+
+    reloaded = LexicalIndex(store, str(storage))
+    assert reloaded.ids.tolist() == index.ids.tolist()
+    assert (reloaded.matrix != index.matrix).nnz == 0
+    assert reloaded.removed_since_fit == 1 and reloaded.max_id == 8
+
+    store.add([9], [{"text": "Paclitaxel resistance involves tubulin isotype switching."}])
+    index.refresh()
+    assert not list(storage.glob("delta-*.npz"))
+    reloaded = LexicalIndex(store, str(storage))
+    assert reloaded.ids.tolist() == index.ids.tolist()
+    assert reloaded.best_matches([KB[2]])[0][1] == 2
+
+
+class _FakeVectorStore:
+    def __init__(self, metadata, hits):
+        self.metadata = metadata
+        self._hits = hits
+
+    async def search_many(self, queries, k=5):
+        return [self._hits(q) for q in queries]
+
+
+async def test_check_content_flags_semantic_paraphrase(tmp_path):
+    from modules.compliance.plagiarism import PlagiarismChecker
+
+    store = _store(tmp_path, KB)
+    checker = PlagiarismChecker.__new__(PlagiarismChecker)
+    checker.lexical_index = LexicalIndex(store, str(tmp_path / "lexical"))
+    # The paraphrase shares no indexed terms with KB[2], but its embedding is close
+    checker.vector_store = _FakeVectorStore(store, lambda q: [{"id": 2, "score": 0.1, "metadata": {}, "text": KB[2]}])
+
+    report = await checker.check_content("Taxane drug freezes spindle assembly, halting tumour growth.")
+
+    assert report["status"] == "FLAGGED"
+    assert report["flagged_sections"][0]["match"] == "semantic"
+    assert report["flagged_sections"][0]["source"] == "paper-2"
+
+    copied = await checker.check_content(KB[1])
+    assert copied["status"] == "BLOCKED"
+    assert copied["flagged_sections"][0]["match"] == "lexical"
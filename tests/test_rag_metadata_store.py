@@ -0,0 +1,39 @@
+from modules.rag.metadata_store import ChunkMetadataStore
+
+
+def test_add_and_get_many(tmp_path):
+    store = ChunkMetadataStore(str(tmp_path / "metadata.db"))
+    store.add([0, 1, 2], [
+        {"text": "alpha", "document_id": "doc-1", "source": "a.pdf"},
+        {"text": "beta", "document_id": "doc-1"},
+        {"text": "gamma", "id": "paper-9"},
+    ])
+
+    hits = store.get_many([2, 0, -1, 42])
+    assert set(hits) == {0, 2}
+    assert hits[0] == {"document_id": "doc-1", "source": "a.pdf", "text": "alpha"}
+    assert "text" not in store.get(1, include_text=False)
+    assert store.count() == 3
+
+
+def test_ids_for_document_and_delete(tmp_path):
+    store = ChunkMetadataStore(str(tmp_path / "metadata.db"))
+    store.add([0, 1, 2], [
+        {"text": "a", "document_id": "doc-1"},
+        {"text": "b", "document_id": "doc-2"},
+        {"text": "c", "id": "doc-1"},
+    ])
+
+    doomed = store.ids_for_document("doc-1")
+    assert sorted(doomed) == [0, 2]
+    assert store.delete(doomed) == 2
+    assert store.get_many([0, 1, 2]).keys() == {1}
+
+
+def test_persists_across_connections(tmp_path):
+    path = str(tmp_path / "metadata.db")
+    store = ChunkMetadataStore(path)
+    store.add([7], [{"text": "persisted"}])
+    store.close()
+
+    assert ChunkMetadataStore(path).get(7)["text"] == "persisted"
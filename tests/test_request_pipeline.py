@@ -0,0 +1,108 @@
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.middleware import AuditLog, RequestPipeline, ResourceGuard, TokenBucketLimiter
+
+ORIGINS = ["http://localhost:3000"]
+
+
+def make_client(limiter=None, guard=None, audit=None, max_body_size=1024):
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    def get_item(item_id: int):
+        return {"id": item_id}
+
+    @app.post("/items")
+    def create_item():
+        return {"ok": True}
+
+    @app.get("/health")
+    def health():
+        return {"status": "ok"}
+
+    app.add_middleware(
+        RequestPipeline,
+        allowed_origins=ORIGINS,
+        limiter=limiter,
+        resource_guard=guard,
+        audit=audit,
+        max_body_size=max_body_size,
+        resource_exempt_paths=["/health"],
+    )
+    return TestClient(app)
+
+
+def test_token_bucket_allows_burst_then_refills():
+    limiter = TokenBucketLimiter(rate_per_minute=60, burst=3)
+    assert [limiter.allow("a", now=0.0) for _ in range(4)] == [True, True, True, False]
+    assert limiter.allow("b", now=0.0)  # buckets are per client
+    assert not limiter.allow("a", now=0.5)
+    assert limiter.allow("a", now=1.5)
+
+
+def test_token_bucket_memory_is_bounded():
+    limiter = TokenBucketLimiter(rate_per_minute=60, max_clients=100)
+    for i in range(1000):
+        limiter.allow(f"10.0.{i // 256}.{i % 256}", now=0.0)
+    assert len(limiter) == 100
+
+
+def test_resource_guard_samples_once_per_interval():
+    samples = []
+
+    def sampler():
+        samples.append(1)
+        return 99.0
+
+    guard = ResourceGuard(max_memory_percent=95.0, interval=1.0, sampler=sampler)
+    assert all(guard.overloaded(now=10.0 + i / 1000) for i in range(500))
+    assert len(samples) == 1
+    guard.overloaded(now=11.5)
+    assert len(samples) == 2
+
+
+def test_security_headers_on_every_response():
+    client = make_client(limiter=TokenBucketLimiter(rate_per_minute=60, burst=1))
+
+    ok = client.get("/items/1")
+    limited = client.get("/items/1")
+
+    assert ok.status_code == 200
+    assert limited.status_code == 429
+    for response in (ok, limited):
+        assert response.headers["X-Frame-Options"] == "DENY"
+        assert "default-src 'self'" in response.headers["Content-Security-Policy"]
+
+
+def test_rejections():
+    client = make_client(guard=ResourceGuard(sampler=lambda: 99.0))
+
+    assert client.get("/items/1").status_code == 503
+    assert client.get("/health").status_code == 200
+
+    client = make_client()
+    assert client.post("/items", content=b"x" * 2048).status_code == 413
+    assert client.post("/items", headers={"Origin": "https://evil.example"}).status_code == 403
+    assert client.post("/items", headers={"Origin": "http://localhost:3000"}).status_code == 200
+    assert client.post("/items").status_code == 200  # non-browser clients send no Origin
+
+
+def test_audit_records_are_batched(caplog):
+    audit = AuditLog(logging.getLogger("test.audit"), flush_interval=60)
+    client = make_client(audit=audit)
+
+    with caplog.at_level(logging.INFO, logger="test.audit"):
+        client.get("/items/7")
+        client.get("/missing")
+        # Other loggers (httpx) may also log at INFO once api.main set up logging
+        assert [r for r in caplog.records if r.name == "test.audit"] == []  # nothing written on the request path
+        audit.close()
+
+    records = [r for r in caplog.records if r.name == "test.audit"]
+    lines = [r.getMessage() for r in records]
+    assert len(lines) == 2
+    assert '"path": "/items/7"' in lines[0] and '"status_code": 200' in lines[0]
+    assert records[1].levelno == logging.WARNING
@@ -0,0 +1,130 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.statistics.dataset_registry import DatasetRegistry
+from modules.statistics.orchestrator import StatisticsOrchestrator
+
+
+def _frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"group": rng.choice(["a", "b"], n), "value": rng.normal(size=n)})
+
+
+def test_sessions_are_isolated(tmp_path):
+    registry = DatasetRegistry(storage_dir=str(tmp_path))
+    alice = registry.register(_frame(10), {"source": "a.csv"}, session_id="alice")
+    bob = registry.register(_frame(20), session_id="bob")
+
+    assert registry.latest("alice") == alice
+    assert registry.latest("bob") == bob
+    assert len(registry.get(alice, "alice")) == 10
+    assert registry.get_metadata(alice, "alice") == {"source": "a.csv"}
+    with pytest.raises(KeyError):
+        registry.get(alice, "bob")
+    assert not registry.drop(alice, "bob")
+
+
+def test_lru_spill_and_reload(tmp_path):
+    size = _frame(5000).memory_usage(deep=True).sum()
+    registry = DatasetRegistry(storage_dir=str(tmp_path), memory_budget_mb=2.5 * size / (1024 * 1024))
+
+    ids = [registry.register(_frame(5000, seed=i), session_id="s") for i in range(3)]
+    stats = registry.stats()
+    assert stats["in_memory"] == 2
+    assert stats["spills"] == 1
+    assert stats["resident_mb"] <= stats["memory_budget_mb"]
+
+    # The oldest dataset was spilled and comes back unchanged
+    restored = registry.get(ids[0], "s")
+    pd.testing.assert_frame_equal(restored, _frame(5000, seed=0))
+    assert registry.stats()["loads"] == 1
+    assert registry.stats()["in_memory"] == 2
+
+
+def test_spilled_datasets_survive_restart(tmp_path):
+    registry = DatasetRegistry(storage_dir=str(tmp_path), memory_budget_mb=0)
+    dataset_id = registry.register(_frame(100), {"rows": 100}, session_id="s")
+    registry.register(_frame(50), session_id="s")
+
+    reopened = DatasetRegistry(storage_dir=str(tmp_path))
+    assert len(reopened.get(dataset_id, "s")) == 100
+    assert reopened.get_metadata(dataset_id, "s") == {"rows": 100}
+
+
+def test_session_cap_drops_least_recent(tmp_path):
+    registry = DatasetRegistry(storage_dir=str(tmp_path), max_datasets_per_session=2)
+    first = registry.register(_frame(5), session_id="s")
+    second = registry.register(_frame(5), session_id="s")
+    registry.get(first, "s")
+    registry.register(_frame(5), session_id="s")
+
+    remaining = {d["dataset_id"] for d in registry.list("s")}
+    assert first in remaining
+    assert second not in remaining
+
+
+def test_orchestrator_analyses_reference_datasets(tmp_path):
+    orchestrator = StatisticsOrchestrator(registry=DatasetRegistry(storage_dir=str(tmp_path)))
+    small = orchestrator.registry.register(_frame(10), session_id="alice")
+    large = orchestrator.registry.register(_frame(30), session_id="bob")
+
+    with orchestrator.use_dataset(session_id="alice"):
+        assert orchestrator.current_dataset_id == small
+        assert orchestrator.get_data_summary()["shape"] == (10, 2)
+    with orchestrator.use_dataset(large, session_id="bob"):
+        assert orchestrator.get_data_summary()["shape"] == (30, 2)
+    with orchestrator.use_dataset(large, session_id="alice"):
+        assert orchestrator.current_data is None
+
+
+def test_idle_sessions_expire_with_their_spill_files(tmp_path):
+    registry = DatasetRegistry(storage_dir=str(tmp_path), memory_budget_mb=0, session_ttl=3600)
+    idle = registry.register(_frame(10), session_id="idle")
+    active = registry.register(_frame(10), session_id="active")
+    registry.register(_frame(5), session_id="active")  # spills `active` to disk
+    spilled = registry._entries[idle].path
+    assert os.path.exists(spilled)
+
+    registry._entries[idle].last_access -= 7200
+    registry._write_entry(registry._entries[idle])
+
+    # Expiry also applies to datasets restored from the catalog after a restart
+    reopened = DatasetRegistry(storage_dir=str(tmp_path), session_ttl=3600)
+    assert reopened.list("idle") == []
+    assert not os.path.exists(spilled)
+    assert len(reopened.get(active, "active")) == 10
+    assert reopened.stats()["expired"] == 1
+
+
+def test_total_size_cap_evicts_least_recent_across_sessions(tmp_path):
+    size = _frame(2000).memory_usage(deep=True).sum()
+    registry = DatasetRegistry(
+        storage_dir=str(tmp_path), memory_budget_mb=0, max_total_mb=2.5 * size / (1024 * 1024)
+    )
+    first = registry.register(_frame(2000, seed=1), session_id="a")
+    second = registry.register(_frame(2000, seed=2), session_id="b")
+    registry.get(first, "a")
+    third = registry.register(_frame(2000, seed=3), session_id="c")
+
+    assert {d["dataset_id"] for s in "abc" for d in registry.list(s)} == {first, third}
+    assert not any(name.startswith(second) for name in os.listdir(tmp_path))
+    assert registry.stats()["evicted"] == 1
+    assert registry.stats()["total_mb"] <= registry.stats()["max_total_mb"]
+
+
+def test_inline_frames_are_not_registered(tmp_path):
+    orchestrator = StatisticsOrchestrator(
+        registry=DatasetRegistry(storage_dir=str(tmp_path), max_datasets_per_session=2)
+    )
+    imported = orchestrator.registry.register(_frame(10), session_id="s")
+
+    with orchestrator.use_dataset(session_id="s"):
+        for _ in range(5):
+            with orchestrator.use_frame(_frame(40), {"rows": 40}):
+                assert orchestrator.get_data_summary()["shape"] == (40, 2)
+        assert orchestrator.current_dataset_id == imported
+
+    assert [d["dataset_id"] for d in orchestrator.registry.list("s")] == [imported]
@@ -0,0 +1,116 @@
+import asyncio
+import time
+
+import pytest
+
+from modules.statistics.executor import AnalysisExecutor, AnalysisTimeout, ExecutorSaturated
+
+
+@pytest.mark.asyncio
+async def test_process_pool_runs_analysis_off_loop():
+    executor = AnalysisExecutor(max_workers=2)
+    try:
+        assert await executor.run_process(pow, 2, 10) == 1024
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.02)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        await executor.run_process(time.sleep, 0.5)
+        task.cancel()
+        # The loop kept serving while the worker slept
+        assert ticks >= 10
+
+        metrics = executor.metrics()['process']
+        assert metrics['completed'] == 2
+        assert metrics['running'] == 0
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_timeout_keeps_slot_until_worker_finishes():
+    executor = AnalysisExecutor(max_workers=1)
+    try:
+        with pytest.raises(AnalysisTimeout):
+            await executor.run_session(time.sleep, 0.4, timeout=0.1)
+
+        metrics = executor.metrics()['session']
+        assert metrics['timed_out'] == 1
+        assert metrics['running'] == 1
+
+        # Next call waits for the sleeping job rather than oversubscribing
+        start = time.monotonic()
+        assert await executor.run_session(sum, [1, 2, 3]) == 6
+        assert time.monotonic() - start >= 0.2
+        assert executor.metrics()['session']['running'] == 0
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_queue_bound_and_cancellation():
+    executor = AnalysisExecutor(max_workers=1, max_queue=1)
+    try:
+        running = asyncio.create_task(executor.run_session(time.sleep, 0.3))
+        await asyncio.sleep(0.05)
+        waiting = asyncio.create_task(executor.run_session(sum, [1]))
+        await asyncio.sleep(0.05)
+        assert executor.metrics()['session']['queued'] == 1
+
+        with pytest.raises(ExecutorSaturated):
+            await executor.run_session(sum, [2])
+
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        await running
+
+        metrics = executor.metrics()['session']
+        assert metrics['rejected'] == 1
+        assert metrics['cancelled'] == 1
+        assert metrics['completed'] == 1
+        assert metrics['queued'] == 0
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_sessions_run_concurrently_but_each_stays_ordered():
+    executor = AnalysisExecutor(max_workers=1, max_sessions=2)
+    try:
+        order = []
+
+        def step(tag, delay):
+            time.sleep(delay)
+            order.append(tag)
+
+        start = time.monotonic()
+        await asyncio.gather(
+            executor.run_session(step, 'a1', 0.3, session_key='alice'),
+            executor.run_session(step, 'a2', 0.0, session_key='alice'),
+            executor.run_session(step, 'b1', 0.3, session_key='bob'),
+        )
+        # Alice's second call waited for her first; Bob did not wait for Alice
+        assert order.index('a1') < order.index('a2')
+        assert time.monotonic() - start < 0.55
+
+        # A third session retires the least recently used idle lane
+        assert await executor.run_session(sum, [1, 2], session_key='carol') == 3
+        metrics = executor.metrics()['session']
+        assert metrics['sessions'] == 2
+        assert metrics['completed'] == 4
+
+        blocker = asyncio.create_task(executor.run_session(time.sleep, 0.3, session_key='bob'))
+        other = asyncio.create_task(executor.run_session(time.sleep, 0.3, session_key='carol'))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ExecutorSaturated):
+            await executor.run_session(sum, [1], session_key='dave')
+        await asyncio.gather(blocker, other)
+    finally:
+        executor.shutdown()
@@ -0,0 +1,66 @@
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.routes import statistics as stats_routes
+from modules.statistics.dataset_registry import DatasetRegistry
+from modules.statistics.orchestrator import StatisticsOrchestrator
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    orchestrator = StatisticsOrchestrator(registry=DatasetRegistry(storage_dir=str(tmp_path)))
+    monkeypatch.setattr(stats_routes, "_statistics_orchestrator", orchestrator)
+    app = FastAPI()
+    app.include_router(stats_routes.router)
+    return orchestrator, app
+
+
+def test_clients_without_header_get_their_own_session(client):
+    orchestrator, app = client
+    alice, bob = TestClient(app), TestClient(app)
+
+    alice_id = alice.get("/api/statistics/datasets").headers["X-Session-ID"]
+    bob_id = bob.get("/api/statistics/datasets").headers["X-Session-ID"]
+    assert alice_id != bob_id
+
+    orchestrator.registry.register(pd.DataFrame({"x": [1, 2]}), session_id=alice_id)
+    assert len(alice.get("/api/statistics/datasets").json()["datasets"]) == 1
+    assert bob.get("/api/statistics/datasets").json()["datasets"] == []
+
+    # An explicit header wins over the cookie
+    listed = bob.get("/api/statistics/datasets", headers={"X-Session-ID": alice_id}).json()
+    assert listed["session_id"] == alice_id
+
+
+def test_clear_data_drops_every_dataset_in_the_session(client):
+    orchestrator, app = client
+    api = TestClient(app)
+    headers = {"X-Session-ID": "s1"}
+    for _ in range(3):
+        orchestrator.registry.register(pd.DataFrame({"x": [1]}), session_id="s1")
+    kept = orchestrator.registry.register(pd.DataFrame({"x": [1]}), session_id="s2")
+
+    response = api.delete("/api/statistics/clear-data", headers=headers)
+
+    assert response.json()["datasets_removed"] == 3
+    assert orchestrator.registry.list("s1") == []
+    assert [d["dataset_id"] for d in orchestrator.registry.list("s2")] == [kept]
+
+
+def test_generic_analysis_leaves_imported_datasets_alone(client):
+    orchestrator, app = client
+    api = TestClient(app)
+    headers = {"X-Session-ID": "s1"}
+    imported = orchestrator.registry.register(pd.DataFrame({"x": [1.0, 2.0]}), session_id="s1")
+    payload = {
+        "analysisType": "descriptive_statistics",
+        "data": [{"x": float(i)} for i in range(10)],
+        "parameters": {"columns": ["x"]},
+    }
+
+    for _ in range(orchestrator.registry.max_datasets_per_session + 1):
+        assert api.post("/api/statistics/analyze", json=payload, headers=headers).status_code == 200
+
+    assert [d["dataset_id"] for d in orchestrator.registry.list("s1")] == [imported]
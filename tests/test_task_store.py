@@ -54,3 +54,69 @@ async def test_list_tasks(task_store):
     assert len(tasks) == 2
     assert tasks[0]["task_id"] == "t2" # Most recent first
     assert tasks[1]["task_id"] == "t1"
+
+@pytest.mark.asyncio
+async def test_log_paging_and_tail(task_store):
+    """Logs are stored incrementally and can be paged or tailed."""
+    await task_store.create_task("task_4")
+    for i in range(1000):
+        await task_store.append_log("task_4", f"line {i}")
+    assert await task_store.append_logs("task_4", ["batch a", "batch b"]) == 2
+
+    assert await task_store.count_logs("task_4") == 1002
+    assert await task_store.get_logs("task_4", offset=10, limit=3) == ["line 10", "line 11", "line 12"]
+    assert await task_store.tail_logs("task_4", 2) == ["batch a", "batch b"]
+
+    fetched = await task_store.get_task("task_4", log_limit=1)
+    assert fetched["logs"] == ["batch b"]
+    assert not await task_store.append_log("missing", "nope")
+
+@pytest.mark.asyncio
+async def test_logs_since_and_stream(task_store):
+    """Cursor queries return only new entries; streaming stops when the task finishes."""
+    await task_store.create_task("task_5")
+    await task_store.append_logs("task_5", ["a", "b"])
+
+    entries = await task_store.get_logs_since("task_5")
+    assert [e["message"] for e in entries] == ["a", "b"]
+    await task_store.append_log("task_5", "c")
+    newer = await task_store.get_logs_since("task_5", after_id=entries[-1]["id"])
+    assert [e["message"] for e in newer] == ["c"]
+
+    async def finish():
+        await asyncio.sleep(0.05)
+        await task_store.append_log("task_5", "d")
+        await task_store.update_task("task_5", status="completed")
+
+    finisher = asyncio.create_task(finish())
+    streamed = [e["message"] async for e in task_store.stream_logs("task_5", poll_interval=0.01)]
+    await finisher
+    assert streamed == ["a", "b", "c", "d"]
+
+@pytest.mark.asyncio
+async def test_legacy_json_logs_are_migrated():
+    """Logs kept in the old tasks.logs column move to task_logs on open."""
+    import aiosqlite
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = Path(temp_dir) / "tasks.db"
+        async with aiosqlite.connect(db_path) as db:
+            await db.execute("""
+                CREATE TABLE tasks (
+                    task_id TEXT PRIMARY KEY, status TEXT NOT NULL DEFAULT 'pending',
+                    progress INTEGER DEFAULT 0, title TEXT, mode TEXT, logs TEXT DEFAULT '[]',
+                    result TEXT, created_at TEXT NOT NULL, updated_at TEXT NOT NULL
+                )
+            """)
+            await db.execute(
+                "INSERT INTO tasks (task_id, logs, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                ("old", '["first", "second"]', "2025-01-01", "2025-01-01")
+            )
+            await db.commit()
+
+        store = TaskStore(str(db_path))
+        try:
+            fetched = await store.get_task("old")
+            assert fetched["logs"] == ["first", "second"]
+        finally:
+            await store.close()
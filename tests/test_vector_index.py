@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+
+from modules.rag.ann_index import ANNIndex
+
+
+def _vectors(n, dim=16, seed=0):
+    return np.random.default_rng(seed).random((n, dim), dtype="float32")
+
+
+@pytest.mark.parametrize("backend", ["flat", "hnsw"])
+def test_add_search_remove(tmp_path, backend):
+    """Removed ids never come back from search."""
+    index = ANNIndex(str(tmp_path), 16, backend=backend)
+    vecs = _vectors(50)
+    ids = index.add(vecs)
+    assert index.ntotal == 50
+
+    _, hits = index.search(vecs[:1], 1)
+    assert hits[0][0] == ids[0]
+
+    assert index.remove([ids[0]]) == 1
+    assert index.ntotal == 49
+    _, hits = index.search(vecs[:1], 5)
+    assert ids[0] not in hits[0]
+
+
+@pytest.mark.parametrize("backend", ["flat", "hnsw"])
+def test_segments_replay_after_reload(tmp_path, backend):
+    """Segments and tombstones are replayed on load without a snapshot."""
+    index = ANNIndex(str(tmp_path), 16, backend=backend)
+    vecs = _vectors(20)
+    ids = index.add(vecs[:10])
+    index.add(vecs[10:])
+    index.remove(ids[:3])
+
+    reloaded = ANNIndex(str(tmp_path), 16, backend=backend)
+    assert reloaded.ntotal == 17
+    assert len(reloaded.segments) == 2
+    _, hits = reloaded.search(vecs[:1], 3)
+    assert ids[0] not in hits[0]
+    assert reloaded.next_id == 20
+
+
+def test_compaction_drops_segments_and_tombstones(tmp_path):
+    index = ANNIndex(str(tmp_path), 16, backend="hnsw", max_segments=2)
+    vecs = _vectors(30)
+    ids = np.concatenate([index.add(vecs[i:i + 10]) for i in range(0, 30, 10)])
+    assert index.needs_compaction
+
+    index.remove(ids[:5])
+    index.compact()
+    assert index.segments == []
+    assert index.index.ntotal == 25
+    files = sorted(p.name for p in tmp_path.iterdir())
+    assert not any(name.startswith("seg_") for name in files)
+
+    reloaded = ANNIndex(str(tmp_path), 16, backend="hnsw")
+    assert reloaded.ntotal == 25
+    kept_ids, _ = reloaded.reconstruct_all()
+    assert set(kept_ids.tolist()) == set(ids[5:].tolist())
+
+
+def test_ivf_trains_on_compaction(tmp_path):
+    index = ANNIndex(str(tmp_path), 16, backend="ivf", nlist=2, nprobe=2)
+    vecs = _vectors(100)
+    ids = index.add(vecs)
+    assert index.active_backend == "flat"
+
+    assert index.maybe_compact()
+    assert index.active_backend == "ivf"
+    index.remove(ids[:10])
+    assert index.ntotal == 90
+
+    reloaded = ANNIndex(str(tmp_path), 16, backend="ivf", nlist=2, nprobe=2)
+    assert reloaded.active_backend == "ivf"
+    assert reloaded.ntotal == 90
+    _, hits = reloaded.search(vecs[50:51], 1)
+    assert hits[0][0] == ids[50]
+
+
+class _StubEncoder:
+    """Deterministic encoder that records how often it is called."""
+
+    def __init__(self, dim=384):
+        self.dim = dim
+        self.calls = 0
+
+    def encode(self, texts):
+        self.calls += 1
+        return np.stack([
+            np.random.default_rng(abs(hash(t)) % (2 ** 32)).random(self.dim, dtype="float32")
+            for t in texts
+        ])
+
+
+@pytest.mark.asyncio
+async def test_vector_store_search_many_single_encode(tmp_path, monkeypatch):
+    import modules.rag.vector_store as vector_store
+
+    monkeypatch.setattr(vector_store, "SentenceTransformer", None)
+    store = vector_store.VectorStore(str(tmp_path))
+    store.model = _StubEncoder()
+
+    texts = [f"chunk {i}" for i in range(10)]
+    await store.add_documents(texts, [{"document_id": f"doc-{i % 2}"} for i in range(10)])
+    store.model.calls = 0
+
+    results = await store.search_many(texts[:4], k=1)
+    assert store.model.calls == 1
+    assert [r[0]["text"] for r in results] == texts[:4]
+
+    store.delete("doc-0")
+    results = await store.search_many([texts[0], texts[1]], k=1)
+    assert results[0][0]["text"] != texts[0]
+    assert results[1][0]["text"] == texts[1]
+    assert await store.search_many([], k=1) == []
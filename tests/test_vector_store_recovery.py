@@ -0,0 +1,87 @@
+import json
+
+import numpy as np
+import pytest
+
+faiss = pytest.importorskip("faiss")
+
+from modules.rag.vector_store import VectorStore
+
+DIM = 384
+
+
+class FakeEmbeddings:
+    """Deterministic text -> vector mapping standing in for the model."""
+
+    def embed(self, texts):
+        return np.stack([_vec(t) for t in texts]).astype("float32")
+
+
+def _vec(text):
+    return np.random.default_rng(abs(hash(text)) % (2 ** 32)).random(DIM, dtype="float32")
+
+
+@pytest.fixture
+def no_model(monkeypatch):
+    monkeypatch.setattr(VectorStore, "_load_dependencies", lambda self: None)
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    def load(self):
+        self.embeddings = FakeEmbeddings()
+    monkeypatch.setattr(VectorStore, "_load_dependencies", load)
+
+
+def _write_legacy(storage, vector_texts, metadata):
+    index = faiss.IndexFlatL2(DIM)
+    index.add(np.stack([_vec(t) for t in vector_texts]))
+    faiss.write_index(index, str(storage / "index.faiss"))
+    (storage / "metadata.json").write_text(json.dumps(metadata))
+
+
+def test_unreadable_index_is_moved_aside_not_deleted(tmp_path, no_model):
+    store = VectorStore(storage_dir=str(tmp_path))
+    store.metadata.add([0], [{"document_id": "d1", "text": "kept"}])
+    store.metadata.close()
+    manifest = tmp_path / "ann" / "manifest.json"
+    manifest.write_text(json.dumps({**json.loads(manifest.read_text()), "dimension": 768}))
+
+    recovered = VectorStore(storage_dir=str(tmp_path))
+
+    assert recovered.index.ntotal == 0
+    assert recovered.metadata.count() == 0
+    broken = {p.name for p in tmp_path.iterdir() if ".broken-" in p.name}
+    assert any(name.startswith("ann.broken-") for name in broken)
+    assert any(name.startswith("metadata.db.broken-") for name in broken)
+
+
+def test_legacy_migration_re_embeds_when_rows_drifted(tmp_path, fake_model):
+    # Baseline delete() dropped "b" from the middle of the metadata list only
+    _write_legacy(tmp_path, ["a", "b", "c"], [{"document_id": "a", "text": "a"}, {"document_id": "c", "text": "c"}])
+
+    store = VectorStore(storage_dir=str(tmp_path))
+
+    assert store.index.ntotal == 2
+    _, hits = store.index.search(_vec("c")[None, :], 1)
+    assert store.metadata.get(int(hits[0][0]))["text"] == "c"
+    assert (tmp_path / "index.faiss.legacy").exists()
+
+
+def test_legacy_migration_waits_for_model_when_rows_drifted(tmp_path, no_model):
+    _write_legacy(tmp_path, ["a", "b"], [{"document_id": "b", "text": "b"}])
+
+    store = VectorStore(storage_dir=str(tmp_path))
+
+    assert store.index.ntotal == 0
+    assert (tmp_path / "index.faiss").exists()
+    assert (tmp_path / "metadata.json").exists()
+
+
+def test_aligned_legacy_index_keeps_its_vectors(tmp_path, no_model):
+    _write_legacy(tmp_path, ["a", "b"], [{"document_id": "a", "text": "a"}, {"document_id": "b", "text": "b"}])
+
+    store = VectorStore(storage_dir=str(tmp_path))
+
+    _, hits = store.index.search(_vec("b")[None, :], 1)
+    assert store.metadata.get(int(hits[0][0]))["text"] == "b"
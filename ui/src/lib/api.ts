@@ -248,6 +248,22 @@ export interface SystemInfo {
   python_version: string;
 }
 
+// Statistics datasets are scoped to a session. The backend issues the id on the
+// first statistics request (X-Session-ID header); keep it for this tab and send it back.
+const STATS_SESSION_KEY = 'biodockify_stats_session';
+
+function statisticsSessionHeaders(endpoint: string): Record<string, string> {
+  if (!endpoint.includes('/statistics') || typeof window === 'undefined') return {};
+  const sessionId = window.sessionStorage.getItem(STATS_SESSION_KEY);
+  return sessionId ? { 'X-Session-ID': sessionId } : {};
+}
+
+function rememberStatisticsSession(endpoint: string, response: Response) {
+  if (!endpoint.includes('/statistics') || typeof window === 'undefined') return;
+  const sessionId = response.headers.get('X-Session-ID');
+  if (sessionId) window.sessionStorage.setItem(STATS_SESSION_KEY, sessionId);
+}
+
 // Helper function for API calls
 async function apiRequest<T>(
   endpoint: string,
@@ -262,13 +278,16 @@ async function apiRequest<T>(
     const response = await fetch(url, {
       ...options,
       signal: controller.signal,
+      credentials: 'same-origin',
       headers: {
         'Content-Type': 'application/json',
+        ...statisticsSessionHeaders(endpoint),
         ...options?.headers,
       },
     });
 
     clearTimeout(id);
+    rememberStatisticsSession(endpoint, response);
 
     if (!response.ok) {
       let message = 'API request failed';